@@ -0,0 +1,326 @@
+"""Content-addressed cache of whole translations.
+
+``haconf --cache-dir DIR`` stores the generated HAProxy configuration and
+the Lua files extracted from it under a key derived from everything that
+can change the output:
+
+- the DSL source, every file it imports and the input format
+- the values of the environment variables the source reads with ``env()``
+- the grammar files and the translator version
+- the Lua output directory (it appears in ``lua-load`` directives)
+- code generation options that change the output, such as
+  ``--hoist-default-server``
+
+On a hit the stored files are written back and parsing, transformation and
+code generation are skipped. Entries are evicted least-recently-used first
+once the cache grows past its size bound; ``haconf --cache-stats`` and
+``haconf --cache-prune`` inspect and trim it.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass, field
+from importlib import resources
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import click
+
+from .. import __version__
+from ..parsers.import_resolver import resolve_import
+from ..utils.files import write_text_if_changed
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+# Bump when the entry layout changes
+CACHE_FORMAT_VERSION = 3
+
+DEFAULT_MAX_SIZE_MB = 256
+
+ENTRIES_DIR = "translations"
+
+_ENV_CALL = re.compile(r"\benv\s*\(")
+_ENV_NAME = re.compile(r'\s*"([^"$\\]*)"')
+_IMPORT = re.compile(r"\bimport\s")
+_IMPORT_NAME = re.compile(r'\s*"([^"$\\]*)"')
+
+
+def referenced_env_vars(source: str) -> list[str] | None:
+    """Return the environment variables read by ``env()`` calls in source.
+
+    Returns None when a variable name is not a plain string literal, since
+    the translation then can't be keyed without running it.
+    """
+    names = set()
+    for call in _ENV_CALL.finditer(source):
+        m = _ENV_NAME.match(source, call.end())
+        if m is None:
+            return None
+        names.add(m.group(1))
+    return sorted(names)
+
+
+def imported_sources(source: str, filepath: Path | None) -> dict[str, str] | None:
+    """Return the contents of every file source imports, directly or not.
+
+    Returns None when an import is not a plain string literal or can't be
+    read; the translation then can't be keyed without running it.
+    """
+    sources: dict[str, str] = {}
+    pending = [(source, filepath)]
+    while pending:
+        text, importer = pending.pop()
+        for stmt in _IMPORT.finditer(text):
+            m = _IMPORT_NAME.match(text, stmt.end())
+            if m is None:
+                return None
+            path = resolve_import(m.group(1), importer)
+            if str(path) in sources:
+                continue
+            try:
+                sources[str(path)] = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                return None
+            pending.append((sources[str(path)], path))
+    return sources
+
+
+def grammar_digest() -> str:
+    """Return a digest of the grammar files shipped with the translator."""
+    digest = hashlib.sha256()
+    grammars = resources.files("haproxy_translator").joinpath("grammars")
+    for entry in sorted(grammars.iterdir(), key=lambda e: e.name):
+        if entry.name.endswith(".lark"):
+            digest.update(entry.name.encode() + b"\0" + entry.read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+def translation_key(
+    source: str,
+    format_name: str,
+    lua_dir: Path,
+    filepath: Path | None = None,
+    codegen_options: Mapping[str, Any] | None = None,
+) -> str | None:
+    """Return the cache key for translating source, or None if it can't be cached.
+
+    ``codegen_options`` are code generation settings that change the output.
+    """
+    imports = imported_sources(source, filepath)
+    if imports is None:
+        return None
+
+    env_vars: set[str] = set()
+    for text in (source, *imports.values()):
+        names = referenced_env_vars(text)
+        if names is None:
+            return None
+        env_vars.update(names)
+
+    material = {
+        "cache_format": CACHE_FORMAT_VERSION,
+        "translator": __version__,
+        "grammar": grammar_digest(),
+        "format": format_name,
+        "lua_dir": str(lua_dir),
+        "codegen": dict(codegen_options or {}),
+        "env": {name: os.environ.get(name) for name in sorted(env_vars)},
+        "source": source,
+        "imports": imports,
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+
+@dataclass
+class CachedTranslation:
+    """Output of one translation: the config and the Lua, map and pattern files it loads."""
+
+    config: str
+    lua_files: dict[str, str] = field(default_factory=dict)
+    map_files: dict[str, str] = field(default_factory=dict)
+    pattern_files: dict[str, str] = field(default_factory=dict)
+
+    def write(self, output: Path | None) -> bool:
+        """Write the Lua, map and pattern files, and the config if ``output`` is given.
+
+        Files already holding their content are left alone.
+
+        Returns:
+            True if any file was written
+        """
+        changed = False
+        for files in (self.lua_files, self.map_files, self.pattern_files):
+            for path, content in files.items():
+                file_path = Path(path)
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                changed |= write_text_if_changed(file_path, content)
+        if output:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            changed |= write_text_if_changed(output, self.config)
+        return changed
+
+
+@dataclass
+class CacheStats:
+    """Summary of the cache contents."""
+
+    entries: int = 0
+    size_bytes: int = 0
+    oldest: float | None = None
+    newest: float | None = None
+
+
+class TranslationCache:
+    """Size-bounded LRU cache of translations in a directory.
+
+    Each entry is one JSON file named after its key; the file's mtime is its
+    last use, so eviction needs no separate index and concurrent ``haconf``
+    runs can share a cache directory.
+    """
+
+    def __init__(self, cache_dir: Path, max_size_mb: int = DEFAULT_MAX_SIZE_MB):
+        self.cache_dir = Path(cache_dir)
+        self.entries_dir = self.cache_dir / ENTRIES_DIR
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+
+    def _entry_path(self, key: str) -> Path:
+        return self.entries_dir / f"{key}.json"
+
+    def _entries(self) -> list[tuple[Path, os.stat_result]]:
+        try:
+            paths = list(self.entries_dir.glob("*.json"))
+        except OSError:
+            return []
+
+        entries = []
+        for path in paths:
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                # Removed by a concurrent prune
+                continue
+        return entries
+
+    def get(self, key: str) -> CachedTranslation | None:
+        """Return the translation stored under key, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            data: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+            entry = CachedTranslation(
+                config=data["config"],
+                lua_files=data["lua_files"],
+                map_files=data["map_files"],
+                pattern_files=data["pattern_files"],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing or corrupt entries are just misses
+            return None
+
+        # Mark as recently used
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return entry
+
+    def put(self, key: str, entry: CachedTranslation) -> None:
+        """Store a translation under key, then evict entries over the size bound."""
+        data = json.dumps(
+            {
+                "config": entry.config,
+                "lua_files": entry.lua_files,
+                "map_files": entry.map_files,
+                "pattern_files": entry.pattern_files,
+            }
+        )
+        try:
+            self.entries_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so concurrent readers never see
+            # a partial entry
+            fd, tmp_name = tempfile.mkstemp(dir=self.entries_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                Path(tmp_name).replace(self._entry_path(key))
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError:
+            # Read-only or full cache directory: translate without caching
+            return
+        self.prune()
+
+    def prune(self, max_size_bytes: int | None = None) -> int:
+        """Evict least recently used entries until the cache fits the size bound.
+
+        Args:
+            max_size_bytes: Size bound, default the cache's own (0 empties it)
+
+        Returns:
+            Number of entries removed
+        """
+        limit = self.max_size_bytes if max_size_bytes is None else max_size_bytes
+        entries = sorted(self._entries(), key=lambda e: e[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+
+        removed = 0
+        for path, stat in entries:
+            if total <= limit:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            removed += 1
+        return removed
+
+    def stats(self) -> CacheStats:
+        """Return the number, total size and age range of entries."""
+        entries = self._entries()
+        mtimes = [stat.st_mtime for _, stat in entries]
+        return CacheStats(
+            entries=len(entries),
+            size_bytes=sum(stat.st_size for _, stat in entries),
+            oldest=min(mtimes, default=None),
+            newest=max(mtimes, default=None),
+        )
+
+
+def _format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size}B"
+    value = size / 1024
+    for unit in ("KB", "MB"):
+        if value < 1024:
+            return f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GB"
+
+
+def _format_time(timestamp: float | None) -> str:
+    if timestamp is None:
+        return "-"
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+
+def show_stats(cache_dir: Path) -> None:
+    """Show the number and size of cached translations (haconf --cache-stats)."""
+    cache_stats = TranslationCache(cache_dir).stats()
+    click.echo(f"Cache directory: {cache_dir}")
+    click.echo(f"Entries:         {cache_stats.entries}")
+    click.echo(f"Size:            {_format_size(cache_stats.size_bytes)}")
+    click.echo(f"Oldest use:      {_format_time(cache_stats.oldest)}")
+    click.echo(f"Newest use:      {_format_time(cache_stats.newest)}")
+
+
+def prune(cache_dir: Path, max_size: int) -> None:
+    """Evict least recently used translations past max_size MB (haconf --cache-prune)."""
+    cache = TranslationCache(cache_dir, max_size)
+    removed = cache.prune()
+    remaining = cache.stats()
+    click.echo(
+        f"Removed {removed} entries, {remaining.entries} left "
+        f"({_format_size(remaining.size_bytes)})"
+    )
@@ -1,6 +1,7 @@
 """Command-line interface for HAProxy configuration translator."""
 
 import sys
+from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -11,18 +12,52 @@ from rich.syntax import Syntax
 
 from .. import __version__
 from ..codegen.haproxy import HAProxyCodeGenerator
+from ..ir.serialization import dump as dump_ir
+from ..ir.serialization import load as load_ir
 from ..lua.manager import LuaManager
+from ..maps.manager import MapManager
+from ..maps.patterns import MIN_PATTERN_VALUES, PatternManager
 from ..parsers import ParserRegistry
 from ..utils.errors import TranslatorError
+from ..utils.files import stream_text_if_changed, write_text_if_changed
+from .cache import (
+    DEFAULT_MAX_SIZE_MB,
+    CachedTranslation,
+    TranslationCache,
+    translation_key,
+)
+from .cache import prune as prune_cache
+from .cache import show_stats as show_cache_stats
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from ..parsers.base import ConfigParser
+    from ..validators.performance import PerformanceReport
     from ..validators.security import SecurityReport
 
 console = Console()
 
+# Exit status with --exit-code when the output files were already up to date
+EXIT_UNCHANGED = 3
+
+
+@dataclass(frozen=True)
+class OutputOptions:
+    """Options shaping the generated output, applied by every translation run."""
+
+    cache_dir: Path | None = None
+    cache_max_size: int = DEFAULT_MAX_SIZE_MB
+    jobs: int = 1
+    hoist_default_server: bool = False
+    factor_defaults: bool = False
+    routing_maps: bool = False
+    acl_pattern_files: bool = False
+    acl_pattern_threshold: int = MIN_PATTERN_VALUES
+
 
 @click.command()
-@click.argument("config_file", type=click.Path(exists=True, path_type=Path))
+@click.argument("config_file", type=click.Path(exists=True, path_type=Path), required=False)
 @click.option(
     "-o",
     "--output",
@@ -46,9 +81,88 @@ console = Console()
 @click.option("--list-formats", is_flag=True, help="List available input formats")
 @click.option("-v", "--verbose", is_flag=True, help="Verbose output")
 @click.option("--security-check", is_flag=True, help="Run security validation and show report")
+@click.option(
+    "--perf-check",
+    is_flag=True,
+    help="Report performance anti-patterns with their estimated cost and a fix",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Reuse translations of unchanged inputs from this cache directory",
+)
+@click.option(
+    "--cache-max-size",
+    type=click.IntRange(min=0),
+    default=DEFAULT_MAX_SIZE_MB,
+    show_default=True,
+    help="Maximum translation cache size in MB",
+)
+@click.option(
+    "--cache-stats",
+    is_flag=True,
+    help="Show the number and size of translations in --cache-dir and exit",
+)
+@click.option(
+    "--cache-prune",
+    is_flag=True,
+    help="Evict least recently used translations from --cache-dir until it fits "
+    "--cache-max-size (0 empties it) and exit",
+)
+@click.option(
+    "--emit-ir",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the validated IR to this file (generates output only with -o)",
+)
+@click.option(
+    "--from-ir",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Generate from IR written by --emit-ir instead of parsing a config file",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Worker processes for formatting frontends, backends and listens",
+)
+@click.option(
+    "--hoist-default-server",
+    is_flag=True,
+    help="Move server options shared by all servers of a backend to its default-server line",
+)
+@click.option(
+    "--factor-defaults",
+    is_flag=True,
+    help="Move settings repeated across frontends, backends and listens to defaults",
+)
+@click.option(
+    "--routing-maps",
+    is_flag=True,
+    help="Route frontends with many host or path use_backend rules through generated map files",
+)
+@click.option(
+    "--acl-pattern-files",
+    is_flag=True,
+    help="Deduplicate ACL values and move long value lists to generated pattern files",
+)
+@click.option(
+    "--acl-pattern-threshold",
+    type=click.IntRange(min=1),
+    default=MIN_PATTERN_VALUES,
+    show_default=True,
+    help="Fewest ACL values moved to a pattern file with --acl-pattern-files",
+)
+@click.option(
+    "--exit-code",
+    is_flag=True,
+    help=f"Exit with status {EXIT_UNCHANGED} if the output files were already up to date",
+)
 @click.version_option(version=__version__, prog_name="haconf")
 def cli(
-    config_file: Path,
+    *,
+    config_file: Path | None,
     output: Path | None,
     format: str | None,
     validate: bool,
@@ -58,6 +172,20 @@ def cli(
     list_formats: bool,
     verbose: bool,
     security_check: bool,
+    perf_check: bool,
+    cache_dir: Path | None,
+    cache_max_size: int,
+    cache_stats: bool,
+    cache_prune: bool,
+    emit_ir: Path | None,
+    from_ir: Path | None,
+    jobs: int,
+    hoist_default_server: bool,
+    factor_defaults: bool,
+    routing_maps: bool,
+    acl_pattern_files: bool,
+    acl_pattern_threshold: int,
+    exit_code: bool,
 ) -> None:
     """
     haconf - HAProxy Configuration Translator.
@@ -68,19 +196,70 @@ def cli(
     Examples:
         haconf config.hap -o haproxy.cfg
         haconf config.yaml --format yaml --validate
+        haconf config.hap --validate --perf-check
         haconf config.hap -o haproxy.cfg --watch
+        haconf config.hap -o haproxy.cfg --cache-dir .haconf-cache
+        haconf --cache-stats --cache-dir .haconf-cache
+        haconf --cache-prune --cache-dir .haconf-cache --cache-max-size 64
+        haconf config.hap --emit-ir config.ir
+        haconf --from-ir config.ir -o haproxy.cfg
+        haconf config.hap -o haproxy.cfg --jobs 8
+        haconf config.hap -o haproxy.cfg --hoist-default-server --factor-defaults
+        haconf config.hap -o haproxy.cfg --routing-maps --acl-pattern-files
+        haconf config.hap -o haproxy.cfg --exit-code
     """
     if list_formats:
         _list_formats()
         return
 
+    if cache_stats or cache_prune:
+        if cache_dir is None:
+            raise click.UsageError("--cache-stats and --cache-prune need --cache-dir")
+        if cache_prune:
+            prune_cache(cache_dir, cache_max_size)
+        if cache_stats:
+            show_cache_stats(cache_dir)
+        return
+
+    if (config_file is None) == (from_ir is None):
+        raise click.UsageError("Give either CONFIG_FILE or --from-ir")
+    if watch and config_file is None:
+        raise click.UsageError("--watch needs CONFIG_FILE")
+
+    options = OutputOptions(
+        cache_dir=cache_dir,
+        cache_max_size=cache_max_size,
+        jobs=jobs,
+        hoist_default_server=hoist_default_server,
+        factor_defaults=factor_defaults,
+        routing_maps=routing_maps,
+        acl_pattern_files=acl_pattern_files,
+        acl_pattern_threshold=acl_pattern_threshold,
+    )
+
     try:
         if watch:
-            _watch_mode(config_file, output, format, lua_dir, verbose)
+            assert config_file is not None  # Checked above
+            _watch_mode(
+                config_file, output, format, lua_dir=lua_dir, verbose=verbose, options=options
+            )
         else:
-            _translate_once(
-                config_file, output, format, validate, debug, lua_dir, verbose, security_check
+            changed = _translate_once(
+                config_file,
+                output,
+                format,
+                validate=validate,
+                debug=debug,
+                lua_dir=lua_dir,
+                verbose=verbose,
+                security_check=security_check,
+                perf_check=perf_check,
+                emit_ir=emit_ir,
+                from_ir=from_ir,
+                options=options,
             )
+            if exit_code and not changed:
+                sys.exit(EXIT_UNCHANGED)
 
     except TranslatorError as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
@@ -96,37 +275,97 @@ def cli(
 
 
 def _translate_once(
-    config_file: Path,
+    config_file: Path | None,
     output: Path | None,
     format: str | None,
+    *,
     validate: bool,
     debug: bool,
     lua_dir: Path | None,
     verbose: bool,
     security_check: bool = False,
-) -> None:
-    """Translate configuration once."""
-    if verbose:
-        console.print(f"[dim]Reading config from:[/dim] {config_file}")
+    perf_check: bool = False,
+    emit_ir: Path | None = None,
+    from_ir: Path | None = None,
+    options: OutputOptions | None = None,
+) -> bool:
+    """Translate configuration once, from config_file or from IR read from from_ir.
+
+    Output files already holding the generated content are left alone.
+    ``options`` default to ``OutputOptions()``.
+
+    Returns:
+        False if output was written to files that were all already up to
+        date, True otherwise
+    """
+    if options is None:
+        options = OutputOptions()
 
-    # Get parser
-    try:
-        if format:
-            parser = ParserRegistry.get_parser(format_name=format)
-        else:
-            parser = ParserRegistry.get_parser(filepath=config_file)
+    # Lua scripts are extracted next to the output by default
+    if lua_dir:
+        lua_output_dir = lua_dir
+    elif output:
+        lua_output_dir = output.parent
+    else:
+        lua_output_dir = Path.cwd()
+    # Map and pattern files always go next to the output
+    data_output_dir = output.parent if output else Path.cwd()
 
+    translation_cache = None
+    cache_key = None
+    if from_ir is not None:
         if verbose:
-            console.print(f"[dim]Using parser:[/dim] {parser.format_name}")
-
-    except ValueError as e:
-        console.print(f"[bold red]Error:[/bold red] {e}")
-        _list_formats()
-        sys.exit(1)
-
-    # Parse configuration
-    with console.status("[bold green]Parsing configuration...", spinner="dots"):
-        ir = parser.parse_file(config_file)
+            console.print(f"[dim]Reading IR from:[/dim] {from_ir}")
+        ir = load_ir(from_ir)
+    elif config_file is not None:
+        if verbose:
+            console.print(f"[dim]Reading config from:[/dim] {config_file}")
+        parser = _get_parser(config_file, format, verbose)
+
+        # Reuse a cached translation of identical input (validation, security and
+        # performance checks, debug output and --emit-ir need the IR, so they
+        # always translate)
+        if options.cache_dir and not (validate or debug or security_check or perf_check or emit_ir):
+            translation_cache = TranslationCache(options.cache_dir, options.cache_max_size)
+            source = config_file.read_text(encoding="utf-8")
+            cache_key = translation_key(
+                source,
+                parser.format_name,
+                lua_output_dir,
+                config_file,
+                codegen_options={
+                    "hoist_default_server": options.hoist_default_server,
+                    "factor_defaults": options.factor_defaults,
+                    "routing_maps": str(data_output_dir) if options.routing_maps else None,
+                    "acl_pattern_files": (
+                        [str(data_output_dir), options.acl_pattern_threshold]
+                        if options.acl_pattern_files
+                        else None
+                    ),
+                },
+            )
+            cached = translation_cache.get(cache_key) if cache_key else None
+            if cache_key and cached is not None:
+                if verbose:
+                    console.print(f"[dim]Using cached translation:[/dim] {cache_key[:16]}")
+                changed = cached.write(output) or output is None
+                _show_output(
+                    cached.config,
+                    output,
+                    lua_output_dir,
+                    bool(cached.lua_files),
+                    changed,
+                    generated_dirs=_generated_dirs(
+                        data_output_dir, bool(cached.map_files), bool(cached.pattern_files)
+                    ),
+                )
+                return changed
+
+        # Parse configuration
+        with console.status("[bold green]Parsing configuration...", spinner="dots"):
+            ir = parser.parse_file(config_file)
+    else:
+        raise click.UsageError("Give either CONFIG_FILE or --from-ir")
 
     if verbose:
         console.print(
@@ -141,6 +380,16 @@ def _translate_once(
         console.print(f"  Variables: {list(ir.variables.keys())}")
         console.print(f"  Templates: {list(ir.templates.keys())}")
 
+    # Run performance validation if requested; its findings are advisory
+    if perf_check:
+        from ..validators.performance import PerformanceValidator
+
+        with console.status("[bold green]Running performance checks...", spinner="dots"):
+            performance_validator = PerformanceValidator(ir)
+            performance_report = performance_validator.validate()
+
+        _display_performance_report(performance_report)
+
     # Run security validation if requested
     if security_check:
         from ..validators.security import SecurityValidator
@@ -154,18 +403,17 @@ def _translate_once(
         if not report.passed:
             sys.exit(2)  # Exit with code 2 for security issues
 
+    if emit_ir:
+        dump_ir(ir, emit_ir)
+        console.print(f"[bold green]✓[/bold green] IR written to: [cyan]{emit_ir}[/cyan]")
+        if output is None:
+            return True
+
     if validate:
         console.print("[bold green]✓[/bold green] Configuration is valid")
-        return
+        return True
 
     # Extract Lua scripts
-    if lua_dir:
-        lua_output_dir = lua_dir
-    elif output:
-        lua_output_dir = output.parent
-    else:
-        lua_output_dir = Path.cwd()
-
     lua_manager = LuaManager(lua_output_dir)
 
     with console.status("[bold green]Extracting Lua scripts...", spinner="dots"):
@@ -176,19 +424,121 @@ def _translate_once(
         for name, path in lua_manager.get_script_paths().items():
             console.print(f"  - {name}: {path}")
 
+    # Write routing map files
+    map_manager = MapManager(data_output_dir)
+    if options.routing_maps:
+        ir = map_manager.extract_routing_maps(ir)
+
+        if verbose and map_manager.map_paths:
+            console.print("[dim]Generated routing maps:[/dim]")
+            for name, paths in map_manager.map_paths.items():
+                console.print(f"  - {name}: {', '.join(str(path) for path in paths)}")
+
+    # Write ACL pattern files
+    pattern_manager = PatternManager(data_output_dir, options.acl_pattern_threshold)
+    if options.acl_pattern_files:
+        ir = pattern_manager.extract_acl_patterns(ir)
+
     # Generate HAProxy configuration
     with console.status("[bold green]Generating HAProxy config...", spinner="dots"):
-        generator = HAProxyCodeGenerator()
-        config = generator.generate(ir, output_path=output)
+        generator = HAProxyCodeGenerator(
+            jobs=options.jobs,
+            hoist_default_server=options.hoist_default_server,
+            factor_defaults=options.factor_defaults,
+        )
+        config = None
+        if output is None:
+            config = generator.generate(ir)
+            changed = True
+        else:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            if translation_cache:
+                config = generator.generate(ir)
+                changed = write_text_if_changed(output, config)
+            else:
+                # Only the cache and stdout need the text; stream files section by section
+                changed = stream_text_if_changed(output, lambda out: generator.generate_to(ir, out))
+            changed |= (
+                lua_manager.files_changed
+                or map_manager.files_changed
+                or pattern_manager.files_changed
+            )
+
+    if translation_cache and cache_key and config is not None:
+        lua_files = {str(path): content for path, content in lua_manager.generated_files.items()}
+        map_files = {str(path): content for path, content in map_manager.generated_files.items()}
+        pattern_files = {
+            str(path): content for path, content in pattern_manager.generated_files.items()
+        }
+        translation_cache.put(
+            cache_key, CachedTranslation(config, lua_files, map_files, pattern_files)
+        )
+
+    _show_output(
+        config,
+        output,
+        lua_output_dir,
+        bool(lua_manager.script_map),
+        changed,
+        generated_dirs=_generated_dirs(
+            data_output_dir,
+            bool(map_manager.generated_files),
+            bool(pattern_manager.generated_files),
+        ),
+    )
+    return changed
+
+
+def _get_parser(config_file: Path, format: str | None, verbose: bool) -> ConfigParser:
+    """Return the parser for format, or for config_file's extension."""
+    try:
+        if format:
+            parser = ParserRegistry.get_parser(format_name=format)
+        else:
+            parser = ParserRegistry.get_parser(filepath=config_file)
+
+        if verbose:
+            console.print(f"[dim]Using parser:[/dim] {parser.format_name}")
+
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        _list_formats()
+        sys.exit(1)
+
+    return parser
+
+
+def _generated_dirs(data_output_dir: Path, has_maps: bool, has_patterns: bool) -> dict[str, Path]:
+    """Return the directories map and pattern files were written to, by kind."""
+    dirs = {}
+    if has_maps:
+        dirs["Map files"] = data_output_dir / "maps"
+    if has_patterns:
+        dirs["Pattern files"] = data_output_dir / "patterns"
+    return dirs
+
 
-    # Output
-    if output:
+def _show_output(
+    config: str | None,
+    output: Path | None,
+    lua_output_dir: Path,
+    has_lua: bool,
+    changed: bool = True,
+    *,
+    generated_dirs: Mapping[str, Path] | None = None,
+) -> None:
+    """Report where the configuration went, or print it if there is no output file."""
+    if output and not changed:
+        console.print(f"[bold green]✓[/bold green] Configuration unchanged: [cyan]{output}[/cyan]")
+    elif output:
         console.print(f"[bold green]✓[/bold green] Configuration written to: [cyan]{output}[/cyan]")
-        if lua_manager.script_map:
+        if has_lua:
             console.print(
                 f"[bold green]✓[/bold green] Lua scripts written to: [cyan]{lua_output_dir / 'lua'}[/cyan]"
             )
-    else:
+        for kind, directory in (generated_dirs or {}).items():
+            console.print(f"[bold green]✓[/bold green] {kind} written to: [cyan]{directory}[/cyan]")
+    elif config is not None:
         # Print to stdout with syntax highlighting
         syntax = Syntax(config, "nginx", theme="monokai", line_numbers=False)
         console.print(Panel(syntax, title="Generated HAProxy Configuration", border_style="green"))
@@ -198,10 +548,16 @@ def _watch_mode(
     config_file: Path,
     output: Path | None,
     format: str | None,
+    *,
     lua_dir: Path | None,
     verbose: bool,
+    options: OutputOptions,
 ) -> None:
-    """Watch for file changes and regenerate."""
+    """Watch for file changes and regenerate.
+
+    ``options`` are passed to every ``_translate_once`` call, so each
+    regeneration writes what a plain run with them would.
+    """
     try:
         from watchdog.events import (
             DirModifiedEvent,
@@ -233,7 +589,16 @@ def _watch_mode(
 
                 console.print("\n[dim]File changed, regenerating...[/dim]")
                 try:
-                    _translate_once(config_file, output, format, False, False, lua_dir, verbose)
+                    _translate_once(
+                        config_file,
+                        output,
+                        format,
+                        validate=False,
+                        debug=False,
+                        lua_dir=lua_dir,
+                        verbose=verbose,
+                        options=options,
+                    )
                 except Exception as e:
                     console.print(f"[bold red]Error:[/bold red] {e}")
 
@@ -241,7 +606,16 @@ def _watch_mode(
     console.print("[dim]Press Ctrl+C to stop[/dim]\n")
 
     # Initial generation
-    _translate_once(config_file, output, format, False, False, lua_dir, verbose)
+    _translate_once(
+        config_file,
+        output,
+        format,
+        validate=False,
+        debug=False,
+        lua_dir=lua_dir,
+        verbose=verbose,
+        options=options,
+    )
 
     # Setup file watcher
     event_handler = ConfigFileHandler(config_file)
@@ -324,6 +698,61 @@ def _display_security_report(report: SecurityReport) -> None:
         console.print("\n[bold red]Security Check Failed[/bold red] (critical/high issues found)\n")
 
 
+def _display_performance_report(report: PerformanceReport) -> None:
+    """Display performance validation report."""
+    from rich.table import Table
+
+    from ..validators.performance import PerformanceImpact
+
+    # Define colors for each impact
+    impact_colors = {
+        PerformanceImpact.HIGH: "red",
+        PerformanceImpact.MEDIUM: "yellow",
+        PerformanceImpact.LOW: "cyan",
+        PerformanceImpact.INFO: "dim",
+    }
+
+    if not report.issues:
+        console.print("\n[bold green]Performance Check Passed[/bold green]")
+        console.print("[dim]No performance issues found.[/dim]\n")
+        return
+
+    # Count issues by impact
+    counts: dict[PerformanceImpact, int] = {}
+    for issue in report.issues:
+        counts[issue.impact] = counts.get(issue.impact, 0) + 1
+
+    # Print summary
+    console.print("\n[bold]Performance Check Report[/bold]")
+    summary_parts = []
+    for impact in PerformanceImpact:
+        if impact in counts:
+            color = impact_colors[impact]
+            summary_parts.append(f"[{color}]{impact.value}: {counts[impact]}[/{color}]")
+    console.print("  " + " | ".join(summary_parts))
+
+    # Create detailed table
+    table = Table(show_header=True, header_style="bold")
+    table.add_column("Impact", width=8)
+    table.add_column("Location", width=30)
+    table.add_column("Issue", width=30)
+    table.add_column("Estimated Cost", width=35)
+    table.add_column("Fix", width=35)
+
+    for issue in sorted(report.issues, key=lambda x: list(PerformanceImpact).index(x.impact)):
+        color = impact_colors[issue.impact]
+        table.add_row(
+            f"[{color}]{issue.impact.value}[/{color}]",
+            issue.location,
+            issue.message,
+            issue.cost,
+            issue.recommendation,
+        )
+
+    console.print(table)
+    console.print()
+
+
 def _list_formats() -> None:
     """List available input formats."""
     console.print("\n[bold]Available Input Formats:[/bold]\n")
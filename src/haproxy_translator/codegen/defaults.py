@@ -0,0 +1,195 @@
+"""Factoring settings that proxies repeat into the defaults section.
+
+Frontends, backends and listens inherit whatever they leave unset from the
+defaults section. ``factor_defaults`` uses that to drop repeated settings
+from the proxies without changing what any of them ends up with:
+
+- A proxy setting something to the value it would inherit has it dropped.
+- When every proxy that uses a setting sets it, defaults takes the value
+  most of them share, and those proxies have it dropped. While even one
+  proxy leaves the setting unset, and so inherits it, the defaults value
+  stays as it is.
+
+Which proxies use a setting follows HAProxy: ``timeout client`` matters to
+frontends and listens, ``retries`` to backends and listens. A proxy that
+uses a setting the IR cannot give it, such as ``log`` in a listen, counts
+as leaving it unset.
+
+Log lines add loggers to the ones inherited from defaults rather than
+replace them, so factoring never changes the defaults ``log``; a proxy only
+drops a log line that repeats the one it inherits.
+
+Options apply in order, defaults first, and the last of the options that
+set the same thing wins (``httplog`` and ``tcplog``, for instance). An
+option moves to defaults when every proxy has it and none sets the same
+thing before it. A proxy drops an option when it would inherit that very
+option from defaults and sets nothing else of its kind before it.
+
+Only configurations with a defaults section are factored. A new one would
+add its always-emitted mode, retries and timeouts to every proxy.
+"""
+
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from ..ir.nodes import Backend, Frontend, Listen
+from ..transformers.sharing import map_changed, replace_changed
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from ..ir.nodes import ConfigIR
+
+_CLIENT_SIDE = (Frontend, Listen)
+_SERVER_SIDE = (Backend, Listen)
+_ALL = (Frontend, Backend, Listen)
+
+# Factored settings: defaults fields, with the proxies that use them. A
+# proxy field of the same name leaves the setting unset when it is None
+_SETTINGS: dict[str, tuple[type, ...]] = {
+    "retries": _SERVER_SIDE,
+    "http_reuse": _SERVER_SIDE,
+    "timeout_connect": _SERVER_SIDE,
+    "timeout_server": _SERVER_SIDE,
+    "timeout_queue": _SERVER_SIDE,
+    "timeout_check": _SERVER_SIDE,
+    "timeout_tunnel": _SERVER_SIDE,
+    "timeout_server_fin": _SERVER_SIDE,
+    "timeout_client": _CLIENT_SIDE,
+    "timeout_client_fin": _CLIENT_SIDE,
+    "timeout_http_request": _ALL,
+    "timeout_http_keep_alive": _ALL,
+    "timeout_tarpit": _ALL,
+}
+
+# Options that set the same thing, so that the last one set wins
+_OPTION_FAMILIES = {
+    **dict.fromkeys(("httplog", "httpslog", "tcplog"), "log format"),
+    **dict.fromkeys(("httpclose", "http-server-close", "http-keep-alive"), "connection mode"),
+    **dict.fromkeys(
+        (
+            "httpchk",
+            "ssl-hello-chk",
+            "smtpchk",
+            "tcp-check",
+            "mysql-check",
+            "pgsql-check",
+            "redis-check",
+            "ldap-check",
+            "spop-check",
+            "external-check",
+        ),
+        "health check",
+    ),
+}
+
+
+def factor_defaults(ir: ConfigIR) -> ConfigIR:
+    """Move settings repeated across proxies into ``ir.defaults``.
+
+    Returns:
+        ``ir`` with the settings factored, or ``ir`` itself if it has no
+        defaults section or nothing can be factored
+    """
+    defaults = ir.defaults
+    proxies: list[Frontend | Backend | Listen] = [*ir.frontends, *ir.backends, *ir.listens]
+    if defaults is None or not proxies:
+        return ir
+
+    settings = {
+        field: _defaults_value(
+            [getattr(proxy, field, None) for proxy in proxies if isinstance(proxy, users)],
+            getattr(defaults, field),
+        )
+        for field, users in _SETTINGS.items()
+    }
+    inherited_log = (defaults.log,) if defaults.log else None
+    options = [*defaults.options, *_shared_options(proxies, defaults.options)]
+    defaults = replace_changed(
+        defaults,
+        **{field: value for field, value in settings.items() if value != getattr(defaults, field)},
+        options=defaults.options if len(options) == len(defaults.options) else options,
+    )
+
+    # The option each kind of option ends up as in defaults
+    inherited_options = {_option_kind(option): option for option in defaults.options}
+
+    def factor(proxy: Frontend | Backend | Listen) -> Frontend | Backend | Listen:
+        return _factor_proxy(proxy, settings, inherited_log, inherited_options)
+
+    return replace_changed(
+        ir,
+        defaults=defaults,
+        frontends=map_changed(factor, ir.frontends),
+        backends=map_changed(factor, ir.backends),
+        listens=map_changed(factor, ir.listens),
+    )
+
+
+def _defaults_value(values: list[Any], current: Any) -> Any:
+    """Return the defaults value that lets the most of ``values`` be dropped.
+
+    ``values`` are the values of a setting in the proxies using it, None
+    where a proxy leaves it unset; those proxies inherit ``current``, so
+    it is kept.
+    """
+    if not values or None in values:
+        return current
+    counts = Counter(values)
+    best = max(counts.values())
+    return current if counts[current] == best else counts.most_common(1)[0][0]
+
+
+def _option_kind(option: str) -> str:
+    """Return what an option sets; of options of one kind, the last set wins."""
+    name = option.removeprefix("no ").partition(" ")[0]
+    return _OPTION_FAMILIES.get(name, name)
+
+
+def _shared_options(
+    proxies: Sequence[Frontend | Backend | Listen], inherited: Sequence[str]
+) -> list[str]:
+    """Return the options every proxy sets first of their kind, not yet in defaults."""
+    shared = []
+    for option in proxies[0].options:
+        if option in inherited or option in shared:
+            continue
+        kind = _option_kind(option)
+        for proxy in proxies:
+            if option not in proxy.options:
+                break
+            before = proxy.options[: proxy.options.index(option)]
+            if any(_option_kind(other) == kind for other in before):
+                break
+        else:
+            shared.append(option)
+    return shared
+
+
+def _factor_proxy(
+    proxy: Frontend | Backend | Listen,
+    settings: dict[str, Any],
+    inherited_log: tuple[str] | None,
+    inherited_options: dict[str, str],
+) -> Frontend | Backend | Listen:
+    """Drop the settings ``proxy`` would inherit from defaults anyway."""
+    changes: dict[str, Any] = {
+        field: None
+        for field, users in _SETTINGS.items()
+        if isinstance(proxy, users)
+        and settings[field] is not None
+        and getattr(proxy, field, None) == settings[field]
+    }
+    if not isinstance(proxy, Listen) and tuple(proxy.log) == inherited_log:
+        changes["log"] = ()
+
+    kept: list[str] = []
+    kinds_set: set[str] = set()
+    for option in proxy.options:
+        kind = _option_kind(option)
+        if kind in kinds_set or inherited_options.get(kind) != option:
+            kept.append(option)
+        kinds_set.add(kind)
+    if len(kept) != len(proxy.options):
+        changes["options"] = kept
+    return replace_changed(proxy, **changes)
@@ -0,0 +1,180 @@
+"""Table-driven emission of section directives.
+
+A section's directives are described by a table with one ``Directive`` per
+IR field, in output order. ``compile_emitter`` turns a table into a Python
+function for one node type and indent, compiled once, which emits the
+directives as a straight run of field loads and tests, like a hand-written
+chain of ``if field: lines.append(...)`` without an indent method call per
+directive. Sequence and mapping fields are tested before they are iterated,
+so the many empty ones cost a truth test instead of an iterator.
+
+Keywords default to the field name with dashes for underscores, and
+``timeout_<name>`` fields become ``timeout <name>``.
+"""
+
+import dataclasses
+from dataclasses import dataclass
+from enum import Enum
+from functools import cache
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+
+class When(Enum):
+    """When a directive is emitted; values are the test's source."""
+
+    TRUTHY = "if {}:"
+    SET = "if {} is not None:"
+    FALSY = "if not {}:"
+    ALWAYS = ""
+
+
+class Emit(Enum):
+    """How a directive is formatted from its field value."""
+
+    VALUE = "value"  # keyword value
+    ENUM = "enum"  # keyword value.value
+    FLAG = "flag"  # keyword
+    ON_OFF = "on_off"  # keyword on|off
+    EACH = "each"  # keyword item, per item; method(item) when a method is given
+    ITEMS = "items"  # keyword key value, per mapping item
+    QUOTED_ITEMS = "quoted_items"  # keyword key "value", per mapping item
+    LINE = "line"  # method(value)
+    LINES = "lines"  # method(value) returns several lines
+
+
+@dataclass(frozen=True, slots=True)
+class Directive:
+    """How one IR field is emitted as configuration lines.
+
+    ``method`` names a code generator method that formats the value (or
+    each item, for ``Emit.EACH``) without indentation.
+    """
+
+    field: str
+    keyword: str = ""
+    emit: Emit = Emit.VALUE
+    when: When = When.TRUTHY
+    method: str | None = None
+
+
+def keyword_for(field: str) -> str:
+    """Derive a directive keyword from an IR field name."""
+    if field.startswith("timeout_"):
+        return "timeout " + field.removeprefix("timeout_").replace("_", "-")
+    return field.replace("_", "-")
+
+
+def scalar(field: str, keyword: str | None = None, when: When = When.TRUTHY) -> Directive:
+    """``keyword value``, when the field is truthy."""
+    return Directive(field, keyword or keyword_for(field), Emit.VALUE, when)
+
+
+def setting(field: str, keyword: str | None = None) -> Directive:
+    """``keyword value``, when the field is not None."""
+    return scalar(field, keyword, When.SET)
+
+
+def flag(field: str, keyword: str | None = None, when: When = When.TRUTHY) -> Directive:
+    """A bare ``keyword``, when the field is truthy."""
+    return Directive(field, keyword or keyword_for(field), Emit.FLAG, when)
+
+
+def on_off(field: str, keyword: str | None = None) -> Directive:
+    """``keyword on`` or ``keyword off``, when the field is not None."""
+    return Directive(field, keyword or keyword_for(field), Emit.ON_OFF, When.SET)
+
+
+def enum_value(field: str, keyword: str | None = None, when: When = When.ALWAYS) -> Directive:
+    """``keyword value.value`` for Enum fields."""
+    return Directive(field, keyword or keyword_for(field), Emit.ENUM, when)
+
+
+def each(field: str, keyword: str = "", method: str | None = None) -> Directive:
+    """``keyword item`` or ``keyword method(item)`` per item, when there are any."""
+    return Directive(field, keyword, Emit.EACH, When.TRUTHY, method)
+
+
+def pairs(field: str, keyword: str = "", quoted: bool = False) -> Directive:
+    """``keyword key value`` per mapping item, with the value quoted if ``quoted``."""
+    emit = Emit.QUOTED_ITEMS if quoted else Emit.ITEMS
+    return Directive(field, keyword, emit, When.TRUTHY)
+
+
+def formatted(field: str, method: str, when: When = When.TRUTHY) -> Directive:
+    """The line ``method(value)`` returns."""
+    return Directive(field, "", Emit.LINE, when, method)
+
+
+def formatted_lines(field: str, method: str, when: When = When.TRUTHY) -> Directive:
+    """The lines ``method(value)`` returns."""
+    return Directive(field, "", Emit.LINES, when, method)
+
+
+def _append(prefix: str, template: str) -> str:
+    """Return source appending an f-string: ``prefix`` as is, then ``template``."""
+    literal = prefix.replace("{", "{{").replace("}", "}}")
+    return "append(f" + repr(literal + template) + ")"
+
+
+def _statements(directive: Directive, indent: str) -> list[str]:
+    """Return the source lines emitting one directive.
+
+    The field is tested and formatted straight from ``node``: reading it
+    again when set is cheaper than storing it for every field.
+    """
+    prefix = indent + directive.keyword + " " if directive.keyword else indent
+    field = f"node.{directive.field}"
+    call = f"generator.{directive.method}"
+    match directive.emit:
+        case Emit.VALUE:
+            body = [_append(prefix, "{" + field + "}")]
+        case Emit.ENUM:
+            body = [_append(prefix, "{" + field + ".value}")]
+        case Emit.FLAG:
+            body = [_append(indent + directive.keyword, "")]
+        case Emit.ON_OFF:
+            body = [_append(prefix, "{'on' if " + field + " else 'off'}")]
+        case Emit.EACH:
+            item = "{" + call + "(item)}" if directive.method else "{item}"
+            body = [f"for item in {field}:", "    " + _append(prefix, item)]
+        case Emit.ITEMS:
+            body = [f"for key, item in {field}.items():", "    " + _append(prefix, "{key} {item}")]
+        case Emit.QUOTED_ITEMS:
+            body = [
+                f"for key, item in {field}.items():",
+                "    " + _append(prefix, '{key} "{item}"'),
+            ]
+        case Emit.LINE:
+            body = [_append(prefix, "{" + call + "(" + field + ")}")]
+        case Emit.LINES:
+            body = [f"for item in {call}({field}):", "    " + _append(prefix, "{item}")]
+    if directive.when is When.ALWAYS:
+        return body
+    return [directive.when.value.format(field), *(f"    {statement}" for statement in body)]
+
+
+@cache
+def compile_emitter(
+    node_type: type, table: Sequence[Directive], indent: str
+) -> Callable[[Any, Any, list[str]], None]:
+    """Compile ``table`` into ``emit(generator, node, lines)`` for ``node_type``.
+
+    The emitter appends the indented directives of ``node`` to ``lines``,
+    calling formatting methods on ``generator``.
+
+    Raises:
+        ValueError: If the table names a field ``node_type`` does not have
+    """
+    fields = {field.name for field in dataclasses.fields(node_type)}
+    source = ["def emit(generator, node, lines):", "    append = lines.append"]
+    for directive in table:
+        if directive.field not in fields:
+            msg = f"{node_type.__name__} has no field {directive.field!r}"
+            raise ValueError(msg)
+        source.extend(f"    {statement}" for statement in _statements(directive, indent))
+    namespace: dict[str, Any] = {}
+    exec(compile("\n".join(source), f"<{node_type.__name__} emitter>", "exec"), namespace)
+    return cast("Callable[[Any, Any, list[str]], None]", namespace["emit"])
@@ -1,8 +1,13 @@
 """HAProxy native configuration code generator."""
 
 import dataclasses
-from typing import TYPE_CHECKING
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
 
+from ..ir.columns import ServerColumns
 from ..ir.nodes import (
     ACL,
     Backend,
@@ -38,17 +43,513 @@ from ..ir.nodes import (
     TcpResponseRule,
     UseServerRule,
 )
+from ..utils.files import write_text_if_changed
+from .defaults import factor_defaults
+from .directives import (
+    When,
+    compile_emitter,
+    each,
+    enum_value,
+    flag,
+    formatted,
+    formatted_lines,
+    on_off,
+    pairs,
+    scalar,
+    setting,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping, Sequence
+    from multiprocessing.context import BaseContext
     from pathlib import Path
+    from typing import TextIO
+
+    from ..ir.nodes import (
+        CompressionConfig,
+        ErrorFile,
+        LogTarget,
+        LuaScript,
+        MonitorFailRule,
+        StatsConfig,
+        StatsSocket,
+        UseBackendRule,
+    )
+
+
+# Directive tables: one entry per IR field, in output order. Composite
+# values are formatted by the named HAProxyCodeGenerator methods.
+
+_GLOBAL_DIRECTIVES = (
+    flag("daemon"),
+    scalar("maxconn", when=When.ALWAYS),
+    # Process control and threading
+    scalar("nbproc"),
+    setting("nbthread"),
+    setting("thread_groups"),
+    on_off("numa_cpu_mapping"),
+    # Rate limiting
+    scalar("maxconnrate"),
+    scalar("maxsslrate"),
+    scalar("maxsessrate"),
+    # Resource limits
+    setting("fd_hard_limit"),
+    setting("maxzlibmem"),
+    on_off("strict_limits"),
+    scalar("user"),
+    scalar("group"),
+    setting("uid"),
+    setting("gid"),
+    scalar("chroot"),
+    scalar("pidfile"),
+    scalar("node"),
+    scalar("description"),
+    scalar("hard_stop_after"),
+    flag("external_check"),
+    setting("maxpipes"),
+    # Master-worker mode
+    flag("master_worker"),
+    scalar("mworker_max_reloads"),
+    # SSL/TLS base paths
+    scalar("ca_base"),
+    scalar("crt_base"),
+    scalar("key_base"),
+    # Server state management
+    scalar("server_state_base"),
+    scalar("server_state_file"),
+    scalar("load_server_state_from_file"),
+    # Performance tuning
+    formatted_lines("tuning", "_format_tune_directives"),
+    # Environment variables
+    pairs("env_vars", "setenv"),
+    each("reset_env_vars", "resetenv"),
+    each("unset_env_vars", "unsetenv"),
+    # System configuration
+    scalar("setcap"),
+    flag("set_dumpable", when=When.SET),
+    scalar("unix_bind"),
+    pairs("cpu_map", "cpu-map"),
+    # Performance and runtime
+    flag("busy_polling"),
+    setting("max_spread_checks"),
+    setting("spread_checks"),
+    setting("maxcompcpuusage"),
+    setting("maxcomprate"),
+    scalar("default_path"),
+    # HTTP client
+    flag("httpclient_resolvers_disabled", "httpclient.resolvers.disabled"),
+    scalar("httpclient_resolvers_id", "httpclient.resolvers.id"),
+    scalar("httpclient_resolvers_prefer", "httpclient.resolvers.prefer"),
+    setting("httpclient_retries", "httpclient.retries"),
+    scalar("httpclient_ssl_verify", "httpclient.ssl.verify"),
+    scalar("httpclient_ssl_ca_file", "httpclient.ssl.ca-file"),
+    scalar("httpclient_timeout_connect", "httpclient.timeout.connect"),
+    # Platform-specific options
+    flag("noepoll"),
+    flag("nokqueue"),
+    flag("nopoll"),
+    flag("nosplice"),
+    flag("nogetaddrinfo"),
+    flag("noreuseport"),
+    flag("noevports"),
+    flag("noktls"),
+    flag("no_memory_trimming"),
+    flag("limited_quic"),
+    scalar("localpeer"),
+    # SSL advanced
+    scalar("ssl_load_extra_files"),
+    scalar("ssl_load_extra_del_ext"),
+    flag("ssl_mode_async"),
+    scalar("ssl_propquery"),
+    scalar("ssl_provider"),
+    scalar("ssl_provider_path"),
+    scalar("issuers_chain_path"),
+    # Profiling and debugging
+    flag("profiling_tasks_on", "profiling.tasks.on"),
+    flag("profiling_tasks_automatic", "profiling.tasks.automatic"),
+    flag("profiling_memory_on", "profiling.memory.on"),
+    scalar("profiling_memory", "profiling.memory"),
+    scalar("profiling_tasks", "profiling.tasks"),
+    flag("quiet"),
+    scalar("debug_counters", "debug.counters"),
+    setting("anonkey"),
+    flag("zero_warning"),
+    scalar("warn_blocked_traffic_after"),
+    flag("force_cfg_parser_pause"),
+    # Device detection - DeviceAtlas
+    scalar("deviceatlas_json_file"),
+    setting("deviceatlas_log_level"),
+    scalar("deviceatlas_separator"),
+    scalar("deviceatlas_properties_cookie"),
+    # Device detection - 51Degrees
+    scalar("fiftyone_degrees_data_file", "51degrees-data-file"),
+    scalar("fiftyone_degrees_property_name_list", "51degrees-property-name-list"),
+    scalar("fiftyone_degrees_property_separator", "51degrees-property-separator"),
+    setting("fiftyone_degrees_cache_size", "51degrees-cache-size"),
+    # Device detection - WURFL
+    scalar("wurfl_data_file"),
+    scalar("wurfl_information_list"),
+    scalar("wurfl_information_list_separator"),
+    scalar("wurfl_patch_file"),
+    setting("wurfl_cache_size"),
+    scalar("wurfl_engine_mode"),
+    scalar("wurfl_useragent_priority"),
+    # Logging
+    scalar("log_tag"),
+    scalar("log_send_hostname"),
+    each("log_targets", "log", "_format_log_target"),
+    # SSL
+    scalar("ssl_dh_param_file"),
+    scalar("ssl_default_bind_ciphers"),
+    scalar("ssl_default_bind_ciphersuites"),
+    each("ssl_default_bind_options", "ssl-default-bind-options"),
+    scalar("ssl_default_server_ciphers"),
+    scalar("ssl_default_server_ciphersuites"),
+    each("ssl_default_server_options", "ssl-default-server-options"),
+    scalar("ssl_server_verify"),
+    scalar("ssl_engine"),
+    scalar("ssl_default_bind_curves"),
+    scalar("ssl_default_bind_sigalgs"),
+    scalar("ssl_default_bind_client_sigalgs"),
+    scalar("ssl_default_server_curves"),
+    scalar("ssl_default_server_sigalgs"),
+    scalar("ssl_default_server_client_sigalgs"),
+    setting("ssl_security_level"),
+    # Security and process management
+    scalar("cluster_secret"),
+    flag("expose_deprecated_directives"),
+    flag("expose_experimental_directives"),
+    flag("insecure_fork_wanted"),
+    flag("insecure_setuid_wanted"),
+    on_off("harden_reject_privileged_ports_quic", "harden.reject-privileged-ports.quic"),
+    on_off("harden_reject_privileged_ports_tcp", "harden.reject-privileged-ports.tcp"),
+    flag("pp2_never_send_local"),
+    flag("prealloc_fd"),
+    flag("ssl_skip_self_issued_ca"),
+    scalar("grace"),
+    scalar("stats_file"),
+    # CPU management and DNS
+    scalar("cpu_policy"),
+    scalar("cpu_set"),
+    scalar("dns_accept_family"),
+    # HTTP/1 and HTTP/2 protocol options
+    flag("h1_accept_payload_with_any_method"),
+    scalar("h1_case_adjust"),
+    scalar("h1_case_adjust_file"),
+    flag("h1_do_not_close_on_insecure_transfer_encoding"),
+    flag("h2_workaround_bogus_websocket_clients"),
+    # OCSP update
+    flag("ocsp_update_disable", "ocsp-update.disable"),
+    scalar("ocsp_update_httpproxy", "ocsp-update.httpproxy"),
+    setting("ocsp_update_maxdelay", "ocsp-update.maxdelay"),
+    setting("ocsp_update_mindelay", "ocsp-update.mindelay"),
+    scalar("ocsp_update_mode", "ocsp-update.mode"),
+    # 51Degrees additional options
+    on_off("fiftyone_degrees_allow_unmatched", "51degrees-allow-unmatched"),
+    setting("fiftyone_degrees_difference", "51degrees-difference"),
+    setting("fiftyone_degrees_drift", "51degrees-drift"),
+    on_off("fiftyone_degrees_use_performance_graph", "51degrees-use-performance-graph"),
+    on_off("fiftyone_degrees_use_predictive_graph", "51degrees-use-predictive-graph"),
+    # Variables
+    pairs("set_vars", "set-var"),
+    # Lua
+    formatted_lines("lua_scripts", "_format_lua_scripts"),
+    each("lua_load_files", "lua-load", "_format_lua_load"),
+    each("lua_load_per_thread_files", "lua-load-per-thread", "_format_lua_load"),
+    each("lua_prepend_paths", "lua-prepend-path", "_format_lua_prepend_path"),
+    # Stats sockets (Runtime API)
+    each("stats_sockets", "stats socket", "_format_stats_socket"),
+    # Tuning, as given
+    pairs("tuning"),
+)
 
+# Frontend, backend and listen sections share these blocks, so the same
+# field is emitted the same way in each of them
+_PROXY_STATUS_DIRECTIVES = (
+    scalar("description"),
+    flag("disabled"),
+    flag("enabled", "disabled", when=When.FALSY),
+    setting("id"),
+    scalar("guid"),
+)
+
+_SERVER_STATE_DIRECTIVES = (
+    enum_value("load_server_state_from", "load-server-state-from-file", when=When.TRUTHY),
+    scalar("server_state_file_name"),
+)
+
+_LOG_DIRECTIVES = (
+    scalar("log_tag"),
+    scalar("log_format"),
+    scalar("error_log_format"),
+    scalar("log_format_sd"),
+)
+
+_TCP_RULE_DIRECTIVES = (
+    each("tcp_request_rules", method="_format_tcp_request_rule"),
+    each("tcp_response_rules", method="_format_tcp_response_rule"),
+)
+
+_HTTP_RULE_DIRECTIVES = (
+    each("http_request_rules", method="_format_http_request_rule"),
+    each("http_response_rules", method="_format_http_response_rule"),
+    each("http_after_response_rules", method="_format_http_after_response_rule"),
+)
+
+_STICK_DIRECTIVES = (
+    formatted("stick_table", "_format_stick_table"),
+    each("stick_rules", method="_format_stick_rule"),
+)
+
+_PERSISTENCE_DIRECTIVES = (
+    formatted_lines("email_alert", "_format_email_alert"),
+    formatted_lines("declare_captures", "_format_declare_captures"),
+    formatted_lines("force_persist_rules", "_format_force_persist_rules"),
+    formatted_lines("ignore_persist_rules", "_format_ignore_persist_rules"),
+)
+
+_ERRORLOC_DIRECTIVES = (
+    pairs("errorloc", "errorloc", quoted=True),
+    pairs("errorloc302", "errorloc302", quoted=True),
+    pairs("errorloc303", "errorloc303", quoted=True),
+)
+
+_FRONTEND_DIRECTIVES = (
+    each("binds", method="_format_bind"),
+    enum_value("mode"),
+    *_PROXY_STATUS_DIRECTIVES,
+    scalar("maxconn"),
+    scalar("backlog"),
+    scalar("fullconn"),
+    scalar("max_keep_alive_queue"),
+    scalar("timeout_client"),
+    scalar("timeout_http_request"),
+    scalar("timeout_http_keep_alive"),
+    scalar("timeout_client_fin"),
+    scalar("timeout_tarpit"),
+    scalar("monitor_uri"),
+    each("monitor_net", "monitor-net"),
+    each("monitor_fail_rules", "monitor fail", "_format_monitor_fail_rule"),
+    each("log", "log"),
+    *_LOG_DIRECTIVES,
+    scalar("log_steps"),
+    scalar("unique_id_format"),
+    scalar("unique_id_header"),
+    formatted_lines("stats_config", "_format_stats"),
+    each("capture_request_headers", "capture request header", "_format_capture"),
+    each("capture_response_headers", "capture response header", "_format_capture"),
+    each("acls", method="_format_acl"),
+    each("filters", method="_format_filter"),
+    *_STICK_DIRECTIVES,
+    *_TCP_RULE_DIRECTIVES,
+    each("quic_initial_rules", method="_format_quic_initial_rule"),
+    *_HTTP_RULE_DIRECTIVES,
+    each("redirect_rules", method="_format_redirect_rule"),
+    each("error_files", "errorfile", "_format_error_file"),
+    each("http_errors", method="_format_http_error"),
+    *_PERSISTENCE_DIRECTIVES,
+    *_ERRORLOC_DIRECTIVES,
+    each("use_backend_rules", "use_backend", "_format_use_backend_rule"),
+    scalar("default_backend", "default_backend"),
+    each("options", "option"),
+)
+
+# Servers and what they inherit come last, so default-server hoisting can
+# emit the rest of a backend first and then its own server lines
+_BACKEND_SERVER_DIRECTIVES = (
+    formatted("default_server", "_format_default_server"),
+    formatted_lines("servers", "_format_servers"),
+    each("server_templates", method="_format_server_template"),
+)
+
+_BACKEND_PROXY_DIRECTIVES = (
+    enum_value("mode"),
+    *_PROXY_STATUS_DIRECTIVES,
+    enum_value("balance"),
+    scalar("hash_type"),
+    scalar("hash_balance_factor"),
+    formatted("persist_rdp_cookie", "_format_persist_rdp_cookie", when=When.SET),
+    *_SERVER_STATE_DIRECTIVES,
+    setting("retries"),
+    scalar("maxconn"),
+    scalar("backlog"),
+    scalar("max_keep_alive_queue"),
+    scalar("max_session_srv_conns"),
+    scalar("timeout_connect"),
+    scalar("timeout_server"),
+    scalar("timeout_check"),
+    scalar("timeout_tunnel"),
+    scalar("timeout_server_fin"),
+    each("options", "option"),
+    each("log", "log"),
+    *_LOG_DIRECTIVES,
+    each("acls", method="_format_acl"),
+    each("filters", method="_format_filter"),
+    *_STICK_DIRECTIVES,
+    scalar("cookie"),
+    formatted_lines("health_check", "_generate_http_check"),
+    *_TCP_RULE_DIRECTIVES,
+    *_HTTP_RULE_DIRECTIVES,
+    each("redirect_rules", method="_format_redirect_rule"),
+    each("error_files", "errorfile", "_format_error_file"),
+    each("http_errors", method="_format_http_error"),
+    *_PERSISTENCE_DIRECTIVES,
+    *_ERRORLOC_DIRECTIVES,
+    scalar("errorfiles"),
+    scalar("dispatch"),
+    scalar("use_fcgi_app"),
+    scalar("http_reuse"),
+    scalar("http_send_name_header"),
+    scalar("retry_on"),
+    scalar("external_check_command", "external-check command"),
+    scalar("external_check_path", "external-check path"),
+    scalar("source"),
+    each("http_check_rules", method="_format_http_check_rule"),
+    each("tcp_check_rules", method="_format_tcp_check_rule"),
+    each("use_server_rules", method="_format_use_server_rule"),
+    formatted_lines("compression", "_format_compression"),
+)
+
+_BACKEND_DIRECTIVES = (*_BACKEND_PROXY_DIRECTIVES, *_BACKEND_SERVER_DIRECTIVES)
+
+_LISTEN_DIRECTIVES = (
+    each("binds", method="_format_bind"),
+    enum_value("mode"),
+    *_PROXY_STATUS_DIRECTIVES,
+    enum_value("balance"),
+    *_SERVER_STATE_DIRECTIVES,
+    scalar("maxconn"),
+    scalar("timeout_client"),
+    scalar("timeout_connect"),
+    scalar("timeout_server"),
+    *_LOG_DIRECTIVES,
+    scalar("log_steps"),
+    each("acls", method="_format_acl"),
+    each("filters", method="_format_filter"),
+    *_STICK_DIRECTIVES,
+    formatted_lines("health_check", "_generate_http_check"),
+    each("options", "option"),
+    formatted("persist_rdp_cookie", "_format_persist_rdp_cookie", when=When.SET),
+    *_TCP_RULE_DIRECTIVES,
+    *_HTTP_RULE_DIRECTIVES,
+    each("redirect_rules", method="_format_redirect_rule"),
+    each("quic_initial_rules", method="_format_quic_initial_rule"),
+    each("error_files", "errorfile", "_format_error_file"),
+    each("http_errors", method="_format_http_error"),
+    *_PERSISTENCE_DIRECTIVES,
+    formatted_lines("stats", "_format_stats"),
+    formatted_lines("servers", "_format_servers"),
+)
+
+# Server option keywords that DefaultServer models, all of which HAProxy
+# accepts on default-server lines; only these are hoisted
+_DEFAULT_SERVER_KEYWORDS = frozenset(
+    (
+        "check",
+        "inter",
+        "rise",
+        "fall",
+        "weight",
+        "maxconn",
+        "ssl",
+        "verify",
+        "sni",
+        "alpn",
+        "send-proxy",
+        "send-proxy-v2",
+        "slowstart",
+        "check-ssl",
+        "check-sni",
+        "ssl-min-ver",
+        "ssl-max-ver",
+        "ca-file",
+        "crt",
+        "source",
+    )
+)
+
+# Below this many proxies plus servers, worker start-up costs more than
+# formatting serially
+PARALLEL_MIN_ITEMS = 20_000
+
+# Chunks per worker, so uneven chunks still keep every worker busy
+_CHUNKS_PER_JOB = 4
+
+
+def _blank_line_after(lines: list[str]) -> list[str]:
+    lines.append("")
+    return lines
 
-class HAProxyCodeGenerator:
-    """Generate native HAProxy configuration from IR."""
 
-    def __init__(self, indent: str = "    "):
+# (kind, proxies) pairs being formatted in parallel; forked workers inherit
+# them instead of receiving pickled copies
+_inherited_proxies: list[tuple[str, Sequence[Frontend | Backend | Listen]]] = []
+
+
+def _server_option_names(columns: ServerColumns) -> list[str]:
+    """Return the names of the columns holding server options."""
+    return [
+        name
+        for name in (*columns.dense, *columns.sparse)
+        if name not in ("name", "address", "port")
+    ]
+
+
+def _format_proxies(
+    options: dict[str, Any], kind: str, proxies: Sequence[Frontend | Backend | Listen]
+) -> str:
+    """Format a chunk of frontends, backends or listens (runs in codegen workers).
+
+    ``options`` are the generator's keyword arguments. Returns the chunk's
+    lines, each section followed by a blank line, as one string: a single
+    string is much cheaper to send back than a list.
+    """
+    generator = HAProxyCodeGenerator(**options)
+    generate_section = getattr(generator, f"_generate_{kind}")
+    lines: list[str] = []
+    for proxy in proxies:
+        lines.extend(generate_section(proxy))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _format_inherited_proxies(options: dict[str, Any], index: int, start: int, stop: int) -> str:
+    """Format proxies ``start:stop`` of ``_inherited_proxies[index]`` (runs in forked workers)."""
+    kind, proxies = _inherited_proxies[index]
+    return _format_proxies(options, kind, proxies[start:stop])
+
+
+class HAProxyCodeGenerator:
+    """Generate native HAProxy configuration from IR.
+
+    With ``jobs`` above 1, frontends, backends and listens of large
+    configurations are formatted in chunks across that many worker
+    processes and reassembled in order; the output is the same.
+
+    With ``hoist_default_server``, server options shared by every server of
+    a backend move to its default-server line (see _hoist_default_server).
+    With ``factor_defaults``, settings repeated across proxies move to the
+    defaults section (see codegen.defaults).
+    """
+
+    def __init__(
+        self,
+        indent: str = "    ",
+        jobs: int = 1,
+        hoist_default_server: bool = False,
+        factor_defaults: bool = False,
+    ):
         self.indent_str = indent
+        self.jobs = jobs
+        self.hoist_default_server = hoist_default_server
+        self.factor_defaults = factor_defaults
         self.lua_files: list[str] = []
+        self._emit_global = compile_emitter(GlobalConfig, _GLOBAL_DIRECTIVES, indent)
+        self._emit_frontend = compile_emitter(Frontend, _FRONTEND_DIRECTIVES, indent)
+        self._emit_backend = compile_emitter(Backend, _BACKEND_DIRECTIVES, indent)
+        self._emit_listen = compile_emitter(Listen, _LISTEN_DIRECTIVES, indent)
+        if hoist_default_server:
+            self._emit_backend_proxy = compile_emitter(Backend, _BACKEND_PROXY_DIRECTIVES, indent)
 
     def generate(self, ir: ConfigIR, output_path: Path | None = None) -> str:
         """
@@ -61,12 +562,57 @@ class HAProxyCodeGenerator:
         Returns:
             Generated configuration as string
         """
-        lines = []
+        config = "\n".join(self.generate_iter(ir))
+
+        # Write to file if output_path specified; an up-to-date file is left alone
+        if output_path:
+            # Create parent directory if it doesn't exist
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            write_text_if_changed(output_path, config)
+
+        return config
+
+    def generate_iter(self, ir: ConfigIR) -> Iterator[str]:
+        """
+        Generate HAProxy configuration line by line.
+
+        Sections are formatted as the lines are consumed, so only one
+        section's lines are held at a time. Joined with newlines, the lines
+        are exactly the output of generate().
+
+        Args:
+            ir: Configuration IR
+
+        Yields:
+            Configuration lines, without line terminators
+        """
+        for block in self._generate_blocks(ir):
+            yield from block
+
+    def generate_to(self, ir: ConfigIR, out: TextIO) -> None:
+        """
+        Write HAProxy configuration to a text stream, one section at a time.
+
+        Writes exactly what generate() returns, without building it in
+        memory first.
+
+        Args:
+            ir: Configuration IR
+            out: Writable text stream, e.g. a file opened for writing
+        """
+        separator = ""
+        for block in self._generate_blocks(ir):
+            out.write(separator)
+            out.write("\n".join(block))
+            separator = "\n"
+
+    def _generate_blocks(self, ir: ConfigIR) -> Iterator[list[str]]:
+        """Yield the header, then each section's lines followed by a blank line."""
+        if self.factor_defaults:
+            ir = factor_defaults(ir)
 
         # Header comment
-        lines.append(f"# Generated HAProxy configuration: {ir.name}")
-        lines.append(f"# Version: {ir.version}")
-        lines.append("")
+        yield [f"# Generated HAProxy configuration: {ir.name}", f"# Version: {ir.version}", ""]
 
         # Merge top-level lua_scripts into global config (HAProxy requires lua-load in global section)
         global_config = ir.global_config
@@ -81,697 +627,159 @@ class HAProxyCodeGenerator:
 
         # Generate global section
         if global_config:
-            lines.extend(self._generate_global(global_config))
-            lines.append("")
+            yield _blank_line_after(self._generate_global(global_config))
 
         # Generate defaults section
         if ir.defaults:
-            lines.extend(self._generate_defaults(ir.defaults))
-            lines.append("")
+            yield _blank_line_after(self._generate_defaults(ir.defaults))
 
         # Generate peers sections
         for peers in ir.peers:
-            lines.extend(self._generate_peers(peers))
-            lines.append("")
+            yield _blank_line_after(self._generate_peers(peers))
 
         # Generate resolvers sections
         for resolvers in ir.resolvers:
-            lines.extend(self._generate_resolvers(resolvers))
-            lines.append("")
+            yield _blank_line_after(self._generate_resolvers(resolvers))
 
         # Generate mailers sections
         for mailers in ir.mailers:
-            lines.extend(self._generate_mailers(mailers))
-            lines.append("")
+            yield _blank_line_after(self._generate_mailers(mailers))
+
+        proxies = (("frontend", ir.frontends), ("backend", ir.backends), ("listen", ir.listens))
+        if self.jobs > 1 and self._proxy_items(ir) >= PARALLEL_MIN_ITEMS:
+            yield from self._generate_proxies_parallel(proxies)
+            return
 
         # Generate frontends
         for frontend in ir.frontends:
-            lines.extend(self._generate_frontend(frontend))
-            lines.append("")
+            yield _blank_line_after(self._generate_frontend(frontend))
 
         # Generate backends
         for backend in ir.backends:
-            lines.extend(self._generate_backend(backend))
-            lines.append("")
+            yield _blank_line_after(self._generate_backend(backend))
 
         # Generate listens
         for listen in ir.listens:
-            lines.extend(self._generate_listen(listen))
-            lines.append("")
-
-        config = "\n".join(lines)
-
-        # Write to file if output_path specified
-        if output_path:
-            # Create parent directory if it doesn't exist
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(config, encoding="utf-8")
-
-        return config
+            yield _blank_line_after(self._generate_listen(listen))
+
+    @staticmethod
+    def _proxy_items(ir: ConfigIR) -> int:
+        """Estimate the formatting work in frontends, backends and listens."""
+        return (
+            len(ir.frontends)
+            + sum(1 + len(backend.servers) for backend in ir.backends)
+            + sum(1 + len(listen.servers) for listen in ir.listens)
+        )
+
+    def _generate_proxies_parallel(
+        self, proxies: Sequence[tuple[str, Sequence[Frontend | Backend | Listen]]]
+    ) -> Iterator[list[str]]:
+        """Format proxies in chunks across worker processes, yielding chunks in order.
+
+        Pickling the IR costs more than formatting it, so where possible the
+        workers are forked and inherit it, and only chunk bounds are sent.
+        Forking is not safe with other threads running; then the chunks are
+        pickled to spawned workers.
+        """
+        total = sum(len(sections) for _, sections in proxies)
+        size = math.ceil(total / (self.jobs * _CHUNKS_PER_JOB))
+        chunks = [
+            (index, start, min(start + size, len(sections)))
+            for index, (_, sections) in enumerate(proxies)
+            for start in range(0, len(sections), size)
+        ]
+        options = [
+            {"indent": self.indent_str, "hoist_default_server": self.hoist_default_server}
+        ] * len(chunks)
+
+        if "fork" in multiprocessing.get_all_start_methods() and threading.active_count() == 1:
+            _inherited_proxies[:] = proxies
+            try:
+                context: BaseContext = multiprocessing.get_context("fork")
+                with ProcessPoolExecutor(max_workers=self.jobs, mp_context=context) as pool:
+                    texts = pool.map(_format_inherited_proxies, options, *zip(*chunks, strict=True))
+                    for text in texts:
+                        yield text.split("\n")
+            finally:
+                _inherited_proxies.clear()
+        else:
+            kinds = [proxies[index][0] for index, _, _ in chunks]
+            sections = [proxies[index][1][start:stop] for index, start, stop in chunks]
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self.jobs, mp_context=context) as pool:
+                for text in pool.map(_format_proxies, options, kinds, sections):
+                    yield text.split("\n")
 
     def _generate_global(self, global_config: GlobalConfig) -> list[str]:
         """Generate global section."""
         lines = ["global"]
+        self._emit_global(self, global_config, lines)
+        return lines
 
-        if global_config.daemon:
-            lines.append(self._indent("daemon"))
-
-        lines.append(self._indent(f"maxconn {global_config.maxconn}"))
-
-        # Process control
-        if global_config.nbproc:
-            lines.append(self._indent(f"nbproc {global_config.nbproc}"))
-
-        # Threading (Phase 10)
-        if global_config.nbthread is not None:
-            lines.append(self._indent(f"nbthread {global_config.nbthread}"))
-
-        if global_config.thread_groups is not None:
-            lines.append(self._indent(f"thread-groups {global_config.thread_groups}"))
-
-        if global_config.numa_cpu_mapping is not None:
-            value = "on" if global_config.numa_cpu_mapping else "off"
-            lines.append(self._indent(f"numa-cpu-mapping {value}"))
-
-        # Rate limiting
-        if global_config.maxconnrate:
-            lines.append(self._indent(f"maxconnrate {global_config.maxconnrate}"))
-
-        if global_config.maxsslrate:
-            lines.append(self._indent(f"maxsslrate {global_config.maxsslrate}"))
-
-        if global_config.maxsessrate:
-            lines.append(self._indent(f"maxsessrate {global_config.maxsessrate}"))
-
-        # Resource limits (Phase 10 Batch 2)
-        if global_config.fd_hard_limit is not None:
-            lines.append(self._indent(f"fd-hard-limit {global_config.fd_hard_limit}"))
-
-        if global_config.maxzlibmem is not None:
-            lines.append(self._indent(f"maxzlibmem {global_config.maxzlibmem}"))
-
-        if global_config.strict_limits is not None:
-            value = "on" if global_config.strict_limits else "off"
-            lines.append(self._indent(f"strict-limits {value}"))
-
-        if global_config.user:
-            lines.append(self._indent(f"user {global_config.user}"))
-
-        if global_config.group:
-            lines.append(self._indent(f"group {global_config.group}"))
-
-        if global_config.uid is not None:
-            lines.append(self._indent(f"uid {global_config.uid}"))
-
-        if global_config.gid is not None:
-            lines.append(self._indent(f"gid {global_config.gid}"))
-
-        if global_config.chroot:
-            lines.append(self._indent(f"chroot {global_config.chroot}"))
-
-        if global_config.pidfile:
-            lines.append(self._indent(f"pidfile {global_config.pidfile}"))
-
-        if global_config.node:
-            lines.append(self._indent(f"node {global_config.node}"))
-
-        if global_config.description:
-            lines.append(self._indent(f"description {global_config.description}"))
-
-        if global_config.hard_stop_after:
-            lines.append(self._indent(f"hard-stop-after {global_config.hard_stop_after}"))
-
-        if global_config.external_check is not None and global_config.external_check:
-            lines.append(self._indent("external-check"))
-
-        # Connection tuning
-        if global_config.maxpipes is not None:
-            lines.append(self._indent(f"maxpipes {global_config.maxpipes}"))
-
-        # Master-worker mode
-        if global_config.master_worker is not None and global_config.master_worker:
-            lines.append(self._indent("master-worker"))
-
-        if global_config.mworker_max_reloads:
-            lines.append(self._indent(f"mworker-max-reloads {global_config.mworker_max_reloads}"))
-
-        # SSL/TLS base paths
-        if global_config.ca_base:
-            lines.append(self._indent(f"ca-base {global_config.ca_base}"))
-
-        if global_config.crt_base:
-            lines.append(self._indent(f"crt-base {global_config.crt_base}"))
-
-        if global_config.key_base:
-            lines.append(self._indent(f"key-base {global_config.key_base}"))
-
-        # Server State Management (Phase 10 Batch 3)
-        if global_config.server_state_base:
-            lines.append(self._indent(f"server-state-base {global_config.server_state_base}"))
-
-        if global_config.server_state_file:
-            lines.append(self._indent(f"server-state-file {global_config.server_state_file}"))
-
-        if global_config.load_server_state_from_file:
-            lines.append(
-                self._indent(
-                    f"load-server-state-from-file {global_config.load_server_state_from_file}"
-                )
-            )
-
-        # Performance tuning (basic)
-        if "nbthread" in global_config.tuning:
-            lines.append(self._indent(f"nbthread {global_config.tuning['nbthread']}"))
-
-        if "maxsslconn" in global_config.tuning:
-            lines.append(self._indent(f"maxsslconn {global_config.tuning['maxsslconn']}"))
-
-        if "ulimit_n" in global_config.tuning:
-            lines.append(self._indent(f"ulimit-n {global_config.tuning['ulimit_n']}"))
-
-        # Performance tuning (tune.* directives)
-        for tune_key, tune_value in sorted(global_config.tuning.items()):
+    def _format_tune_directives(self, tuning: Mapping[str, Any]) -> list[str]:
+        """Format basic tuning settings, then tune.* directives in key order."""
+        lines = []
+        if "nbthread" in tuning:
+            lines.append(f"nbthread {tuning['nbthread']}")
+        if "maxsslconn" in tuning:
+            lines.append(f"maxsslconn {tuning['maxsslconn']}")
+        if "ulimit_n" in tuning:
+            lines.append(f"ulimit-n {tuning['ulimit_n']}")
+
+        for tune_key, tune_value in sorted(tuning.items()):
             if tune_key not in ("nbthread", "maxsslconn", "ulimit_n"):
                 # Keys already in HAProxy format from transformer
                 # Convert boolean values to on/off
                 output_value = (
                     "on" if tune_value else "off" if isinstance(tune_value, bool) else tune_value
                 )
-                lines.append(self._indent(f"{tune_key} {output_value}"))
-
-        # Environment variables
-        for var_name, var_value in global_config.env_vars.items():
-            lines.append(self._indent(f"setenv {var_name} {var_value}"))
-
-        for var_name in global_config.reset_env_vars:
-            lines.append(self._indent(f"resetenv {var_name}"))
-
-        for var_name in global_config.unset_env_vars:
-            lines.append(self._indent(f"unsetenv {var_name}"))
-
-        # System configuration (Phase 3)
-        if global_config.setcap:
-            lines.append(self._indent(f"setcap {global_config.setcap}"))
-
-        if global_config.set_dumpable is not None:
-            lines.append(self._indent("set-dumpable"))
-
-        if global_config.unix_bind:
-            lines.append(self._indent(f"unix-bind {global_config.unix_bind}"))
-
-        for process_thread, cpu_list in global_config.cpu_map.items():
-            lines.append(self._indent(f"cpu-map {process_thread} {cpu_list}"))
-
-        # Performance & Runtime (Phase 4A)
-        if global_config.busy_polling is not None and global_config.busy_polling:
-            lines.append(self._indent("busy-polling"))
-
-        if global_config.max_spread_checks is not None:
-            lines.append(self._indent(f"max-spread-checks {global_config.max_spread_checks}"))
-
-        if global_config.spread_checks is not None:
-            lines.append(self._indent(f"spread-checks {global_config.spread_checks}"))
-
-        if global_config.maxcompcpuusage is not None:
-            lines.append(self._indent(f"maxcompcpuusage {global_config.maxcompcpuusage}"))
-
-        if global_config.maxcomprate is not None:
-            lines.append(self._indent(f"maxcomprate {global_config.maxcomprate}"))
-
-        if global_config.default_path:
-            lines.append(self._indent(f"default-path {global_config.default_path}"))
-
-        # HTTP Client Configuration (Phase 4B Part 1)
-        if global_config.httpclient_resolvers_disabled:
-            lines.append(self._indent("httpclient.resolvers.disabled"))
-
-        if global_config.httpclient_resolvers_id:
-            lines.append(
-                self._indent(f"httpclient.resolvers.id {global_config.httpclient_resolvers_id}")
-            )
-
-        if global_config.httpclient_resolvers_prefer:
-            lines.append(
-                self._indent(
-                    f"httpclient.resolvers.prefer {global_config.httpclient_resolvers_prefer}"
-                )
-            )
-
-        if global_config.httpclient_retries is not None:
-            lines.append(self._indent(f"httpclient.retries {global_config.httpclient_retries}"))
-
-        if global_config.httpclient_ssl_verify:
-            lines.append(
-                self._indent(f"httpclient.ssl.verify {global_config.httpclient_ssl_verify}")
-            )
-
-        if global_config.httpclient_ssl_ca_file:
-            lines.append(
-                self._indent(f"httpclient.ssl.ca-file {global_config.httpclient_ssl_ca_file}")
-            )
-
-        # Phase 12 Batch 3 - HTTPClient timeout
-        if global_config.httpclient_timeout_connect:
-            lines.append(
-                self._indent(
-                    f"httpclient.timeout.connect {global_config.httpclient_timeout_connect}"
-                )
-            )
-
-        # Platform-Specific Options (Phase 4B Part 1)
-        if global_config.noepoll is not None and global_config.noepoll:
-            lines.append(self._indent("noepoll"))
-
-        if global_config.nokqueue is not None and global_config.nokqueue:
-            lines.append(self._indent("nokqueue"))
-
-        if global_config.nopoll is not None and global_config.nopoll:
-            lines.append(self._indent("nopoll"))
-
-        if global_config.nosplice is not None and global_config.nosplice:
-            lines.append(self._indent("nosplice"))
-
-        if global_config.nogetaddrinfo is not None and global_config.nogetaddrinfo:
-            lines.append(self._indent("nogetaddrinfo"))
-
-        if global_config.noreuseport is not None and global_config.noreuseport:
-            lines.append(self._indent("noreuseport"))
-
-        # Phase 12 Batch 6 - Additional platform-specific options
-        if global_config.noevports is not None and global_config.noevports:
-            lines.append(self._indent("noevports"))
-
-        if global_config.noktls is not None and global_config.noktls:
-            lines.append(self._indent("noktls"))
-
-        if global_config.no_memory_trimming is not None and global_config.no_memory_trimming:
-            lines.append(self._indent("no-memory-trimming"))
-
-        if global_config.limited_quic is not None and global_config.limited_quic:
-            lines.append(self._indent("limited-quic"))
-
-        if global_config.localpeer:
-            lines.append(self._indent(f"localpeer {global_config.localpeer}"))
-
-        # SSL Advanced (Phase 4B Part 2)
-        if global_config.ssl_load_extra_files:
-            lines.append(self._indent(f"ssl-load-extra-files {global_config.ssl_load_extra_files}"))
-
-        if global_config.ssl_load_extra_del_ext:
-            lines.append(
-                self._indent(f"ssl-load-extra-del-ext {global_config.ssl_load_extra_del_ext}")
-            )
-
-        if global_config.ssl_mode_async is not None and global_config.ssl_mode_async:
-            lines.append(self._indent("ssl-mode-async"))
-
-        if global_config.ssl_propquery:
-            lines.append(self._indent(f"ssl-propquery {global_config.ssl_propquery}"))
-
-        if global_config.ssl_provider:
-            lines.append(self._indent(f"ssl-provider {global_config.ssl_provider}"))
-
-        if global_config.ssl_provider_path:
-            lines.append(self._indent(f"ssl-provider-path {global_config.ssl_provider_path}"))
-
-        if global_config.issuers_chain_path:
-            lines.append(self._indent(f"issuers-chain-path {global_config.issuers_chain_path}"))
-
-        # Profiling & Debugging (Phase 4B Part 2)
-        if global_config.profiling_tasks_on:
-            lines.append(self._indent("profiling.tasks.on"))
-
-        if global_config.profiling_tasks_automatic:
-            lines.append(self._indent("profiling.tasks.automatic"))
-
-        if global_config.profiling_memory_on:
-            lines.append(self._indent("profiling.memory.on"))
-
-        # Phase 12 Batch 6 - Additional profiling directives
-        if global_config.profiling_memory:
-            lines.append(self._indent(f"profiling.memory {global_config.profiling_memory}"))
-
-        if global_config.profiling_tasks:
-            lines.append(self._indent(f"profiling.tasks {global_config.profiling_tasks}"))
-
-        # Debugging & Development (Phase 7)
-        if global_config.quiet is not None and global_config.quiet:
-            lines.append(self._indent("quiet"))
-
-        if global_config.debug_counters:
-            lines.append(self._indent(f"debug.counters {global_config.debug_counters}"))
-
-        if global_config.anonkey is not None:
-            lines.append(self._indent(f"anonkey {global_config.anonkey}"))
-
-        if global_config.zero_warning is not None and global_config.zero_warning:
-            lines.append(self._indent("zero-warning"))
-
-        if global_config.warn_blocked_traffic_after:
-            lines.append(
-                self._indent(
-                    f"warn-blocked-traffic-after {global_config.warn_blocked_traffic_after}"
-                )
-            )
-
-        if global_config.force_cfg_parser_pause:
-            lines.append(self._indent("force-cfg-parser-pause"))
-
-        # Device Detection - DeviceAtlas (Phase 4B Part 4)
-        if global_config.deviceatlas_json_file:
-            lines.append(
-                self._indent(f"deviceatlas-json-file {global_config.deviceatlas_json_file}")
-            )
-
-        if global_config.deviceatlas_log_level is not None:
-            lines.append(
-                self._indent(f"deviceatlas-log-level {global_config.deviceatlas_log_level}")
-            )
-
-        if global_config.deviceatlas_separator:
-            lines.append(
-                self._indent(f"deviceatlas-separator {global_config.deviceatlas_separator}")
-            )
-
-        if global_config.deviceatlas_properties_cookie:
-            lines.append(
-                self._indent(
-                    f"deviceatlas-properties-cookie {global_config.deviceatlas_properties_cookie}"
-                )
-            )
-
-        # Device Detection - 51Degrees (Phase 4B Part 4)
-        if global_config.fiftyone_degrees_data_file:
-            lines.append(
-                self._indent(f"51degrees-data-file {global_config.fiftyone_degrees_data_file}")
-            )
-
-        if global_config.fiftyone_degrees_property_name_list:
-            lines.append(
-                self._indent(
-                    f"51degrees-property-name-list {global_config.fiftyone_degrees_property_name_list}"
-                )
-            )
-
-        if global_config.fiftyone_degrees_property_separator:
-            lines.append(
-                self._indent(
-                    f"51degrees-property-separator {global_config.fiftyone_degrees_property_separator}"
-                )
-            )
-
-        if global_config.fiftyone_degrees_cache_size is not None:
-            lines.append(
-                self._indent(f"51degrees-cache-size {global_config.fiftyone_degrees_cache_size}")
-            )
-
-        # Device Detection - WURFL (Phase 4B Part 4)
-        if global_config.wurfl_data_file:
-            lines.append(self._indent(f"wurfl-data-file {global_config.wurfl_data_file}"))
-
-        if global_config.wurfl_information_list:
-            lines.append(
-                self._indent(f"wurfl-information-list {global_config.wurfl_information_list}")
-            )
-
-        if global_config.wurfl_information_list_separator:
-            lines.append(
-                self._indent(
-                    f"wurfl-information-list-separator {global_config.wurfl_information_list_separator}"
-                )
-            )
-
-        if global_config.wurfl_patch_file:
-            lines.append(self._indent(f"wurfl-patch-file {global_config.wurfl_patch_file}"))
-
-        if global_config.wurfl_cache_size is not None:
-            lines.append(self._indent(f"wurfl-cache-size {global_config.wurfl_cache_size}"))
-
-        if global_config.wurfl_engine_mode:
-            lines.append(self._indent(f"wurfl-engine-mode {global_config.wurfl_engine_mode}"))
-
-        if global_config.wurfl_useragent_priority:
-            lines.append(
-                self._indent(f"wurfl-useragent-priority {global_config.wurfl_useragent_priority}")
-            )
-
-        # Logging configuration
-        if global_config.log_tag:
-            lines.append(self._indent(f"log-tag {global_config.log_tag}"))
-
-        if global_config.log_send_hostname:
-            lines.append(self._indent(f"log-send-hostname {global_config.log_send_hostname}"))
-
-        # Log targets
-        for log in global_config.log_targets:
-            log_line = f"log {log.address} {log.facility.value} {log.level.value}"
-            if log.minlevel:
-                log_line += f" {log.minlevel.value}"
-            lines.append(self._indent(log_line))
-
-        # SSL configuration
-        if global_config.ssl_dh_param_file:
-            lines.append(self._indent(f"ssl-dh-param-file {global_config.ssl_dh_param_file}"))
-
-        if global_config.ssl_default_bind_ciphers:
-            lines.append(
-                self._indent(f"ssl-default-bind-ciphers {global_config.ssl_default_bind_ciphers}")
-            )
-
-        if global_config.ssl_default_bind_ciphersuites:
-            lines.append(
-                self._indent(
-                    f"ssl-default-bind-ciphersuites {global_config.ssl_default_bind_ciphersuites}"
-                )
-            )
-
-        for option in global_config.ssl_default_bind_options:
-            lines.append(self._indent(f"ssl-default-bind-options {option}"))
-
-        if global_config.ssl_default_server_ciphers:
-            lines.append(
-                self._indent(
-                    f"ssl-default-server-ciphers {global_config.ssl_default_server_ciphers}"
-                )
-            )
-
-        if global_config.ssl_default_server_ciphersuites:
-            lines.append(
-                self._indent(
-                    f"ssl-default-server-ciphersuites {global_config.ssl_default_server_ciphersuites}"
-                )
-            )
-
-        for option in global_config.ssl_default_server_options:
-            lines.append(self._indent(f"ssl-default-server-options {option}"))
-
-        if global_config.ssl_server_verify:
-            lines.append(self._indent(f"ssl-server-verify {global_config.ssl_server_verify}"))
-
-        if global_config.ssl_engine:
-            lines.append(self._indent(f"ssl-engine {global_config.ssl_engine}"))
-
-        # Phase 13 Batch 4 - SSL Advanced Configuration
-        if global_config.ssl_default_bind_curves:
-            lines.append(
-                self._indent(f"ssl-default-bind-curves {global_config.ssl_default_bind_curves}")
-            )
-
-        if global_config.ssl_default_bind_sigalgs:
-            lines.append(
-                self._indent(f"ssl-default-bind-sigalgs {global_config.ssl_default_bind_sigalgs}")
-            )
-
-        if global_config.ssl_default_bind_client_sigalgs:
-            lines.append(
-                self._indent(
-                    f"ssl-default-bind-client-sigalgs {global_config.ssl_default_bind_client_sigalgs}"
-                )
-            )
-
-        if global_config.ssl_default_server_curves:
-            lines.append(
-                self._indent(f"ssl-default-server-curves {global_config.ssl_default_server_curves}")
-            )
-
-        if global_config.ssl_default_server_sigalgs:
-            lines.append(
-                self._indent(
-                    f"ssl-default-server-sigalgs {global_config.ssl_default_server_sigalgs}"
-                )
-            )
-
-        if global_config.ssl_default_server_client_sigalgs:
-            lines.append(
-                self._indent(
-                    f"ssl-default-server-client-sigalgs {global_config.ssl_default_server_client_sigalgs}"
-                )
-            )
-
-        if global_config.ssl_security_level is not None:
-            lines.append(self._indent(f"ssl-security-level {global_config.ssl_security_level}"))
-
-        # Phase 14 - Remaining Global Directives (30 directives)
-        # Security & Process Management
-        if global_config.cluster_secret:
-            lines.append(self._indent(f"cluster-secret {global_config.cluster_secret}"))
-
-        if global_config.expose_deprecated_directives:
-            lines.append(self._indent("expose-deprecated-directives"))
-
-        if global_config.expose_experimental_directives:
-            lines.append(self._indent("expose-experimental-directives"))
-
-        if global_config.insecure_fork_wanted:
-            lines.append(self._indent("insecure-fork-wanted"))
-
-        if global_config.insecure_setuid_wanted:
-            lines.append(self._indent("insecure-setuid-wanted"))
-
-        if global_config.harden_reject_privileged_ports_quic is not None:
-            value = "on" if global_config.harden_reject_privileged_ports_quic else "off"
-            lines.append(self._indent(f"harden.reject-privileged-ports.quic {value}"))
-
-        if global_config.harden_reject_privileged_ports_tcp is not None:
-            value = "on" if global_config.harden_reject_privileged_ports_tcp else "off"
-            lines.append(self._indent(f"harden.reject-privileged-ports.tcp {value}"))
-
-        if global_config.pp2_never_send_local:
-            lines.append(self._indent("pp2-never-send-local"))
-
-        if global_config.prealloc_fd:
-            lines.append(self._indent("prealloc-fd"))
-
-        if global_config.ssl_skip_self_issued_ca:
-            lines.append(self._indent("ssl-skip-self-issued-ca"))
-
-        if global_config.grace:
-            lines.append(self._indent(f"grace {global_config.grace}"))
-
-        if global_config.stats_file:
-            lines.append(self._indent(f"stats-file {global_config.stats_file}"))
-
-        # CPU Management
-        if global_config.cpu_policy:
-            lines.append(self._indent(f"cpu-policy {global_config.cpu_policy}"))
-
-        if global_config.cpu_set:
-            lines.append(self._indent(f"cpu-set {global_config.cpu_set}"))
-
-        # DNS
-        if global_config.dns_accept_family:
-            lines.append(self._indent(f"dns-accept-family {global_config.dns_accept_family}"))
-
-        # HTTP/1 Protocol Options
-        if global_config.h1_accept_payload_with_any_method:
-            lines.append(self._indent("h1-accept-payload-with-any-method"))
-
-        if global_config.h1_case_adjust:
-            lines.append(self._indent(f"h1-case-adjust {global_config.h1_case_adjust}"))
-
-        if global_config.h1_case_adjust_file:
-            lines.append(self._indent(f"h1-case-adjust-file {global_config.h1_case_adjust_file}"))
-
-        if global_config.h1_do_not_close_on_insecure_transfer_encoding:
-            lines.append(self._indent("h1-do-not-close-on-insecure-transfer-encoding"))
-
-        # HTTP/2 Protocol Options
-        if global_config.h2_workaround_bogus_websocket_clients:
-            lines.append(self._indent("h2-workaround-bogus-websocket-clients"))
-
-        # OCSP Update
-        if global_config.ocsp_update_disable:
-            lines.append(self._indent("ocsp-update.disable"))
-
-        if global_config.ocsp_update_httpproxy:
-            lines.append(
-                self._indent(f"ocsp-update.httpproxy {global_config.ocsp_update_httpproxy}")
-            )
-
-        if global_config.ocsp_update_maxdelay is not None:
-            lines.append(self._indent(f"ocsp-update.maxdelay {global_config.ocsp_update_maxdelay}"))
-
-        if global_config.ocsp_update_mindelay is not None:
-            lines.append(self._indent(f"ocsp-update.mindelay {global_config.ocsp_update_mindelay}"))
-
-        if global_config.ocsp_update_mode:
-            lines.append(self._indent(f"ocsp-update.mode {global_config.ocsp_update_mode}"))
-
-        # 51Degrees Additional Options
-        if global_config.fiftyone_degrees_allow_unmatched is not None:
-            value = "on" if global_config.fiftyone_degrees_allow_unmatched else "off"
-            lines.append(self._indent(f"51degrees-allow-unmatched {value}"))
-
-        if global_config.fiftyone_degrees_difference is not None:
-            lines.append(
-                self._indent(f"51degrees-difference {global_config.fiftyone_degrees_difference}")
-            )
-
-        if global_config.fiftyone_degrees_drift is not None:
-            lines.append(self._indent(f"51degrees-drift {global_config.fiftyone_degrees_drift}"))
-
-        if global_config.fiftyone_degrees_use_performance_graph is not None:
-            value = "on" if global_config.fiftyone_degrees_use_performance_graph else "off"
-            lines.append(self._indent(f"51degrees-use-performance-graph {value}"))
-
-        if global_config.fiftyone_degrees_use_predictive_graph is not None:
-            value = "on" if global_config.fiftyone_degrees_use_predictive_graph else "off"
-            lines.append(self._indent(f"51degrees-use-predictive-graph {value}"))
+                lines.append(f"{tune_key} {output_value}")
+        return lines
 
-        # Variables
-        for var_name, var_value in global_config.set_vars.items():
-            lines.append(self._indent(f"set-var {var_name} {var_value}"))
+    def _format_log_target(self, log: LogTarget) -> str:
+        """Format the arguments of a global log directive."""
+        log_line = f"{log.address} {log.facility.value} {log.level.value}"
+        if log.minlevel:
+            log_line += f" {log.minlevel.value}"
+        return log_line
 
-        # Lua scripts
-        for script in global_config.lua_scripts:
+    def _format_lua_scripts(self, scripts: Sequence[LuaScript]) -> list[str]:
+        """Format lua-load directives for file scripts, recording the files."""
+        lines = []
+        for script in scripts:
             if script.source_type == "file":
-                lines.append(self._indent(f"lua-load {script.content}"))
+                lines.append(f"lua-load {script.content}")
                 self.lua_files.append(script.content)
-
-        # Phase 13 Batch 3 - Lua global directives
-        for file_path, args in global_config.lua_load_files:
-            args_str = " ".join(args) if args else ""
-            lua_load_line = f"lua-load {file_path}"
-            if args_str:
-                lua_load_line += f" {args_str}"
-            lines.append(self._indent(lua_load_line))
-            self.lua_files.append(file_path)
-
-        for file_path, args in global_config.lua_load_per_thread_files:
-            args_str = " ".join(args) if args else ""
-            lua_load_line = f"lua-load-per-thread {file_path}"
-            if args_str:
-                lua_load_line += f" {args_str}"
-            lines.append(self._indent(lua_load_line))
-            self.lua_files.append(file_path)
-
-        for path, path_type in global_config.lua_prepend_paths:
-            if path_type and path_type != "path":
-                lines.append(self._indent(f"lua-prepend-path {path} {path_type}"))
-            else:
-                lines.append(self._indent(f"lua-prepend-path {path}"))
-
-        # Stats sockets (Runtime API)
-        for stats_socket in global_config.stats_sockets:
-            socket_line = f"stats socket {stats_socket.path}"
-            if stats_socket.level:
-                socket_line += f" level {stats_socket.level}"
-            if stats_socket.mode:
-                socket_line += f" mode {stats_socket.mode}"
-            if stats_socket.user:
-                socket_line += f" user {stats_socket.user}"
-            if stats_socket.group:
-                socket_line += f" group {stats_socket.group}"
-            if stats_socket.process:
-                socket_line += f" process {stats_socket.process}"
-            lines.append(self._indent(socket_line))
-
-        # Tuning
-        for key, value in global_config.tuning.items():
-            lines.append(self._indent(f"{key} {value}"))
-
         return lines
 
+    def _format_lua_load(self, load: tuple[str, Sequence[str]]) -> str:
+        """Format the arguments of a lua-load directive, recording the file."""
+        file_path, args = load
+        self.lua_files.append(file_path)
+        return f"{file_path} {' '.join(args)}" if args else file_path
+
+    def _format_lua_prepend_path(self, prepend_path: tuple[str, str | None]) -> str:
+        """Format the arguments of a lua-prepend-path directive."""
+        path, path_type = prepend_path
+        if path_type and path_type != "path":
+            return f"{path} {path_type}"
+        return path
+
+    def _format_stats_socket(self, stats_socket: StatsSocket) -> str:
+        """Format the arguments of a stats socket directive."""
+        socket_line = stats_socket.path
+        if stats_socket.level:
+            socket_line += f" level {stats_socket.level}"
+        if stats_socket.mode:
+            socket_line += f" mode {stats_socket.mode}"
+        if stats_socket.user:
+            socket_line += f" user {stats_socket.user}"
+        if stats_socket.group:
+            socket_line += f" group {stats_socket.group}"
+        if stats_socket.process:
+            socket_line += f" process {stats_socket.process}"
+        return socket_line
+
     def _generate_defaults(self, defaults: DefaultsConfig) -> list[str]:
         """Generate defaults section."""
         lines = ["defaults"]
@@ -826,6 +834,10 @@ class HAProxyCodeGenerator:
         for option in defaults.options:
             lines.append(self._indent(f"option {option}"))
 
+        # Connection reuse
+        if defaults.http_reuse:
+            lines.append(self._indent(f"http-reuse {defaults.http_reuse}"))
+
         # Error files
         for code, file in defaults.errorfiles.items():
             lines.append(self._indent(f"errorfile {code} {file}"))
@@ -865,638 +877,77 @@ class HAProxyCodeGenerator:
     def _generate_frontend(self, frontend: Frontend) -> list[str]:
         """Generate frontend section."""
         lines = [f"frontend {frontend.name}"]
-
-        # Bind directives
-        for bind in frontend.binds:
-            lines.append(self._indent(self._format_bind(bind)))
-
-        # Mode
-        lines.append(self._indent(f"mode {frontend.mode.value}"))
-
-        # Description
-        if frontend.description:
-            lines.append(self._indent(f"description {frontend.description}"))
-
-        # Handle disabled/enabled status
-        if frontend.disabled:
-            lines.append(self._indent("disabled"))
-
-        if not frontend.enabled:
-            lines.append(self._indent("disabled"))
-
-        # ID
-        if frontend.id is not None:
-            lines.append(self._indent(f"id {frontend.id}"))
-
-        # GUID (Global Unique Identifier)
-        if frontend.guid:
-            lines.append(self._indent(f"guid {frontend.guid}"))
-
-        # Max connections
-        if frontend.maxconn:
-            lines.append(self._indent(f"maxconn {frontend.maxconn}"))
-
-        # Backlog
-        if frontend.backlog:
-            lines.append(self._indent(f"backlog {frontend.backlog}"))
-
-        # Fullconn (dynamic weight threshold)
-        if frontend.fullconn:
-            lines.append(self._indent(f"fullconn {frontend.fullconn}"))
-
-        # Keep-alive queue
-        if frontend.max_keep_alive_queue:
-            lines.append(self._indent(f"max-keep-alive-queue {frontend.max_keep_alive_queue}"))
-
-        # Timeout
-        if frontend.timeout_client:
-            lines.append(self._indent(f"timeout client {frontend.timeout_client}"))
-
-        if frontend.timeout_http_request:
-            lines.append(self._indent(f"timeout http-request {frontend.timeout_http_request}"))
-
-        if frontend.timeout_http_keep_alive:
-            lines.append(
-                self._indent(f"timeout http-keep-alive {frontend.timeout_http_keep_alive}")
-            )
-
-        if frontend.timeout_client_fin:
-            lines.append(self._indent(f"timeout client-fin {frontend.timeout_client_fin}"))
-
-        if frontend.timeout_tarpit:
-            lines.append(self._indent(f"timeout tarpit {frontend.timeout_tarpit}"))
-
-        # Monitor URI
-        if frontend.monitor_uri:
-            lines.append(self._indent(f"monitor-uri {frontend.monitor_uri}"))
-
-        # Monitor network sources
-        for net in frontend.monitor_net:
-            lines.append(self._indent(f"monitor-net {net}"))
-
-        # Monitor fail conditions
-        for fail_rule in frontend.monitor_fail_rules:
-            lines.append(self._indent(f"monitor fail {fail_rule.condition}"))
-
-        # Logging
-        for log_target in frontend.log:
-            lines.append(self._indent(f"log {log_target}"))
-
-        if frontend.log_tag:
-            lines.append(self._indent(f"log-tag {frontend.log_tag}"))
-
-        # Log format
-        if frontend.log_format:
-            lines.append(self._indent(f"log-format {frontend.log_format}"))
-
-        if frontend.error_log_format:
-            lines.append(self._indent(f"error-log-format {frontend.error_log_format}"))
-
-        if frontend.log_format_sd:
-            lines.append(self._indent(f"log-format-sd {frontend.log_format_sd}"))
-
-        if frontend.log_steps:
-            lines.append(self._indent(f"log-steps {frontend.log_steps}"))
-
-        # Unique ID tracking
-        if frontend.unique_id_format:
-            lines.append(self._indent(f"unique-id-format {frontend.unique_id_format}"))
-
-        if frontend.unique_id_header:
-            lines.append(self._indent(f"unique-id-header {frontend.unique_id_header}"))
-
-        # Stats configuration
-        if frontend.stats_config:
-            stats = frontend.stats_config
-            if stats.enable:
-                lines.append(self._indent("stats enable"))
-            if stats.uri:
-                lines.append(self._indent(f"stats uri {stats.uri}"))
-            if stats.realm:
-                lines.append(self._indent(f"stats realm {stats.realm}"))
-            for auth in stats.auth:
-                lines.append(self._indent(f"stats auth {auth}"))
-            if stats.hide_version:
-                lines.append(self._indent("stats hide-version"))
-            if stats.refresh:
-                lines.append(self._indent(f"stats refresh {stats.refresh}"))
-            if stats.show_legends:
-                lines.append(self._indent("stats show-legends"))
-            if stats.show_desc:
-                lines.append(self._indent(f"stats show-desc {stats.show_desc}"))
-            for admin_rule in stats.admin_rules:
-                lines.append(self._indent(f"stats admin {admin_rule}"))
-
-        # Capture headers
-        for header_name, length in frontend.capture_request_headers:
-            lines.append(self._indent(f"capture request header {header_name} len {length}"))
-
-        for header_name, length in frontend.capture_response_headers:
-            lines.append(self._indent(f"capture response header {header_name} len {length}"))
-
-        # ACLs
-        for acl in frontend.acls:
-            lines.append(self._indent(self._format_acl(acl)))
-
-        # Filters
-        for filter_obj in frontend.filters:
-            lines.append(self._indent(self._format_filter(filter_obj)))
-
-        # Stick table
-        if frontend.stick_table:
-            lines.append(self._indent(self._format_stick_table(frontend.stick_table)))
-
-        # Stick rules
-        for stick_rule in frontend.stick_rules:
-            lines.append(self._indent(self._format_stick_rule(stick_rule)))
-
-        # TCP request rules
-        for tcp_req in frontend.tcp_request_rules:
-            lines.append(self._indent(self._format_tcp_request_rule(tcp_req)))
-
-        # TCP response rules
-        for tcp_resp in frontend.tcp_response_rules:
-            lines.append(self._indent(self._format_tcp_response_rule(tcp_resp)))
-
-        # QUIC Initial rules
-        for quic_rule in frontend.quic_initial_rules:
-            lines.append(self._indent(self._format_quic_initial_rule(quic_rule)))
-
-        # HTTP request rules
-        for req_rule in frontend.http_request_rules:
-            lines.append(self._indent(self._format_http_request_rule(req_rule)))
-
-        # HTTP response rules
-        for resp_rule in frontend.http_response_rules:
-            lines.append(self._indent(self._format_http_response_rule(resp_rule)))
-
-        # HTTP after-response rules
-        for after_resp_rule in frontend.http_after_response_rules:
-            lines.append(self._indent(self._format_http_after_response_rule(after_resp_rule)))
-
-        # Redirect rules
-        for redirect in frontend.redirect_rules:
-            lines.append(self._indent(self._format_redirect_rule(redirect)))
-
-        # Error files
-        for error_file in frontend.error_files:
-            lines.append(self._indent(f"errorfile {error_file.code} {error_file.file}"))
-
-        # HTTP error responses
-        for http_error in frontend.http_errors:
-            lines.append(self._indent(self._format_http_error(http_error)))
-
-        # Email alert configuration
-        if frontend.email_alert:
-            for line in self._format_email_alert(frontend.email_alert):
-                lines.append(self._indent(line))
-
-        # Declare capture slots
-        if frontend.declare_captures:
-            for line in self._format_declare_captures(frontend.declare_captures):
-                lines.append(self._indent(line))
-
-        # Force persist rules
-        if frontend.force_persist_rules:
-            for line in self._format_force_persist_rules(frontend.force_persist_rules):
-                lines.append(self._indent(line))
-
-        # Ignore persist rules
-        if frontend.ignore_persist_rules:
-            for line in self._format_ignore_persist_rules(frontend.ignore_persist_rules):
-                lines.append(self._indent(line))
-
-        # Error location redirects
-        for code, location in frontend.errorloc.items():
-            lines.append(self._indent(f'errorloc {code} "{location}"'))
-        for code, location in frontend.errorloc302.items():
-            lines.append(self._indent(f'errorloc302 {code} "{location}"'))
-        for code, location in frontend.errorloc303.items():
-            lines.append(self._indent(f'errorloc303 {code} "{location}"'))
-
-        # Use backend rules
-        for backend_rule in frontend.use_backend_rules:
-            use_line = f"use_backend {backend_rule.backend}"
-            if backend_rule.condition:
-                use_line += f" if {backend_rule.condition}"
-            lines.append(self._indent(use_line))
-
-        # Default backend
-        if frontend.default_backend:
-            lines.append(self._indent(f"default_backend {frontend.default_backend}"))
-
-        # Options
-        for option in frontend.options:
-            lines.append(self._indent(f"option {option}"))
-
+        self._emit_frontend(self, frontend, lines)
         return lines
 
     def _generate_backend(self, backend: Backend) -> list[str]:
         """Generate backend section."""
         lines = [f"backend {backend.name}"]
-
-        # Mode
-        lines.append(self._indent(f"mode {backend.mode.value}"))
-
-        # Description
-        if backend.description:
-            lines.append(self._indent(f"description {backend.description}"))
-
-        # Handle disabled/enabled status
-        if backend.disabled:
-            lines.append(self._indent("disabled"))
-
-        if not backend.enabled:
-            lines.append(self._indent("disabled"))
-
-        # ID
-        if backend.id is not None:
-            lines.append(self._indent(f"id {backend.id}"))
-
-        # GUID (Global Unique Identifier)
-        if backend.guid:
-            lines.append(self._indent(f"guid {backend.guid}"))
-
-        # Balance algorithm
-        lines.append(self._indent(f"balance {backend.balance.value}"))
-
-        # Hash type (for hash-based load balancing)
-        if backend.hash_type:
-            lines.append(self._indent(f"hash-type {backend.hash_type}"))
-
-        # Hash balance factor (tuning for hash-based load balancing)
-        if backend.hash_balance_factor:
-            lines.append(self._indent(f"hash-balance-factor {backend.hash_balance_factor}"))
-
-        # Persist RDP cookie
-        if backend.persist_rdp_cookie is not None:
-            if backend.persist_rdp_cookie:
-                lines.append(self._indent(f"persist rdp-cookie({backend.persist_rdp_cookie})"))
-            else:
-                lines.append(self._indent("persist rdp-cookie"))
-
-        # Load server state from file
-        if backend.load_server_state_from:
-            lines.append(
-                self._indent(f"load-server-state-from-file {backend.load_server_state_from.value}")
-            )
-
-        # Server state file name
-        if backend.server_state_file_name:
-            lines.append(self._indent(f"server-state-file-name {backend.server_state_file_name}"))
-
-        # Retries
-        if backend.retries is not None:
-            lines.append(self._indent(f"retries {backend.retries}"))
-
-        # Max connections
-        if backend.maxconn:
-            lines.append(self._indent(f"maxconn {backend.maxconn}"))
-
-        # Backlog
-        if backend.backlog:
-            lines.append(self._indent(f"backlog {backend.backlog}"))
-
-        # Keep-alive queue
-        if backend.max_keep_alive_queue:
-            lines.append(self._indent(f"max-keep-alive-queue {backend.max_keep_alive_queue}"))
-
-        # Session-server connections
-        if backend.max_session_srv_conns:
-            lines.append(self._indent(f"max-session-srv-conns {backend.max_session_srv_conns}"))
-
-        # Timeouts
-        if backend.timeout_connect:
-            lines.append(self._indent(f"timeout connect {backend.timeout_connect}"))
-
-        if backend.timeout_server:
-            lines.append(self._indent(f"timeout server {backend.timeout_server}"))
-
-        if backend.timeout_check:
-            lines.append(self._indent(f"timeout check {backend.timeout_check}"))
-
-        if backend.timeout_tunnel:
-            lines.append(self._indent(f"timeout tunnel {backend.timeout_tunnel}"))
-
-        if backend.timeout_server_fin:
-            lines.append(self._indent(f"timeout server-fin {backend.timeout_server_fin}"))
-
-        # Options
-        for option in backend.options:
-            lines.append(self._indent(f"option {option}"))
-
-        # Logging
-        for log_target in backend.log:
-            lines.append(self._indent(f"log {log_target}"))
-
-        if backend.log_tag:
-            lines.append(self._indent(f"log-tag {backend.log_tag}"))
-
-        # Log format
-        if backend.log_format:
-            lines.append(self._indent(f"log-format {backend.log_format}"))
-
-        if backend.error_log_format:
-            lines.append(self._indent(f"error-log-format {backend.error_log_format}"))
-
-        if backend.log_format_sd:
-            lines.append(self._indent(f"log-format-sd {backend.log_format_sd}"))
-
-        # ACLs
-        for acl in backend.acls:
-            lines.append(self._indent(self._format_acl(acl)))
-
-        # Filters
-        for filter_obj in backend.filters:
-            lines.append(self._indent(self._format_filter(filter_obj)))
-
-        # Stick table
-        if backend.stick_table:
-            lines.append(self._indent(self._format_stick_table(backend.stick_table)))
-
-        # Stick rules
-        for stick_rule in backend.stick_rules:
-            lines.append(self._indent(self._format_stick_rule(stick_rule)))
-
-        # Cookie
-        if backend.cookie:
-            lines.append(self._indent(f"cookie {backend.cookie}"))
-
-        # Health check
-        if backend.health_check:
-            lines.extend(self._generate_http_check(backend.health_check, indent=True))
-
-        # TCP request rules
-        for tcp_req in backend.tcp_request_rules:
-            lines.append(self._indent(self._format_tcp_request_rule(tcp_req)))
-
-        # TCP response rules
-        for tcp_resp in backend.tcp_response_rules:
-            lines.append(self._indent(self._format_tcp_response_rule(tcp_resp)))
-
-        # HTTP request rules
-        for req_rule in backend.http_request_rules:
-            lines.append(self._indent(self._format_http_request_rule(req_rule)))
-
-        # HTTP response rules
-        for resp_rule in backend.http_response_rules:
-            lines.append(self._indent(self._format_http_response_rule(resp_rule)))
-
-        # HTTP after-response rules
-        for after_resp_rule in backend.http_after_response_rules:
-            lines.append(self._indent(self._format_http_after_response_rule(after_resp_rule)))
-
-        # Redirect rules
-        for redirect in backend.redirect_rules:
-            lines.append(self._indent(self._format_redirect_rule(redirect)))
-
-        # Error files
-        for error_file in backend.error_files:
-            lines.append(self._indent(f"errorfile {error_file.code} {error_file.file}"))
-
-        # HTTP error responses
-        for http_error in backend.http_errors:
-            lines.append(self._indent(self._format_http_error(http_error)))
-
-        # Email alert configuration
-        if backend.email_alert:
-            for line in self._format_email_alert(backend.email_alert):
-                lines.append(self._indent(line))
-
-        # Declare capture slots
-        if backend.declare_captures:
-            for line in self._format_declare_captures(backend.declare_captures):
-                lines.append(self._indent(line))
-
-        # Force persist rules
-        if backend.force_persist_rules:
-            for line in self._format_force_persist_rules(backend.force_persist_rules):
-                lines.append(self._indent(line))
-
-        # Ignore persist rules
-        if backend.ignore_persist_rules:
-            for line in self._format_ignore_persist_rules(backend.ignore_persist_rules):
-                lines.append(self._indent(line))
-
-        # Error location redirects
-        for code, location in backend.errorloc.items():
-            lines.append(self._indent(f'errorloc {code} "{location}"'))
-        for code, location in backend.errorloc302.items():
-            lines.append(self._indent(f'errorloc302 {code} "{location}"'))
-        for code, location in backend.errorloc303.items():
-            lines.append(self._indent(f'errorloc303 {code} "{location}"'))
-
-        # Error files directory
-        if backend.errorfiles:
-            lines.append(self._indent(f"errorfiles {backend.errorfiles}"))
-
-        # Dispatch (simple load balancing)
-        if backend.dispatch:
-            lines.append(self._indent(f"dispatch {backend.dispatch}"))
-
-        # FastCGI application
-        if backend.use_fcgi_app:
-            lines.append(self._indent(f"use-fcgi-app {backend.use_fcgi_app}"))
-
-        # HTTP reuse (connection pooling)
-        if backend.http_reuse:
-            lines.append(self._indent(f"http-reuse {backend.http_reuse}"))
-
-        # HTTP send name header
-        if backend.http_send_name_header:
-            lines.append(self._indent(f"http-send-name-header {backend.http_send_name_header}"))
-
-        # Retry conditions
-        if backend.retry_on:
-            lines.append(self._indent(f"retry-on {backend.retry_on}"))
-
-        # External health check
-        if backend.external_check_command:
-            lines.append(self._indent(f"external-check command {backend.external_check_command}"))
-        if backend.external_check_path:
-            lines.append(self._indent(f"external-check path {backend.external_check_path}"))
-
-        # Source IP binding
-        if backend.source:
-            lines.append(self._indent(f"source {backend.source}"))
-
-        # HTTP check rules (advanced health checks)
-        for http_check in backend.http_check_rules:
-            lines.append(self._indent(self._format_http_check_rule(http_check)))
-
-        # TCP check rules (advanced health checks)
-        for tcp_check in backend.tcp_check_rules:
-            lines.append(self._indent(self._format_tcp_check_rule(tcp_check)))
-
-        # Use-server rules (conditional server selection)
-        for use_server in backend.use_server_rules:
-            lines.append(self._indent(self._format_use_server_rule(use_server)))
-
-        # Compression
-        if backend.compression:
-            lines.append(self._indent(f"compression algo {backend.compression.algo}"))
-            if backend.compression.types:
-                types_str = " ".join(backend.compression.types)
-                lines.append(self._indent(f"compression type {types_str}"))
-
-        # Default server
-        if backend.default_server:
-            lines.append(self._indent(self._format_default_server(backend.default_server)))
-
-        # Servers
-        for server in backend.servers:
-            lines.append(self._indent(self._format_server(server)))
-
-        # Server templates
-        for template in backend.server_templates:
-            lines.append(self._indent(self._format_server_template(template)))
-
+        servers = self._hoist_default_server(backend) if self.hoist_default_server else None
+        if servers is None:
+            self._emit_backend(self, backend, lines)
+        else:
+            self._emit_backend_proxy(self, backend, lines)
+            lines.extend(map(self._indent, servers))
         return lines
 
     def _generate_listen(self, listen: Listen) -> list[str]:
         """Generate listen section (combined frontend/backend)."""
         lines = [f"listen {listen.name}"]
+        self._emit_listen(self, listen, lines)
+        return lines
 
-        # Bind directives
-        for bind in listen.binds:
-            lines.append(self._indent(self._format_bind(bind)))
-
-        # Mode
-        lines.append(self._indent(f"mode {listen.mode.value}"))
-
-        # Description
-        if listen.description:
-            lines.append(self._indent(f"description {listen.description}"))
-
-        # Handle disabled/enabled status
-        if listen.disabled:
-            lines.append(self._indent("disabled"))
-
-        if not listen.enabled:
-            lines.append(self._indent("disabled"))
-
-        # ID
-        if listen.id is not None:
-            lines.append(self._indent(f"id {listen.id}"))
-
-        # GUID (Global Unique Identifier)
-        if listen.guid:
-            lines.append(self._indent(f"guid {listen.guid}"))
-
-        # Balance
-        lines.append(self._indent(f"balance {listen.balance.value}"))
-
-        # Load server state from file
-        if listen.load_server_state_from:
-            lines.append(
-                self._indent(f"load-server-state-from-file {listen.load_server_state_from.value}")
-            )
-
-        # Server state file name
-        if listen.server_state_file_name:
-            lines.append(self._indent(f"server-state-file-name {listen.server_state_file_name}"))
-
-        # Log formats
-        if listen.log_tag:
-            lines.append(self._indent(f"log-tag {listen.log_tag}"))
-
-        if listen.log_format:
-            lines.append(self._indent(f"log-format {listen.log_format}"))
-
-        if listen.error_log_format:
-            lines.append(self._indent(f"error-log-format {listen.error_log_format}"))
-
-        if listen.log_format_sd:
-            lines.append(self._indent(f"log-format-sd {listen.log_format_sd}"))
-
-        if listen.log_steps:
-            lines.append(self._indent(f"log-steps {listen.log_steps}"))
-
-        # ACLs
-        for acl in listen.acls:
-            lines.append(self._indent(self._format_acl(acl)))
-
-        # Filters
-        for filter_obj in listen.filters:
-            lines.append(self._indent(self._format_filter(filter_obj)))
-
-        # Options
-        for option in listen.options:
-            lines.append(self._indent(f"option {option}"))
-
-        # Persist RDP cookie
-        if listen.persist_rdp_cookie is not None:
-            if listen.persist_rdp_cookie:
-                lines.append(self._indent(f"persist rdp-cookie({listen.persist_rdp_cookie})"))
-            else:
-                lines.append(self._indent("persist rdp-cookie"))
-
-        # HTTP request rules
-        for req_rule in listen.http_request_rules:
-            lines.append(self._indent(self._format_http_request_rule(req_rule)))
-
-        # HTTP response rules
-        for resp_rule in listen.http_response_rules:
-            lines.append(self._indent(self._format_http_response_rule(resp_rule)))
-
-        # HTTP after-response rules
-        for after_resp_rule in listen.http_after_response_rules:
-            lines.append(self._indent(self._format_http_after_response_rule(after_resp_rule)))
-
-        # QUIC Initial rules
-        for quic_rule in listen.quic_initial_rules:
-            lines.append(self._indent(self._format_quic_initial_rule(quic_rule)))
-
-        # HTTP error responses
-        for http_error in listen.http_errors:
-            lines.append(self._indent(self._format_http_error(http_error)))
+    def _format_monitor_fail_rule(self, rule: MonitorFailRule) -> str:
+        """Format the condition of a monitor fail directive."""
+        return rule.condition
 
-        # Email alert configuration
-        if listen.email_alert:
-            for line in self._format_email_alert(listen.email_alert):
-                lines.append(self._indent(line))
+    def _format_capture(self, capture: tuple[str, int]) -> str:
+        """Format the arguments of a capture request/response header directive."""
+        header_name, length = capture
+        return f"{header_name} len {length}"
 
-        # Declare capture slots
-        if listen.declare_captures:
-            for line in self._format_declare_captures(listen.declare_captures):
-                lines.append(self._indent(line))
+    def _format_error_file(self, error_file: ErrorFile) -> str:
+        """Format the arguments of an errorfile directive."""
+        return f"{error_file.code} {error_file.file}"
 
-        # Force persist rules
-        if listen.force_persist_rules:
-            for line in self._format_force_persist_rules(listen.force_persist_rules):
-                lines.append(self._indent(line))
+    def _format_use_backend_rule(self, rule: UseBackendRule) -> str:
+        """Format the arguments of a use_backend directive."""
+        if rule.condition:
+            return f"{rule.backend} if {rule.condition}"
+        return rule.backend
 
-        # Ignore persist rules
-        if listen.ignore_persist_rules:
-            for line in self._format_ignore_persist_rules(listen.ignore_persist_rules):
-                lines.append(self._indent(line))
+    def _format_persist_rdp_cookie(self, cookie: str) -> str:
+        """Format a persist rdp-cookie directive; an empty name uses the default."""
+        return f"persist rdp-cookie({cookie})" if cookie else "persist rdp-cookie"
 
-        # Stats configuration
-        if listen.stats:
-            stats = listen.stats
-            if stats.enable:
-                lines.append(self._indent("stats enable"))
-            if stats.uri:
-                lines.append(self._indent(f"stats uri {stats.uri}"))
-            if stats.realm:
-                lines.append(self._indent(f"stats realm {stats.realm}"))
-            for auth in stats.auth:
-                lines.append(self._indent(f"stats auth {auth}"))
-            if stats.hide_version:
-                lines.append(self._indent("stats hide-version"))
-            if stats.refresh:
-                lines.append(self._indent(f"stats refresh {stats.refresh}"))
-            if stats.show_legends:
-                lines.append(self._indent("stats show-legends"))
-            if stats.show_desc:
-                lines.append(self._indent(f"stats show-desc {stats.show_desc}"))
-            for admin_rule in stats.admin_rules:
-                lines.append(self._indent(f"stats admin {admin_rule}"))
-
-        # Servers
-        for server in listen.servers:
-            lines.append(self._indent(self._format_server(server)))
+    def _format_stats(self, stats: StatsConfig) -> list[str]:
+        """Format stats directives."""
+        lines = []
+        if stats.enable:
+            lines.append("stats enable")
+        if stats.uri:
+            lines.append(f"stats uri {stats.uri}")
+        if stats.realm:
+            lines.append(f"stats realm {stats.realm}")
+        for auth in stats.auth:
+            lines.append(f"stats auth {auth}")
+        if stats.hide_version:
+            lines.append("stats hide-version")
+        if stats.refresh:
+            lines.append(f"stats refresh {stats.refresh}")
+        if stats.show_legends:
+            lines.append("stats show-legends")
+        if stats.show_desc:
+            lines.append(f"stats show-desc {stats.show_desc}")
+        for admin_rule in stats.admin_rules:
+            lines.append(f"stats admin {admin_rule}")
+        return lines
 
+    def _format_compression(self, compression: CompressionConfig) -> list[str]:
+        """Format compression directives."""
+        lines = [f"compression algo {compression.algo}"]
+        if compression.types:
+            lines.append(f"compression type {' '.join(compression.types)}")
         return lines
 
     def _generate_http_check(self, health_check: HealthCheck, indent: bool = False) -> list[str]:
@@ -1758,14 +1209,14 @@ class HAProxyCodeGenerator:
 
         return lines
 
-    def _format_declare_captures(self, declare_captures: list[DeclareCapture]) -> list[str]:
+    def _format_declare_captures(self, declare_captures: Sequence[DeclareCapture]) -> list[str]:
         """Format declare capture directives."""
         lines = []
         for capture in declare_captures:
             lines.append(f"declare capture {capture.capture_type} len {capture.length}")
         return lines
 
-    def _format_force_persist_rules(self, rules: list[ForcePersistRule]) -> list[str]:
+    def _format_force_persist_rules(self, rules: Sequence[ForcePersistRule]) -> list[str]:
         """Format force-persist directives."""
         lines = []
         for rule in rules:
@@ -1775,7 +1226,7 @@ class HAProxyCodeGenerator:
             lines.append(line)
         return lines
 
-    def _format_ignore_persist_rules(self, rules: list[IgnorePersistRule]) -> list[str]:
+    def _format_ignore_persist_rules(self, rules: Sequence[IgnorePersistRule]) -> list[str]:
         """Format ignore-persist directives."""
         lines = []
         for rule in rules:
@@ -1877,7 +1328,11 @@ class HAProxyCodeGenerator:
 
     def _format_default_server(self, default_server: DefaultServer) -> str:
         """Format default-server directive."""
-        parts = ["default-server"]
+        return " ".join(["default-server", *self._format_default_server_options(default_server)])
+
+    def _format_default_server_options(self, default_server: DefaultServer) -> list[str]:
+        """Format the options following default-server."""
+        parts: list[str] = []
 
         if default_server.check:
             parts.append("check")
@@ -1938,11 +1393,128 @@ class HAProxyCodeGenerator:
         if default_server.source:
             parts.append(f"source {default_server.source}")
 
-        return " ".join(parts)
+        return parts
+
+    def _hoist_default_server(self, backend: Backend) -> list[str] | None:
+        """Format a backend's default-server and server lines with shared options hoisted.
+
+        Options that every server has and default-server accepts move to the
+        default-server line, replacing the backend's own setting of the same
+        keyword. Server lines then leave out every option the default-server
+        line already sets, since they inherit it.
+
+        Returns:
+            The unindented lines, or None to format the backend as is: when
+            no option can be hoisted, or when server templates, which also
+            inherit default-server, are present
+        """
+        servers = backend.servers
+        if len(servers) < 2 or backend.server_templates:
+            return None
+
+        rows = list(self._server_rows(servers))
+        shared = rows[0][1]
+        for _, parts in rows:
+            # Servers from one template usually have the very same options
+            if parts != shared:
+                shared = [part for part in shared if part in parts]
+                if not shared:
+                    return None
+
+        defaults = {}
+        if backend.default_server:
+            for part in self._format_default_server_options(backend.default_server):
+                defaults[part.partition(" ")[0]] = part
+        hoisted = False
+        for part in shared:
+            keyword = part.partition(" ")[0]
+            if keyword in _DEFAULT_SERVER_KEYWORDS:
+                defaults[keyword] = part
+                hoisted = True
+        if not hoisted:
+            return None
+
+        inherited = set(defaults.values())
+        lines = [" ".join(["default-server", *defaults.values()])]
+        suffixes: dict[tuple[str, ...], str] = {}
+        for head, parts in rows:
+            key = tuple(parts)
+            suffix = suffixes.get(key)
+            if suffix is None:
+                suffix = suffixes[key] = "".join(
+                    [f" {part}" for part in parts if part not in inherited]
+                )
+            lines.append(head + suffix)
+        return lines
+
+    def _format_servers(self, servers: Sequence[Server]) -> Iterator[str]:
+        """Format server lines, straight from the columns for ServerColumns."""
+        if isinstance(servers, ServerColumns):
+            yield from self._format_server_columns(servers)
+        else:
+            for server in servers:
+                yield self._format_server(server)
+
+    def _format_server_columns(self, columns: ServerColumns) -> Iterator[str]:
+        """Format columnar servers without building a Server per row.
+
+        Everything after the address depends only on the option columns,
+        so it is formatted once per distinct combination of their values.
+        """
+        option_names = _server_option_names(columns)
+        value = columns.value
+        suffixes: dict[tuple[int, ...], str] = {}
+        for row in range(len(columns)):
+            values = [value(row, name) for name in option_names]
+            # Column values stay alive, so their ids identify them
+            key = tuple(map(id, values))
+            suffix = suffixes.get(key)
+            if suffix is None:
+                server = dataclasses.replace(
+                    columns.shared, **dict(zip(option_names, values, strict=True))
+                )
+                suffix = suffixes[key] = "".join(
+                    f" {part}" for part in self._format_server_options(server)
+                )
+            name, address, port = value(row, "name"), value(row, "address"), value(row, "port")
+            yield f"server {name} {address}:{port}{suffix}"
+
+    def _server_rows(self, servers: Sequence[Server]) -> Iterator[tuple[str, list[str]]]:
+        """Yield ``server <name> <address>:<port>`` and the options of each server.
+
+        Rows of ServerColumns with the same option values share one list.
+        """
+        if not isinstance(servers, ServerColumns):
+            for server in servers:
+                head = f"server {server.name} {server.address}:{server.port}"
+                yield head, self._format_server_options(server)
+            return
+
+        option_names = _server_option_names(servers)
+        value = servers.value
+        options: dict[tuple[int, ...], list[str]] = {}
+        for row in range(len(servers)):
+            values = [value(row, name) for name in option_names]
+            # Column values stay alive, so their ids identify them
+            key = tuple(map(id, values))
+            parts = options.get(key)
+            if parts is None:
+                server = dataclasses.replace(
+                    servers.shared, **dict(zip(option_names, values, strict=True))
+                )
+                parts = options[key] = self._format_server_options(server)
+            name, address, port = value(row, "name"), value(row, "address"), value(row, "port")
+            yield f"server {name} {address}:{port}", parts
 
     def _format_server(self, server: Server) -> str:
         """Format server definition."""
         parts = [f"server {server.name} {server.address}:{server.port}"]
+        parts.extend(self._format_server_options(server))
+        return " ".join(parts)
+
+    def _format_server_options(self, server: Server) -> list[str]:
+        """Format the options following a server's name and address."""
+        parts: list[str] = []
 
         if server.check:
             parts.append("check")
@@ -2013,7 +1585,7 @@ class HAProxyCodeGenerator:
             elif value:
                 parts.append(f"{key} {value}")
 
-        return " ".join(parts)
+        return parts
 
     def _format_server_template(self, template: ServerTemplate) -> str:
         """Format server template."""
@@ -2092,7 +1664,7 @@ class HAProxyCodeGenerator:
 
         # Add parameters
         for key, value in tcp_req.parameters.items():
-            if key == "params" and isinstance(value, list):
+            if key == "params" and isinstance(value, (list, tuple)):
                 # Params list should be appended directly without key
                 parts.extend(value)
             else:
@@ -2109,7 +1681,7 @@ class HAProxyCodeGenerator:
 
         # Add parameters
         for key, value in tcp_resp.parameters.items():
-            if key == "params" and isinstance(value, list):
+            if key == "params" and isinstance(value, (list, tuple)):
                 # Params list should be appended directly without key
                 parts.extend(value)
             else:
@@ -0,0 +1,145 @@
+"""Columnar storage for the servers of very large backends.
+
+Service-discovery generated backends can hold tens of thousands of servers
+that differ only in name, address, port and weight. ServerColumns stores
+such a pool as one shared Server holding the values most servers have,
+plus a column per field that differs:
+
+- dense columns hold one value per server, for fields that vary on most
+  rows (name, address, ...)
+- sparse columns hold only the rows that differ from the shared value
+  (the odd backup or disabled server)
+
+It is a read-only ``Sequence[Server]``, so code that iterates
+``backend.servers`` keeps working on Server views built on access, while
+the code generator formats lines straight from the columns.
+
+Columns are built from a backend's finished Server list (see
+``from_servers``), so they reduce what the IR retains afterwards, not
+the peak reached while the backend is expanded.
+"""
+
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import fields, replace
+from typing import Any, overload
+
+from .nodes import Server
+
+# Field names in declaration order
+SERVER_FIELDS = tuple(f.name for f in fields(Server))
+
+
+def _most_common(column: list[Any]) -> Any:
+    try:
+        return Counter(column).most_common(1)[0][0]
+    except TypeError:
+        # Unhashable values (lists, dicts): settle for the first
+        return column[0]
+
+
+class ServerColumns(Sequence[Server]):
+    """Servers stored as a struct of arrays.
+
+    Attributes:
+        shared: Values common to the pool, as a Server.
+        dense: Field name -> one value per server.
+        sparse: Field name -> {row: value} for rows that differ from shared.
+    """
+
+    __slots__ = ("_length", "dense", "shared", "sparse")
+
+    def __init__(
+        self,
+        length: int,
+        shared: Server,
+        dense: dict[str, list[Any]] | None = None,
+        sparse: dict[str, dict[int, Any]] | None = None,
+    ) -> None:
+        self._length = length
+        self.shared = shared
+        self.dense = dense or {}
+        self.sparse = sparse or {}
+
+    @classmethod
+    def from_servers(cls, servers: Iterable[Server]) -> ServerColumns:
+        """Build columns from Server instances.
+
+        Each field's shared value is its most common one. A field becomes a
+        sparse column when some servers differ from it, and a dense column
+        when more than half of them do.
+        """
+        servers = list(servers)
+        if not servers:
+            return cls(0, Server())
+
+        shared: dict[str, Any] = {}
+        dense: dict[str, list[Any]] = {}
+        sparse: dict[str, dict[int, Any]] = {}
+        for name in SERVER_FIELDS:
+            column = [getattr(server, name) for server in servers]
+            default = shared[name] = _most_common(column)
+            overrides = {
+                row: value
+                for row, value in enumerate(column)
+                # Type check too: True == 1, but they format differently
+                if value != default or type(value) is not type(default)
+            }
+            if len(overrides) * 2 > len(column):
+                dense[name] = column
+            elif overrides:
+                sparse[name] = overrides
+        return cls(len(servers), Server(**shared), dense, sparse)
+
+    def value(self, row: int, name: str) -> Any:
+        """Return field ``name`` of server ``row`` without building a view."""
+        column = self.dense.get(name)
+        if column is not None:
+            return column[row]
+        overrides = self.sparse.get(name)
+        if overrides is not None and row in overrides:
+            return overrides[row]
+        return getattr(self.shared, name)
+
+    def row(self, index: int) -> dict[str, Any]:
+        """Return the fields of server ``index`` that differ from ``shared``."""
+        values = {name: column[index] for name, column in self.dense.items()}
+        for name, overrides in self.sparse.items():
+            if index in overrides:
+                values[name] = overrides[index]
+        return values
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Server: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Server]: ...
+
+    def __getitem__(self, index: int | slice) -> Server | list[Server]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("server index out of range")
+        return replace(self.shared, **self.row(index))
+
+    def __iter__(self) -> Iterator[Server]:
+        for index in range(self._length):
+            yield replace(self.shared, **self.row(index))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(other) == self._length and all(a == b for a, b in zip(self, other, strict=True))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"ServerColumns({self._length} servers, "
+            f"dense={sorted(self.dense)}, sparse={sorted(self.sparse)})"
+        )
@@ -0,0 +1,146 @@
+"""Stable content fingerprints for configuration sections.
+
+A section's fingerprint is a digest of its type and field values, nested
+nodes included, so two builds can be compared section by section without
+generating any output. It is stable across processes and Python versions
+(``hash()`` is not: string hashes are salted per process) and independent
+of how the IR is stored: lists and tuples, dicts and FrozenMappings, and
+Server lists and ServerColumns of the same content fingerprint alike.
+
+Source locations are left out, so moving a section within a file, or into
+another file, does not change its fingerprint.
+
+Nodes are hashed bottom-up and each node's digest is cached by identity for
+the duration of one ``Fingerprinter``, so subtrees shared through
+interning or structural sharing are hashed once.
+"""
+
+import hashlib
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import fields, replace
+from enum import Enum
+from typing import Any
+
+from .columns import ServerColumns
+from .nodes import ConfigIR, FrozenMapping, IRNode
+
+DIGEST_SIZE = 16
+
+# Fields that do not affect generated output
+_IGNORED_FIELDS = frozenset({"location"})
+
+
+def iter_sections(ir: ConfigIR) -> Iterator[tuple[str, IRNode]]:
+    """Yield ``(key, section)`` for each section, in output order.
+
+    Keys are the section headers as HAProxy writes them: ``global``,
+    ``defaults``, ``frontend web``, ``backend api``, ...
+    """
+    if ir.global_config is not None:
+        yield "global", ir.global_config
+    if ir.defaults is not None:
+        yield "defaults", ir.defaults
+    for kind, sections in (
+        ("peers", ir.peers),
+        ("resolvers", ir.resolvers),
+        ("mailers", ir.mailers),
+        ("frontend", ir.frontends),
+        ("backend", ir.backends),
+        ("listen", ir.listens),
+    ):
+        for section in sections:
+            yield f"{kind} {section.name}", section
+
+
+class Fingerprinter:
+    """Computes content digests of IR nodes.
+
+    Digests are cached by node identity, so use one instance per tree and
+    do not keep it past the tree's lifetime.
+    """
+
+    def __init__(self) -> None:
+        self._digests: dict[int, bytes] = {}
+        # type -> (encoded type name, ((field name, encoded field name), ...))
+        self._layouts: dict[type, tuple[bytes, tuple[tuple[str, bytes], ...]]] = {}
+
+    def fingerprint(self, node: IRNode) -> str:
+        """Return the hex digest of ``node``."""
+        return self._digest(node).hex()
+
+    def _digest(self, node: IRNode, cache: bool = True) -> bytes:
+        digest = self._digests.get(id(node)) if cache else None
+        if digest is not None:
+            return digest
+
+        layout = self._layouts.get(type(node))
+        if layout is None:
+            layout = self._layouts[type(node)] = (
+                type(node).__name__.encode(),
+                tuple(
+                    (f.name, f.name.encode() + b"=")
+                    for f in fields(node)
+                    if f.name not in _IGNORED_FIELDS
+                ),
+            )
+
+        type_name, names = layout
+        parts = [type_name]
+        for name, encoded in names:
+            parts.append(encoded)
+            self._encode(parts, getattr(node, name))
+        digest = hashlib.blake2b(b"".join(parts), digest_size=DIGEST_SIZE).digest()
+        if cache:
+            self._digests[id(node)] = digest
+        return digest
+
+    def _encode(self, parts: list[bytes], value: Any) -> None:  # noqa: PLR0912
+        # Every encoding starts with a tag and is self-delimiting, so
+        # adjacent values cannot run into each other
+        if value is None:
+            parts.append(b"N")
+        elif isinstance(value, bool):
+            parts.append(b"T" if value else b"F")
+        elif isinstance(value, str):
+            data = value.encode("utf-8", "surrogatepass")
+            parts.append(b"s%d:" % len(data))
+            parts.append(data)
+        elif isinstance(value, int):
+            parts.append(b"i%d;" % value)
+        elif isinstance(value, float):
+            parts.append(b"f" + repr(value).encode() + b";")
+        elif isinstance(value, Enum):
+            parts.append(b"e" + type(value).__name__.encode())
+            self._encode(parts, value.value)
+        elif isinstance(value, IRNode):
+            parts.append(b"n")
+            parts.append(self._digest(value))
+        elif isinstance(value, Mapping):
+            # Insertion order is kept: options are emitted in that order
+            parts.append(b"m%d:" % len(value))
+            for key, item in value.items():
+                self._encode(parts, key)
+                self._encode(parts, item)
+        elif isinstance(value, ServerColumns):
+            # Views are built on access; their ids must not be cached
+            parts.append(b"l%d:" % len(value))
+            for server in value:
+                parts.append(b"n")
+                parts.append(self._digest(server, cache=False))
+        elif isinstance(value, Sequence):
+            parts.append(b"l%d:" % len(value))
+            for item in value:
+                self._encode(parts, item)
+        else:
+            parts.append(b"r" + repr(value).encode())
+
+
+def section_fingerprints(ir: ConfigIR) -> dict[str, str]:
+    """Return ``{section key: fingerprint}`` for every section of ``ir``."""
+    fingerprinter = Fingerprinter()
+    return {key: fingerprinter.fingerprint(section) for key, section in iter_sections(ir)}
+
+
+def with_fingerprints(ir: ConfigIR) -> ConfigIR:
+    """Return ``ir`` with ``ConfigIR.fingerprints`` filled in."""
+    return replace(ir, fingerprints=FrozenMapping(section_fingerprints(ir)))
@@ -0,0 +1,137 @@
+"""Hash-consing of IR trees.
+
+Loop-unrolled and template-expanded configurations repeat the same health
+checks, ACLs, rules, option dicts and strings many times over. IRInterner
+rebuilds a tree so that structurally equal values are one shared object,
+and memory scales with distinct content rather than with raw count.
+
+Interning works bottom-up: a node's children are interned first, so two
+nodes are equal exactly when they have the same type and their fields are
+the same objects. Lookups therefore hash field identities instead of
+walking subtrees, and values that merely compare equal across types
+(``True == 1``, ``1 == 1.0``) are never merged.
+"""
+
+import sys
+from collections.abc import Mapping
+from dataclasses import fields, replace
+from typing import Any, cast
+
+from .nodes import (
+    EMPTY_MAPPING,
+    Backend,
+    ConfigIR,
+    DefaultsConfig,
+    Frontend,
+    FrozenMapping,
+    GlobalConfig,
+    IRNode,
+    Listen,
+    MailersSection,
+    PeersSection,
+    ResolversSection,
+)
+
+# Sections are unique by name; they are frozen but not looked up
+_SECTION_TYPES = (
+    ConfigIR,
+    GlobalConfig,
+    DefaultsConfig,
+    Frontend,
+    Backend,
+    Listen,
+    PeersSection,
+    ResolversSection,
+    MailersSection,
+)
+
+
+class IRInterner:
+    """Deduplicates structurally equal IR nodes, collections and strings.
+
+    ``intern()`` returns an equivalent tree in which lists are tuples and
+    dicts are FrozenMappings, so every node in it is hashable, and each
+    distinct node, tuple, mapping, string and number exists once. Values of
+    other types (enums, None, anything unrecognised) are kept as they are.
+
+    An interner keeps every distinct value it has returned alive, so use
+    one per translation.
+    """
+
+    def __init__(self) -> None:
+        # identity key -> canonical value
+        self._table: dict[tuple[Any, ...], Any] = {}
+        # id -> value for everything intern() returned, so it is not walked twice
+        self._interned: dict[int, Any] = {id(EMPTY_MAPPING): EMPTY_MAPPING, id(()): ()}
+        self._field_names: dict[type, tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        """Number of distinct nodes, collections and numbers interned."""
+        return len(self._table)
+
+    def intern[T](self, value: T) -> T:
+        """Return the canonical equivalent of ``value``.
+
+        Lists and dicts come back as tuples and FrozenMappings, which the
+        Sequence and Mapping fields of IR nodes accept.
+        """
+        # Exact types: str subclasses such as lark Tokens cannot be interned,
+        # and bools are not numbers here
+        if type(value) in (str, int, float):
+            return cast("T", self._intern_atom(cast("str | float", value)))
+        if id(value) in self._interned:
+            return value
+
+        if isinstance(value, IRNode):
+            return cast("T", self._intern_node(value))
+        if type(value) is list or type(value) is tuple:
+            return cast("T", self._intern_sequence(cast("list[Any] | tuple[Any, ...]", value)))
+        if isinstance(value, Mapping):
+            return cast("T", self._intern_mapping(value))
+        return value
+
+    def _intern_atom(self, value: str | float) -> str | float:
+        if type(value) is str:
+            return sys.intern(value)
+        return cast("str | float", self._table.setdefault((type(value), value), value))
+
+    def _intern_sequence(self, value: list[Any] | tuple[Any, ...]) -> tuple[Any, ...]:
+        items = tuple(self.intern(item) for item in value)
+        if not items:
+            return ()
+        if isinstance(items[0], _SECTION_TYPES):
+            return self._keep(items)
+        return self._lookup((tuple, *map(id, items)), items)
+
+    def _intern_mapping(self, value: Mapping[Any, Any]) -> Mapping[Any, Any]:
+        frozen = FrozenMapping({self.intern(k): self.intern(v) for k, v in value.items()})
+        if not frozen:
+            return EMPTY_MAPPING
+        # Keyed in order: options are emitted in insertion order
+        key = (FrozenMapping, *(id(item) for pair in frozen.items() for item in pair))
+        return self._lookup(key, frozen)
+
+    def _intern_node(self, node: IRNode) -> IRNode:
+        names = self._field_names.get(type(node))
+        if names is None:
+            names = self._field_names[type(node)] = tuple(f.name for f in fields(node))
+
+        values = [getattr(node, name) for name in names]
+        interned = [self.intern(value) for value in values]
+        if any(new is not old for new, old in zip(interned, values, strict=True)):
+            node = replace(node, **dict(zip(names, interned, strict=True)))
+
+        if isinstance(node, _SECTION_TYPES):
+            return self._keep(node)
+        return self._lookup((type(node), *map(id, interned)), node)
+
+    def _lookup[V](self, key: tuple[Any, ...], value: V) -> V:
+        # Equal keys only come from values of the same type
+        canonical = cast("V", self._table.setdefault(key, value))
+        if canonical is value:
+            self._interned[id(value)] = value
+        return canonical
+
+    def _keep[V](self, value: V) -> V:
+        self._interned[id(value)] = value
+        return value
@@ -1,5 +1,6 @@
 """Intermediate Representation (IR) node definitions."""
 
+from collections.abc import Iterator, Mapping, Sequence
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING, Any
@@ -8,6 +9,54 @@ if TYPE_CHECKING:
     from ..utils.errors import SourceLocation
 
 
+class FrozenMapping(Mapping[Any, Any]):
+    """Read-only, hashable mapping.
+
+    Unset mapping fields share the empty instance, EMPTY_MAPPING; the
+    interner (see interning.py) freezes populated dicts into one so the
+    nodes holding them can be hashed.
+    """
+
+    __slots__ = ("_data", "_hash")
+
+    def __init__(self, data: Mapping[Any, Any] | None = None) -> None:
+        self._data: dict[Any, Any] = dict(data) if data else {}
+        self._hash: int | None = None
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenMapping):
+            return self._data == other._data
+        if isinstance(other, Mapping):
+            return self._data == dict(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._data.items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return repr(self._data)
+
+    def __reduce__(self) -> str | tuple[Any, ...]:
+        if not self._data:
+            # Unpickle (e.g. from an import worker process) to the shared instance
+            return "EMPTY_MAPPING"
+        return (FrozenMapping, (self._data,))
+
+
+EMPTY_MAPPING: Mapping[Any, Any] = FrozenMapping()
+
+
 # Enums for type safety
 class Mode(Enum):
     """HAProxy mode."""
@@ -68,16 +117,16 @@ class LoadServerStateFrom(Enum):
 
 
 # Base classes
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IRNode:
     """Base class for all IR nodes."""
 
     location: SourceLocation | None = None
-    metadata: dict[str, Any] = field(default_factory=dict)
+    metadata: Mapping[str, Any] = EMPTY_MAPPING
 
 
 # Configuration components
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LogTarget(IRNode):
     """Log target configuration."""
 
@@ -87,17 +136,17 @@ class LogTarget(IRNode):
     minlevel: LogLevel | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LuaScript(IRNode):
     """Lua script definition."""
 
     name: str | None = None
     source_type: str = "inline"  # "inline" or "file"
     content: str = ""  # Inline Lua code or file path
-    parameters: dict[str, Any] = field(default_factory=dict)  # Template params
+    parameters: Mapping[str, Any] = EMPTY_MAPPING  # Template params
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StatsSocket(IRNode):
     """Stats socket configuration for runtime API."""
 
@@ -109,7 +158,7 @@ class StatsSocket(IRNode):
     process: str | None = None  # Process binding (e.g., "all", "1-4")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Peer(IRNode):
     """Individual peer server in peers section."""
 
@@ -118,16 +167,16 @@ class Peer(IRNode):
     port: int = 1024
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PeersSection(IRNode):
     """Peers section for stick table replication."""
 
     name: str = ""
-    peers: list[Peer] = field(default_factory=list)
+    peers: Sequence[Peer] = ()
     disabled: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Nameserver(IRNode):
     """DNS nameserver in resolvers section."""
 
@@ -136,12 +185,12 @@ class Nameserver(IRNode):
     port: int = 53
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ResolversSection(IRNode):
     """Resolvers section for DNS resolution."""
 
     name: str = ""
-    nameservers: list[Nameserver] = field(default_factory=list)
+    nameservers: Sequence[Nameserver] = ()
     accepted_payload_size: int | None = None
     hold_nx: str | None = None  # e.g., "30s"
     hold_obsolete: str | None = None
@@ -154,7 +203,7 @@ class ResolversSection(IRNode):
     timeout_retry: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Mailer(IRNode):
     """Individual mailer server in mailers section."""
 
@@ -163,16 +212,16 @@ class Mailer(IRNode):
     port: int = 25
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MailersSection(IRNode):
     """Mailers section for email alerts."""
 
     name: str = ""
-    mailers: list[Mailer] = field(default_factory=list)
+    mailers: Sequence[Mailer] = ()
     timeout_mail: str | None = None  # e.g., "10s"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StickTable(IRNode):
     """Stick table configuration for session persistence and rate limiting."""
 
@@ -181,12 +230,10 @@ class StickTable(IRNode):
     expire: str | None = None  # Expiration time (e.g., "30m", "1h")
     nopurge: bool = False  # Don't purge oldest entries when full
     peers: str | None = None  # Peer section name for replication
-    store: list[str] = field(
-        default_factory=list
-    )  # Data types: gpc0, conn_rate, http_req_rate, etc.
+    store: Sequence[str] = ()  # Data types: gpc0, conn_rate, http_req_rate, etc.
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StickRule(IRNode):
     """Stick rule for session persistence (stick on/match/store)."""
 
@@ -196,36 +243,36 @@ class StickRule(IRNode):
     condition: str | None = None  # ACL condition (e.g., "if !localhost")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TcpRequestRule(IRNode):
     """TCP request processing rule."""
 
     rule_type: str = "connection"  # "connection", "content", "inspect-delay"
     action: str = ""  # accept, reject, expect-proxy, set-var, track-sc0, etc.
     condition: str | None = None  # ACL condition
-    parameters: dict[str, Any] = field(default_factory=dict)  # Additional params
+    parameters: Mapping[str, Any] = EMPTY_MAPPING  # Additional params
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TcpResponseRule(IRNode):
     """TCP response processing rule."""
 
     rule_type: str = "content"  # "content", "inspect-delay"
     action: str = ""  # accept, reject, close, set-var, etc.
     condition: str | None = None  # ACL condition
-    parameters: dict[str, Any] = field(default_factory=dict)
+    parameters: Mapping[str, Any] = EMPTY_MAPPING
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class QuicInitialRule(IRNode):
     """QUIC Initial packet processing rule."""
 
     action: str = ""  # accept, reject, expect-proxy, track-sc0-2, set-var, etc.
     condition: str | None = None  # ACL condition (if/unless)
-    parameters: dict[str, Any] = field(default_factory=dict)  # track_key, var_name, etc.
+    parameters: Mapping[str, Any] = EMPTY_MAPPING  # track_key, var_name, etc.
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RedirectRule(IRNode):
     """HTTP redirect rule."""
 
@@ -233,12 +280,10 @@ class RedirectRule(IRNode):
     target: str = ""  # Redirect target (URL, path, scheme)
     code: int | None = None  # HTTP status code (301, 302, 303, etc.)
     condition: str | None = None  # ACL condition
-    options: dict[str, Any] = field(
-        default_factory=dict
-    )  # drop-query, append-slash, set-cookie, etc.
+    options: Mapping[str, Any] = EMPTY_MAPPING  # drop-query, append-slash, set-cookie, etc.
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ErrorFile(IRNode):
     """Custom error page file mapping."""
 
@@ -246,7 +291,7 @@ class ErrorFile(IRNode):
     file: str = ""  # Path to error page file
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HttpError(IRNode):
     """Custom HTTP error response definition (http-error directive)."""
 
@@ -260,10 +305,10 @@ class HttpError(IRNode):
     lf_file: str | None = None  # Log-format file
     string: str | None = None  # Raw string payload
     lf_string: str | None = None  # Log-format string payload
-    headers: dict[str, str] = field(default_factory=dict)  # Additional HTTP headers
+    headers: Mapping[str, str] = EMPTY_MAPPING  # Additional HTTP headers
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EmailAlert(IRNode):
     """Email alert configuration (email-alert directive)."""
 
@@ -274,7 +319,7 @@ class EmailAlert(IRNode):
     myhostname: str | None = None  # Hostname for emails
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DeclareCapture(IRNode):
     """Declare capture slot (declare capture directive)."""
 
@@ -282,21 +327,21 @@ class DeclareCapture(IRNode):
     length: int = 0  # Maximum capture length
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ForcePersistRule(IRNode):
     """Force persistence rule (force-persist directive)."""
 
     condition: str | None = None  # ACL condition (if/unless)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IgnorePersistRule(IRNode):
     """Ignore persistence rule (ignore-persist directive)."""
 
     condition: str | None = None  # ACL condition (if/unless)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HttpCheckRule(IRNode):
     """Advanced HTTP health check rule (http-check directive)."""
 
@@ -304,7 +349,7 @@ class HttpCheckRule(IRNode):
     # Send options
     method: str | None = None  # HTTP method (GET, POST, OPTIONS, etc.)
     uri: str | None = None  # URI path
-    headers: dict[str, str] = field(default_factory=dict)  # HTTP headers
+    headers: Mapping[str, str] = EMPTY_MAPPING  # HTTP headers
     body: str | None = None  # Request body
     # Expect options
     expect_type: str | None = None  # status, string, rstatus, rstring
@@ -319,7 +364,7 @@ class HttpCheckRule(IRNode):
     condition: str | None = None  # if/unless ACL condition
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TcpCheckRule(IRNode):
     """Advanced TCP health check rule (tcp-check directive)."""
 
@@ -339,7 +384,7 @@ class TcpCheckRule(IRNode):
     comment: str | None = None  # Comment text
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UseServerRule(IRNode):
     """use-server directive for conditional server selection in backends."""
 
@@ -347,29 +392,29 @@ class UseServerRule(IRNode):
     condition: str | None = None  # ACL condition (if/unless)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MonitorFailRule(IRNode):
     """monitor fail directive for conditional monitoring failures."""
 
     condition: str = ""  # ACL condition (if/unless)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StatsConfig(IRNode):
     """Statistics reporting configuration."""
 
     enable: bool = False  # Enable stats
     uri: str | None = None  # Stats URI path
     realm: str | None = None  # Authentication realm
-    auth: list[str] = field(default_factory=list)  # user:password pairs
+    auth: Sequence[str] = ()  # user:password pairs
     hide_version: bool = False  # Hide HAProxy version
     refresh: str | None = None  # Refresh interval
     show_legends: bool = False  # Show legends
     show_desc: str | None = None  # Description to show
-    admin_rules: list[str] = field(default_factory=list)  # Admin ACL conditions
+    admin_rules: Sequence[str] = ()  # Admin ACL conditions
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GlobalConfig(IRNode):
     """Global configuration section."""
 
@@ -412,11 +457,11 @@ class GlobalConfig(IRNode):
     # SSL/TLS configuration
     ssl_dh_param_file: str | None = None
     ssl_default_bind_ciphers: str | None = None
-    ssl_default_bind_options: list[str] = field(default_factory=list)
+    ssl_default_bind_options: Sequence[str] = ()
     ssl_default_bind_ciphersuites: str | None = None
     ssl_default_server_ciphers: str | None = None
     ssl_default_server_ciphersuites: str | None = None
-    ssl_default_server_options: list[str] = field(default_factory=list)
+    ssl_default_server_options: Sequence[str] = ()
     ssl_server_verify: str | None = None
     ssl_engine: str | None = None
 
@@ -432,18 +477,18 @@ class GlobalConfig(IRNode):
     # Logging configuration
     log_tag: str | None = None
     log_send_hostname: str | None = None
-    log_targets: list[LogTarget] = field(default_factory=list)
+    log_targets: Sequence[LogTarget] = ()
 
     # Environment variables
-    env_vars: dict[str, str] = field(default_factory=dict)  # setenv/presetenv
-    reset_env_vars: list[str] = field(default_factory=list)  # resetenv
-    unset_env_vars: list[str] = field(default_factory=list)  # unsetenv
+    env_vars: Mapping[str, str] = EMPTY_MAPPING  # setenv/presetenv
+    reset_env_vars: Sequence[str] = ()  # resetenv
+    unset_env_vars: Sequence[str] = ()  # unsetenv
 
     # System configuration (Phase 3)
     setcap: str | None = None
     set_dumpable: bool | None = None
     unix_bind: str | None = None
-    cpu_map: dict[str, str] = field(default_factory=dict)  # process/thread -> CPU list
+    cpu_map: Mapping[str, str] = EMPTY_MAPPING  # process/thread -> CPU list
 
     # Performance & Runtime (Phase 4A)
     busy_polling: bool | None = None
@@ -526,18 +571,16 @@ class GlobalConfig(IRNode):
     wurfl_useragent_priority: str | None = None
 
     # Lua scripts
-    lua_scripts: list[LuaScript] = field(default_factory=list)
+    lua_scripts: Sequence[LuaScript] = ()
 
     # Lua global directives (Phase 13 Batch 3)
-    lua_load_files: list[tuple[str, list[str]]] = field(default_factory=list)  # (file, args)
-    lua_load_per_thread_files: list[tuple[str, list[str]]] = field(
-        default_factory=list
-    )  # (file, args)
-    lua_prepend_paths: list[tuple[str, str]] = field(default_factory=list)  # (path, type)
+    lua_load_files: Sequence[tuple[str, list[str]]] = ()  # (file, args)
+    lua_load_per_thread_files: Sequence[tuple[str, list[str]]] = ()  # (file, args)
+    lua_prepend_paths: Sequence[tuple[str, str]] = ()  # (path, type)
 
     # Stats
     stats: StatsConfig | None = None
-    stats_sockets: list[StatsSocket] = field(default_factory=list)
+    stats_sockets: Sequence[StatsSocket] = ()
 
     # Phase 14 - Remaining Global Directives (30 directives)
     # Security & Process Management
@@ -585,13 +628,13 @@ class GlobalConfig(IRNode):
     fiftyone_degrees_use_predictive_graph: bool | None = None
 
     # Variables
-    set_vars: dict[str, str] = field(default_factory=dict)  # var_name -> value
+    set_vars: Mapping[str, str] = EMPTY_MAPPING  # var_name -> value
 
     # Performance tuning (tune.* directives stored here)
-    tuning: dict[str, Any] = field(default_factory=dict)
+    tuning: Mapping[str, Any] = EMPTY_MAPPING
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DefaultsConfig(IRNode):
     """Defaults section."""
 
@@ -611,11 +654,12 @@ class DefaultsConfig(IRNode):
     log: str | None = "global"
     error_log_format: str | None = None  # Custom error log format string
     log_steps: str | None = None  # Logging steps (accept, connect, request, response, close, all)
-    options: list[str] = field(default_factory=list)
-    errorfiles: dict[int, str] = field(default_factory=dict)
-    errorloc: dict[int, str] = field(default_factory=dict)  # 302 redirect
-    errorloc302: dict[int, str] = field(default_factory=dict)  # explicit 302
-    errorloc303: dict[int, str] = field(default_factory=dict)  # 303 redirect
+    options: Sequence[str] = ()
+    http_reuse: str | None = None  # Connection reuse mode: never, safe, aggressive, always
+    errorfiles: Mapping[int, str] = EMPTY_MAPPING
+    errorloc: Mapping[int, str] = EMPTY_MAPPING  # 302 redirect
+    errorloc302: Mapping[int, str] = EMPTY_MAPPING  # explicit 302
+    errorloc303: Mapping[int, str] = EMPTY_MAPPING  # 303 redirect
     http_check: HealthCheck | None = None
     email_alert: EmailAlert | None = None  # Email alert configuration
     rate_limit_sessions: int | None = None  # Max new sessions per second (Phase 5B)
@@ -627,19 +671,17 @@ class DefaultsConfig(IRNode):
     srvtcpka_idle: str | None = None  # Time before sending server keepalive probes
     srvtcpka_intvl: str | None = None  # Interval between server keepalive probes
     persist_rdp_cookie: str | None = None  # RDP cookie name for persistence (None = default "msts")
-    quic_initial_rules: list[QuicInitialRule] = field(
-        default_factory=list
-    )  # QUIC Initial packet processing rules
+    quic_initial_rules: Sequence[QuicInitialRule] = ()  # QUIC Initial packet processing rules
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ACL(IRNode):
     """ACL definition."""
 
     name: str = ""
     criterion: str = ""  # e.g., "path_beg", "src", "hdr(host)"
-    flags: list[str] = field(default_factory=list)  # e.g., ["-i", "-m", "str"]
-    values: list[str] = field(default_factory=list)
+    flags: Sequence[str] = ()  # e.g., ["-i", "-m", "str"]
+    values: Sequence[str] = ()
 
     def __str__(self) -> str:
         parts = [f"acl {self.name} {self.criterion}"]
@@ -650,13 +692,13 @@ class ACL(IRNode):
         return " ".join(parts)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HttpRequestRule(IRNode):
     """HTTP request rule."""
 
     action: str = ""  # deny, allow, redirect, set-header, lua.xxx, etc.
     condition: str | None = None  # ACL condition
-    parameters: dict[str, Any] = field(default_factory=dict)
+    parameters: Mapping[str, Any] = EMPTY_MAPPING
 
     def __str__(self) -> str:
         parts = [f"http-request {self.action}"]
@@ -670,33 +712,33 @@ class HttpRequestRule(IRNode):
         return " ".join(parts)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HttpResponseRule(IRNode):
     """HTTP response rule."""
 
     action: str = ""
     condition: str | None = None
-    parameters: dict[str, Any] = field(default_factory=dict)
+    parameters: Mapping[str, Any] = EMPTY_MAPPING
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HttpAfterResponseRule(IRNode):
     """HTTP after-response rule (response manipulation after headers received)."""
 
     action: str = ""
     condition: str | None = None
-    parameters: dict[str, Any] = field(default_factory=dict)
+    parameters: Mapping[str, Any] = EMPTY_MAPPING
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Bind(IRNode):
     """Bind directive."""
 
     address: str = ""  # "*:80", "127.0.0.1:8080", etc.
     ssl: bool = False
     ssl_cert: str | None = None
-    alpn: list[str] = field(default_factory=list)
-    options: dict[str, Any] = field(default_factory=dict)
+    alpn: Sequence[str] = ()
+    options: Mapping[str, Any] = EMPTY_MAPPING
 
     def __str__(self) -> str:
         parts = [f"bind {self.address}"]
@@ -714,7 +756,7 @@ class Bind(IRNode):
         return " ".join(parts)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Server(IRNode):
     """Backend server definition."""
 
@@ -730,7 +772,7 @@ class Server(IRNode):
     ssl: bool = False
     ssl_verify: str | None = None
     sni: str | None = None  # Server Name Indication
-    alpn: list[str] = field(default_factory=list)  # ALPN protocols
+    alpn: Sequence[str] = ()  # ALPN protocols
     backup: bool = False
     disabled: bool = False
     send_proxy: bool = False
@@ -747,10 +789,10 @@ class Server(IRNode):
     crt: str | None = None  # Client certificate for mutual TLS
     # Networking options
     source: str | None = None  # Source IP address for outgoing connections
-    options: dict[str, Any] = field(default_factory=dict)
+    options: Mapping[str, Any] = EMPTY_MAPPING
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DefaultServer(IRNode):
     """Default server configuration applied to all servers in a backend."""
 
@@ -763,7 +805,7 @@ class DefaultServer(IRNode):
     ssl: bool = False
     ssl_verify: str | None = None
     sni: str | None = None
-    alpn: list[str] = field(default_factory=list)
+    alpn: Sequence[str] = ()
     send_proxy: bool = False
     send_proxy_v2: bool = False
     slowstart: str | None = None  # Warmup time
@@ -776,10 +818,10 @@ class DefaultServer(IRNode):
     crt: str | None = None  # Client certificate for mutual TLS
     # Networking options
     source: str | None = None  # Source IP address for outgoing connections
-    options: dict[str, Any] = field(default_factory=dict)
+    options: Mapping[str, Any] = EMPTY_MAPPING
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ServerTemplate(IRNode):
     """Server template for dynamic generation."""
 
@@ -790,7 +832,7 @@ class ServerTemplate(IRNode):
     base_server: Server | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HealthCheck(IRNode):
     """Health check configuration."""
 
@@ -801,20 +843,20 @@ class HealthCheck(IRNode):
     expect_rstatus: str | None = None  # Regex status pattern
     expect_rstring: str | None = None  # Regex string pattern
     expect_negate: bool = False  # Negate the expectation (!status, !string)
-    headers: dict[str, str] = field(default_factory=dict)
+    headers: Mapping[str, str] = EMPTY_MAPPING
     interval: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CompressionConfig(IRNode):
     """Compression configuration."""
 
     algo: str = "gzip"  # gzip, deflate, raw-deflate
-    types: list[str] = field(default_factory=list)
+    types: Sequence[str] = ()
     offload: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UseBackendRule(IRNode):
     """Use backend rule."""
 
@@ -822,7 +864,7 @@ class UseBackendRule(IRNode):
     condition: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Filter(IRNode):
     """Content filter configuration."""
 
@@ -842,10 +884,10 @@ class Filter(IRNode):
     table: str | None = None
 
     # Generic parameters for extensibility
-    parameters: dict[str, Any] = field(default_factory=dict)
+    parameters: Mapping[str, Any] = EMPTY_MAPPING
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Frontend(IRNode):
     """Frontend section."""
 
@@ -855,21 +897,21 @@ class Frontend(IRNode):
     enabled: bool = True  # Whether this frontend is enabled (inverse of disabled)
     id: int | None = None  # Unique identifier for this frontend
     guid: str | None = None  # Global unique identifier string (max 127 chars)
-    binds: list[Bind] = field(default_factory=list)
+    binds: Sequence[Bind] = ()
     mode: Mode = Mode.HTTP
-    acls: list[ACL] = field(default_factory=list)
-    filters: list[Filter] = field(default_factory=list)
-    http_request_rules: list[HttpRequestRule] = field(default_factory=list)
-    http_response_rules: list[HttpResponseRule] = field(default_factory=list)
-    http_after_response_rules: list[HttpAfterResponseRule] = field(default_factory=list)
-    tcp_request_rules: list[TcpRequestRule] = field(default_factory=list)
-    tcp_response_rules: list[TcpResponseRule] = field(default_factory=list)
-    quic_initial_rules: list[QuicInitialRule] = field(default_factory=list)
-    use_backend_rules: list[UseBackendRule] = field(default_factory=list)
+    acls: Sequence[ACL] = ()
+    filters: Sequence[Filter] = ()
+    http_request_rules: Sequence[HttpRequestRule] = ()
+    http_response_rules: Sequence[HttpResponseRule] = ()
+    http_after_response_rules: Sequence[HttpAfterResponseRule] = ()
+    tcp_request_rules: Sequence[TcpRequestRule] = ()
+    tcp_response_rules: Sequence[TcpResponseRule] = ()
+    quic_initial_rules: Sequence[QuicInitialRule] = ()
+    use_backend_rules: Sequence[UseBackendRule] = ()
     default_backend: str | None = None
-    options: list[str] = field(default_factory=list)
+    options: Sequence[str] = ()
     stick_table: StickTable | None = None
-    stick_rules: list[StickRule] = field(default_factory=list)
+    stick_rules: Sequence[StickRule] = ()
     timeout_client: str | None = None
     timeout_http_request: str | None = None  # HTTP request timeout
     timeout_http_keep_alive: str | None = None  # Keep-alive timeout
@@ -881,11 +923,9 @@ class Frontend(IRNode):
     max_keep_alive_queue: int | None = None  # Maximum idle connections in keep-alive queue
     rate_limit_sessions: int | None = None  # Max new sessions per second (Phase 5B)
     monitor_uri: str | None = None  # Monitor URI for health checks
-    monitor_net: list[str] = field(default_factory=list)  # Network sources for monitoring requests
-    monitor_fail_rules: list[MonitorFailRule] = field(
-        default_factory=list
-    )  # Conditional monitoring failures
-    log: list[str] = field(default_factory=list)  # Log targets (global or specific)
+    monitor_net: Sequence[str] = ()  # Network sources for monitoring requests
+    monitor_fail_rules: Sequence[MonitorFailRule] = ()  # Conditional monitoring failures
+    log: Sequence[str] = ()  # Log targets (global or specific)
     log_tag: str | None = None  # Tag for log messages
     log_format: str | None = None  # Custom log format string
     error_log_format: str | None = None  # Custom error log format string
@@ -894,33 +934,25 @@ class Frontend(IRNode):
     unique_id_format: str | None = None  # Format string for unique request IDs
     unique_id_header: str | None = None  # HTTP header name for unique request ID
     stats_config: StatsConfig | None = None  # Statistics reporting configuration
-    capture_request_headers: list[tuple[str, int]] = field(
-        default_factory=list
-    )  # [(header_name, length), ...]
-    capture_response_headers: list[tuple[str, int]] = field(
-        default_factory=list
-    )  # [(header_name, length), ...]
-    redirect_rules: list[RedirectRule] = field(default_factory=list)  # HTTP redirect rules
-    error_files: list[ErrorFile] = field(default_factory=list)  # Custom error page files
-    errorloc: dict[int, str] = field(default_factory=dict)  # 302 redirect for error codes
-    errorloc302: dict[int, str] = field(default_factory=dict)  # Explicit 302 redirect
-    errorloc303: dict[int, str] = field(default_factory=dict)  # 303 See Other redirect
-    http_errors: list[HttpError] = field(default_factory=list)  # Custom HTTP error responses
+    capture_request_headers: Sequence[tuple[str, int]] = ()  # [(header_name, length), ...]
+    capture_response_headers: Sequence[tuple[str, int]] = ()  # [(header_name, length), ...]
+    redirect_rules: Sequence[RedirectRule] = ()  # HTTP redirect rules
+    error_files: Sequence[ErrorFile] = ()  # Custom error page files
+    errorloc: Mapping[int, str] = EMPTY_MAPPING  # 302 redirect for error codes
+    errorloc302: Mapping[int, str] = EMPTY_MAPPING  # Explicit 302 redirect
+    errorloc303: Mapping[int, str] = EMPTY_MAPPING  # 303 See Other redirect
+    http_errors: Sequence[HttpError] = ()  # Custom HTTP error responses
     email_alert: EmailAlert | None = None  # Email alert configuration
-    declare_captures: list[DeclareCapture] = field(default_factory=list)  # Declare capture slots
-    force_persist_rules: list[ForcePersistRule] = field(
-        default_factory=list
-    )  # Force persistence rules
-    ignore_persist_rules: list[IgnorePersistRule] = field(
-        default_factory=list
-    )  # Ignore persistence rules
+    declare_captures: Sequence[DeclareCapture] = ()  # Declare capture slots
+    force_persist_rules: Sequence[ForcePersistRule] = ()  # Force persistence rules
+    ignore_persist_rules: Sequence[IgnorePersistRule] = ()  # Ignore persistence rules
     # TCP keepalive (Phase 5B)
     clitcpka_cnt: int | None = None  # Max keepalive probes before dropping connection
     clitcpka_idle: str | None = None  # Time before sending keepalive probes
     clitcpka_intvl: str | None = None  # Interval between keepalive probes
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Backend(IRNode):
     """Backend section."""
 
@@ -932,27 +964,27 @@ class Backend(IRNode):
     guid: str | None = None  # Global unique identifier string (max 127 chars)
     mode: Mode = Mode.HTTP
     balance: BalanceAlgorithm = BalanceAlgorithm.ROUNDROBIN
-    servers: list[Server] = field(default_factory=list)
-    server_templates: list[ServerTemplate] = field(default_factory=list)
+    servers: Sequence[Server] = ()
+    server_templates: Sequence[ServerTemplate] = ()
     default_server: DefaultServer | None = None  # Default server options
     health_check: HealthCheck | None = None
-    acls: list[ACL] = field(default_factory=list)
-    filters: list[Filter] = field(default_factory=list)
-    options: list[str] = field(default_factory=list)
-    http_request_rules: list[HttpRequestRule] = field(default_factory=list)
-    http_response_rules: list[HttpResponseRule] = field(default_factory=list)
-    http_after_response_rules: list[HttpAfterResponseRule] = field(default_factory=list)
-    tcp_request_rules: list[TcpRequestRule] = field(default_factory=list)
-    log: list[str] = field(default_factory=list)  # Log targets (global or specific)
+    acls: Sequence[ACL] = ()
+    filters: Sequence[Filter] = ()
+    options: Sequence[str] = ()
+    http_request_rules: Sequence[HttpRequestRule] = ()
+    http_response_rules: Sequence[HttpResponseRule] = ()
+    http_after_response_rules: Sequence[HttpAfterResponseRule] = ()
+    tcp_request_rules: Sequence[TcpRequestRule] = ()
+    log: Sequence[str] = ()  # Log targets (global or specific)
     log_tag: str | None = None  # Tag for log messages
     log_format: str | None = None  # Custom log format string
     error_log_format: str | None = None  # Custom error log format string
     log_format_sd: str | None = None  # Structured data log format (RFC 5424)
-    tcp_response_rules: list[TcpResponseRule] = field(default_factory=list)
+    tcp_response_rules: Sequence[TcpResponseRule] = ()
     compression: CompressionConfig | None = None
     cookie: str | None = None
     stick_table: StickTable | None = None
-    stick_rules: list[StickRule] = field(default_factory=list)
+    stick_rules: Sequence[StickRule] = ()
     timeout_server: str | None = None
     timeout_connect: str | None = None
     timeout_check: str | None = None
@@ -963,12 +995,12 @@ class Backend(IRNode):
     backlog: int | None = None  # Socket listen backlog size
     max_keep_alive_queue: int | None = None  # Maximum idle connections in keep-alive queue
     max_session_srv_conns: int | None = None  # Maximum connections per session to server
-    redirect_rules: list[RedirectRule] = field(default_factory=list)  # HTTP redirect rules
-    error_files: list[ErrorFile] = field(default_factory=list)  # Custom error page files
-    errorloc: dict[int, str] = field(default_factory=dict)  # 302 redirect for error codes
-    errorloc302: dict[int, str] = field(default_factory=dict)  # Explicit 302 redirect
-    errorloc303: dict[int, str] = field(default_factory=dict)  # 303 See Other redirect
-    http_errors: list[HttpError] = field(default_factory=list)  # Custom HTTP error responses
+    redirect_rules: Sequence[RedirectRule] = ()  # HTTP redirect rules
+    error_files: Sequence[ErrorFile] = ()  # Custom error page files
+    errorloc: Mapping[int, str] = EMPTY_MAPPING  # 302 redirect for error codes
+    errorloc302: Mapping[int, str] = EMPTY_MAPPING  # Explicit 302 redirect
+    errorloc303: Mapping[int, str] = EMPTY_MAPPING  # 303 See Other redirect
+    http_errors: Sequence[HttpError] = ()  # Custom HTTP error responses
     errorfiles: str | None = None  # Directory containing custom error files
     dispatch: str | None = (
         None  # Simple dispatch target (IP:port) for load balancing without backend
@@ -977,13 +1009,9 @@ class Backend(IRNode):
     http_reuse: str | None = None  # Connection reuse mode: never, safe, aggressive, always
     http_send_name_header: str | None = None  # HTTP header name to send backend/server name
     retry_on: str | None = None  # Retry conditions (comma-separated keywords)
-    http_check_rules: list[HttpCheckRule] = field(
-        default_factory=list
-    )  # Advanced HTTP health checks
-    tcp_check_rules: list[TcpCheckRule] = field(default_factory=list)  # Advanced TCP health checks
-    use_server_rules: list[UseServerRule] = field(
-        default_factory=list
-    )  # Conditional server selection
+    http_check_rules: Sequence[HttpCheckRule] = ()  # Advanced HTTP health checks
+    tcp_check_rules: Sequence[TcpCheckRule] = ()  # Advanced TCP health checks
+    use_server_rules: Sequence[UseServerRule] = ()  # Conditional server selection
     external_check_command: str | None = None  # External health check command to execute
     external_check_path: str | None = None  # PATH environment variable for external check command
     source: str | None = None  # Source IP/port for backend connections
@@ -999,13 +1027,9 @@ class Backend(IRNode):
         None  # Server state file name (use-backend-name or file path)
     )
     email_alert: EmailAlert | None = None  # Email alert configuration
-    declare_captures: list[DeclareCapture] = field(default_factory=list)  # Declare capture slots
-    force_persist_rules: list[ForcePersistRule] = field(
-        default_factory=list
-    )  # Force persistence rules
-    ignore_persist_rules: list[IgnorePersistRule] = field(
-        default_factory=list
-    )  # Ignore persistence rules
+    declare_captures: Sequence[DeclareCapture] = ()  # Declare capture slots
+    force_persist_rules: Sequence[ForcePersistRule] = ()  # Force persistence rules
+    ignore_persist_rules: Sequence[IgnorePersistRule] = ()  # Ignore persistence rules
     # TCP keepalive (Phase 5B)
     srvtcpka_cnt: int | None = None  # Max keepalive probes before dropping connection
     srvtcpka_idle: str | None = None  # Time before sending keepalive probes
@@ -1013,7 +1037,7 @@ class Backend(IRNode):
     persist_rdp_cookie: str | None = None  # RDP cookie name for persistence (None = default "msts")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Listen(IRNode):
     """Listen section (combined frontend/backend)."""
 
@@ -1023,24 +1047,24 @@ class Listen(IRNode):
     enabled: bool = True  # Whether this listen is enabled (inverse of disabled)
     id: int | None = None  # Unique identifier for this listen
     guid: str | None = None  # Global unique identifier string (max 127 chars)
-    binds: list[Bind] = field(default_factory=list)
+    binds: Sequence[Bind] = ()
     mode: Mode = Mode.HTTP
     balance: BalanceAlgorithm = BalanceAlgorithm.ROUNDROBIN
-    servers: list[Server] = field(default_factory=list)
-    acls: list[ACL] = field(default_factory=list)
-    filters: list[Filter] = field(default_factory=list)
-    http_request_rules: list[HttpRequestRule] = field(default_factory=list)
-    http_response_rules: list[HttpResponseRule] = field(default_factory=list)
-    http_after_response_rules: list[HttpAfterResponseRule] = field(default_factory=list)
-    tcp_request_rules: list[TcpRequestRule] = field(default_factory=list)
-    tcp_response_rules: list[TcpResponseRule] = field(default_factory=list)
-    quic_initial_rules: list[QuicInitialRule] = field(default_factory=list)
-    options: list[str] = field(default_factory=list)
+    servers: Sequence[Server] = ()
+    acls: Sequence[ACL] = ()
+    filters: Sequence[Filter] = ()
+    http_request_rules: Sequence[HttpRequestRule] = ()
+    http_response_rules: Sequence[HttpResponseRule] = ()
+    http_after_response_rules: Sequence[HttpAfterResponseRule] = ()
+    tcp_request_rules: Sequence[TcpRequestRule] = ()
+    tcp_response_rules: Sequence[TcpResponseRule] = ()
+    quic_initial_rules: Sequence[QuicInitialRule] = ()
+    options: Sequence[str] = ()
     stick_table: StickTable | None = None
-    stick_rules: list[StickRule] = field(default_factory=list)
-    redirect_rules: list[RedirectRule] = field(default_factory=list)  # HTTP redirect rules
-    error_files: list[ErrorFile] = field(default_factory=list)  # Custom error page files
-    http_errors: list[HttpError] = field(default_factory=list)  # Custom HTTP error responses
+    stick_rules: Sequence[StickRule] = ()
+    redirect_rules: Sequence[RedirectRule] = ()  # HTTP redirect rules
+    error_files: Sequence[ErrorFile] = ()  # Custom error page files
+    http_errors: Sequence[HttpError] = ()  # Custom HTTP error responses
     health_check: HealthCheck | None = None
     timeout_client: str | None = None
     timeout_server: str | None = None
@@ -1059,13 +1083,9 @@ class Listen(IRNode):
     log_format_sd: str | None = None  # Structured data log format (RFC 5424)
     log_steps: str | None = None  # Logging steps (accept, connect, request, response, close, all)
     email_alert: EmailAlert | None = None  # Email alert configuration
-    declare_captures: list[DeclareCapture] = field(default_factory=list)  # Declare capture slots
-    force_persist_rules: list[ForcePersistRule] = field(
-        default_factory=list
-    )  # Force persistence rules
-    ignore_persist_rules: list[IgnorePersistRule] = field(
-        default_factory=list
-    )  # Ignore persistence rules
+    declare_captures: Sequence[DeclareCapture] = ()  # Declare capture slots
+    force_persist_rules: Sequence[ForcePersistRule] = ()  # Force persistence rules
+    ignore_persist_rules: Sequence[IgnorePersistRule] = ()  # Ignore persistence rules
     # TCP keepalive (Phase 5B) - both client and server side
     clitcpka_cnt: int | None = None  # Max keepalive probes before dropping client connection
     clitcpka_idle: str | None = None  # Time before sending client keepalive probes
@@ -1078,7 +1098,7 @@ class Listen(IRNode):
 
 
 # DSL-specific IR nodes (for advanced features)
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Variable(IRNode):
     """Variable definition (let x = ...)."""
 
@@ -1087,25 +1107,25 @@ class Variable(IRNode):
     type_hint: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Template(IRNode):
     """Template definition for reuse."""
 
     name: str = ""
-    parameters: dict[str, Any] = field(default_factory=dict)
+    parameters: Mapping[str, Any] = EMPTY_MAPPING
     applies_to: str = ""  # "server", "backend", "frontend", etc.
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FunctionCall(IRNode):
     """Function call (for DSL functions)."""
 
     function_name: str = ""
-    arguments: list[Any] = field(default_factory=list)
-    keyword_arguments: dict[str, Any] = field(default_factory=dict)
+    arguments: Sequence[Any] = ()
+    keyword_arguments: Mapping[str, Any] = EMPTY_MAPPING
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IfBlock(IRNode):
     """Conditional block (if/else)."""
 
@@ -1114,17 +1134,17 @@ class IfBlock(IRNode):
     else_config: ConfigIR | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ForLoop(IRNode):
     """For loop for generating config."""
 
     variable: str = ""
     iterable: Any = None  # range, list, etc.
-    body: list[Any] = field(default_factory=list)  # List of config items to generate
+    body: Sequence[Any] = ()  # List of config items to generate
 
 
 # Top-level configuration
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ConfigIR(IRNode):
     """Complete HAProxy configuration in IR form."""
 
@@ -1132,17 +1152,33 @@ class ConfigIR(IRNode):
     name: str = "haproxy_config"
     global_config: GlobalConfig | None = None
     defaults: DefaultsConfig | None = None
-    frontends: list[Frontend] = field(default_factory=list)
-    backends: list[Backend] = field(default_factory=list)
-    listens: list[Listen] = field(default_factory=list)
-    lua_scripts: list[LuaScript] = field(default_factory=list)
+    frontends: Sequence[Frontend] = ()
+    backends: Sequence[Backend] = ()
+    listens: Sequence[Listen] = ()
+    lua_scripts: Sequence[LuaScript] = ()
 
     # Additional top-level sections
-    peers: list[PeersSection] = field(default_factory=list)
-    resolvers: list[ResolversSection] = field(default_factory=list)
-    mailers: list[MailersSection] = field(default_factory=list)
+    peers: Sequence[PeersSection] = ()
+    resolvers: Sequence[ResolversSection] = ()
+    mailers: Sequence[MailersSection] = ()
 
     # DSL-specific features
-    variables: dict[str, Variable] = field(default_factory=dict)
-    templates: dict[str, Template] = field(default_factory=dict)
-    imports: list[str] = field(default_factory=list)
+    variables: Mapping[str, Variable] = EMPTY_MAPPING
+    templates: Mapping[str, Template] = EMPTY_MAPPING
+    imports: Sequence[str] = ()
+
+    # Section key ("backend api") -> content fingerprint, filled in after
+    # validation (see fingerprint.py)
+    fingerprints: Mapping[str, str] = EMPTY_MAPPING
+
+    def changed_sections(self, previous: ConfigIR) -> list[str]:
+        """Return keys of sections added, changed or removed since ``previous``.
+
+        Compares fingerprints only, so both configurations must have them;
+        ``DSLParser.parse`` fills them in. Keys come in this configuration's
+        section order, followed by those of removed sections.
+        """
+        old = previous.fingerprints
+        changed = [key for key, value in self.fingerprints.items() if old.get(key) != value]
+        changed.extend(key for key in old if key not in self.fingerprints)
+        return changed
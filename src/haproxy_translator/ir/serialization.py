@@ -0,0 +1,326 @@
+"""Compact binary serialization of ConfigIR.
+
+Lets one process parse a configuration and others generate output from it
+without parsing again: ``haconf --emit-ir out.ir`` writes the validated IR
+and ``haconf --from-ir out.ir`` reads it back.
+
+A file starts with a header:
+
+- the magic bytes ``HAPIR``
+- FORMAT_VERSION, as a big-endian unsigned short
+- SCHEMA_HASH, 16 bytes derived from the node classes, their fields and
+  the enum members in ``nodes.py``
+
+Files written with another version or schema are rejected rather than
+misread. The body is one tagged value, the ConfigIR, encoded depth first:
+
+- integers are zigzag varints, floats 8-byte doubles
+- a string is written once; later occurrences refer to it by index
+- a node is its type index followed by its field values in declaration
+  order; a node reached again (shared through interning or copy-on-write)
+  is written as a back-reference, so sharing survives the round trip
+- lists and tuples, dicts and FrozenMappings, and ServerColumns keep their
+  type; lark Trees (``let`` expressions the transformer leaves unevaluated)
+  are kept too, lark Tokens become plain strings
+"""
+
+import hashlib
+import struct
+from dataclasses import fields
+from enum import Enum
+from typing import TYPE_CHECKING, Any, cast
+
+from lark import Tree
+
+from ..utils.errors import SerializationError, SourceLocation
+from . import nodes
+from .columns import ServerColumns
+from .nodes import EMPTY_MAPPING, ConfigIR, FrozenMapping, IRNode
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+MAGIC = b"HAPIR"
+# Bump when the encoding changes
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct(">5sH16s")
+_DOUBLE = struct.Struct(">d")
+
+# Value tags
+_NONE = 0
+_TRUE = 1
+_FALSE = 2
+_INT = 3
+_FLOAT = 4
+_STR = 5
+_STR_REF = 6
+_LIST = 7
+_TUPLE = 8
+_DICT = 9
+_FROZEN_MAPPING = 10
+_EMPTY_MAPPING = 11
+_ENUM = 12
+_NODE = 13
+_NODE_REF = 14
+_LOCATION = 15
+_SERVER_COLUMNS = 16
+_TREE = 17
+
+_NODE_TYPES: tuple[type[IRNode], ...] = tuple(
+    sorted(
+        (
+            cls
+            for cls in vars(nodes).values()
+            if isinstance(cls, type) and issubclass(cls, IRNode) and cls is not IRNode
+        ),
+        key=lambda cls: cls.__name__,
+    )
+)
+_NODE_INDEX = {cls: index for index, cls in enumerate(_NODE_TYPES)}
+
+_ENUM_MEMBERS: tuple[Enum, ...] = tuple(
+    member
+    for cls in sorted(
+        (cls for cls in vars(nodes).values() if isinstance(cls, type) and issubclass(cls, Enum)),
+        key=lambda cls: cls.__name__,
+    )
+    for member in cls
+)
+_ENUM_INDEX = {member: index for index, member in enumerate(_ENUM_MEMBERS)}
+
+
+def _schema_hash() -> bytes:
+    hasher = hashlib.blake2b(digest_size=16)
+    for cls in _NODE_TYPES:
+        hasher.update(f"{cls.__name__}({','.join(f.name for f in fields(cls))});".encode())
+    for member in _ENUM_MEMBERS:
+        hasher.update(f"{type(member).__name__}.{member.name}={member.value!r};".encode())
+    return hasher.digest()
+
+
+SCHEMA_HASH = _schema_hash()
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.out = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, SCHEMA_HASH))
+        self.strings: dict[str, int] = {}
+        # id -> index of nodes written so far; they stay alive in the tree
+        self.nodes: dict[int, int] = {}
+
+    def varint(self, value: int) -> None:
+        out = self.out
+        while value > 0x7F:
+            out.append(value & 0x7F | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def value(self, value: Any) -> None:  # noqa: PLR0912
+        out = self.out
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, str):
+            self.string(value)
+        elif isinstance(value, int):
+            out.append(_INT)
+            self.varint(value << 1 if value >= 0 else (-value << 1) - 1)
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, IRNode):
+            self.node(value)
+        elif isinstance(value, Enum):
+            out.append(_ENUM)
+            self.varint(self.index(_ENUM_INDEX, value))
+        elif isinstance(value, (list, tuple)):
+            out.append(_LIST if isinstance(value, list) else _TUPLE)
+            self.varint(len(value))
+            for item in value:
+                self.value(item)
+        elif value is EMPTY_MAPPING:
+            out.append(_EMPTY_MAPPING)
+        elif isinstance(value, (dict, FrozenMapping)):
+            out.append(_DICT if isinstance(value, dict) else _FROZEN_MAPPING)
+            self.varint(len(value))
+            for key, item in value.items():
+                self.value(key)
+                self.value(item)
+        elif isinstance(value, SourceLocation):
+            out.append(_LOCATION)
+            self.value(value.filepath)
+            self.value(value.line)
+            self.value(value.column)
+            self.value(value.length)
+        elif isinstance(value, ServerColumns):
+            out.append(_SERVER_COLUMNS)
+            self.varint(len(value))
+            self.node(value.shared)
+            self.value(value.dense)
+            self.value(value.sparse)
+        elif isinstance(value, Tree):
+            out.append(_TREE)
+            self.value(str(value.data))
+            self.value(value.children)
+        else:
+            raise SerializationError(f"Cannot serialize value of type {type(value).__name__}")
+
+    def string(self, value: str) -> None:
+        index = self.strings.get(value)
+        if index is not None:
+            self.out.append(_STR_REF)
+            self.varint(index)
+            return
+        self.strings[value] = len(self.strings)
+        data = value.encode("utf-8", "surrogatepass")
+        self.out.append(_STR)
+        self.varint(len(data))
+        self.out += data
+
+    def node(self, node: IRNode) -> None:
+        index = self.nodes.get(id(node))
+        if index is not None:
+            self.out.append(_NODE_REF)
+            self.varint(index)
+            return
+        self.out.append(_NODE)
+        self.varint(self.index(_NODE_INDEX, type(node)))
+        for name in node.__dataclass_fields__:
+            self.value(getattr(node, name))
+        # Indexed once complete, as the reader only has it then
+        self.nodes[id(node)] = len(self.nodes)
+
+    @staticmethod
+    def index(table: dict[Any, int], key: Any) -> int:
+        try:
+            return table[key]
+        except KeyError:
+            raise SerializationError(f"Cannot serialize {key!r}: not defined in ir.nodes") from None
+
+
+class _Reader:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.pos = _HEADER.size
+        self.strings: list[str] = []
+        self.nodes: list[IRNode] = []
+        self.readers: dict[int, Callable[[], Any]] = {
+            _NONE: lambda: None,
+            _TRUE: lambda: True,
+            _FALSE: lambda: False,
+            _INT: self.int,
+            _FLOAT: self.float,
+            _STR: self.string,
+            _STR_REF: lambda: self.strings[self.varint()],
+            _LIST: lambda: [self.value() for _ in range(self.varint())],
+            _TUPLE: lambda: tuple([self.value() for _ in range(self.varint())]),
+            _DICT: self.dict,
+            _FROZEN_MAPPING: lambda: FrozenMapping(self.dict()),
+            _EMPTY_MAPPING: lambda: EMPTY_MAPPING,
+            _ENUM: lambda: _ENUM_MEMBERS[self.varint()],
+            _NODE: self.node,
+            _NODE_REF: lambda: self.nodes[self.varint()],
+            _LOCATION: lambda: SourceLocation(
+                self.value(), self.value(), self.value(), self.value()
+            ),
+            _SERVER_COLUMNS: lambda: ServerColumns(
+                self.varint(), self.value(), self.value(), self.value()
+            ),
+            _TREE: lambda: Tree(self.value(), self.value()),
+        }
+
+    def varint(self) -> int:
+        data, pos = self.data, self.pos
+        result = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.pos = pos
+                return result
+            shift += 7
+
+    def value(self) -> Any:
+        tag = self.data[self.pos]
+        self.pos += 1
+        return self.readers[tag]()
+
+    def int(self) -> int:
+        value = self.varint()
+        return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+    def float(self) -> float:
+        (value,) = _DOUBLE.unpack_from(self.data, self.pos)
+        self.pos += _DOUBLE.size
+        return cast("float", value)
+
+    def string(self) -> str:
+        length = self.varint()
+        value = self.data[self.pos : self.pos + length].decode("utf-8", "surrogatepass")
+        self.pos += length
+        self.strings.append(value)
+        return value
+
+    def dict(self) -> dict[Any, Any]:
+        return {self.value(): self.value() for _ in range(self.varint())}
+
+    def node(self) -> IRNode:
+        cls = _NODE_TYPES[self.varint()]
+        node = cls(*[self.value() for _ in cls.__dataclass_fields__])
+        self.nodes.append(node)
+        return node
+
+
+def dumps(ir: ConfigIR) -> bytes:
+    """Serialize ``ir`` to bytes."""
+    writer = _Writer()
+    writer.node(ir)
+    return bytes(writer.out)
+
+
+def loads(data: bytes) -> ConfigIR:
+    """Deserialize a ConfigIR written by ``dumps``.
+
+    Raises:
+        SerializationError: If data is not serialized IR, or was written
+            by a version with a different format or IR schema.
+    """
+    if len(data) < _HEADER.size:
+        raise SerializationError("Not a serialized IR file")
+    magic, version, schema = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SerializationError("Not a serialized IR file")
+    if version != FORMAT_VERSION:
+        raise SerializationError(
+            f"Unsupported serialized IR format version {version} (expected {FORMAT_VERSION})"
+        )
+    if schema != SCHEMA_HASH:
+        raise SerializationError(
+            "Serialized IR was written by a translator with a different IR schema"
+        )
+    reader = _Reader(data)
+    try:
+        ir = reader.value()
+    except (IndexError, KeyError, TypeError, UnicodeDecodeError, struct.error) as e:
+        raise SerializationError(f"Corrupt serialized IR: {e}") from e
+    if reader.pos != len(data):
+        raise SerializationError("Corrupt serialized IR: length mismatch")
+    if not isinstance(ir, ConfigIR):
+        raise SerializationError("Serialized IR does not hold a configuration")
+    return ir
+
+
+def dump(ir: ConfigIR, path: Path) -> None:
+    """Serialize ``ir`` to the file at ``path``."""
+    path.write_bytes(dumps(ir))
+
+
+def load(path: Path) -> ConfigIR:
+    """Read a ConfigIR serialized to the file at ``path``."""
+    return loads(path.read_bytes())
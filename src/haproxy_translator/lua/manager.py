@@ -5,6 +5,7 @@ import hashlib
 from pathlib import Path
 
 from ..ir.nodes import ConfigIR, LuaScript
+from ..utils.files import write_text_if_changed
 
 
 class LuaManager:
@@ -13,6 +14,10 @@ class LuaManager:
     def __init__(self, output_dir: Path):
         self.output_dir = Path(output_dir) / "lua"
         self.script_map: dict[str, Path] = {}
+        # Contents of the Lua files written by this manager
+        self.generated_files: dict[Path, str] = {}
+        # Whether any of them differed from the file already on disk
+        self.files_changed = False
 
     def extract_lua_scripts(self, ir: ConfigIR) -> ConfigIR:
         """
@@ -25,7 +30,7 @@ class LuaManager:
             Updated IR with file references instead of inline scripts
         """
         # Collect lua scripts from both top-level and global config
-        all_lua_scripts = []
+        all_lua_scripts: list[LuaScript] = []
 
         # Get scripts from top-level lua_scripts
         if ir.lua_scripts:
@@ -92,8 +97,10 @@ class LuaManager:
         header = f"-- Generated Lua script: {script.name or 'unnamed'}\n"
         header += "-- Auto-generated by HAProxy Config Translator\n\n"
 
-        # Write Lua file
-        filepath.write_text(header + content, encoding="utf-8")
+        # Write Lua file, leaving an up-to-date one alone
+        if write_text_if_changed(filepath, header + content):
+            self.files_changed = True
+        self.generated_files[filepath] = header + content
 
         return filepath
 
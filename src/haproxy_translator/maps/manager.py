@@ -0,0 +1,271 @@
+"""Map file generation for frontends that route on a key.
+
+A frontend routing on the Host header or the path often has one
+``use_backend`` rule per backend, each gated by an ACL of its own::
+
+    acl is_shop hdr(host) -i shop.example.com
+    acl is_blog hdr(host) -i blog.example.com
+    use_backend shop if is_shop
+    use_backend blog if is_blog
+
+HAProxy tries these rules one by one for every request. ``MapManager``
+replaces runs of such rules with a single rule looking the backend up in a
+generated map file, which HAProxy indexes in a tree for exact and prefix
+matches::
+
+    use_backend %[req.hdr(host),lower,map(maps/web_host.map)]
+
+Routing stays the same:
+
+- Only rules whose condition is a single ACL are converted, and only ACLs
+  defined once, matching a plain host or path criterion with no flags but
+  ``-i`` and ``-m``. Each ACL value becomes a map key.
+- ``-i`` ACLs look up the lowercased key; the others keep its case.
+- Of rules with the same key, the first wins, as it did before.
+- A prefix map returns the longest matching prefix, where the rules took
+  the first one. Prefix runs in which a shorter prefix comes before a
+  longer one are left alone.
+- A lookup that finds no backend makes HAProxy skip the remaining rules
+  and use ``default_backend``. A map rule followed by other rules is
+  therefore only applied when its key is found.
+
+ACLs left unused by the conversion are dropped.
+"""
+
+import dataclasses
+import re
+from collections import Counter
+from collections.abc import Mapping
+from itertools import groupby
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from ..ir.nodes import ACL, ConfigIR, Frontend, UseBackendRule
+from ..transformers.sharing import map_changed, replace_changed
+from ..utils.files import write_text_if_changed
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+# Fewest rules worth replacing with a map lookup
+MIN_MAP_RULES = 4
+
+# Criteria a routing ACL can match on: sample fetch and default match method
+_CRITERIA = {
+    "hdr(host)": ("req.hdr(host)", "str"),
+    "req.hdr(host)": ("req.hdr(host)", "str"),
+    "hdr_beg(host)": ("req.hdr(host)", "beg"),
+    "hdr_end(host)": ("req.hdr(host)", "end"),
+    "hdr_dom(host)": ("req.hdr(host)", "dom"),
+    "path": ("path", "str"),
+    "path_beg": ("path", "beg"),
+    "path_end": ("path", "end"),
+}
+
+# Match methods with a map converter of their own; map() matches exactly
+_CONVERTERS = {"str": "map", "beg": "map_beg", "end": "map_end", "dom": "map_dom"}
+
+# Names used in map file names for the sample fetches
+_FETCH_LABELS = {"req.hdr(host)": "host", "path": "path"}
+
+# ACL names, and map keys that need no quoting in a map file
+_PLAIN_TOKEN = re.compile(r"[^\s\"'\\#]\S*")
+_CONDITION_TOKENS = re.compile(r"[^\s!{}()|]+")
+
+
+class _Lookup(NamedTuple):
+    """How rules look up their backend: rules sharing one can share a map."""
+
+    fetch: str
+    method: str
+    lower: bool
+
+    def expression(self, path: Path) -> str:
+        """Return the sample expression looking the backend up in ``path``."""
+        converters = ",lower" if self.lower else ""
+        return f"{self.fetch}{converters},{_CONVERTERS[self.method]}({path})"
+
+
+class MapManager:
+    """Manage map file generation for key-based routing."""
+
+    def __init__(self, output_dir: Path, min_rules: int = MIN_MAP_RULES):
+        self.output_dir = Path(output_dir) / "maps"
+        self.min_rules = min_rules
+        # Map files written for each frontend
+        self.map_paths: dict[str, list[Path]] = {}
+        # Contents of the map files written by this manager
+        self.generated_files: dict[Path, str] = {}
+        # Whether any of them differed from the file already on disk
+        self.files_changed = False
+
+    def extract_routing_maps(self, ir: ConfigIR) -> ConfigIR:
+        """
+        Replace key-based use_backend rules with map file lookups.
+
+        Args:
+            ir: Configuration IR
+
+        Returns:
+            Updated IR, or ``ir`` itself if no frontend routes through a map
+        """
+        return replace_changed(ir, frontends=map_changed(self._extract_frontend, ir.frontends))
+
+    def _extract_frontend(self, frontend: Frontend) -> Frontend:
+        """Replace the runs of key-based rules in one frontend."""
+        rules = frontend.use_backend_rules
+        if len(rules) < self.min_rules:
+            return frontend
+
+        acl_counts = Counter(acl.name for acl in frontend.acls)
+        acls = {acl.name: acl for acl in frontend.acls if acl_counts[acl.name] == 1}
+        lookups = [_rule_lookup(rule, acls) for rule in rules]
+
+        kept_rules: list[UseBackendRule] = []
+        mapped_acls: set[str] = set()
+        start = 0
+        # Runs of consecutive rules sharing a lookup
+        for lookup, group in groupby(lookups, key=_found_lookup):
+            run = list(group)
+            stop = start + len(run)
+            run_rules = rules[start:stop]
+            entries = None
+            if lookup is not None and len(run) >= self.min_rules:
+                entries = _map_entries(
+                    lookup,
+                    [
+                        (found[1], rule.backend)
+                        for found, rule in zip(run, run_rules, strict=True)
+                        # Every rule of a run with a lookup has one
+                        if found is not None
+                    ],
+                )
+            if lookup is None or entries is None:
+                kept_rules.extend(run_rules)
+            else:
+                expression = lookup.expression(self._write_map_file(frontend.name, lookup, entries))
+                # A lookup that misses ends rule evaluation, so guard the
+                # rule when others follow it
+                condition = None if stop == len(rules) else f"{{ {expression} -m found }}"
+                kept_rules.append(UseBackendRule(backend=f"%[{expression}]", condition=condition))
+                mapped_acls.update(str(rule.condition).strip() for rule in run_rules)
+            start = stop
+
+        if not mapped_acls:
+            return frontend
+
+        updated = dataclasses.replace(frontend, use_backend_rules=kept_rules)
+        still_used = _referenced_names(updated, mapped_acls)
+        return dataclasses.replace(
+            updated,
+            acls=[
+                acl
+                for acl in frontend.acls
+                if acl.name not in mapped_acls or acl.name in still_used
+            ],
+        )
+
+    def _write_map_file(self, frontend: str, lookup: _Lookup, entries: dict[str, str]) -> Path:
+        """Write a map file of ``entries`` for a frontend and return its path."""
+        label = _FETCH_LABELS[lookup.fetch]
+        if lookup.method != "str":
+            label += f"_{lookup.method}"
+        stem = f"{self._sanitize_filename(frontend)}_{label}"
+        filepath = self.output_dir / f"{stem}.map"
+        suffix = 1
+        while filepath in self.generated_files:
+            suffix += 1
+            filepath = self.output_dir / f"{stem}_{suffix}.map"
+
+        header = f"# Generated map: frontend {frontend}, {lookup.fetch} -> backend\n"
+        header += "# Auto-generated by HAProxy Config Translator\n"
+        content = header + "".join(f"{key} {backend}\n" for key, backend in entries.items())
+
+        # Write map file, leaving an up-to-date one alone
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if write_text_if_changed(filepath, content):
+            self.files_changed = True
+        self.generated_files[filepath] = content
+        self.map_paths.setdefault(frontend, []).append(filepath)
+        return filepath
+
+    def _sanitize_filename(self, name: str) -> str:
+        """Sanitize name for use as filename."""
+        return re.sub(r"[^a-zA-Z0-9_]", "_", name).lower()
+
+
+def _rule_lookup(
+    rule: UseBackendRule, acls: dict[str, ACL]
+) -> tuple[_Lookup, Sequence[str]] | None:
+    """Return the lookup and keys routing ``rule``, or None if it has to stay a rule."""
+    condition = (rule.condition or "").strip()
+    acl = acls.get(condition)
+    if acl is None or not _PLAIN_TOKEN.fullmatch(rule.backend) or "%[" in rule.backend:
+        return None
+    criterion = _CRITERIA.get(acl.criterion.replace(" ", "").lower())
+    if criterion is None:
+        return None
+    fetch, method = criterion
+
+    # The DSL keeps flags among the values, so read flags from both
+    tokens = [*acl.flags, *acl.values]
+    lower = False
+    while tokens and tokens[0].startswith("-"):
+        flag = tokens.pop(0)
+        if flag == "-i":
+            lower = True
+        elif flag == "-m" and tokens and tokens[0] in _CONVERTERS:
+            method = tokens.pop(0)
+        else:
+            return None
+    if not tokens or not all(_PLAIN_TOKEN.fullmatch(key) for key in tokens):
+        return None
+    return _Lookup(fetch, method, lower), tokens
+
+
+def _found_lookup(found: tuple[_Lookup, Sequence[str]] | None) -> _Lookup | None:
+    """Return the lookup of a ``_rule_lookup`` result, grouping rules into runs."""
+    return found[0] if found is not None else None
+
+
+def _map_entries(lookup: _Lookup, routes: list[tuple[Sequence[str], str]]) -> dict[str, str] | None:
+    """Return the map routing like the ``(keys, backend)`` rules did, or None if no map can."""
+    entries: dict[str, str] = {}
+    for keys, backend in routes:
+        for key in keys:
+            # Rules were tried in order, so the first rule with a key wins
+            entries.setdefault(key.lower() if lookup.lower else key, backend)
+    if lookup.method == "beg":
+        # The longest prefix wins in a map; it must be the first one too
+        order = list(entries)
+        for index, key in enumerate(order):
+            if any(later.startswith(key) for later in order[index + 1 :]):
+                return None
+    return entries
+
+
+def _referenced_names(frontend: Frontend, names: set[str]) -> set[str]:
+    """Return which of ``names`` appear in ``frontend`` outside its ACL definitions."""
+    found: set[str] = set()
+    for field in dataclasses.fields(frontend):
+        if field.name in ("name", "acls", "location", "metadata"):
+            continue
+        for text in _strings(getattr(frontend, field.name)):
+            found.update(names.intersection(_CONDITION_TOKENS.findall(text)))
+    return found
+
+
+def _strings(value: Any) -> Iterator[str]:
+    """Yield the strings held in an IR value, however deeply nested."""
+    if isinstance(value, str):
+        yield value
+    elif dataclasses.is_dataclass(value):
+        for field in dataclasses.fields(value):
+            if field.name not in ("location", "metadata"):
+                yield from _strings(getattr(value, field.name))
+    elif isinstance(value, Mapping):
+        for item in value.items():
+            yield from _strings(item)
+    elif isinstance(value, list | tuple):
+        for item in value:
+            yield from _strings(item)
@@ -0,0 +1,218 @@
+"""Pattern files for ACLs with long value lists.
+
+ACLs listing thousands of values, such as IP allow-lists or bot user
+agents, make the configuration large and slow for HAProxy to parse.
+``PatternManager`` moves the values of such ACLs into pattern files that
+the ACL loads with ``-f``::
+
+    acl allowed src -f patterns/3f2a9c41d07be815.lst
+
+Values are deduplicated first, ignoring case for ``-i`` ACLs, and the
+networks of IP ACLs are merged into the fewest covering ones, so HAProxy
+builds smaller trees. An ACL matches if any of its values does, so neither
+changes what it matches.
+
+Pattern files are named after a digest of their content. ACLs with the
+same values share a file, and a file already on disk under that name holds
+the right content, so it is left alone.
+"""
+
+import hashlib
+import ipaddress
+import re
+import socket
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ..transformers.sharing import map_changed, replace_changed
+from ..utils.files import write_text_if_changed
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from ..ir.nodes import ACL, Backend, ConfigIR, Frontend, Listen
+
+# Fewest values, once deduplicated, worth moving to a pattern file
+MIN_PATTERN_VALUES = 64
+
+# ACL flags, and the ones taking an argument
+_FLAGS = frozenset({"-i", "-n", "-M", "-f", "-m", "-u", "--"})
+_FLAGS_WITH_ARGUMENT = frozenset({"-f", "-m", "-u"})
+
+# Criteria whose values are addresses or networks, unless -m says otherwise
+_IP_CRITERIA = frozenset({"src", "dst", "fc_src", "fc_dst", "bc_src", "bc_dst"})
+
+# Dotted-quad IPv4 address, with an optional prefix length
+_IPV4_OCTET = r"(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+_IPV4_NETWORK = re.compile(rf"((?:{_IPV4_OCTET}\.){{3}}{_IPV4_OCTET})(?:/(3[0-2]|[12]?\d))?")
+
+# Values a pattern file line holds as they are: a file takes each line
+# literally, where the configuration parser would handle quotes and escapes
+_LITERAL_VALUE = re.compile(r"[^\s\"'\\#]\S*")
+
+
+class PatternManager:
+    """Manage pattern file generation for long ACL value lists."""
+
+    def __init__(self, output_dir: Path, min_values: int = MIN_PATTERN_VALUES):
+        self.output_dir = Path(output_dir) / "patterns"
+        self.min_values = min_values
+        # Contents of the pattern files written by this manager
+        self.generated_files: dict[Path, str] = {}
+        # Whether any of them differed from the file already on disk
+        self.files_changed = False
+
+    def extract_acl_patterns(self, ir: ConfigIR) -> ConfigIR:
+        """
+        Deduplicate ACL values and move long value lists to pattern files.
+
+        Args:
+            ir: Configuration IR
+
+        Returns:
+            Updated IR, or ``ir`` itself if no ACL changed
+        """
+        return replace_changed(
+            ir,
+            frontends=map_changed(self._extract_proxy, ir.frontends),
+            backends=map_changed(self._extract_proxy, ir.backends),
+            listens=map_changed(self._extract_proxy, ir.listens),
+        )
+
+    def _extract_proxy(self, proxy: Frontend | Backend | Listen) -> Frontend | Backend | Listen:
+        """Canonicalize the ACLs of one proxy."""
+        return replace_changed(proxy, acls=map_changed(self._extract_acl, proxy.acls))
+
+    def _extract_acl(self, acl: ACL) -> ACL:
+        """Canonicalize the values of one ACL, moving them to a file if many."""
+        # The DSL keeps flags among the values, so read flags from both
+        value_flags, values = _split_flags(acl.values)
+        if not values:
+            return acl
+        patterns = canonical_patterns(acl.criterion, [*acl.flags, *value_flags], values)
+        if len(patterns) >= self.min_values and all(
+            _LITERAL_VALUE.fullmatch(pattern) for pattern in patterns
+        ):
+            patterns = ["-f", str(self._write_pattern_file(patterns))]
+        if patterns == values:
+            return acl
+        return replace_changed(acl, values=[*value_flags, *patterns])
+
+    def _write_pattern_file(self, patterns: Sequence[str]) -> Path:
+        """Write a pattern file of ``patterns`` and return its path."""
+        content = "".join(f"{pattern}\n" for pattern in patterns)
+        digest = hashlib.sha256(content.encode()).hexdigest()[:16]
+        filepath = self.output_dir / f"{digest}.lst"
+        if filepath in self.generated_files:
+            return filepath
+
+        # Write pattern file, leaving an up-to-date one alone
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if write_text_if_changed(filepath, content):
+            self.files_changed = True
+        self.generated_files[filepath] = content
+        return filepath
+
+
+def canonical_patterns(criterion: str, flags: Sequence[str], values: Sequence[str]) -> list[str]:
+    """Return ``values`` without duplicates, merging networks for IP criteria.
+
+    The result matches exactly what ``values`` matched.
+
+    Args:
+        criterion: ACL criterion, such as ``src`` or ``path_beg``
+        flags: ACL flags, such as ``-i`` or ``-m ip``
+        values: ACL values
+    """
+    method = flags[flags.index("-m") + 1] if "-m" in flags[:-1] else None
+    if method == "ip" or (method is None and criterion in _IP_CRITERIA):
+        networks = _merge_networks(values)
+        if networks is not None:
+            return networks
+    if "-i" in flags:
+        # Keep the first spelling of values equal but for case
+        unique: dict[str, str] = {}
+        for value in values:
+            unique.setdefault(value.lower(), value)
+        return list(unique.values())
+    return list(dict.fromkeys(values))
+
+
+def _merge_networks(values: Sequence[str]) -> list[str] | None:
+    """Return the fewest networks covering ``values``, or None if one isn't an address.
+
+    Host bits set in a value are ignored, as HAProxy ignores them.
+    """
+    ranges: dict[int, list[tuple[int, int]]] = {4: [], 6: []}
+    try:
+        for value in values:
+            version, start, end = _address_range(value)
+            ranges[version].append((start, end))
+    except ValueError:
+        # Host names are resolved by HAProxy; leave them as they are
+        return None
+
+    # ipaddress.collapse_addresses() does the same, but far slower
+    merged = []
+    for version, bits, format_address in (
+        (4, ipaddress.IPV4LENGTH, lambda address: socket.inet_ntoa(address.to_bytes(4))),
+        (6, ipaddress.IPV6LENGTH, lambda address: str(ipaddress.IPv6Address(address))),
+    ):
+        for start, end in _union(ranges[version]):
+            for block_start, prefixlen in _cidr_blocks(start, end, bits):
+                address = format_address(block_start)
+                merged.append(address if prefixlen == bits else f"{address}/{prefixlen}")
+    return merged
+
+
+def _address_range(value: str) -> tuple[int, int, int]:
+    """Return the IP version of a network, and the range of addresses it covers.
+
+    Raises:
+        ValueError: If ``value`` is not an address or network
+    """
+    match = _IPV4_NETWORK.fullmatch(value)
+    if match:
+        # Parsing plain IPv4 networks directly is many times faster
+        size = 1 << (ipaddress.IPV4LENGTH - int(match[2] or ipaddress.IPV4LENGTH))
+        start = int.from_bytes(socket.inet_aton(match[1])) & -size
+        return 4, start, start + size
+    network = ipaddress.ip_network(value, strict=False)
+    size = 1 << (network.max_prefixlen - network.prefixlen)
+    return network.version, int(network.network_address), int(network.network_address) + size
+
+
+def _union(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Return the disjoint, non-adjacent ranges covering ``ranges``, in order."""
+    union: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if union and start <= union[-1][1]:
+            if end > union[-1][1]:
+                union[-1] = (union[-1][0], end)
+        else:
+            union.append((start, end))
+    return union
+
+
+def _cidr_blocks(start: int, end: int, bits: int) -> list[tuple[int, int]]:
+    """Split the range from ``start`` to ``end`` into the fewest aligned blocks."""
+    blocks = []
+    while start < end:
+        # The largest block aligned on start that fits in the range
+        size = start & -start or 1 << bits
+        while size > end - start:
+            size >>= 1
+        blocks.append((start, bits - size.bit_length() + 1))
+        start += size
+    return blocks
+
+
+def _split_flags(tokens: Sequence[str]) -> tuple[list[str], list[str]]:
+    """Split ACL tokens into the leading flags and the values."""
+    index = 0
+    while index < len(tokens) and tokens[index] in _FLAGS:
+        flag = tokens[index]
+        index += 2 if flag in _FLAGS_WITH_ARGUMENT else 1
+        if flag == "--":
+            break
+    return list(tokens[:index]), list(tokens[index:])
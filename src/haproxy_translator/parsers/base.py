@@ -1,5 +1,6 @@
 """Base parser interface and registry for pluggable parsers."""
 
+import threading
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, ClassVar
 
@@ -12,7 +13,13 @@ if TYPE_CHECKING:
 
 
 class ConfigParser(ABC):
-    """Base class for all configuration format parsers."""
+    """Base class for all configuration format parsers.
+
+    Subclasses should define ``format_name`` and ``file_extensions`` as class
+    attributes so ParserRegistry can register them without building a
+    parser. Registered parsers are shared across threads, so ``parse`` must
+    not keep per-call state on the instance.
+    """
 
     @property
     @abstractmethod
@@ -77,38 +84,71 @@ class ConfigParser(ABC):
 
 
 class ParserRegistry:
-    """Registry for all available parsers."""
+    """Registry for all available parsers.
+
+    Parsers are built lazily on first use and shared process-wide, so the
+    grammar behind a format is only compiled once.
+    """
 
     _parsers: ClassVar[dict[str, type[ConfigParser]]] = {}
     _extension_map: ClassVar[dict[str, str]] = {}
+    _instances: ClassVar[dict[type[ConfigParser], ConfigParser]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @staticmethod
+    def _metadata(parser_class: type[ConfigParser]) -> tuple[str, list[str]]:
+        """Read a parser's format name and extensions, preferring class attributes."""
+        format_name: object = parser_class.format_name
+        file_extensions: object = parser_class.file_extensions
+        if isinstance(format_name, str) and isinstance(file_extensions, list | tuple):
+            return format_name, list(file_extensions)
+
+        # Metadata declared as properties needs an instance to read
+        parser = parser_class()
+        return parser.format_name, parser.file_extensions
 
     @classmethod
     def register(cls, parser_class: type[ConfigParser]) -> None:
         """Register a parser class."""
-        parser = parser_class()
-        cls._parsers[parser.format_name] = parser_class
+        format_name, file_extensions = cls._metadata(parser_class)
+        with cls._lock:
+            cls._parsers[format_name] = parser_class
+            cls._instances.pop(parser_class, None)
+
+            for ext in file_extensions:
+                cls._extension_map[ext] = format_name
 
-        for ext in parser.file_extensions:
-            cls._extension_map[ext] = parser.format_name
+    @classmethod
+    def _instance(cls, parser_class: type[ConfigParser]) -> ConfigParser:
+        """Return the shared parser for parser_class, building it on first use."""
+        parser = cls._instances.get(parser_class)
+        if parser is None:
+            with cls._lock:
+                # Another thread may have built it while we waited
+                parser = cls._instances.get(parser_class)
+                if parser is None:
+                    parser = parser_class()
+                    cls._instances[parser_class] = parser
+        return parser
 
     @classmethod
     def get_parser(
         cls, format_name: str | None = None, filepath: Path | None = None
     ) -> ConfigParser:
-        """Get parser by format name or auto-detect from file extension."""
+        """Get the shared parser by format name or auto-detect from file extension."""
         if format_name:
             if format_name not in cls._parsers:
                 raise ValueError(
                     f"Unknown format: {format_name}. "
                     f"Available formats: {', '.join(cls._parsers.keys())}"
                 )
-            return cls._parsers[format_name]()
+            return cls._instance(cls._parsers[format_name])
 
         if filepath:
             ext = filepath.suffix
             if ext in cls._extension_map:
                 format_name = cls._extension_map[ext]
-                return cls._parsers[format_name]()
+                return cls._instance(cls._parsers[format_name])
             raise ValueError(
                 f"Cannot determine parser for file extension: {ext}. "
                 f"Supported extensions: {', '.join(cls._extension_map.keys())}"
@@ -1,48 +1,223 @@
 """DSL parser using Lark."""
 
+import threading
+from contextvars import ContextVar
+from functools import partial
 from importlib import resources
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, ClassVar, cast
 
-from lark import Lark, LarkError
+from lark import Lark, LarkError, UnexpectedInput
+from lark.exceptions import VisitError
 
+from ..ir.fingerprint import with_fingerprints
+from ..ir.interning import IRInterner
 from ..transformers.dsl_transformer import DSLTransformer
-from ..transformers.loop_unroller import LoopUnroller
-from ..transformers.template_expander import TemplateExpander
-from ..transformers.variable_resolver import VariableResolver
+from ..transformers.pass_manager import PassManager
 from ..utils.errors import ParseError, SourceLocation, ValidationError
 from ..validators.semantic import SemanticValidator
+from . import grammar_cache
 from .base import ConfigParser
+from .import_resolver import ImportResolver
+from .lalr_lexer import ViablePrefixContextualLexer
 
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from lark import Tree
+
     from ..ir import ConfigIR
 
+# Supported values for DSLParser(parser_mode=...)
+PARSER_MODES = ("auto", "lalr", "earley")
+
+
+def _read_grammar(name: str) -> str:
+    # Load grammar file using importlib.resources (Python 3.9+)
+    return resources.files("haproxy_translator").joinpath(f"grammars/{name}").read_text()
+
+
+# DSLTransformer for the inline parse running in the current thread/context
+_active_transformer: ContextVar[DSLTransformer] = ContextVar("_active_transformer")
+
+
+class _InlineTransformer:
+    """Forward Lark's inline callbacks to the active DSLTransformer.
+
+    Lark binds an inline transformer when the parser is built, but
+    DSLTransformer collects per-parse state (variables, templates, file
+    path). This stand-in exposes the same callbacks and dispatches each
+    call to the transformer of the parse in progress, so one compiled
+    parser serves every parse and thread.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        # Rules without a DSLTransformer method (and dunder lookups) fall
+        # back to Lark's default tree building
+        if name.startswith("_") or not callable(getattr(DSLTransformer, name, None)):
+            raise AttributeError(name)
+
+        def callback(arg: Any) -> Any:
+            try:
+                return getattr(_active_transformer.get(), name)(arg)
+            except Exception as e:
+                # Report errors the way Transformer.transform does
+                raise VisitError(name, arg, e) from e
+
+        return callback
+
+    def __repr__(self) -> str:
+        # Stable across processes so it can be part of the grammar cache key
+        return f"{type(self).__name__}()"
+
+
+def _lark_config(parser_mode: str, *, inline: bool = False) -> tuple[str, dict[str, Any]]:
+    """Return the grammar text and Lark options for ``parser_mode``.
+
+    With ``inline``, Lark runs DSLTransformer while parsing and returns the
+    ConfigIR directly (LALR only).
+    """
+    grammar = _read_grammar("haproxy_dsl.lark")
+    options: dict[str, Any] = {
+        "start": "config",
+        "parser": parser_mode,
+        # ambiguity="resolve" - Earley automatically resolves ambiguities (default)
+        "propagate_positions": True,  # Track source positions
+        "maybe_placeholders": False,
+    }
+
+    if parser_mode == "lalr":
+        # LALR needs a few conflict-free rewrites and a lexer that only emits
+        # tokens the parser can shift (see lalr_lexer.py)
+        grammar += "\n" + _read_grammar("haproxy_dsl_lalr.lark")
+        options["_plugins"] = {"ContextualLexer": ViablePrefixContextualLexer}
+
+    if inline:
+        options["transformer"] = _InlineTransformer()
+        # DSLTransformer never reads node positions
+        options["propagate_positions"] = False
+
+    return grammar, options
+
+
+def _build_lark(parser_mode: str, *, inline: bool = False) -> Lark:
+    """Compile the DSL grammar for ``parser_mode`` ("lalr" or "earley").
+
+    The LALR tables are loaded from the on-disk cache when possible (see
+    grammar_cache.py).
+    """
+    grammar, options = _lark_config(parser_mode, inline=inline)
+    if parser_mode == "lalr":
+        return grammar_cache.load_or_build(grammar, options, lambda: Lark(grammar, **options))
+    return Lark(grammar, **options)
+
+
+_lark_parsers: dict[tuple[str, bool], Lark] = {}
+_lark_lock = threading.Lock()
+
+
+def _get_lark(parser_mode: str, *, inline: bool = False) -> Lark:
+    """Return the process-wide Lark parser for ``parser_mode``.
+
+    Compiling the grammar dominates parser start-up, so each mode is built
+    once per process, even when several threads ask for it at once, and
+    shared by every DSLParser instance. Lark parsers keep no per-parse
+    state, so sharing them across threads is safe.
+    """
+    with _lark_lock:
+        key = (parser_mode, inline)
+        if key not in _lark_parsers:
+            _lark_parsers[key] = _build_lark(parser_mode, inline=inline)
+        return _lark_parsers[key]
+
 
 class DSLParser(ConfigParser):
-    """Parser for HAProxy DSL format."""
-
-    def __init__(self) -> None:
-        # Load grammar file using importlib.resources (Python 3.9+)
-        grammar_file = resources.files("haproxy_translator").joinpath("grammars/haproxy_dsl.lark")
-        grammar = grammar_file.read_text()
-
-        self.parser = Lark(
-            grammar,
-            start="config",
-            parser="earley",  # Earley parser - handles ambiguity better than LALR
-            # ambiguity="resolve" - automatically resolves ambiguities (default)
-            propagate_positions=True,  # Track source positions
-            maybe_placeholders=False,
-        )
-
-    @property
-    def format_name(self) -> str:
-        return "dsl"
-
-    @property
-    def file_extensions(self) -> list[str]:
-        return [".hap", ".haproxy"]
+    """Parser for HAProxy DSL format.
+
+    Args:
+        parser_mode: Parsing algorithm to use:
+
+            - ``"auto"`` (default): parse with LALR(1), which runs in linear
+              time, and retry with Earley when LALR rejects the input. Earley
+              is only compiled the first time a fallback is needed.
+            - ``"lalr"``: LALR(1) only. Fastest, but rejects the few inputs
+              that need more than one token of lookahead.
+            - ``"earley"``: Earley only. Handles every input the grammar
+              allows, but is much slower on large configurations.
+
+        inline_transform: Run DSLTransformer inside the LALR parser, building
+            IR nodes as rules are reduced instead of materializing the full
+            parse tree and walking it afterwards. Saves time and peak memory
+            on large configurations. Inputs that fall back to Earley still
+            go through a parse tree.
+        import_jobs: Worker processes used to parse independent
+            ``import "file"`` statements, which are resolved relative to the
+            importing file (see import_resolver.py). None (default) uses one
+            per CPU; 1 parses imports in this process.
+        intern_ir: Deduplicate structurally equal IR nodes, collections and
+            strings as each section is built (see ir/interning.py). Lists
+            and dicts in the returned IR become tuples and read-only
+            mappings, and every node becomes hashable.
+        columnar_servers: Store the servers of backends with at least this
+            many servers as ServerColumns (see ir/columns.py) instead of
+            one Server per entry. None (default) disables. The columns are
+            built once a backend is resolved, so parsing still creates one
+            Server per entry: this shrinks the returned IR and spares code
+            generation per-row objects, not the peak memory of the parse.
+    """
+
+    format_name: ClassVar[str] = "dsl"
+    file_extensions: ClassVar[list[str]] = [".hap", ".haproxy"]
+
+    def __init__(
+        self,
+        parser_mode: str = "auto",
+        inline_transform: bool = False,
+        import_jobs: int | None = None,
+        intern_ir: bool = False,
+        columnar_servers: int | None = None,
+    ) -> None:
+        if parser_mode not in PARSER_MODES:
+            raise ValueError(
+                f"Unknown parser mode: {parser_mode}. Available modes: {', '.join(PARSER_MODES)}"
+            )
+
+        self.parser_mode = parser_mode
+        self.inline_transform = inline_transform and parser_mode != "earley"
+        self.parser = _get_lark("earley" if parser_mode == "earley" else "lalr")
+        self.inline_parser = _get_lark("lalr", inline=True) if self.inline_transform else None
+        self.import_jobs = import_jobs
+        self.intern_ir = intern_ir
+        self.columnar_servers = columnar_servers
+
+    def _parse_tree(self, source: str) -> Tree[Any]:
+        """Parse source to a Lark tree, falling back to Earley in auto mode."""
+        if self.parser_mode != "auto":
+            return self.parser.parse(source)
+
+        try:
+            return self.parser.parse(source)
+        except LarkError:
+            # Earley either parses the input or reports the syntax error
+            return _get_lark("earley").parse(source)
+
+    def _parse_to_ir(self, source: str, filename: str) -> ConfigIR:
+        """Parse source and transform it to IR (pipeline steps 1-2)."""
+        if self.inline_parser is None:
+            parse_tree = self._parse_tree(source)
+        else:
+            token = _active_transformer.set(DSLTransformer(filepath=filename))
+            try:
+                return cast("ConfigIR", self.inline_parser.parse(source))
+            except UnexpectedInput:
+                if self.parser_mode != "auto":
+                    raise
+            finally:
+                _active_transformer.reset(token)
+            # Earley either parses the input or reports the syntax error
+            parse_tree = _get_lark("earley").parse(source)
+
+        transformer = DSLTransformer(filepath=filename)
+        return cast("ConfigIR", transformer.transform(parse_tree))
 
     def parse(self, source: str, filepath: Path | None = None) -> ConfigIR:
         """Parse DSL source code into IR and apply transformations.
@@ -50,56 +225,34 @@ class DSLParser(ConfigParser):
         Pipeline:
         1. Parse source to AST
         2. Transform AST to IR
-        3. Expand templates (first pass - non-loop servers)
-        4. Resolve variables (first pass - non-loop values)
-        5. Unroll loops
-        6. Expand templates (second pass - loop-generated servers)
-        7. Resolve variables (second pass - loop-generated server values)
-        8. Validate semantics
+        3. Resolve imports
+        4. Unroll loops, expand templates and resolve variables, in one walk
+           per section (see PassManager)
+        5. Validate semantics
+        6. Fingerprint each section (see ConfigIR.fingerprints)
         """
         try:
-            # Step 1: Parse with Lark
-            parse_tree = self.parser.parse(source)
-
-            # Step 2: Transform to IR
-            transformer = DSLTransformer(filepath=str(filepath) if filepath else "<input>")
-            ir = cast("ConfigIR", transformer.transform(parse_tree))
-
-            # Step 3: Expand templates (first pass - for non-loop servers)
-            template_expander = TemplateExpander(ir)
-            ir = template_expander.expand()
-
-            # Step 4: Resolve variables (first pass - multi-pass for nested references)
-            variable_resolver = VariableResolver(ir)
-            ir = variable_resolver.resolve()
-
-            # Step 5: Unroll loops
-            loop_unroller = LoopUnroller(ir, variables=variable_resolver.variables)
-            ir = loop_unroller.unroll()
+            # Steps 1-2: Parse with Lark and transform to IR
+            ir = self._parse_to_ir(source, str(filepath) if filepath else "<input>")
 
-            # Step 6: Expand templates (second pass - for loop-generated servers)
-            template_expander2 = TemplateExpander(ir)
-            ir = template_expander2.expand()
+            # Step 3: Merge imported modules
+            parse_module = partial(_parse_module, self.parser_mode, self.inline_transform)
+            ir = ImportResolver(ir, filepath, parse_module, jobs=self.import_jobs).resolve()
 
-            # Step 7: Resolve variables (second pass - for loop-generated server values)
-            variable_resolver2 = VariableResolver(ir)
-            ir = variable_resolver2.resolve()
+            # Step 4: Unroll loops, expand templates and resolve variables
+            interner = IRInterner() if self.intern_ir else None
+            ir = PassManager(ir, interner, columnar_servers=self.columnar_servers).run()
 
-            # Step 8: Validate semantics
+            # Step 5: Validate semantics
             validator = SemanticValidator(ir)
-            return validator.validate()
+            ir = validator.validate()
+
+            # Step 6: Fingerprint sections for change detection
+            return with_fingerprints(ir)
 
         except LarkError as e:
             # Convert Lark error to ParseError
-            location = None
-            if hasattr(e, "line") and hasattr(e, "column"):
-                location = SourceLocation(
-                    filepath=str(filepath) if filepath else "<input>",
-                    line=e.line,
-                    column=e.column,
-                )
-
-            raise ParseError(f"Syntax error: {e}", location=location) from e
+            raise _syntax_error(e, str(filepath) if filepath else "<input>") from e
 
         except (ValidationError, ParseError):
             # Re-raise validation and parse errors as-is
@@ -108,3 +261,20 @@ class DSLParser(ConfigParser):
         except Exception as e:
             # Catch any other errors
             raise ParseError(f"Parse error: {e}") from e
+
+
+def _syntax_error(error: LarkError, filename: str) -> ParseError:
+    """Convert a Lark error to ParseError."""
+    location = None
+    if hasattr(error, "line") and hasattr(error, "column"):
+        location = SourceLocation(filepath=filename, line=error.line, column=error.column)
+    return ParseError(f"Syntax error: {error}", location=location)
+
+
+def _parse_module(parser_mode: str, inline_transform: bool, filename: str, source: str) -> ConfigIR:
+    """Parse an imported module to IR (runs in import worker processes)."""
+    parser = DSLParser(parser_mode=parser_mode, inline_transform=inline_transform)
+    try:
+        return parser._parse_to_ir(source, filename)
+    except LarkError as e:
+        raise _syntax_error(e, filename) from e
@@ -0,0 +1,155 @@
+"""On-disk cache of the compiled LALR grammar.
+
+Building the LALR tables for the DSL grammar takes around a second, which
+dominates start-up for short translations. The compiled parser is
+serialized with ``Lark.save`` and looked up, in order, in:
+
+1. the user cache directory (``$HAPROXY_TRANSLATOR_CACHE_DIR``, else
+   ``$XDG_CACHE_HOME/haproxy-translator``, else ``~/.cache/haproxy-translator``)
+2. the prebuilt cache shipped in the package (``grammars/haproxy_dsl_lalr.cache``)
+
+Every cache file starts with a key derived from the grammar text, the
+Lark options, the Lark version and the cache format version, so a stale or
+foreign file is never loaded; on a miss the grammar is compiled and the
+result written to the user cache directory.
+
+Regenerate the prebuilt cache after editing the grammar or upgrading Lark
+with ``python tools/build_grammar_cache.py``.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import zlib
+from importlib import resources
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import lark
+from lark import Lark
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Bump when the on-disk layout changes
+CACHE_FORMAT_VERSION = 1
+
+CACHE_DIR_ENV = "HAPROXY_TRANSLATOR_CACHE_DIR"
+PREBUILT_CACHE = "grammars/haproxy_dsl_lalr.cache"
+
+_MAGIC = b"haproxy-translator-grammar"
+
+
+def cache_key(grammar: str, options: dict[str, Any]) -> str:
+    """Return the cache key for a grammar compiled with ``options``."""
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_FORMAT_VERSION}\0{lark.__version__}\0".encode())
+    digest.update(repr(sorted(options.items())).encode())
+    digest.update(b"\0")
+    digest.update(grammar.encode())
+    return digest.hexdigest()
+
+
+def user_cache_dir() -> Path | None:
+    """Return the user cache directory, or None if caching is disabled.
+
+    Setting ``HAPROXY_TRANSLATOR_CACHE_DIR`` to an empty string disables the
+    user cache (the prebuilt cache is still used).
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override is not None:
+        return Path(override) if override else None
+
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+    return base / "haproxy-translator"
+
+
+def cache_filename(key: str) -> str:
+    """Return the file name of the user cache entry for ``key``."""
+    return f"haproxy_dsl_lalr-{key[:16]}.cache"
+
+
+def serialize(parser: Lark, key: str) -> bytes:
+    """Serialize a compiled LALR parser into cache file contents."""
+    buffer = io.BytesIO()
+    parser.save(buffer)
+    return _MAGIC + b" " + key.encode() + b"\n" + zlib.compress(buffer.getvalue())
+
+
+def deserialize(data: bytes, key: str) -> Lark | None:
+    """Load a parser from cache file contents, or None if ``key`` does not match."""
+    header, _, payload = data.partition(b"\n")
+    if header != _MAGIC + b" " + key.encode():
+        return None
+
+    try:
+        return Lark.load(io.BytesIO(zlib.decompress(payload)))
+    except Exception:
+        # A truncated or corrupt cache is just a miss
+        return None
+
+
+def _read_user_cache(key: str) -> Lark | None:
+    cache_dir = user_cache_dir()
+    if cache_dir is None:
+        return None
+
+    try:
+        data = (cache_dir / cache_filename(key)).read_bytes()
+    except OSError:
+        return None
+    return deserialize(data, key)
+
+
+def _read_prebuilt_cache(key: str) -> Lark | None:
+    try:
+        data = resources.files("haproxy_translator").joinpath(PREBUILT_CACHE).read_bytes()
+    except OSError:
+        return None
+    return deserialize(data, key)
+
+
+def _write_user_cache(parser: Lark, key: str) -> None:
+    cache_dir = user_cache_dir()
+    if cache_dir is None:
+        return
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see
+        # a partial cache entry
+        fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(serialize(parser, key))
+            Path(tmp_name).replace(cache_dir / cache_filename(key))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError:
+        # Read-only or full cache directory: keep going without a cache
+        pass
+
+
+def load_or_build(grammar: str, options: dict[str, Any], build: Callable[[], Lark]) -> Lark:
+    """Load the compiled parser for ``grammar`` from cache, or build and cache it.
+
+    Args:
+        grammar: Full grammar text passed to Lark
+        options: Lark options passed to Lark (part of the cache key)
+        build: Compiles the grammar on a cache miss
+
+    Returns:
+        The compiled LALR parser
+    """
+    key = cache_key(grammar, options)
+
+    parser = _read_user_cache(key)
+    if parser is None:
+        parser = _read_prebuilt_cache(key)
+    if parser is None:
+        parser = build()
+        _write_user_cache(parser, key)
+    return parser
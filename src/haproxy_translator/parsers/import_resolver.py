@@ -0,0 +1,187 @@
+"""Resolution of ``import`` statements.
+
+``import "path"`` loads another DSL file, resolved relative to the file
+that imports it, and merges its sections, variables and templates into the
+importing configuration. The importer's own definitions win over imported
+ones, and later imports win over earlier ones.
+
+Imported files are loaded breadth-first into a dependency graph, which is
+checked for cycles before merging. Each module's IR (after parsing and
+transformation, before variables and templates are applied) is kept in a
+process-wide cache keyed by path, mtime and content hash, so shared
+libraries are parsed once however many configurations import them.
+Uncached modules on the same level of the graph are independent and are
+parsed in a process pool when there is enough source to pay for it.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ..utils.errors import ParseError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from ..ir.nodes import ConfigIR, Template, Variable
+
+    # (filepath, source) -> module IR; must be picklable for the process pool
+    ParseModule = Callable[[str, str], ConfigIR]
+
+# Below this much uncached source on one level, worker start-up costs more
+# than parsing serially
+PARALLEL_MIN_BYTES = 256 * 1024
+
+# Sections concatenated across modules, imported modules first
+_LIST_FIELDS = ("frontends", "backends", "listens", "lua_scripts", "peers", "resolvers", "mailers")
+
+# path -> (mtime_ns, sha256, IR)
+_module_cache: dict[Path, tuple[int, str, ConfigIR]] = {}
+_module_cache_lock = threading.Lock()
+
+
+def resolve_import(name: str, importer: Path | None) -> Path:
+    """Return the absolute path of ``import name`` in the file ``importer``.
+
+    Relative imports are resolved against the importing file's directory,
+    or the working directory when the source has no file.
+    """
+    path = Path(name)
+    if not path.is_absolute():
+        path = (importer.parent if importer else Path.cwd()) / path
+    return path.resolve()
+
+
+def clear_module_cache() -> None:
+    """Forget every cached module IR."""
+    with _module_cache_lock:
+        _module_cache.clear()
+
+
+class ImportResolver:
+    """Loads the modules a configuration imports and merges them into it."""
+
+    def __init__(
+        self,
+        config: ConfigIR,
+        filepath: Path | None,
+        parse_module: ParseModule,
+        jobs: int | None = None,
+    ):
+        self.config = config
+        self.root = filepath.resolve() if filepath else None
+        self.parse_module = parse_module
+        self.jobs = jobs if jobs is not None else os.cpu_count() or 1
+        self.graph: dict[Path | None, list[Path]] = {}
+        self.modules: dict[Path, ConfigIR] = {}
+
+    def resolve(self) -> ConfigIR:
+        """Return the configuration with all imported modules merged in."""
+        if not self.config.imports:
+            return self.config
+
+        self.graph[self.root] = [resolve_import(name, self.root) for name in self.config.imports]
+        pending = list(dict.fromkeys(self.graph[self.root]))
+        while pending:
+            self.modules.update(self._load(pending))
+            next_level: list[Path] = []
+            for path in pending:
+                self.graph[path] = [
+                    resolve_import(name, path) for name in self.modules[path].imports
+                ]
+                next_level.extend(
+                    dep
+                    for dep in self.graph[path]
+                    if dep not in self.modules and dep not in next_level
+                )
+            pending = next_level
+
+        return self._merge(self._load_order())
+
+    def _load(self, paths: list[Path]) -> dict[Path, ConfigIR]:
+        """Return the IR of each module, parsing those not in the module cache."""
+        loaded: dict[Path, ConfigIR] = {}
+        stale: list[tuple[Path, int, str, str]] = []
+        for path in paths:
+            try:
+                data = path.read_bytes()
+                mtime_ns = path.stat().st_mtime_ns
+            except OSError as e:
+                raise ParseError(f"Cannot import {path}: {e.strerror}") from e
+
+            digest = hashlib.sha256(data).hexdigest()
+            with _module_cache_lock:
+                cached = _module_cache.get(path)
+            if cached is not None and cached[:2] == (mtime_ns, digest):
+                loaded[path] = cached[2]
+            else:
+                stale.append((path, mtime_ns, digest, data.decode("utf-8")))
+
+        sources = [source for *_, source in stale]
+        filepaths = [str(path) for path, *_ in stale]
+        workers = min(self.jobs, len(stale))
+        if workers > 1 and sum(map(len, sources)) >= PARALLEL_MIN_BYTES:
+            # Spawned workers are safe to start from threaded callers
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                parsed = list(pool.map(self.parse_module, filepaths, sources))
+        else:
+            parsed = [self.parse_module(f, s) for f, s in zip(filepaths, sources, strict=True)]
+
+        with _module_cache_lock:
+            for (path, mtime_ns, digest, _), ir in zip(stale, parsed, strict=True):
+                _module_cache[path] = (mtime_ns, digest, ir)
+                loaded[path] = ir
+        return loaded
+
+    def _load_order(self) -> list[Path]:
+        """Order modules dependencies-first, raising ParseError on a cycle."""
+        order: list[Path] = []
+        done: set[Path] = set()
+        stack: list[Path | None] = []
+
+        def visit(path: Path | None) -> None:
+            if path in stack:
+                cycle = [*stack[stack.index(path) :], path]
+                raise ParseError("Import cycle: " + " -> ".join(str(p) for p in cycle))
+            stack.append(path)
+            for dep in self.graph[path]:
+                if dep not in done:
+                    visit(dep)
+            stack.pop()
+            if path is not None and path != self.root:
+                done.add(path)
+                order.append(path)
+
+        visit(self.root)
+        return order
+
+    def _merge(self, order: list[Path]) -> ConfigIR:
+        """Merge the modules in ``order``, then the configuration itself."""
+        variables: dict[str, Variable] = {}
+        templates: dict[str, Template] = {}
+        lists: dict[str, list[object]] = {name: [] for name in _LIST_FIELDS}
+        global_config = None
+        defaults = None
+
+        for module in [*(self.modules[path] for path in order), self.config]:
+            variables.update(module.variables)
+            templates.update(module.templates)
+            for name in _LIST_FIELDS:
+                lists[name].extend(getattr(module, name))
+            global_config = module.global_config or global_config
+            defaults = module.defaults or defaults
+
+        return replace(
+            self.config,
+            global_config=global_config,
+            defaults=defaults,
+            variables=variables,
+            templates=templates,
+            **lists,  # type: ignore[arg-type]
+        )
@@ -0,0 +1,247 @@
+"""Contextual lexer for the LALR parsing mode.
+
+The DSL grammar was written for Earley's dynamic lexer, which tries every
+terminal at every position and lets the parser decide. Lark's standard LALR
+lexer instead picks the first regex alternative that matches, ordered by
+priority, so keywords such as ``tune.bufsize`` or ``send-proxy`` are split
+into identifier prefixes and high-priority terminals like
+``TCP_ACTION_KEYWORD`` swallow plain words.
+
+This lexer restores Earley-like behaviour for the common case: it collects
+every terminal that matches at the current position, orders the candidates
+by match length, then priority, then literal-over-pattern, and returns the
+first one the LALR automaton can actually shift from its current stack,
+looking a few tokens further ahead when several of them can. Inputs that
+still need more lookahead fail to parse and are handed to the Earley
+parser by ``DSLParser``.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, cast
+
+from lark.exceptions import UnexpectedCharacters
+from lark.lexer import BasicLexer, ContextualLexer, LexerState, Scanner, Token
+from lark.parsers.lalr_analysis import Shift
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Sequence
+
+    from lark.common import LexerConf
+
+# Extra tokens checked when more than one candidate can be shifted
+LOOKAHEAD = 2
+
+# (length, priority, is_literal, value, terminal name)
+_Candidate = tuple[int, int, bool, str, str]
+
+# Held while a per-state lexer builds its tables on first use
+_scanner_lock = threading.Lock()
+
+
+def shift(
+    states: dict[Any, dict[str, Any]], state_stack: Sequence[Any], terminal: str
+) -> list[Any] | None:
+    """Return the state stack after shifting ``terminal``, or None if it can't be.
+
+    Replays the reductions the LALR table would perform on a copy of the
+    state stack, without running any tree callbacks. LALR state merging can
+    add spurious reduce actions, but never a spurious shift, so reaching a
+    shift proves the token is valid here.
+    """
+    stack = list(state_stack)
+    while True:
+        action = states[stack[-1]].get(terminal)
+        if action is None:
+            return None
+        kind, arg = action
+        if kind is Shift:
+            stack.append(arg)
+            return stack
+        size = len(arg.expansion)
+        if size:
+            del stack[-size:]
+        stack.append(states[stack[-1]][arg.origin.name][1])
+
+
+class ViablePrefixLexer(BasicLexer):
+    """Longest-match lexer that only emits tokens the parser can shift."""
+
+    state_lexers: dict[Any, Any]
+    _literal_re: Any
+    _literals: dict[str, tuple[str, int]]
+    _patterns: list[tuple[Callable[..., Any], str, int]]
+
+    @property
+    def scanner(self) -> Scanner:
+        # The lexers of a parser are shared by every thread using it, so
+        # the tables are built once, under a lock, and the scanner is only
+        # published once they are complete
+        if self._scanner is None:
+            with _scanner_lock:
+                if self._scanner is None:
+                    self._scanner = self._build_scanner()
+        return self._scanner
+
+    def _build_scanner(self) -> Scanner:
+        scanner = super()._build_scanner()
+
+        literals: dict[str, tuple[str, int]] = {}
+        literal_terms = [t for t in self.terminals if t.pattern.type == "str"]
+        for term in sorted(literal_terms, key=lambda t: -len(t.pattern.value)):
+            literals.setdefault(term.pattern.value, (term.name, term.priority))
+        # Longest-first alternation yields the longest literal at a position
+        literal_re = (
+            self.re.compile("|".join(self.re.escape(v) for v in literals), self.g_regex_flags)
+            if literals
+            else None
+        )
+        patterns = [
+            (
+                self.re.compile(t.pattern.to_regexp(), self.g_regex_flags).match,
+                t.name,
+                t.priority,
+            )
+            for t in self.terminals
+            if t.pattern.type == "re"
+        ]
+
+        # Retyping identifiers into keywords is done by candidate selection,
+        # so drop Lark's "unless" callbacks and keep only user callbacks.
+        self.callback = dict(self.user_callbacks)
+        self._literals = literals
+        self._literal_re = literal_re
+        self._patterns = patterns
+        return scanner
+
+    def candidates(self, text: str, pos: int, end: int) -> list[_Candidate]:
+        """Return every terminal match at ``pos``, best candidate first."""
+        if self._scanner is None:
+            # Builds the tables below
+            _ = self.scanner
+
+        found: list[_Candidate] = []
+        if self._literal_re is not None:
+            m = self._literal_re.match(text, pos, end)
+            if m:
+                value = m.group(0)
+                name, priority = self._literals[value]
+                found.append((len(value), priority, True, value, name))
+        for match, name, priority in self._patterns:
+            m = match(text, pos, end)
+            if m is not None and m.end() > pos:
+                found.append((m.end() - pos, priority, False, m.group(0), name))
+        found.sort(reverse=True)
+        return found
+
+    def select(
+        self, text: str, pos: int, end: int, states: dict[Any, dict[str, Any]], stack: list[Any]
+    ) -> tuple[str, str] | None:
+        """Pick the token at ``pos``: the best candidate the parser can shift.
+
+        When several candidates can be shifted (typically a keyword that is
+        also a valid option name), the first one that lets the following
+        ``LOOKAHEAD`` tokens be shifted too wins.
+        """
+        choices: list[tuple[str, str, list[Any]]] = []
+        for _, _, _, value, type_ in self.candidates(text, pos, end):
+            if type_ in self.ignore_types:
+                if not choices:
+                    return value, type_
+                break
+            next_stack = shift(states, stack, type_)
+            if next_stack is not None:
+                choices.append((value, type_, next_stack))
+
+        if not choices:
+            return None
+        if len(choices) > 1:
+            for value, type_, next_stack in choices:
+                if self._shifts_ahead(
+                    text, pos + len(value), end, states, next_stack, depth=LOOKAHEAD
+                ):
+                    return value, type_
+        return choices[0][0], choices[0][1]
+
+    def _shifts_ahead(
+        self,
+        text: str,
+        pos: int,
+        end: int,
+        states: dict[Any, dict[str, Any]],
+        stack: list[Any],
+        *,
+        depth: int,
+    ) -> bool:
+        """Check whether the next ``depth`` tokens after ``pos`` can be shifted."""
+        if depth == 0:
+            return True
+        while pos < end:
+            lexer = self.state_lexers[stack[-1]]
+            for _, _, _, value, type_ in lexer.candidates(text, pos, end):
+                if type_ in lexer.ignore_types:
+                    pos += len(value)
+                    break
+                next_stack = shift(states, stack, type_)
+                if next_stack is not None and self._shifts_ahead(
+                    text, pos + len(value), end, states, next_stack, depth=depth - 1
+                ):
+                    return True
+            else:
+                return False
+        return shift(states, stack, "$END") is not None
+
+    def next_token(self, lex_state: LexerState, parser_state: Any = None) -> Token:
+        line_ctr = lex_state.line_ctr
+        text = lex_state.text
+        states = parser_state.parse_conf.parse_table.states
+
+        while line_ctr.char_pos < text.end:
+            res = self.select(
+                text.text, line_ctr.char_pos, text.end, states, parser_state.state_stack
+            )
+            if res is None:
+                found = self.candidates(text.text, line_ctr.char_pos, text.end)
+                if not found:
+                    raise UnexpectedCharacters(
+                        text.text,
+                        line_ctr.char_pos,
+                        line_ctr.line,
+                        line_ctr.column,
+                        allowed=self.scanner.allowed_types - self.ignore_types,
+                        token_history=lex_state.last_token and [lex_state.last_token],
+                        state=parser_state,
+                        terminals_by_name=self.terminals_by_name,
+                    )
+                # Emit the best match and let the parser report the error
+                res = found[0][3], found[0][4]
+
+            value, type_ = res
+            token = Token(type_, value, line_ctr.char_pos, line_ctr.line, line_ctr.column)
+            line_ctr.feed(value, type_ in self.newline_types)
+            token.end_line = line_ctr.line
+            token.end_column = line_ctr.column
+            token.end_pos = line_ctr.char_pos
+            if type_ in self.callback:
+                token = self.callback[type_](token)
+            if type_ not in self.ignore_types:
+                lex_state.last_token = token
+                return token
+
+        raise EOFError(self)
+
+
+class ViablePrefixContextualLexer(ContextualLexer):
+    """Contextual lexer whose per-state lexers are ``ViablePrefixLexer``."""
+
+    BasicLexer = ViablePrefixLexer
+
+    def __init__(
+        self,
+        conf: LexerConf,
+        states: dict[int, Collection[str]],
+        always_accept: Collection[str] = (),
+    ) -> None:
+        super().__init__(conf, states, always_accept)
+        # Lookahead needs the lexer of the state after a candidate token
+        for lexer in (*self.lexers.values(), self.root_lexer):
+            cast("ViablePrefixLexer", lexer).state_lexers = self.lexers
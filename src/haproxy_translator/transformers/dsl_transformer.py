@@ -1,11 +1,12 @@
 """Lark transformer to convert parse tree to IR."""
 
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from lark import Token, Transformer
 
 from ..ir.nodes import (
     ACL,
+    EMPTY_MAPPING,
     Backend,
     BalanceAlgorithm,
     Bind,
@@ -58,6 +59,9 @@ from ..ir.nodes import (
     Variable,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
 
 class DSLTransformer(Transformer):
     """Transform Lark parse tree to ConfigIR."""
@@ -1648,6 +1652,7 @@ class DSLTransformer(Transformer):
         timeout_tarpit = None
         log = "global"
         options = []
+        http_reuse = None
         errorloc = {}
         errorloc302 = {}
         errorloc303 = {}
@@ -1680,6 +1685,8 @@ class DSLTransformer(Transformer):
                             options.extend(value)
                         else:
                             options.append(value)
+                    case "http_reuse":
+                        http_reuse = value
                     case "clitcpka_cnt":
                         clitcpka_cnt = value
                     case "clitcpka_idle":
@@ -1752,6 +1759,7 @@ class DSLTransformer(Transformer):
             timeout_tarpit=timeout_tarpit,
             log=log,
             options=options,
+            http_reuse=http_reuse,
             errorloc=errorloc,
             errorloc302=errorloc302,
             errorloc303=errorloc303,
@@ -1789,6 +1797,9 @@ class DSLTransformer(Transformer):
     def defaults_option(self, items: list[Any]) -> tuple[str, Any]:
         return ("option", items[0])
 
+    def defaults_http_reuse(self, items: list[Any]) -> tuple[str, str]:
+        return ("http_reuse", items[0])
+
     def defaults_errorloc(self, items: list[Any]) -> tuple[str, tuple[int, str]]:
         return ("errorloc", (int(items[0]), str(items[1])))
 
@@ -3465,7 +3476,7 @@ class DSLTransformer(Transformer):
             srvtcpka_idle=srvtcpka_idle,
             srvtcpka_intvl=srvtcpka_intvl,
             persist_rdp_cookie=persist_rdp_cookie,
-            metadata=metadata,
+            metadata=metadata or EMPTY_MAPPING,
         )
 
     def backend_mode(self, items: list[Any]) -> tuple[str, str]:
@@ -3955,7 +3966,7 @@ class DSLTransformer(Transformer):
             rate_limit_sessions=rate_limit_sessions,
             persist_rdp_cookie=persist_rdp_cookie,
             stats=stats,
-            metadata=metadata,
+            metadata=metadata or EMPTY_MAPPING,
         )
 
     def listen_mode(self, items: list[Any]) -> tuple[str, str]:
@@ -4097,7 +4108,7 @@ class DSLTransformer(Transformer):
             expect_rstring=expect_rstring,
             expect_negate=expect_negate,
             headers=headers,
-            metadata=metadata,
+            metadata=metadata or EMPTY_MAPPING,
         )
 
     def hc_method(self, items: list[Any]) -> tuple[str, str]:
@@ -4183,7 +4194,7 @@ class DSLTransformer(Transformer):
         ssl = False
         ssl_verify = None
         sni = None
-        alpn = []
+        alpn: Sequence[str] = ()
         backup = False
         send_proxy = False
         send_proxy_v2 = False
@@ -4286,8 +4297,9 @@ class DSLTransformer(Transformer):
             ca_file=ca_file,
             crt=crt,
             source=source,
-            options=options,
-            metadata=metadata,
+            # Unset collections share the IR's empty defaults
+            options=options or EMPTY_MAPPING,
+            metadata=metadata or EMPTY_MAPPING,
         )
 
     def server_inline(self, items: list[Any]) -> Server:
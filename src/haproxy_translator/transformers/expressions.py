@@ -0,0 +1,197 @@
+"""Safe compiled evaluation of ``${expr}`` expressions.
+
+Loop bodies may interpolate arithmetic over the loop variable and ``let``
+variables, e.g. ``"10.0.1.${10 + i}"``. Each distinct expression is parsed
+once with Python's expression syntax, checked against a whitelist of
+node types and compiled into nested closures; evaluating it again is a
+call against a scope mapping (see ``Scope``), with no ``eval`` and no
+access to builtins, attributes or calls.
+
+Supported: int, float, string, bool and None literals, names, ``+ - * /
+// %``, unary ``- + not``, ``and``/``or``, comparisons (including chained
+and ``in``), ``a if c else b`` and subscripts.
+"""
+
+import ast
+import operator
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    # scope -> value
+    Evaluator = Callable[[Mapping[str, Any]], Any]
+
+# Distinct expressions kept compiled
+CACHE_SIZE = 4096
+
+_BINARY_OPS: dict[type[ast.operator], Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+_UNARY_OPS: dict[type[ast.unaryop], Callable[[Any], Any]] = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: operator.not_,
+}
+
+_COMPARE_OPS: dict[type[ast.cmpop], Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+
+class ExpressionError(ValueError):
+    """An expression is not supported or could not be evaluated."""
+
+
+class Scope(dict[str, Any]):
+    """Names layered over a parent scope.
+
+    Lookups of names not defined in this layer fall through to the parent,
+    so a loop iteration's scope holds only the loop variable rather than a
+    copy of every global variable.
+    """
+
+    __slots__ = ("parent",)
+
+    def __init__(self, names: Mapping[str, Any], parent: Mapping[str, Any]):
+        super().__init__(names)
+        self.parent = parent
+
+    def __missing__(self, name: str) -> Any:
+        return self.parent[name]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(source: str) -> Evaluator:
+    """Compile an expression into a function of the scope it reads names from.
+
+    Raises:
+        ExpressionError: If the expression is not valid or uses unsupported syntax
+    """
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"invalid syntax: {e.msg}") from None
+    return _compile(tree.body)
+
+
+def evaluate(source: str, scope: Mapping[str, Any]) -> Any:
+    """Evaluate an expression against scope."""
+    return compile_expression(source)(scope)
+
+
+def _compile(node: ast.expr) -> Evaluator:
+    compiler = _COMPILERS.get(type(node))
+    evaluator = compiler(node) if compiler else None
+    if evaluator is None:
+        raise ExpressionError(f"unsupported syntax: {ast.unparse(node)}")
+    return evaluator
+
+
+def _compile_constant(node: Any) -> Evaluator | None:
+    value = node.value
+    if value is not None and not isinstance(value, (bool, int, float, str)):
+        return None
+    return lambda scope: value
+
+
+def _compile_name(node: Any) -> Evaluator:
+    name = node.id
+
+    def load(scope: Mapping[str, Any]) -> Any:
+        try:
+            return scope[name]
+        except KeyError:
+            raise ExpressionError(f"name '{name}' is not defined") from None
+
+    return load
+
+
+def _compile_binary(node: Any) -> Evaluator | None:
+    binary = _BINARY_OPS.get(type(node.op))
+    if binary is None:
+        return None
+    lhs, rhs = _compile(node.left), _compile(node.right)
+    return lambda scope: binary(lhs(scope), rhs(scope))
+
+
+def _compile_unary(node: Any) -> Evaluator | None:
+    unary = _UNARY_OPS.get(type(node.op))
+    if unary is None:
+        return None
+    operand = _compile(node.operand)
+    return lambda scope: unary(operand(scope))
+
+
+def _compile_boolean(node: Any) -> Evaluator:
+    operands = [_compile(value) for value in node.values]
+    is_and = isinstance(node.op, ast.And)
+
+    def boolean(scope: Mapping[str, Any]) -> Any:
+        # Short-circuits and returns the deciding operand, like Python
+        for operand in operands:
+            result = operand(scope)
+            if bool(result) != is_and:
+                return result
+        return result
+
+    return boolean
+
+
+def _compile_compare(node: Any) -> Evaluator | None:
+    if not all(type(op) in _COMPARE_OPS for op in node.ops):
+        return None
+    first = _compile(node.left)
+    chain = [
+        (_COMPARE_OPS[type(op)], _compile(comparator))
+        for op, comparator in zip(node.ops, node.comparators, strict=True)
+    ]
+
+    def compare(scope: Mapping[str, Any]) -> bool:
+        lhs = first(scope)
+        for compare_op, comparator in chain:
+            rhs = comparator(scope)
+            if not compare_op(lhs, rhs):
+                return False
+            lhs = rhs
+        return True
+
+    return compare
+
+
+def _compile_conditional(node: Any) -> Evaluator:
+    test, body, orelse = _compile(node.test), _compile(node.body), _compile(node.orelse)
+    return lambda scope: body(scope) if test(scope) else orelse(scope)
+
+
+def _compile_subscript(node: Any) -> Evaluator | None:
+    if isinstance(node.slice, ast.Slice):
+        return None
+    container, key = _compile(node.value), _compile(node.slice)
+    return lambda scope: container(scope)[key(scope)]
+
+
+_COMPILERS: dict[type[ast.expr], Callable[[Any], Evaluator | None]] = {
+    ast.Constant: _compile_constant,
+    ast.Name: _compile_name,
+    ast.BinOp: _compile_binary,
+    ast.UnaryOp: _compile_unary,
+    ast.BoolOp: _compile_boolean,
+    ast.Compare: _compile_compare,
+    ast.IfExp: _compile_conditional,
+    ast.Subscript: _compile_subscript,
+}
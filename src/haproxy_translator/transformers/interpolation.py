@@ -0,0 +1,84 @@
+"""Compiled ``${...}`` interpolation templates.
+
+Strings are split into literal text and references once, compiled to a
+``str.format`` template and cached by their text, so substituting the same
+string again - for every iteration of a loop, or every section that uses
+it - is a single format call rather than a regex scan.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# ${name}: variable references, as resolved by VariableResolver
+VARIABLE_PATTERN = re.compile(r"\$\{([a-zA-Z_][a-zA-Z0-9_]*)\}")
+
+# ${expr}: loop variables and expressions, as evaluated by LoopUnroller
+EXPRESSION_PATTERN = re.compile(r"\$\{([^}]+)\}")
+
+# Distinct strings kept per pattern
+CACHE_SIZE = 65536
+
+
+@dataclass(frozen=True)
+class Template:
+    """A string compiled to a format string and the references it interpolates.
+
+    ``format`` has one ``{}`` field per reference, in order; braces in the
+    literal text are escaped.
+    """
+
+    format: str
+    references: tuple[str, ...] = ()
+
+    def render(self, lookup: Callable[[str], str]) -> str:
+        """Return the string with each reference replaced by ``lookup(reference)``."""
+        return self.format.format(*map(lookup, self.references))
+
+
+def _escape(literal: str) -> str:
+    return literal.replace("{", "{{").replace("}", "}}")
+
+
+def _compile(pattern: re.Pattern[str], text: str) -> Template:
+    # split() with one capturing group alternates literal, reference, literal, ...
+    fragments = pattern.split(text)
+    return Template(
+        format="{}".join(_escape(literal) for literal in fragments[0::2]),
+        references=tuple(reference.strip() for reference in fragments[1::2]),
+    )
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_variables(text: str) -> Template:
+    return _compile(VARIABLE_PATTERN, text)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_expressions(text: str) -> Template:
+    return _compile(EXPRESSION_PATTERN, text)
+
+
+def compile_variables(text: str) -> Template:
+    """Return the template of ``${name}`` variable references in text."""
+    if "${" not in text:
+        # Plain strings are by far the most common; don't fill the cache with them
+        return Template(format=_escape(text))
+    return _compile_variables(text)
+
+
+def compile_expressions(text: str) -> Template:
+    """Return the template of ``${expr}`` expressions in text, stripped of spaces."""
+    if "${" not in text:
+        return Template(format=_escape(text))
+    return _compile_expressions(text)
+
+
+def clear_template_cache() -> None:
+    """Forget every compiled template."""
+    _compile_variables.cache_clear()
+    _compile_expressions.cache_clear()
@@ -1,18 +1,25 @@
 """Loop unrolling transformer - expands for loops into server definitions."""
 
-import re
 from dataclasses import replace
 from typing import TYPE_CHECKING, Any
 
 from ..ir.nodes import Backend, ConfigIR, ForLoop, Server
 from ..utils.errors import ParseError
+from .expressions import Scope, compile_expression
+from .interpolation import compile_expressions
+from .sharing import map_changed, replace_changed
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from ..ir.nodes import Variable
 
 
 class LoopUnroller:
-    """Expands for loops in server definitions."""
+    """Expands for loops in server definitions.
+
+    ``unroll`` unrolls every backend; ``unroll_backend`` unrolls one.
+    """
 
     def __init__(self, config: ConfigIR, variables: dict[str, Variable] | None = None):
         self.config = config
@@ -24,14 +31,14 @@ class LoopUnroller:
     def unroll(self) -> ConfigIR:
         """Unroll all for loops in the configuration."""
         # Process each backend's servers
-        expanded_backends = [self._unroll_backend(backend) for backend in self.config.backends]
+        expanded_backends = map_changed(self.unroll_backend, self.config.backends)
 
-        return replace(
+        return replace_changed(
             self.config,
             backends=expanded_backends,
         )
 
-    def _unroll_backend(self, backend: Backend) -> Backend:
+    def unroll_backend(self, backend: Backend) -> Backend:
         """Unroll for loops in a backend's servers."""
         # Check if backend has loops in metadata
         if "server_loops" not in backend.metadata:
@@ -64,8 +71,8 @@ class LoopUnroller:
 
         servers = []
         for value in values:
-            # Create a context with the loop variable
-            context = {loop.variable: value}
+            # Create a context with the loop variable over the global variables
+            context = Scope({loop.variable: value}, self.variables)
 
             # Expand each item in the loop body
             for body_item in loop.body:
@@ -92,9 +99,9 @@ class LoopUnroller:
                 if isinstance(val, (int, float)):
                     return int(val)
                 if isinstance(val, str):
-                    # An empty context is passed for the loop variable,
-                    # as it is not yet defined.
-                    resolved = self._substitute_variables(val, {})
+                    # Only global variables are in scope, as the loop
+                    # variable is not yet defined.
+                    resolved = self._substitute_variables(val, self.variables)
                     try:
                         return int(resolved)
                     except ValueError as err:
@@ -115,7 +122,7 @@ class LoopUnroller:
         # Handle other types
         raise ParseError(f"Unsupported iterable type: {type(iterable)} from {iterable}")
 
-    def _expand_server(self, server: Server, context: dict[str, Any]) -> Server:
+    def _expand_server(self, server: Server, context: Mapping[str, Any]) -> Server:
         """Expand a server template with variable substitution."""
         # Substitute variables in name
         name = self._substitute_variables(server.name, context)
@@ -124,34 +131,21 @@ class LoopUnroller:
         address = self._substitute_variables(server.address, context)
 
         # Create new server with substituted values
-        return replace(
+        return replace_changed(
             server,
             name=name,
             address=address,
         )
 
-    def _substitute_variables(self, text: str, context: dict[str, Any]) -> str:
-        """Substitute ${var} and ${expr} in a string."""
-        # Pattern for ${...}
-        pattern = re.compile(r"\$\{([^}]+)\}")
-
-        def replacer(match: re.Match[str]) -> str:
-            expr = match.group(1).strip()
-
-            # Combine global and loop-local contexts. Local context has precedence.
-            eval_context = {**self.variables, **context}
-
-            # Check if it's a simple variable reference
-            if expr in eval_context:
-                return str(eval_context[expr])
+    def _substitute_variables(self, text: str, scope: Mapping[str, Any]) -> str:
+        """Substitute ${var} and ${expr} in a string, evaluated against scope."""
+        if "${" not in text:
+            return text
 
-            # Try to evaluate as an expression
+        def evaluate(expr: str) -> str:
             try:
-                # Create a safe evaluation context with loop variables
-                # Evaluate the expression
-                result = eval(expr, {"__builtins__": {}}, eval_context)
-                return str(result)
+                return str(compile_expression(expr)(scope))
             except Exception as e:
                 raise ParseError(f"Failed to evaluate expression '{expr}': {e}") from e
 
-        return pattern.sub(replacer, text)
+        return compile_expressions(text).render(evaluate)
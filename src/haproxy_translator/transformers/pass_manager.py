@@ -0,0 +1,97 @@
+"""Pass manager - runs loop, template and variable stages in a single walk."""
+
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
+from ..ir.columns import ServerColumns
+from .loop_unroller import LoopUnroller
+from .sharing import map_changed, replace_changed
+from .template_expander import TemplateExpander
+from .variable_resolver import VariableResolver
+
+if TYPE_CHECKING:
+    from ..ir.interning import IRInterner
+    from ..ir.nodes import Backend, ConfigIR, Frontend, Listen
+
+
+class PassManager:
+    """Unrolls loops, expands templates and resolves variables in one walk.
+
+    Variable values are resolved once up front, since loop ranges and every
+    substitution depend on them. Each section is then taken through the
+    remaining stages in dependency order before moving on to the next:
+
+    - backends: unroll server loops, expand templates, resolve variables
+    - frontends and listens: expand templates, resolve variables
+    - global, defaults and Lua scripts: resolve variables
+
+    Loop-generated servers are expanded and resolved along with the rest
+    of their backend, so no stage has to run a second time. The stages are
+    the public per-section methods of LoopUnroller, TemplateExpander and
+    VariableResolver.
+
+    With an ``interner``, each section is interned as soon as it is done,
+    so duplicates produced by one backend's loops are released before the
+    next backend is expanded. Backends with at least ``columnar_servers``
+    servers have them stored as ServerColumns once they are resolved; the
+    Server list they are built from is the backend's peak, as before.
+    """
+
+    def __init__(
+        self,
+        config: ConfigIR,
+        interner: IRInterner | None = None,
+        columnar_servers: int | None = None,
+    ):
+        self.config = config
+        self.interner = interner
+        self.columnar_servers = columnar_servers
+        self.template_expander = TemplateExpander(config)
+        self.variable_resolver = VariableResolver(config)
+
+    def run(self) -> ConfigIR:
+        """Run every stage over the configuration."""
+        resolver = self.variable_resolver
+        variables = resolver.resolve_variable_values()
+        loop_unroller = LoopUnroller(self.config, variables=variables)
+
+        config = self.config
+        intern = self._intern
+        config = replace_changed(
+            config,
+            variables=variables,
+            global_config=(
+                intern(resolver.resolve_global(config.global_config))
+                if config.global_config
+                else None
+            ),
+            defaults=(
+                intern(resolver.resolve_defaults(config.defaults)) if config.defaults else None
+            ),
+            frontends=map_changed(self._run_frontend, config.frontends),
+            backends=map_changed(
+                lambda backend: self._run_backend(backend, loop_unroller), config.backends
+            ),
+            listens=map_changed(self._run_listen, config.listens),
+            lua_scripts=map_changed(resolver.resolve_lua_script, config.lua_scripts),
+        )
+        return intern(config)
+
+    def _intern[T](self, value: T) -> T:
+        return value if self.interner is None else self.interner.intern(value)
+
+    def _run_frontend(self, frontend: Frontend) -> Frontend:
+        frontend = self.template_expander.expand_frontend(frontend)
+        return self._intern(self.variable_resolver.resolve_frontend(frontend))
+
+    def _run_backend(self, backend: Backend, loop_unroller: LoopUnroller) -> Backend:
+        backend = loop_unroller.unroll_backend(backend)
+        backend = self.template_expander.expand_backend(backend)
+        backend = self.variable_resolver.resolve_backend(backend)
+        if self.columnar_servers is not None and len(backend.servers) >= self.columnar_servers:
+            backend = replace(backend, servers=ServerColumns.from_servers(backend.servers))
+        return self._intern(backend)
+
+    def _run_listen(self, listen: Listen) -> Listen:
+        listen = self.template_expander.expand_listen(listen)
+        return self._intern(self.variable_resolver.resolve_listen(listen))
@@ -0,0 +1,39 @@
+"""Copy-on-write helpers for the IR transformers.
+
+IR nodes are immutable, so a transform that changes nothing can return the
+node it was given. The stages follow that convention through these
+helpers: a node is only copied when one of its fields actually changed, and
+a parent is only rebuilt when one of its children was. A pass over a
+subtree with no templates, loops or variables then allocates nothing.
+
+Changes are detected by identity, which the stages preserve for values
+they leave alone (a string without ``${`` is returned as is).
+"""
+
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+
+def replace_changed[T](node: T, **changes: Any) -> T:
+    """Like ``dataclasses.replace``, but return ``node`` if no field changes."""
+    changed = {name: value for name, value in changes.items() if value is not getattr(node, name)}
+    return replace(node, **changed) if changed else node  # type: ignore[type-var]
+
+
+def map_changed[T](function: Callable[[T], T], items: Sequence[T]) -> Sequence[T]:
+    """Apply ``function`` to each item; return ``items`` itself if none changes.
+
+    A new list is only built from the first changed item on.
+    """
+    results: list[T] | None = None
+    for index, item in enumerate(items):
+        result = function(item)
+        if results is None:
+            if result is item:
+                continue
+            results = list(items[:index])
+        results.append(result)
+    return items if results is None else results
@@ -1,16 +1,20 @@
 """Template expansion transformer - expands @template spreads into properties."""
 
-from dataclasses import replace
 from typing import TYPE_CHECKING, Any
 
 from ..ir.nodes import BalanceAlgorithm, Mode
+from .sharing import map_changed, replace_changed
 
 if TYPE_CHECKING:
     from ..ir.nodes import ACL, Backend, ConfigIR, Frontend, HealthCheck, Listen, Server
 
 
 class TemplateExpander:
-    """Expands template spreads in server, health check, and ACL definitions."""
+    """Expands template spreads in server, health check, and ACL definitions.
+
+    ``expand`` expands the whole configuration; ``expand_frontend``,
+    ``expand_backend`` and ``expand_listen`` expand one section each.
+    """
 
     def __init__(self, config: ConfigIR):
         self.config = config
@@ -19,53 +23,53 @@ class TemplateExpander:
     def expand(self) -> ConfigIR:
         """Expand all template spreads in the configuration."""
         # Process each backend's servers, health checks, and ACLs
-        expanded_backends = [self._expand_backend(backend) for backend in self.config.backends]
+        expanded_backends = map_changed(self.expand_backend, self.config.backends)
 
         # Process each frontend's ACLs
-        expanded_frontends = [self._expand_frontend(frontend) for frontend in self.config.frontends]
+        expanded_frontends = map_changed(self.expand_frontend, self.config.frontends)
 
         # Process each listen section
-        expanded_listens = [self._expand_listen(listen) for listen in self.config.listens]
+        expanded_listens = map_changed(self.expand_listen, self.config.listens)
 
-        return replace(
+        return replace_changed(
             self.config,
             backends=expanded_backends,
             frontends=expanded_frontends,
             listens=expanded_listens,
         )
 
-    def _expand_frontend(self, frontend: Frontend) -> Frontend:
+    def expand_frontend(self, frontend: Frontend) -> Frontend:
         """Expand template spreads in a frontend's ACLs."""
-        expanded_acls = [self._expand_acl(acl) for acl in frontend.acls]
-        return replace(frontend, acls=expanded_acls)
+        expanded_acls = map_changed(self._expand_acl, frontend.acls)
+        return replace_changed(frontend, acls=expanded_acls)
 
-    def _expand_listen(self, listen: Listen) -> Listen:
+    def expand_listen(self, listen: Listen) -> Listen:
         """Expand template spreads in a listen section."""
-        expanded_servers = [self._expand_server(server) for server in listen.servers]
-        expanded_acls = [self._expand_acl(acl) for acl in listen.acls]
+        expanded_servers = map_changed(self._expand_server, listen.servers)
+        expanded_acls = map_changed(self._expand_acl, listen.acls)
         expanded_health_check = (
             self._expand_health_check(listen.health_check) if listen.health_check else None
         )
 
-        return replace(
+        return replace_changed(
             listen,
             servers=expanded_servers,
             acls=expanded_acls,
             health_check=expanded_health_check,
         )
 
-    def _expand_backend(self, backend: Backend) -> Backend:
+    def expand_backend(self, backend: Backend) -> Backend:
         """Expand template spreads in a backend's servers, health check, ACLs, and backend-level properties."""
         # First expand child elements
-        expanded_servers = [self._expand_server(server) for server in backend.servers]
-        expanded_acls = [self._expand_acl(acl) for acl in backend.acls]
+        expanded_servers = map_changed(self._expand_server, backend.servers)
+        expanded_acls = map_changed(self._expand_acl, backend.acls)
         expanded_health_check = (
             self._expand_health_check(backend.health_check) if backend.health_check else None
         )
 
         # Check if backend has template spreads
         if "template_spreads" not in backend.metadata:
-            return replace(
+            return replace_changed(
                 backend,
                 servers=expanded_servers,
                 acls=expanded_acls,
@@ -94,7 +98,7 @@ class TemplateExpander:
                     backend_dict[field_name] = converted_value
 
         # Create new backend with expanded properties
-        return replace(
+        return replace_changed(
             backend,
             servers=expanded_servers,
             acls=expanded_acls,
@@ -130,7 +134,7 @@ class TemplateExpander:
                     server_dict[field_name] = value
 
         # Create new server with expanded properties
-        return replace(server, **server_dict)
+        return replace_changed(server, **server_dict)
 
     def _expand_health_check(self, health_check: HealthCheck) -> HealthCheck:
         """Expand template spreads in a health check definition."""
@@ -158,7 +162,7 @@ class TemplateExpander:
                     hc_dict[field_name] = value
 
         # Create new health check with expanded properties
-        return replace(health_check, **hc_dict)
+        return replace_changed(health_check, **hc_dict)
 
     def _expand_acl(self, acl: ACL) -> ACL:
         """Expand template spreads in an ACL definition."""
@@ -186,7 +190,7 @@ class TemplateExpander:
                     acl_dict[field_name] = value
 
         # Create new ACL with expanded properties
-        return replace(acl, **acl_dict)
+        return replace_changed(acl, **acl_dict)
 
     def _server_to_dict(self, server: Server) -> dict[str, Any]:
         """Extract explicit (non-default) server properties to a dict."""
@@ -1,11 +1,11 @@
 """Variable resolution transformer - resolves variables and env() calls."""
 
 import os
-import re
-from dataclasses import replace
 from typing import TYPE_CHECKING, Any
 
 from ..utils.errors import ParseError
+from .interpolation import VARIABLE_PATTERN, compile_variables
+from .sharing import map_changed, replace_changed
 
 if TYPE_CHECKING:
     from ..ir.nodes import (
@@ -25,34 +25,37 @@ if TYPE_CHECKING:
 
 
 class VariableResolver:
-    """Resolves variable references and environment variables in the configuration."""
+    """Resolves variable references and environment variables in the configuration.
+
+    ``resolve`` resolves the whole configuration. ``resolve_variable_values``
+    followed by the per-section ``resolve_*`` methods does the same one
+    section at a time, as PassManager does.
+    """
 
     def __init__(self, config: ConfigIR):
         self.config = config
         self.variables = config.variables
         # Pattern for ${var_name} in strings
-        self.var_pattern = re.compile(r"\$\{([a-zA-Z_][a-zA-Z0-9_]*)\}")
+        self.var_pattern = VARIABLE_PATTERN
 
     def resolve(self) -> ConfigIR:
         """Resolve all variables and env() calls in the configuration."""
         # First, resolve env() calls in variable values
-        resolved_variables = self._resolve_variable_values()
+        resolved_variables = self.resolve_variable_values()
 
         # Then substitute variable references throughout the config
         resolved_global = (
-            self._resolve_global(self.config.global_config) if self.config.global_config else None
+            self.resolve_global(self.config.global_config) if self.config.global_config else None
         )
         resolved_defaults = (
-            self._resolve_defaults(self.config.defaults) if self.config.defaults else None
+            self.resolve_defaults(self.config.defaults) if self.config.defaults else None
         )
-        resolved_frontends = [self._resolve_frontend(f) for f in self.config.frontends]
-        resolved_backends = [self._resolve_backend(b) for b in self.config.backends]
-        resolved_listens = [self._resolve_listen(listen) for listen in self.config.listens]
-        resolved_lua_scripts = [
-            self._resolve_lua_script(script) for script in self.config.lua_scripts
-        ]
-
-        return replace(
+        resolved_frontends = map_changed(self.resolve_frontend, self.config.frontends)
+        resolved_backends = map_changed(self.resolve_backend, self.config.backends)
+        resolved_listens = map_changed(self.resolve_listen, self.config.listens)
+        resolved_lua_scripts = map_changed(self.resolve_lua_script, self.config.lua_scripts)
+
+        return replace_changed(
             self.config,
             variables=resolved_variables,
             global_config=resolved_global,
@@ -63,84 +66,117 @@ class VariableResolver:
             lua_scripts=resolved_lua_scripts,
         )
 
-    def _resolve_variable_values(self) -> dict[str, Variable]:
+    def resolve_variable_values(self) -> dict[str, Variable]:
         """Resolve env() calls and variable references in variable values.
 
-        Performs multiple passes to resolve nested variable references.
+        Builds the ``${...}`` reference graph once and resolves variables in
+        dependency order, so each value is substituted exactly once and
+        chains of any depth resolve.
         For example: port=8080, addr="10.0.1.1:${port}" -> addr="10.0.1.1:8080"
-        """
-        # Start with original variables
-        resolved = dict(self.variables)
-
-        # Keep resolving until no more changes occur (max 10 passes to prevent infinite loops)
-        max_passes = 10
-        for _ in range(max_passes):
-            changed = False
-            new_resolved = {}
 
-            for name, var in resolved.items():
-                # Temporarily update self.variables to use partially resolved values
-                old_variables = self.variables
-                self.variables = resolved
+        Raises:
+            ParseError: If variables reference each other in a cycle
+        """
+        references = {name: self._references(var.value) for name, var in self.variables.items()}
 
-                try:
-                    resolved_value = self._resolve_value(var.value)
-                    new_resolved[name] = replace(var, value=resolved_value)
+        resolved: dict[str, Variable] = {}
+        original = self.variables
+        # Substitute from the resolved values; every dependency of a variable
+        # comes before it in the resolution order
+        self.variables = resolved
+        try:
+            for name in self._resolution_order(references):
+                var = original[name]
+                resolved[name] = replace_changed(var, value=self._resolve_value(var.value))
+        finally:
+            self.variables = original
 
-                    # Check if value changed
-                    if resolved_value != var.value:
-                        changed = True
-                finally:
-                    self.variables = old_variables
+        # Update self.variables with final resolved values for use in config resolution
+        self.variables = {name: resolved[name] for name in original}
+        return self.variables
 
-            resolved = new_resolved
+    def _references(self, value: Any) -> list[str]:
+        """Return the variable names referenced by ``${...}`` in a value."""
+        if isinstance(value, str):
+            return list(dict.fromkeys(compile_variables(value).references))
+        if isinstance(value, dict):
+            value = list(value.values())
+        if isinstance(value, list):
+            return list(dict.fromkeys(ref for item in value for ref in self._references(item)))
+        return []
 
-            # If nothing changed, we're done
-            if not changed:
-                break
+    def _resolution_order(self, references: dict[str, list[str]]) -> list[str]:
+        """Topologically sort variables so each comes after those it references.
 
-        # Update self.variables with final resolved values for use in config resolution
-        self.variables = resolved
-        return resolved
+        References to undefined variables are left for substitution to report.
+        """
+        order: list[str] = []
+        done: set[str] = set()
+        for root, root_references in references.items():
+            if root in done:
+                continue
+            # Iterative depth-first search: chains can be thousands deep
+            path = [root]
+            on_path = {root}
+            pending = [iter(root_references)]
+            while pending:
+                for dep in pending[-1]:
+                    if dep not in references or dep in done:
+                        continue
+                    if dep in on_path:
+                        cycle = [*path[path.index(dep) :], dep]
+                        raise ParseError(f"Variable reference cycle: {' -> '.join(cycle)}")
+                    path.append(dep)
+                    on_path.add(dep)
+                    pending.append(iter(references[dep]))
+                    break
+                else:
+                    pending.pop()
+                    name = path.pop()
+                    on_path.discard(name)
+                    done.add(name)
+                    order.append(name)
+        return order
 
     def _resolve_value(self, value: Any) -> Any:
-        """Resolve a single value (handles strings, numbers, bools, etc.)."""
+        """Resolve a single value (handles strings, numbers, bools, etc.).
+
+        Returns ``value`` itself when it contains no references.
+        """
         if isinstance(value, str):
             # Substitute ${var} references
             return self._substitute_variables(value)
         if isinstance(value, dict):
             # Recursively resolve dictionary values
-            return {k: self._resolve_value(v) for k, v in value.items()}
+            resolved = {k: self._resolve_value(v) for k, v in value.items()}
+            return value if all(resolved[k] is v for k, v in value.items()) else resolved
         if isinstance(value, list):
             # Recursively resolve list items
-            return [self._resolve_value(item) for item in value]
+            return map_changed(self._resolve_value, value)
         # Numbers, booleans, None, etc. - return as-is
         return value
 
     def _substitute_variables(self, text: str) -> str:
         """Substitute ${var_name} references in a string."""
-
-        def replacer(match: re.Match[str]) -> str:
-            var_name = match.group(1)
-            if var_name in self.variables:
-                var_value = self.variables[var_name].value
-                # Convert value to string
-                if isinstance(var_value, bool):
-                    return "true" if var_value else "false"
-                return str(var_value)
-            # Leave unresolved variables as-is (or raise error)
-            raise ParseError(f"Undefined variable: {var_name}")
-
-        return self.var_pattern.sub(replacer, text)
-
-    def _resolve_global(self, global_config: GlobalConfig) -> GlobalConfig:
+        if "${" not in text:
+            return text
+        return compile_variables(text).render(self._variable_text)
+
+    def _variable_text(self, var_name: str) -> str:
+        """Return the text a ${var_name} reference is replaced with."""
+        if var_name in self.variables:
+            var_value = self.variables[var_name].value
+            # Convert value to string
+            if isinstance(var_value, bool):
+                return "true" if var_value else "false"
+            return str(var_value)
+        # Leave unresolved variables as-is (or raise error)
+        raise ParseError(f"Undefined variable: {var_name}")
+
+    def resolve_global(self, global_config: GlobalConfig) -> GlobalConfig:
         """Resolve variables in global config."""
         # Resolve Lua scripts in global config
-        resolved_lua_scripts = []
-        if global_config.lua_scripts:
-            resolved_lua_scripts = [
-                self._resolve_lua_script(script) for script in global_config.lua_scripts
-            ]
+        resolved_lua_scripts = map_changed(self.resolve_lua_script, global_config.lua_scripts)
 
         # Resolve maxconn if it's a variable reference
         resolved_maxconn = global_config.maxconn
@@ -151,20 +187,22 @@ class VariableResolver:
             except (ValueError, TypeError):
                 resolved_maxconn = global_config.maxconn
 
-        return replace(global_config, lua_scripts=resolved_lua_scripts, maxconn=resolved_maxconn)
+        return replace_changed(
+            global_config, lua_scripts=resolved_lua_scripts, maxconn=resolved_maxconn
+        )
 
-    def _resolve_defaults(self, defaults: DefaultsConfig) -> DefaultsConfig:
+    def resolve_defaults(self, defaults: DefaultsConfig) -> DefaultsConfig:
         """Resolve variables in defaults config."""
         # Resolve log if it's a string
         resolved_log = (
             self._resolve_value(defaults.log) if isinstance(defaults.log, str) else defaults.log
         )
-        return replace(defaults, log=resolved_log)
+        return replace_changed(defaults, log=resolved_log)
 
-    def _resolve_frontend(self, frontend: Frontend) -> Frontend:
+    def resolve_frontend(self, frontend: Frontend) -> Frontend:
         """Resolve variables in frontend."""
         # Resolve bind addresses
-        resolved_binds = [self._resolve_bind(b) for b in frontend.binds]
+        resolved_binds = map_changed(self._resolve_bind, frontend.binds)
 
         # Resolve default_backend if it's a variable reference
         resolved_default_backend = (
@@ -172,40 +210,40 @@ class VariableResolver:
         )
 
         # Resolve ACLs
-        resolved_acls = [self._resolve_acl(acl) for acl in frontend.acls]
+        resolved_acls = map_changed(self._resolve_acl, frontend.acls)
 
-        return replace(
+        return replace_changed(
             frontend,
             binds=resolved_binds,
             default_backend=resolved_default_backend,
             acls=resolved_acls,
         )
 
-    def _resolve_backend(self, backend: Backend) -> Backend:
+    def resolve_backend(self, backend: Backend) -> Backend:
         """Resolve variables in backend."""
         # Resolve servers
-        resolved_servers = [self._resolve_server(s) for s in backend.servers]
+        resolved_servers = map_changed(self._resolve_server, backend.servers)
 
         # Resolve health check if present
         resolved_health_check = (
             self._resolve_health_check(backend.health_check) if backend.health_check else None
         )
 
-        return replace(
+        return replace_changed(
             backend,
             servers=resolved_servers,
             health_check=resolved_health_check,
         )
 
-    def _resolve_listen(self, listen: Listen) -> Listen:
+    def resolve_listen(self, listen: Listen) -> Listen:
         """Resolve variables in listen section."""
         # Resolve binds
-        resolved_binds = [self._resolve_bind(b) for b in listen.binds]
+        resolved_binds = map_changed(self._resolve_bind, listen.binds)
 
         # Resolve servers
-        resolved_servers = [self._resolve_server(s) for s in listen.servers]
+        resolved_servers = map_changed(self._resolve_server, listen.servers)
 
-        return replace(
+        return replace_changed(
             listen,
             binds=resolved_binds,
             servers=resolved_servers,
@@ -215,7 +253,7 @@ class VariableResolver:
         """Resolve variables in bind directive."""
         resolved_address = self._resolve_value(bind.address)
         resolved_ssl_cert = self._resolve_value(bind.ssl_cert) if bind.ssl_cert else None
-        return replace(bind, address=resolved_address, ssl_cert=resolved_ssl_cert)
+        return replace_changed(bind, address=resolved_address, ssl_cert=resolved_ssl_cert)
 
     def _resolve_server(self, server: Server) -> Server:
         """Resolve variables in server."""
@@ -245,7 +283,7 @@ class VariableResolver:
                 resolved_weight = resolved_weight_str
 
         # Resolve ALPN list (may contain variable references)
-        resolved_alpn = self._resolve_value(server.alpn) if server.alpn else []
+        resolved_alpn = self._resolve_value(server.alpn) if server.alpn else server.alpn
 
         # Resolve other server options that may contain variables
         resolved_sni = self._resolve_value(server.sni) if server.sni else None
@@ -253,7 +291,7 @@ class VariableResolver:
         resolved_ca_file = self._resolve_value(server.ca_file) if server.ca_file else None
         resolved_crt = self._resolve_value(server.crt) if server.crt else None
 
-        return replace(
+        return replace_changed(
             server,
             address=resolved_address,
             port=resolved_port,
@@ -269,15 +307,15 @@ class VariableResolver:
     def _resolve_acl(self, acl: ACL) -> ACL:
         """Resolve variables in ACL."""
         resolved_criterion = self._resolve_value(acl.criterion)
-        resolved_values = [self._resolve_value(v) for v in acl.values]
-        return replace(acl, criterion=resolved_criterion, values=resolved_values)
+        resolved_values = map_changed(self._resolve_value, acl.values)
+        return replace_changed(acl, criterion=resolved_criterion, values=resolved_values)
 
     def _resolve_health_check(self, health_check: HealthCheck) -> HealthCheck:
         """Resolve variables in health check."""
         resolved_uri = str(self._resolve_value(health_check.uri))
-        return replace(health_check, uri=resolved_uri)
+        return replace_changed(health_check, uri=resolved_uri)
 
-    def _resolve_lua_script(self, script: LuaScript) -> LuaScript:
+    def resolve_lua_script(self, script: LuaScript) -> LuaScript:
         """Resolve variables in Lua script."""
         # Do NOT resolve content - it may contain Lua template parameters like ${user}
         # which should be preserved for Lua manager interpolation
@@ -287,11 +325,9 @@ class VariableResolver:
             resolved_content = self._resolve_value(script.content)
 
         # Resolve parameters (template parameters might reference config variables)
-        resolved_parameters = {
-            key: self._resolve_value(value) for key, value in script.parameters.items()
-        }
+        resolved_parameters = self._resolve_value(script.parameters)
 
-        return replace(
+        return replace_changed(
             script,
             content=resolved_content,
             parameters=resolved_parameters,
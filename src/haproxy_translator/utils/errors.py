@@ -3,7 +3,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True)
 class SourceLocation:
     """Source code location for error reporting."""
 
@@ -61,6 +61,12 @@ class CodeGenerationError(TranslatorError):
     pass
 
 
+class SerializationError(TranslatorError):
+    """Error writing or reading serialized IR."""
+
+    pass
+
+
 @dataclass
 class ValidationResult:
     """Result of validation."""
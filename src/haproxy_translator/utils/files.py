@@ -0,0 +1,108 @@
+"""Atomic file writes that leave unchanged files alone.
+
+Output is written to a temporary file next to the target and renamed over
+it, so readers never see a partial file. When the target already has the
+same content (same size and BLAKE2b digest), the temporary file is
+discarded instead, keeping the target's mtime: tools that reload HAProxy
+when the configuration file changes then see no change.
+"""
+
+import hashlib
+import os
+import secrets
+import shutil
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+    from typing import TextIO
+
+
+def _file_digest(path: Path) -> bytes:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "blake2b").digest()
+
+
+def _has_content(path: Path, size: int, digest: Callable[[], bytes]) -> bool:
+    """Return whether ``path`` is a file of ``size`` bytes with the given digest."""
+    try:
+        if path.stat().st_size != size:
+            return False
+        return _file_digest(path) == digest()
+    except OSError:
+        return False
+
+
+def _temp_path(path: Path) -> Path:
+    # Same directory, so the final rename stays on one filesystem
+    return path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+
+
+def _write_temp(path: Path, write: Callable[[TextIO], object]) -> Path:
+    """Write a temporary file next to ``path`` with ``write`` and return its path."""
+    temp = _temp_path(path)
+    try:
+        # Exclusive creation applies the umask, like a plain write would
+        with temp.open("x", encoding="utf-8", newline="") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    return temp
+
+
+def _replace(temp: Path, path: Path) -> None:
+    """Rename ``temp`` over ``path``, keeping the permissions ``path`` had."""
+    try:
+        if path.exists():
+            shutil.copymode(path, temp)
+        temp.replace(path)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+
+
+def write_text_if_changed(path: Path, text: str) -> bool:
+    """Atomically write ``text`` to ``path`` (UTF-8) unless it already holds it.
+
+    Args:
+        path: File to write; its directory must exist
+        text: New content
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    data = text.encode("utf-8")
+    if _has_content(path, len(data), lambda: hashlib.blake2b(data).digest()):
+        return False
+    _replace(_write_temp(path, lambda f: f.write(text)), path)
+    return True
+
+
+def stream_text_if_changed(path: Path, write: Callable[[TextIO], None]) -> bool:
+    """Atomically write what ``write`` writes to a text stream to ``path``.
+
+    The content is streamed into the temporary file, so it is never held
+    in memory; it is compared with ``path`` once complete.
+
+    Args:
+        path: File to write; its directory must exist
+        write: Writes the new content to the UTF-8 text stream it is given
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    temp = _write_temp(path, write)
+    try:
+        unchanged = _has_content(path, temp.stat().st_size, lambda: _file_digest(temp))
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    if unchanged:
+        temp.unlink()
+        return False
+    _replace(temp, path)
+    return True
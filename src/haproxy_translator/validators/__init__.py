@@ -1,9 +1,19 @@
 """Validators for HAProxy configuration."""
 
+from .performance import (
+    PerformanceImpact,
+    PerformanceIssue,
+    PerformanceReport,
+    PerformanceValidator,
+)
 from .security import SecurityIssue, SecurityLevel, SecurityReport, SecurityValidator
 from .semantic import SemanticValidator
 
 __all__ = [
+    "PerformanceImpact",
+    "PerformanceIssue",
+    "PerformanceReport",
+    "PerformanceValidator",
     "SecurityIssue",
     "SecurityLevel",
     "SecurityReport",
@@ -0,0 +1,399 @@
+"""Performance validation for HAProxy configuration.
+
+This module reports settings known to cost throughput, latency or memory,
+along with an estimate of what each costs and how to fix it.
+"""
+
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import TYPE_CHECKING, ClassVar
+
+from ..ir.nodes import BalanceAlgorithm, Mode
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from ..ir.nodes import (
+        ACL,
+        Backend,
+        ConfigIR,
+        DefaultsConfig,
+        Frontend,
+        Listen,
+        StickTable,
+    )
+
+
+class PerformanceImpact(Enum):
+    """Performance issue impact levels."""
+
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+    INFO = "info"
+
+
+@dataclass
+class PerformanceIssue:
+    """Represents a performance issue found during validation."""
+
+    impact: PerformanceImpact
+    message: str
+    location: str
+    cost: str
+    recommendation: str
+
+
+@dataclass
+class PerformanceReport:
+    """Results of performance validation."""
+
+    issues: list[PerformanceIssue] = field(default_factory=list)
+
+    def add_issue(self, issue: PerformanceIssue) -> None:
+        """Add an issue to the report."""
+        self.issues.append(issue)
+
+
+class PerformanceValidator:
+    """Validates performance aspects of HAProxy configuration.
+
+    Checks for:
+    - Regex ACLs whose patterns are plain strings, prefixes or suffixes
+    - HTTP backends that don't reuse server connections
+    - ``option httpclose`` defeating keep-alive
+    - Threads not bound to CPUs
+    - Stick tables whose entries never expire
+    - ``tune.maxrewrite`` taking most of ``tune.bufsize``
+    - ``balance source`` over large server pools
+    """
+
+    # HAProxy defaults for the buffer settings
+    DEFAULT_BUFSIZE = 16384
+    DEFAULT_MAXREWRITE = 1024
+
+    # Servers from which a pool counts as large for source hashing
+    LARGE_POOL_SIZE = 32
+
+    # Options closing connections after each request
+    CLOSE_OPTIONS = frozenset({"httpclose", "forceclose"})
+
+    # Characters special in regexes outside of an escape
+    REGEX_SPECIAL = frozenset(".^$*+?()[]{}|\\")
+
+    # Cheaper match method for literal patterns, by anchors: (start, end)
+    LITERAL_METHODS: ClassVar[dict[tuple[bool, bool], str]] = {
+        (True, True): "str",
+        (True, False): "beg",
+        (False, True): "end",
+        (False, False): "sub",
+    }
+
+    # What the patterns of each match method are
+    METHOD_PATTERNS: ClassVar[dict[str, str]] = {
+        "str": "strings",
+        "beg": "prefixes",
+        "end": "suffixes",
+        "sub": "substrings",
+    }
+
+    def __init__(self, config: ConfigIR):
+        self.config = config
+        self.report = PerformanceReport()
+
+    def validate(self) -> PerformanceReport:
+        """Run all performance validations and return a report."""
+        self._check_acl_matching()
+        self._check_connection_reuse()
+        self._check_connection_close()
+        self._check_threads()
+        self._check_stick_tables()
+        self._check_buffers()
+        self._check_source_balancing()
+
+        return self.report
+
+    def _proxies(self) -> list[tuple[str, Frontend | Backend | Listen]]:
+        """Return the frontends, backends and listens with their locations."""
+        return [
+            *((f"frontend '{frontend.name}'", frontend) for frontend in self.config.frontends),
+            *((f"backend '{backend.name}'", backend) for backend in self.config.backends),
+            *((f"listen '{listen.name}'", listen) for listen in self.config.listens),
+        ]
+
+    def _check_acl_matching(self) -> None:
+        """Check for regex ACLs that a cheaper match method can replace."""
+        for context, proxy in self._proxies():
+            for acl in proxy.acls:
+                self._check_acl_regex(acl, f"{context}.acl '{acl.name}'")
+
+    def _check_acl_regex(self, acl: ACL, location: str) -> None:
+        """Check one ACL for regex patterns that are plain literals."""
+        # The DSL keeps flags among the values, so read flags from both
+        tokens = [*acl.flags, *acl.values]
+        flags = []
+        while tokens and tokens[0].startswith("-"):
+            flags.append(tokens.pop(0))
+            if flags[-1] == "-m" and tokens:
+                flags.append(tokens.pop(0))
+        method = flags[flags.index("-m") + 1] if "-m" in flags[:-1] else None
+        fetch = re.sub(r"_reg(?=\(|$)", "", acl.criterion)
+        if method is None and fetch != acl.criterion:
+            method = "reg"
+        # Pattern files and other flags: leave the ACL alone
+        if method != "reg" or not tokens or set(flags) - {"-i", "-m", "reg"}:
+            return
+
+        literals = []
+        for pattern in tokens:
+            literal = self._regex_literal(pattern)
+            if literal is None:
+                return
+            literals.append(literal)
+        methods = {self.LITERAL_METHODS[anchors] for _, anchors in literals}
+        if len(methods) != 1:
+            return
+        (method,) = methods
+        case_flag = "-i " if "-i" in flags else ""
+        values = " ".join(literal for literal, _ in literals)
+        # HAProxy looks exact strings and prefixes up in a tree
+        if method in ("str", "beg"):
+            impact = PerformanceImpact.MEDIUM
+            cost = "Runs every regex on each request where one tree lookup would do"
+        else:
+            impact = PerformanceImpact.LOW
+            cost = "Runs the regex engine on each request where a string scan would do"
+        self.report.add_issue(
+            PerformanceIssue(
+                impact=impact,
+                message=f"Regex match on plain {self.METHOD_PATTERNS[method]}",
+                location=location,
+                cost=cost,
+                recommendation=f"Use '{fetch} {case_flag}-m {method} {values}'",
+            )
+        )
+
+    def _regex_literal(self, pattern: str) -> tuple[str, tuple[bool, bool]] | None:
+        """Return the literal a regex matches and its anchors, or None if not a literal."""
+        start = pattern.startswith("^")
+        body = pattern.removeprefix("^")
+        end = body.endswith("$") and not body.endswith("\\$")
+        body = body.removesuffix("$") if end else body
+
+        literal = []
+        chars = iter(body)
+        for char in chars:
+            if char == "\\":
+                escaped = next(chars, "")
+                if not escaped or escaped.isalnum():
+                    # \d, \w and the like are character classes
+                    return None
+                literal.append(escaped)
+            elif char in self.REGEX_SPECIAL or char.isspace() or char in "\"'#":
+                return None
+            else:
+                literal.append(char)
+        if not literal:
+            return None
+        return "".join(literal), (start, end)
+
+    def _check_connection_reuse(self) -> None:
+        """Check HTTP backends for server connections that are never reused."""
+        defaults = self.config.defaults
+        default_reuse = defaults.http_reuse if defaults else None
+        for backend in self.config.backends:
+            if backend.mode != Mode.HTTP:
+                continue
+            context = f"backend '{backend.name}'"
+            http_reuse = backend.http_reuse or default_reuse
+            if http_reuse == "never":
+                self.report.add_issue(
+                    PerformanceIssue(
+                        impact=PerformanceImpact.MEDIUM,
+                        message="Server connections are never reused",
+                        location=f"{context}.http-reuse",
+                        cost="A TCP (and TLS) handshake to a server for every request",
+                        recommendation="Use 'http-reuse safe', or 'aggressive' for stateless servers",
+                    )
+                )
+            elif http_reuse is None:
+                self.report.add_issue(
+                    PerformanceIssue(
+                        impact=PerformanceImpact.INFO,
+                        message="No http-reuse mode configured",
+                        location=context,
+                        cost="None on HAProxy 2.0+ (defaults to safe); one handshake per request before",
+                        recommendation="Set 'http-reuse safe' in defaults to make reuse explicit",
+                    )
+                )
+
+    def _check_connection_close(self) -> None:
+        """Check for option httpclose, which closes connections after each request."""
+        keep_alive = self._keep_alive_configured()
+        sections: list[tuple[str, Sequence[str]]] = []
+        if self.config.defaults is not None:
+            sections.append(("defaults", self.config.defaults.options))
+        sections.extend((context, proxy.options) for context, proxy in self._proxies())
+
+        for context, options in sections:
+            for option in options:
+                if option.strip() not in self.CLOSE_OPTIONS:
+                    continue
+                self.report.add_issue(
+                    PerformanceIssue(
+                        impact=PerformanceImpact.HIGH if keep_alive else PerformanceImpact.MEDIUM,
+                        message=(
+                            f"'option {option}' disables the keep-alive configured elsewhere"
+                            if keep_alive
+                            else f"'option {option}' closes connections after each request"
+                        ),
+                        location=f"{context}.option",
+                        cost="New client and server connections, with handshakes, for every request",
+                        recommendation=(
+                            "Remove it to use keep-alive; use 'option http-server-close' "
+                            "only if servers cannot keep connections open"
+                        ),
+                    )
+                )
+
+    def _keep_alive_configured(self) -> bool:
+        """Return whether the configuration sets up HTTP keep-alive anywhere."""
+        defaults = self.config.defaults
+        sections: list[Frontend | Backend | Listen | DefaultsConfig] = [
+            proxy for _, proxy in self._proxies()
+        ]
+        if defaults is not None:
+            sections.append(defaults)
+        for section in sections:
+            if getattr(section, "timeout_http_keep_alive", None):
+                return True
+            if any(option.strip() == "http-keep-alive" for option in section.options):
+                return True
+            if getattr(section, "http_reuse", None) not in (None, "never"):
+                return True
+        return False
+
+    def _check_threads(self) -> None:
+        """Check for threads left to migrate between CPUs."""
+        global_config = self.config.global_config
+        if global_config is None:
+            return
+
+        nbthread = global_config.nbthread or global_config.tuning.get("nbthread")
+        if isinstance(nbthread, int) and nbthread > 1 and not global_config.cpu_map:
+            self.report.add_issue(
+                PerformanceIssue(
+                    impact=PerformanceImpact.LOW,
+                    message=f"nbthread {nbthread} without cpu-map",
+                    location="global.nbthread",
+                    cost="Threads migrate between CPUs, losing cache locality under load",
+                    recommendation=f"Bind threads to CPUs, e.g. 'cpu-map auto:1/1-{nbthread} 0-{nbthread - 1}'",
+                )
+            )
+
+    def _check_stick_tables(self) -> None:
+        """Check for stick tables whose entries never expire."""
+        for context, proxy in self._proxies():
+            table = proxy.stick_table
+            if table is not None and not table.expire:
+                self._report_stick_table(table, f"{context}.stick-table")
+
+    def _report_stick_table(self, table: StickTable, location: str) -> None:
+        """Report a stick table without expire."""
+        if table.nopurge:
+            impact = PerformanceImpact.HIGH
+            cost = f"Once {table.size} entries are stored, new ones are not tracked"
+        else:
+            impact = PerformanceImpact.MEDIUM
+            cost = f"Table fills up to {table.size} entries and stays full, evicting on each insert"
+        self.report.add_issue(
+            PerformanceIssue(
+                impact=impact,
+                message="Stick table without expire",
+                location=location,
+                cost=cost,
+                recommendation="Set 'expire' to how long entries are useful, e.g. 30m",
+            )
+        )
+
+    def _check_buffers(self) -> None:
+        """Check that tune.maxrewrite leaves room in tune.bufsize."""
+        global_config = self.config.global_config
+        if global_config is None:
+            return
+        tuning = global_config.tuning
+        if "tune.bufsize" not in tuning and "tune.maxrewrite" not in tuning:
+            return
+
+        bufsize = _as_int(tuning.get("tune.bufsize", self.DEFAULT_BUFSIZE))
+        maxrewrite = _as_int(tuning.get("tune.maxrewrite", self.DEFAULT_MAXREWRITE))
+        if bufsize is None or maxrewrite is None or maxrewrite <= bufsize // 2:
+            return
+
+        if maxrewrite >= bufsize:
+            impact = PerformanceImpact.HIGH
+            cost = "No buffer space left for request data; HAProxy refuses or overrides it"
+        else:
+            impact = PerformanceImpact.MEDIUM
+            cost = (
+                f"Only {bufsize - maxrewrite} bytes per buffer for headers; larger requests get 400"
+            )
+        self.report.add_issue(
+            PerformanceIssue(
+                impact=impact,
+                message=f"tune.maxrewrite {maxrewrite} is over half of tune.bufsize {bufsize}",
+                location="global.tune.maxrewrite",
+                cost=cost,
+                recommendation=f"Keep tune.maxrewrite at most {bufsize // 2}; 1024 usually suffices",
+            )
+        )
+
+    def _check_source_balancing(self) -> None:
+        """Check for source hashing over large server pools."""
+        pools: list[tuple[str, Backend | Listen, int, str | None]] = [
+            (
+                f"backend '{backend.name}'",
+                backend,
+                len(backend.servers) + sum(template.count for template in backend.server_templates),
+                backend.hash_type,
+            )
+            for backend in self.config.backends
+        ]
+        pools.extend(
+            (f"listen '{listen.name}'", listen, len(listen.servers), None)
+            for listen in self.config.listens
+        )
+
+        for context, proxy, pool_size, hash_type in pools:
+            if proxy.balance != BalanceAlgorithm.SOURCE or pool_size < self.LARGE_POOL_SIZE:
+                continue
+            consistent = hash_type is not None and hash_type.split()[:1] == ["consistent"]
+            self.report.add_issue(
+                PerformanceIssue(
+                    impact=PerformanceImpact.LOW if consistent else PerformanceImpact.MEDIUM,
+                    message=f"balance source over {pool_size} servers",
+                    location=f"{context}.balance",
+                    cost=(
+                        "Clients behind a NAT or proxy all land on one server, unevening load"
+                        if consistent
+                        else "Adding or removing a server moves almost every client to another"
+                    ),
+                    recommendation=(
+                        "Use leastconn or roundrobin with a stick table for persistence"
+                        if consistent
+                        else "Use 'hash-type consistent', or leastconn with a stick table"
+                    ),
+                )
+            )
+
+
+def _as_int(value: object) -> int | None:
+    """Return ``value`` as an integer, or None if it isn't one."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
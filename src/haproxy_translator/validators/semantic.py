@@ -1,10 +1,14 @@
 """Semantic validation for HAProxy configuration."""
 
-from typing import Any
+from collections import Counter
+from typing import TYPE_CHECKING, Any
 
 from ..ir.nodes import Backend, ConfigIR, Frontend, Mode
 from ..utils.errors import ValidationError
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
 
 class SemanticValidator:
     """Validates semantic correctness of HAProxy configuration."""
@@ -99,8 +103,8 @@ class SemanticValidator:
             self.warnings.append(f"Backend '{backend.name}': no servers defined")
 
         # Validate server names are unique
-        server_names = [server.name for server in backend.servers]
-        duplicates = {name for name in server_names if server_names.count(name) > 1}
+        server_names = Counter(server.name for server in backend.servers)
+        duplicates = {name for name, count in server_names.items() if count > 1}
         if duplicates:
             self.errors.append(
                 f"Backend '{backend.name}': duplicate server names: {', '.join(sorted(duplicates))}"
@@ -110,7 +114,7 @@ class SemanticValidator:
         if backend.health_check:
             self._validate_health_check(backend.health_check, f"Backend '{backend.name}'")
 
-    def _validate_mode_options(self, mode: Mode, options: list[str], context: str) -> None:
+    def _validate_mode_options(self, mode: Mode, options: Sequence[str], context: str) -> None:
         """Validate that options are compatible with the mode."""
         http_only_options = {
             "httplog",
@@ -0,0 +1,223 @@
+"""Tests for the translation cache."""
+
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from haproxy_translator.cli import main as cli_main
+from haproxy_translator.cli.cache import (
+    CachedTranslation,
+    TranslationCache,
+    referenced_env_vars,
+    translation_key,
+)
+from haproxy_translator.cli.main import cli
+
+CONFIG = """
+config test {
+    let host = env("CACHE_TEST_HOST", "10.0.1.1")
+
+    lua {
+        inline hello {
+            core.Info("hello")
+        }
+    }
+    backend servers {
+        balance: roundrobin
+        servers {
+            server web1 {
+                address: "${host}"
+                port: 8080
+            }
+        }
+    }
+}
+"""
+
+
+@pytest.fixture
+def runner():
+    """Create CLI test runner."""
+    return CliRunner()
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    """Create a config with an env() reference and an inline Lua script."""
+    path = tmp_path / "test.hap"
+    path.write_text(CONFIG)
+    return path
+
+
+class TestTranslationKey:
+    """Test cache key derivation."""
+
+    def test_env_vars_found(self):
+        assert referenced_env_vars('env("B") env( "A", "x") env("B")') == ["A", "B"]
+
+    def test_dynamic_env_name_not_cacheable(self):
+        assert referenced_env_vars("env(${name})") is None
+        assert translation_key('env("${name}")', "dsl", "lua") is None
+
+    def test_key_depends_on_env_values(self, monkeypatch):
+        monkeypatch.setenv("CACHE_TEST_HOST", "a")
+        key = translation_key(CONFIG, "dsl", "lua")
+        monkeypatch.setenv("CACHE_TEST_HOST", "b")
+        assert translation_key(CONFIG, "dsl", "lua") != key
+
+    def test_key_depends_on_codegen_options(self):
+        key = translation_key(CONFIG, "dsl", "lua")
+        assert translation_key(CONFIG, "dsl", "lua", codegen_options={"x": False}) != key
+
+    def test_key_ignores_unreferenced_env(self, monkeypatch):
+        key = translation_key(CONFIG, "dsl", "lua")
+        monkeypatch.setenv("UNRELATED_VAR", "x")
+        assert translation_key(CONFIG, "dsl", "lua") == key
+
+    def test_key_depends_on_imports(self, tmp_path):
+        lib = tmp_path / "lib" / "common.hap"
+        lib.parent.mkdir()
+        lib.write_text('config lib { let a = env("CACHE_TEST_LIB", "x") }')
+        source = 'config test { import "lib/common.hap" }'
+        main = tmp_path / "main.hap"
+        key = translation_key(source, "dsl", "lua", main)
+
+        lib.write_text('config lib { let a = env("CACHE_TEST_LIB", "y") }')
+        assert translation_key(source, "dsl", "lua", main) != key
+        assert translation_key('config test { import "missing.hap" }', "dsl", "lua", main) is None
+
+    def test_key_depends_on_imported_env(self, tmp_path, monkeypatch):
+        (tmp_path / "lib.hap").write_text('config lib { let a = env("CACHE_TEST_LIB", "x") }')
+        source = 'config test { import "lib.hap" }'
+        key = translation_key(source, "dsl", "lua", tmp_path / "main.hap")
+
+        monkeypatch.setenv("CACHE_TEST_LIB", "z")
+        assert translation_key(source, "dsl", "lua", tmp_path / "main.hap") != key
+
+    def test_key_depends_on_source_and_lua_dir(self):
+        key = translation_key(CONFIG, "dsl", "lua")
+        assert translation_key(CONFIG + "\n", "dsl", "lua") != key
+        assert translation_key(CONFIG, "dsl", "other") != key
+
+
+class TestTranslationCache:
+    """Test entry storage and LRU eviction."""
+
+    def test_roundtrip(self, tmp_path):
+        cache = TranslationCache(tmp_path)
+        entry = CachedTranslation(
+            "global\n",
+            {"lua/a.lua": "-- a"},
+            {"maps/web_host.map": "a b\n"},
+            {"patterns/0123.lst": "10.0.0.0/8\n"},
+        )
+        cache.put("k1", entry)
+        assert cache.get("k1") == entry
+        assert cache.get("k2") is None
+
+    def test_write_creates_map_files(self, tmp_path):
+        entry = CachedTranslation("global\n", map_files={str(tmp_path / "maps" / "a.map"): "a b\n"})
+        assert entry.write(tmp_path / "haproxy.cfg")
+        assert (tmp_path / "maps" / "a.map").read_text() == "a b\n"
+        assert not entry.write(tmp_path / "haproxy.cfg")
+
+    def test_corrupt_entry_is_miss(self, tmp_path):
+        cache = TranslationCache(tmp_path)
+        cache.put("k1", CachedTranslation("global\n"))
+        (cache.entries_dir / "k1.json").write_text("{")
+        assert cache.get("k1") is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = TranslationCache(tmp_path)
+        for i, key in enumerate(("old", "used", "new")):
+            cache.put(key, CachedTranslation("x" * 1000))
+            os.utime(cache.entries_dir / f"{key}.json", (i, i))
+        cache.get("used")
+
+        entry_size = (cache.entries_dir / "new.json").stat().st_size
+        assert cache.prune(2 * entry_size) == 1
+        assert cache.get("old") is None
+        assert cache.get("used") is not None
+
+    def test_put_respects_size_bound(self, tmp_path):
+        cache = TranslationCache(tmp_path, max_size_mb=0)
+        cache.put("k1", CachedTranslation("global\n"))
+        assert cache.stats().entries == 0
+
+
+class TestCachedTranslate:
+    """Test haconf --cache-dir."""
+
+    def translate(self, runner, config_file, tmp_path):
+        output = tmp_path / "out" / "haproxy.cfg"
+        result = runner.invoke(
+            cli, [str(config_file), "-o", str(output), "--cache-dir", str(tmp_path / "cache")]
+        )
+        assert result.exit_code == 0, result.output
+        return output
+
+    def test_hit_skips_translation(self, runner, config_file, tmp_path, monkeypatch):
+        output = self.translate(runner, config_file, tmp_path)
+        expected = output.read_text()
+        lua_file = tmp_path / "out" / "lua" / "hello.lua"
+        lua_content = lua_file.read_text()
+        output.unlink()
+        lua_file.unlink()
+
+        monkeypatch.setattr(cli_main, "HAProxyCodeGenerator", None)
+        self.translate(runner, config_file, tmp_path)
+
+        assert output.read_text() == expected
+        assert lua_file.read_text() == lua_content
+
+    def test_env_change_misses(self, runner, config_file, tmp_path, monkeypatch):
+        output = self.translate(runner, config_file, tmp_path)
+        monkeypatch.setenv("CACHE_TEST_HOST", "10.9.9.9")
+        self.translate(runner, config_file, tmp_path)
+
+        assert "10.9.9.9" in output.read_text()
+        assert TranslationCache(tmp_path / "cache").stats().entries == 2
+
+    def test_validate_bypasses_cache(self, runner, config_file, tmp_path):
+        result = runner.invoke(
+            cli, [str(config_file), "--validate", "--cache-dir", str(tmp_path / "cache")]
+        )
+        assert result.exit_code == 0
+        assert TranslationCache(tmp_path / "cache").stats().entries == 0
+
+
+class TestCacheCommands:
+    """Test haconf --cache-stats/--cache-prune."""
+
+    def test_stats(self, runner, tmp_path):
+        TranslationCache(tmp_path).put("k1", CachedTranslation("global\n"))
+        result = runner.invoke(cli, ["--cache-stats", "--cache-dir", str(tmp_path)])
+        assert result.exit_code == 0
+        assert "Entries:         1" in result.output
+
+    def test_prune_all(self, runner, tmp_path):
+        TranslationCache(tmp_path).put("k1", CachedTranslation("global\n"))
+        args = ["--cache-prune", "--cache-dir", str(tmp_path), "--cache-max-size", "0"]
+        result = runner.invoke(cli, args)
+        assert result.exit_code == 0
+        assert "Removed 1 entries, 0 left" in result.output
+
+    def test_prune_keeps_entries_within_size(self, runner, tmp_path):
+        TranslationCache(tmp_path).put("k1", CachedTranslation("global\n"))
+        result = runner.invoke(
+            cli, ["--cache-prune", "--cache-stats", "--cache-dir", str(tmp_path)]
+        )
+        assert result.exit_code == 0
+        assert "Removed 0 entries, 1 left" in result.output
+        assert "Entries:         1" in result.output
+
+    def test_needs_cache_dir(self, runner):
+        result = runner.invoke(cli, ["--cache-stats"])
+        assert result.exit_code == 2
+        assert "--cache-dir" in result.output
+
+    def test_listed_in_help(self, runner):
+        result = runner.invoke(cli, ["--help"])
+        assert "--cache-stats" in result.output
+        assert "--cache-prune" in result.output
@@ -1,9 +1,11 @@
 """Tests for CLI."""
 
+import os
+
 import pytest
 from click.testing import CliRunner
 
-from haproxy_translator.cli.main import cli
+from haproxy_translator.cli.main import EXIT_UNCHANGED, OutputOptions, cli
 
 
 @pytest.fixture
@@ -301,6 +303,255 @@ config test {
         assert result.exit_code == 0
         assert output_file.exists()
 
+    def test_jobs_option(self, runner, sample_config, tmp_path):
+        """--jobs does not change the generated configuration."""
+        serial = tmp_path / "serial.cfg"
+        parallel = tmp_path / "parallel.cfg"
+        assert runner.invoke(cli, [str(sample_config), "-o", str(serial)]).exit_code == 0
+        result = runner.invoke(cli, [str(sample_config), "-o", str(parallel), "--jobs", "4"])
+        assert result.exit_code == 0
+        assert parallel.read_text() == serial.read_text()
+
+    def test_hoist_default_server_option(self, runner, tmp_path):
+        """--hoist-default-server moves shared server options to default-server."""
+        servers = "".join(
+            f"""
+            server web{i} {{
+                address: "10.0.1.{i}"
+                port: 8080
+                check: true
+                maxconn: 100
+            }}"""
+            for i in range(3)
+        )
+        config_file = tmp_path / "test.hap"
+        config_file.write_text(f"config test {{ backend app {{ servers {{{servers}\n}} }} }}\n")
+        output = tmp_path / "haproxy.cfg"
+        result = runner.invoke(cli, [str(config_file), "-o", str(output), "--hoist-default-server"])
+        assert result.exit_code == 0
+        config = output.read_text()
+        assert "default-server check inter" not in config
+        assert "    default-server check rise 2 fall 3 maxconn 100\n" in config
+        assert "    server web0 10.0.1.0:8080\n" in config
+
+    def test_factor_defaults_option(self, runner, tmp_path):
+        """--factor-defaults moves settings every backend repeats to defaults."""
+        config_file = tmp_path / "test.hap"
+        config_file.write_text(
+            "config test {\n"
+            "    defaults { timeout: { server: 50s } }\n"
+            + "".join(
+                f'    backend app{i} {{ timeout_server: 30s\n option: ["redispatch"] }}\n'
+                for i in range(2)
+            )
+            + "}\n"
+        )
+        output = tmp_path / "haproxy.cfg"
+        result = runner.invoke(cli, [str(config_file), "-o", str(output), "--factor-defaults"])
+        assert result.exit_code == 0, result.output
+        config = output.read_text()
+        assert config.count("timeout server 30s") == 1
+        assert config.count("option redispatch") == 1
+        assert config.index("option redispatch") < config.index("backend app0")
+
+    def test_routing_maps_option(self, runner, tmp_path):
+        """--routing-maps writes a map file next to the output and routes through it."""
+        config_file = tmp_path / "test.hap"
+        sites = ("shop", "blog", "docs", "mail")
+        config_file.write_text(
+            "config test {\n"
+            "    frontend web {\n"
+            "        bind *:80\n"
+            "        acl {\n"
+            + "".join(f'            is_{site} path "/{site}"\n' for site in sites)
+            + "        }\n"
+            "        route {\n"
+            + "".join(f"            to {site} if is_{site}\n" for site in sites)
+            + "            default: shop\n"
+            "        }\n"
+            "    }\n"
+            + "".join(
+                f'    backend {site} {{ servers {{ server s1 {{ address: "10.0.0.1" port: 80 }} }} }}\n'
+                for site in sites
+            )
+            + "}\n"
+        )
+        output = tmp_path / "out" / "haproxy.cfg"
+        result = runner.invoke(cli, [str(config_file), "-o", str(output), "--routing-maps"])
+        assert result.exit_code == 0, result.output
+        map_file = tmp_path / "out" / "maps" / "web_path.map"
+        assert "Map files written to" in result.output
+        assert "/shop shop\n" in map_file.read_text()
+        config = output.read_text()
+        assert f"use_backend %[path,map({map_file})]\n" in config
+        assert "acl is_shop" not in config
+
+        # Unchanged map files count as unchanged output
+        result = runner.invoke(
+            cli, [str(config_file), "-o", str(output), "--routing-maps", "--exit-code"]
+        )
+        assert result.exit_code == EXIT_UNCHANGED, result.output
+
+    def test_acl_pattern_files_option(self, runner, tmp_path):
+        """--acl-pattern-files moves long ACL value lists to pattern files."""
+        config_file = tmp_path / "test.hap"
+        networks = " ".join(f'"10.0.{i}.0/24"' for i in range(8))
+        config_file.write_text(
+            "config test {\n"
+            "    frontend web {\n"
+            "        bind *:80\n"
+            f'        acl {{ internal src {networks} "192.168.0.1" }}\n'
+            "        default_backend: app\n"
+            "    }\n"
+            '    backend app { servers { server s1 { address: "10.0.0.1" port: 80 } } }\n'
+            "}\n"
+        )
+        output = tmp_path / "out" / "haproxy.cfg"
+        args = [str(config_file), "-o", str(output), "--acl-pattern-files"]
+        result = runner.invoke(cli, [*args, "--acl-pattern-threshold", "2"])
+        assert result.exit_code == 0, result.output
+        assert "Pattern files written to" in result.output
+        (pattern_file,) = (tmp_path / "out" / "patterns").iterdir()
+        assert pattern_file.read_text() == "10.0.0.0/21\n192.168.0.1\n"
+        assert f"    acl internal src -f {pattern_file}\n" in output.read_text()
+
+        # Below the threshold the merged networks stay inline
+        result = runner.invoke(cli, args)
+        assert result.exit_code == 0, result.output
+        assert "    acl internal src 10.0.0.0/21 192.168.0.1\n" in output.read_text()
+
+    def test_perf_check_option(self, runner, tmp_path):
+        """--perf-check reports anti-patterns without failing the translation."""
+        config_file = tmp_path / "test.hap"
+        config_file.write_text(
+            "config test {\n"
+            "    frontend web {\n"
+            "        bind *:80\n"
+            '        acl { is_api path_reg "^/api" }\n'
+            "        default_backend: app\n"
+            "    }\n"
+            "    backend app {\n"
+            "        http-reuse: never\n"
+            '        servers { server s1 { address: "10.0.0.1" port: 80 } }\n'
+            "    }\n"
+            "}\n"
+        )
+        output = tmp_path / "haproxy.cfg"
+        args = [str(config_file), "-o", str(output), "--perf-check"]
+        result = runner.invoke(cli, [*args, "--cache-dir", str(tmp_path / "cache")])
+        assert result.exit_code == 0, result.output
+        assert "Performance Check Report" in result.output
+        assert "Estimated" in result.output
+        assert output.exists()
+
+        # Reports even when an identical translation is cached
+        result = runner.invoke(cli, [*args, "--cache-dir", str(tmp_path / "cache")])
+        assert "Performance Check Report" in result.output
+
+    def test_watch_keeps_output_options(self, runner, sample_config, tmp_path, monkeypatch):
+        """--watch regenerates with the same options as a plain run."""
+        calls = []
+
+        def translate_once(*args, **kwargs):
+            calls.append(kwargs)
+            # Stop before the watcher starts
+            raise RuntimeError("stop")
+
+        monkeypatch.setattr("haproxy_translator.cli.main._translate_once", translate_once)
+        output = tmp_path / "haproxy.cfg"
+        args = [str(sample_config), "-o", str(output), "--watch", "--routing-maps", "-j", "4"]
+        result = runner.invoke(cli, [*args, "--factor-defaults", "--acl-pattern-files"])
+        assert "stop" in result.output
+
+        (kwargs,) = calls
+        assert kwargs["options"] == OutputOptions(
+            jobs=4, factor_defaults=True, routing_maps=True, acl_pattern_files=True
+        )
+
+
+class TestUnchangedOutput:
+    """Test that up-to-date output files are left alone."""
+
+    def test_second_run_unchanged(self, runner, sample_config, tmp_path):
+        output = tmp_path / "haproxy.cfg"
+        result = runner.invoke(cli, [str(sample_config), "-o", str(output), "--exit-code"])
+        assert result.exit_code == 0
+        assert "Configuration written to" in result.output
+        os.utime(output, (1_000_000_000, 1_000_000_000))
+
+        result = runner.invoke(cli, [str(sample_config), "-o", str(output)])
+        assert result.exit_code == 0
+        assert "Configuration unchanged" in result.output
+        assert output.stat().st_mtime == 1_000_000_000
+
+    def test_exit_code(self, runner, sample_config, tmp_path):
+        """--exit-code exits with EXIT_UNCHANGED when nothing changed."""
+        output = tmp_path / "haproxy.cfg"
+        args = [str(sample_config), "-o", str(output), "--exit-code"]
+        assert runner.invoke(cli, args).exit_code == 0
+        assert runner.invoke(cli, args).exit_code == EXIT_UNCHANGED
+
+        output.write_text("stale")
+        assert runner.invoke(cli, args).exit_code == 0
+
+    def test_exit_code_with_cache(self, runner, sample_config, tmp_path):
+        """Cached translations are written the same way."""
+        output = tmp_path / "haproxy.cfg"
+        args = [str(sample_config), "-o", str(output), "--exit-code"]
+        args += ["--cache-dir", str(tmp_path / "cache")]
+        assert runner.invoke(cli, args).exit_code == 0
+        # Second run is a cache hit
+        assert runner.invoke(cli, args).exit_code == EXIT_UNCHANGED
+
+
+class TestIRHandoff:
+    """Test --emit-ir and --from-ir."""
+
+    def test_emit_then_generate(self, runner, sample_config, tmp_path):
+        """Output generated from emitted IR matches a direct translation."""
+        ir_file = tmp_path / "config.ir"
+        result = runner.invoke(cli, [str(sample_config), "--emit-ir", str(ir_file)])
+        assert result.exit_code == 0
+        assert "IR written to" in result.output
+        assert ir_file.exists()
+
+        direct = tmp_path / "direct.cfg"
+        from_ir = tmp_path / "from_ir.cfg"
+        assert runner.invoke(cli, [str(sample_config), "-o", str(direct)]).exit_code == 0
+        result = runner.invoke(cli, ["--from-ir", str(ir_file), "-o", str(from_ir)])
+        assert result.exit_code == 0
+        assert from_ir.read_text() == direct.read_text()
+
+    def test_emit_with_output(self, runner, sample_config, tmp_path):
+        """With -o, --emit-ir also generates the configuration."""
+        ir_file = tmp_path / "config.ir"
+        output = tmp_path / "haproxy.cfg"
+        result = runner.invoke(
+            cli, [str(sample_config), "--emit-ir", str(ir_file), "-o", str(output)]
+        )
+        assert result.exit_code == 0
+        assert ir_file.exists()
+        assert "backend servers" in output.read_text()
+
+    def test_needs_config_or_ir(self, runner, sample_config, tmp_path):
+        """Exactly one of CONFIG_FILE and --from-ir is required."""
+        result = runner.invoke(cli, [])
+        assert result.exit_code == 2
+        assert "Give either CONFIG_FILE or --from-ir" in result.output
+
+        ir_file = tmp_path / "config.ir"
+        runner.invoke(cli, [str(sample_config), "--emit-ir", str(ir_file)])
+        result = runner.invoke(cli, [str(sample_config), "--from-ir", str(ir_file)])
+        assert result.exit_code == 2
+
+    def test_invalid_ir_file(self, runner, tmp_path):
+        """A file that is not serialized IR is reported as an error."""
+        ir_file = tmp_path / "config.ir"
+        ir_file.write_bytes(b"not an IR file")
+        result = runner.invoke(cli, ["--from-ir", str(ir_file)])
+        assert result.exit_code == 1
+        assert "Not a serialized IR file" in result.output
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
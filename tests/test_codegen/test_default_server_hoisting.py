@@ -0,0 +1,115 @@
+"""Tests for hoisting shared server options into default-server."""
+
+import dataclasses
+
+import pytest
+
+from haproxy_translator.codegen.haproxy import HAProxyCodeGenerator
+from haproxy_translator.ir.columns import ServerColumns
+from haproxy_translator.ir.nodes import Backend, DefaultServer, Server, ServerTemplate
+
+
+def make_servers(count=3, **options):
+    return tuple(
+        Server(name=f"s{i}", address=f"10.0.0.{i}", port=80, **options) for i in range(count)
+    )
+
+
+def hoisted(backend):
+    return HAProxyCodeGenerator(hoist_default_server=True)._generate_backend(backend)
+
+
+def server_lines(lines):
+    return [line.strip() for line in lines if line.strip().startswith(("server ", "default-"))]
+
+
+@pytest.fixture(params=[tuple, ServerColumns.from_servers], ids=["tuple", "columns"])
+def as_servers(request):
+    """Servers as a plain tuple and as ServerColumns."""
+    return request.param
+
+
+class TestDefaultServerHoisting:
+    """Test HAProxyCodeGenerator(hoist_default_server=True)."""
+
+    def test_shared_options_hoisted(self, as_servers):
+        servers = make_servers(check=True, check_interval="3s", weight=100, ssl=True, sni="x")
+        backend = Backend(name="app", servers=as_servers(servers))
+        assert server_lines(hoisted(backend)) == [
+            "default-server check inter 3s rise 2 fall 3 weight 100 ssl sni x",
+            "server s0 10.0.0.0:80",
+            "server s1 10.0.0.1:80",
+            "server s2 10.0.0.2:80",
+        ]
+
+    def test_differences_stay_on_server_lines(self, as_servers):
+        servers = (
+            *make_servers(2, check=True, maxconn=500, backup=True),
+            Server(name="s2", address="10.0.0.2", port=80, check=True, maxconn=100, backup=True),
+        )
+        backend = Backend(name="app", servers=as_servers(servers))
+        assert server_lines(hoisted(backend)) == [
+            "default-server check rise 2 fall 3",
+            # backup is not a default-server option
+            "server s0 10.0.0.0:80 maxconn 500 backup",
+            "server s1 10.0.0.1:80 maxconn 500 backup",
+            "server s2 10.0.0.2:80 maxconn 100 backup",
+        ]
+
+    def test_merged_with_backend_default_server(self, as_servers):
+        backend = Backend(
+            name="app",
+            default_server=DefaultServer(maxconn=50, slowstart="10s"),
+            servers=as_servers(make_servers(check=True, maxconn=500)),
+        )
+        assert server_lines(hoisted(backend)) == [
+            "default-server maxconn 500 slowstart 10s check rise 2 fall 3",
+            "server s0 10.0.0.0:80",
+            "server s1 10.0.0.1:80",
+            "server s2 10.0.0.2:80",
+        ]
+
+    def test_rest_of_backend_unchanged(self):
+        backend = Backend(
+            name="app",
+            retries=3,
+            options=("httplog",),
+            servers=make_servers(check=True),
+        )
+        plain = HAProxyCodeGenerator()._generate_backend(backend)
+        lines = hoisted(backend)
+        assert [line for line in lines if "server" not in line] == [
+            line for line in plain if "server" not in line
+        ]
+        assert lines.index("    default-server check rise 2 fall 3") == plain.index(
+            "    server s0 10.0.0.0:80 check rise 2 fall 3"
+        )
+
+    @pytest.mark.parametrize(
+        "backend",
+        [
+            Backend(name="one", servers=make_servers(1, check=True)),
+            Backend(name="nothing_shared", servers=make_servers(backup=True)),
+            Backend(
+                name="templates",
+                servers=make_servers(check=True),
+                server_templates=(ServerTemplate(prefix="web", count=3, fqdn_pattern="web"),),
+            ),
+        ],
+        ids=lambda backend: backend.name,
+    )
+    def test_left_alone(self, backend):
+        assert hoisted(backend) == HAProxyCodeGenerator()._generate_backend(backend)
+
+    def test_off_by_default(self):
+        backend = Backend(name="app", servers=make_servers(check=True))
+        assert "default-server" not in "\n".join(HAProxyCodeGenerator()._generate_backend(backend))
+
+    def test_columns_and_tuple_match(self):
+        servers = [
+            dataclasses.replace(server, weight=i % 2 + 2)
+            for i, server in enumerate(make_servers(6, check=True, ssl=True))
+        ]
+        assert hoisted(Backend(name="app", servers=tuple(servers))) == hoisted(
+            Backend(name="app", servers=ServerColumns.from_servers(servers))
+        )
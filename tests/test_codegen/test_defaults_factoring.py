@@ -0,0 +1,198 @@
+"""Tests for factoring repeated proxy settings into defaults."""
+
+from pathlib import Path
+
+import pytest
+
+from haproxy_translator.codegen.defaults import _SETTINGS, _option_kind, factor_defaults
+from haproxy_translator.codegen.haproxy import HAProxyCodeGenerator
+from haproxy_translator.ir.nodes import Backend, ConfigIR, DefaultsConfig, Frontend, Listen
+from haproxy_translator.parsers.dsl_parser import DSLParser
+
+EXAMPLES_DIR = Path(__file__).parent.parent.parent / "examples"
+
+
+def effective(ir, proxy):
+    """Return what ``proxy`` ends up with for the factored settings."""
+    defaults = ir.defaults
+    settings = {
+        field: getattr(proxy, field, None) or getattr(defaults, field)
+        for field, users in _SETTINGS.items()
+        if isinstance(proxy, users)
+    }
+    # Proxy log lines add to the logger inherited from defaults
+    inherited_log = (defaults.log,) if defaults.log else ()
+    log = dict.fromkeys((*inherited_log, *getattr(proxy, "log", ())))
+    options = {}
+    for option in (*defaults.options, *proxy.options):
+        options[_option_kind(option)] = option
+    return settings, tuple(log), options
+
+
+def effective_all(ir):
+    return [effective(ir, proxy) for proxy in (*ir.frontends, *ir.backends, *ir.listens)]
+
+
+def make_config(defaults=None, **proxies):
+    return ConfigIR(name="test", defaults=defaults or DefaultsConfig(), **proxies)
+
+
+class TestFactorDefaults:
+    """Test factor_defaults."""
+
+    def test_redundant_settings_dropped(self):
+        ir = make_config(
+            DefaultsConfig(timeout_connect="5s", options=("httplog",)),
+            backends=[
+                Backend(name="a", timeout_connect="5s", options=("httplog", "forwardfor")),
+                Backend(name="b", options=("redispatch",)),
+            ],
+        )
+        factored = factor_defaults(ir)
+        assert factored.defaults == ir.defaults
+        assert factored.backends[0].timeout_connect is None
+        assert factored.backends[0].options == ["forwardfor"]
+        assert factored.backends[1] is ir.backends[1]
+
+    def test_value_every_user_sets_moves_to_defaults(self):
+        ir = make_config(
+            backends=[
+                Backend(name="a", timeout_server="30s", retries=2),
+                Backend(name="b", timeout_server="30s", retries=2),
+                Backend(name="c", timeout_server="90s", retries=2),
+            ],
+            # Frontends don't use timeout server or retries
+            frontends=[Frontend(name="web")],
+        )
+        factored = factor_defaults(ir)
+        assert factored.defaults.timeout_server == "30s"
+        assert factored.defaults.retries == 2
+        assert [b.timeout_server for b in factored.backends] == [None, None, "90s"]
+        assert [b.retries for b in factored.backends] == [None, None, None]
+        assert effective_all(factored) == effective_all(ir)
+
+    def test_unset_user_keeps_defaults_value(self):
+        ir = make_config(
+            DefaultsConfig(timeout_server="50s"),
+            backends=[Backend(name="a", timeout_server="30s"), Backend(name="b")],
+        )
+        assert factor_defaults(ir) is ir
+
+    def test_listen_without_field_keeps_defaults_value(self):
+        """Listens use retries but cannot set it, so they inherit it."""
+        ir = make_config(
+            backends=[Backend(name="a", retries=5), Backend(name="b", retries=5)],
+            listens=[Listen(name="stats")],
+        )
+        assert factor_defaults(ir) is ir
+
+    def test_defaults_log_global_kept(self):
+        """Proxy log lines add to defaults' log, so a shared one cannot replace it."""
+        ir = make_config(
+            DefaultsConfig(log="global"),
+            frontends=[Frontend(name="web", log=("127.0.0.1 local0",))],
+            backends=[Backend(name="app", log=("127.0.0.1 local0",))],
+        )
+        factored = factor_defaults(ir)
+        assert factored is ir
+        config = HAProxyCodeGenerator(factor_defaults=True).generate(ir)
+        assert "    log global\n" in config
+        assert config.count("log 127.0.0.1 local0") == 2
+
+    def test_shared_log_not_moved_to_defaults(self):
+        ir = make_config(
+            DefaultsConfig(log=None),
+            frontends=[Frontend(name="web", log=("127.0.0.1 local0",))],
+            backends=[Backend(name="app", log=("127.0.0.1 local0",))],
+        )
+        assert factor_defaults(ir) is ir
+
+    def test_log_repeating_inherited_dropped(self):
+        ir = make_config(
+            DefaultsConfig(log="global"),
+            frontends=[
+                Frontend(name="a", log=("global",)),
+                Frontend(name="b", log=("global", "127.0.0.1 local0")),
+            ],
+        )
+        factored = factor_defaults(ir)
+        assert factored.defaults is ir.defaults
+        assert factored.frontends[0].log == ()
+        assert factored.frontends[1] is ir.frontends[1]
+        assert effective_all(factored) == effective_all(ir)
+
+    def test_shared_options_move_to_defaults(self):
+        ir = make_config(
+            DefaultsConfig(options=("dontlognull",)),
+            frontends=[Frontend(name="web", options=("forwardfor", "httplog"))],
+            backends=[
+                Backend(name="a", options=("httplog", "forwardfor", "httpchk GET /")),
+                Backend(name="b", options=("forwardfor", "httplog")),
+            ],
+        )
+        factored = factor_defaults(ir)
+        assert factored.defaults.options == ["dontlognull", "forwardfor", "httplog"]
+        assert factored.frontends[0].options == []
+        assert factored.backends[0].options == ["httpchk GET /"]
+        assert effective_all(factored) == effective_all(ir)
+
+    def test_option_order_kept(self):
+        """An option is not dropped when one of its kind comes before it."""
+        ir = make_config(
+            DefaultsConfig(options=("httplog",)),
+            frontends=[
+                Frontend(name="a", options=("tcplog", "httplog")),
+                Frontend(name="b", options=("httplog",)),
+            ],
+        )
+        factored = factor_defaults(ir)
+        assert factored.defaults.options == ("httplog",)
+        assert factored.frontends[0] is ir.frontends[0]
+        assert factored.frontends[1].options == []
+        assert effective_all(factored) == effective_all(ir)
+
+    def test_later_option_of_same_kind_moves_after(self):
+        ir = make_config(
+            DefaultsConfig(options=("httplog",)),
+            frontends=[
+                Frontend(name="a", options=("tcplog", "httplog")),
+                Frontend(name="b", options=("tcplog",)),
+            ],
+        )
+        factored = factor_defaults(ir)
+        # Appended after httplog, tcplog wins in defaults as it did in both
+        assert factored.defaults.options == ["httplog", "tcplog"]
+        assert factored.frontends[0].options == ["httplog"]
+        assert factored.frontends[1].options == []
+        assert effective_all(factored) == effective_all(ir)
+
+    def test_without_defaults_section(self):
+        ir = ConfigIR(name="test", backends=[Backend(name="a", timeout_server="30s")])
+        assert factor_defaults(ir) is ir
+
+    def test_http_reuse_emitted_in_defaults(self):
+        ir = make_config(
+            backends=[
+                Backend(name="a", http_reuse="safe"),
+                Backend(name="b", http_reuse="safe"),
+            ]
+        )
+        config = HAProxyCodeGenerator(factor_defaults=True).generate(ir)
+        assert config.count("http-reuse safe") == 1
+        defaults = config[config.index("defaults") : config.index("backend a")]
+        assert "    http-reuse safe\n" in defaults
+
+    @pytest.mark.parametrize("path", sorted(EXAMPLES_DIR.glob("*.hap")), ids=lambda p: p.name)
+    def test_examples_keep_effective_settings(self, path):
+        ir = DSLParser().parse_file(path)
+        factored = factor_defaults(ir)
+        if ir.defaults:
+            assert effective_all(factored) == effective_all(ir)
+
+    def test_generator_option(self):
+        ir = make_config(backends=[Backend(name="a", timeout_server="30s")])
+        plain = HAProxyCodeGenerator().generate(ir)
+        assert plain.index("timeout server 30s") > plain.index("backend a")
+        factored = HAProxyCodeGenerator(factor_defaults=True).generate(ir)
+        assert factored.count("timeout server") == 1
+        assert factored.index("timeout server 30s") < factored.index("backend a")
@@ -0,0 +1,149 @@
+"""Tests for table-driven directive emission."""
+
+import pytest
+
+from haproxy_translator.codegen import haproxy
+from haproxy_translator.codegen.directives import (
+    When,
+    compile_emitter,
+    each,
+    enum_value,
+    flag,
+    keyword_for,
+    on_off,
+    pairs,
+    scalar,
+    setting,
+)
+from haproxy_translator.codegen.haproxy import HAProxyCodeGenerator
+from haproxy_translator.ir.nodes import (
+    Backend,
+    ErrorFile,
+    FrozenMapping,
+    GlobalConfig,
+    HealthCheck,
+    Listen,
+    StickTable,
+    TcpRequestRule,
+)
+
+
+def table_fields(table):
+    return {directive.field for directive in table}
+
+
+class TestCompileEmitter:
+    """Test compile_emitter and the directive builders."""
+
+    def test_keyword_for(self):
+        assert keyword_for("hash_balance_factor") == "hash-balance-factor"
+        assert keyword_for("timeout_http_keep_alive") == "timeout http-keep-alive"
+
+    def test_emits_each_kind(self):
+        table = (
+            enum_value("mode"),
+            flag("disabled"),
+            setting("retries"),
+            scalar("cookie", "cookie {brace}"),
+            each("options", "option"),
+            pairs("errorloc", "errorloc", quoted=True),
+        )
+        emit = compile_emitter(Backend, table, "  ")
+        lines = []
+        emit(
+            None,
+            Backend(
+                disabled=True,
+                retries=0,
+                cookie="SRV",
+                options=("httplog", "forwardfor"),
+                errorloc=FrozenMapping({503: "/down"}),
+            ),
+            lines,
+        )
+        assert lines == [
+            "  mode http",
+            "  disabled",
+            "  retries 0",
+            "  cookie {brace} SRV",
+            "  option httplog",
+            "  option forwardfor",
+            '  errorloc 503 "/down"',
+        ]
+
+    def test_unset_fields_emit_nothing(self):
+        table = (flag("disabled"), setting("retries"), each("options", "option"))
+        lines = []
+        compile_emitter(Backend, table, "    ")(None, Backend(), lines)
+        assert lines == []
+
+    def test_on_off(self):
+        emit = compile_emitter(GlobalConfig, (on_off("strict_limits"),), "")
+        for value, expected in (
+            (None, []),
+            (True, ["strict-limits on"]),
+            (False, ["strict-limits off"]),
+        ):
+            lines = []
+            emit(None, GlobalConfig(strict_limits=value), lines)
+            assert lines == expected
+
+    def test_falsy(self):
+        emit = compile_emitter(Backend, (flag("enabled", "disabled", when=When.FALSY),), "")
+        lines = []
+        emit(None, Backend(enabled=False), lines)
+        assert lines == ["disabled"]
+
+    def test_unknown_field(self):
+        with pytest.raises(ValueError, match="Backend has no field 'binds'"):
+            compile_emitter(Backend, (each("binds", method="_format_bind"),), "    ")
+
+
+class TestProxyTables:
+    """Frontend, backend and listen sections emit shared fields the same way."""
+
+    def test_listen_emits_proxy_fields(self):
+        """Listen fields that frontends or backends emit are emitted for listens too."""
+        listen_fields = table_fields(haproxy._LISTEN_DIRECTIVES)
+        proxy_fields = table_fields(haproxy._FRONTEND_DIRECTIVES) | table_fields(
+            haproxy._BACKEND_DIRECTIVES
+        )
+        missing = (proxy_fields & Listen.__dataclass_fields__.keys()) - listen_fields
+        assert not missing
+
+    def test_shared_fields_emitted_alike(self):
+        """A field in more than one table uses the same directive in each."""
+        tables = (
+            haproxy._FRONTEND_DIRECTIVES,
+            haproxy._BACKEND_DIRECTIVES,
+            haproxy._LISTEN_DIRECTIVES,
+        )
+        directives = {}
+        for table in tables:
+            for directive in table:
+                assert directives.setdefault(directive.field, directive) == directive
+
+    def test_listen_backend_directives(self):
+        listen = Listen(
+            name="app",
+            maxconn=500,
+            timeout_client="30s",
+            timeout_connect="5s",
+            timeout_server="30s",
+            stick_table=StickTable(type="ip", size=1000),
+            health_check=HealthCheck(uri="/health"),
+            tcp_request_rules=(TcpRequestRule(rule_type="content", action="accept"),),
+            error_files=(ErrorFile(code=503, file="/etc/haproxy/503.http"),),
+        )
+        lines = HAProxyCodeGenerator()._generate_listen(listen)
+        for expected in (
+            "    maxconn 500",
+            "    timeout client 30s",
+            "    timeout connect 5s",
+            "    timeout server 30s",
+            "    stick-table type ip size 1000",
+            "    http-check send meth GET uri /health",
+            "    tcp-request content accept",
+            "    errorfile 503 /etc/haproxy/503.http",
+        ):
+            assert expected in lines
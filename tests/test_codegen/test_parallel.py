@@ -0,0 +1,80 @@
+"""Tests for parallel code generation."""
+
+import io
+
+import pytest
+
+from haproxy_translator.codegen import haproxy
+from haproxy_translator.codegen.haproxy import HAProxyCodeGenerator
+from haproxy_translator.ir.columns import ServerColumns
+from haproxy_translator.ir.nodes import Backend, Bind, ConfigIR, Frontend, Listen, Server
+
+
+def make_config():
+    servers = [Server(name=f"s{i}", address=f"10.0.0.{i}", port=80, check=True) for i in range(5)]
+    return ConfigIR(
+        name="parallel",
+        frontends=[
+            Frontend(name=f"web{i}", binds=[Bind(address=f"*:{8000 + i}")]) for i in range(7)
+        ],
+        backends=[
+            Backend(
+                name=f"pool{i}",
+                servers=ServerColumns.from_servers(servers) if i % 3 == 0 else servers,
+            )
+            for i in range(23)
+        ],
+        listens=[Listen(name=f"stats{i}", binds=[Bind(address=f"*:{9000 + i}")]) for i in range(3)],
+    )
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    """Format in parallel however small the configuration."""
+    monkeypatch.setattr(haproxy, "PARALLEL_MIN_ITEMS", 0)
+
+
+class TestParallelCodegen:
+    """Test HAProxyCodeGenerator(jobs=N)."""
+
+    @pytest.mark.usefixtures("parallel")
+    def test_forked_workers_match_serial(self):
+        """Output formatted in forked workers is identical to the serial output."""
+        ir = make_config()
+        assert HAProxyCodeGenerator(jobs=3).generate(ir) == HAProxyCodeGenerator().generate(ir)
+
+    @pytest.mark.usefixtures("parallel")
+    def test_spawned_workers_match_serial(self, monkeypatch):
+        """With other threads running, chunks are sent to spawned workers instead."""
+        monkeypatch.setattr(haproxy.threading, "active_count", lambda: 2)
+        ir = make_config()
+        out = io.StringIO()
+        HAProxyCodeGenerator(jobs=2).generate_to(ir, out)
+        assert out.getvalue() == HAProxyCodeGenerator().generate(ir)
+
+    @pytest.mark.usefixtures("parallel")
+    def test_workers_use_generator_options(self):
+        """Workers format with the generator's options, not the defaults."""
+        ir = make_config()
+        serial = HAProxyCodeGenerator(hoist_default_server=True).generate(ir)
+        assert "default-server" in serial
+        assert HAProxyCodeGenerator(jobs=2, hoist_default_server=True).generate(ir) == serial
+
+    @pytest.mark.usefixtures("parallel")
+    def test_lines_in_order(self):
+        """generate_iter yields single lines in section order."""
+        lines = list(HAProxyCodeGenerator(jobs=2).generate_iter(make_config()))
+        assert not any("\n" in line for line in lines)
+        headers = [line for line in lines if line.startswith(("frontend ", "backend ", "listen "))]
+        assert headers[:8] == [*(f"frontend web{i}" for i in range(7)), "backend pool0"]
+        assert headers[-1] == "listen stats2"
+
+    def test_small_configs_stay_serial(self, monkeypatch):
+        """Below PARALLEL_MIN_ITEMS no worker processes are started."""
+
+        def fail(*args, **kwargs):
+            raise AssertionError("worker pool started")
+
+        monkeypatch.setattr(haproxy, "ProcessPoolExecutor", fail)
+        ir = make_config()
+        assert HAProxyCodeGenerator(jobs=8).generate(ir) == HAProxyCodeGenerator().generate(ir)
@@ -0,0 +1,88 @@
+"""Tests for streaming code generation."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from haproxy_translator.codegen.haproxy import HAProxyCodeGenerator
+from haproxy_translator.ir.nodes import Backend, ConfigIR, Server
+from haproxy_translator.parsers import DSLParser
+
+EXAMPLES_DIR = Path(__file__).parent.parent.parent / "examples"
+
+
+@pytest.fixture
+def codegen():
+    return HAProxyCodeGenerator()
+
+
+class TestStreamingCodegen:
+    """Test generate_iter and generate_to."""
+
+    @pytest.mark.parametrize(
+        "example", sorted(EXAMPLES_DIR.glob("*.hap")), ids=lambda path: path.name
+    )
+    def test_matches_generate(self, codegen, example):
+        """Streamed output is exactly the output of generate()."""
+        ir = DSLParser().parse_file(example)
+        expected = codegen.generate(ir)
+
+        assert "\n".join(codegen.generate_iter(ir)) == expected
+        out = io.StringIO()
+        codegen.generate_to(ir, out)
+        assert out.getvalue() == expected
+
+    def test_empty_config(self, codegen):
+        """A config without sections streams just the header."""
+        out = io.StringIO()
+        codegen.generate_to(ConfigIR(name="empty"), out)
+        assert out.getvalue() == codegen.generate(ConfigIR(name="empty"))
+        assert out.getvalue().startswith("# Generated HAProxy configuration: empty\n")
+
+    def test_sections_formatted_lazily(self, codegen, monkeypatch):
+        """A section is only formatted when its lines are consumed."""
+        ir = ConfigIR(
+            backends=[
+                Backend(name=f"pool{i}", servers=[Server(name="s1", address="10.0.0.1")])
+                for i in range(3)
+            ]
+        )
+        formatted = []
+        generate_backend = HAProxyCodeGenerator._generate_backend
+
+        def record(self, backend):
+            formatted.append(backend.name)
+            return generate_backend(self, backend)
+
+        monkeypatch.setattr(HAProxyCodeGenerator, "_generate_backend", record)
+        lines = codegen.generate_iter(ir)
+        assert next(line for line in lines if line.startswith("backend ")) == "backend pool0"
+        assert formatted == ["pool0"]
+
+    def test_writes_section_by_section(self, codegen):
+        """generate_to writes each section separately instead of one string."""
+
+        class Recorder(io.StringIO):
+            def __init__(self):
+                super().__init__()
+                self.writes = []
+
+            def write(self, text):
+                self.writes.append(text)
+                return super().write(text)
+
+        ir = ConfigIR(
+            backends=[
+                Backend(name=f"pool{i}", servers=[Server(name="s1", address="10.0.0.1")])
+                for i in range(3)
+            ]
+        )
+        out = Recorder()
+        codegen.generate_to(ir, out)
+        backend_writes = [text for text in out.writes if text.startswith("backend ")]
+        assert [text.split("\n", 1)[0] for text in backend_writes] == [
+            "backend pool0",
+            "backend pool1",
+            "backend pool2",
+        ]
@@ -117,6 +117,68 @@ class TestBackendHttpReuse:
         assert ir.backends[0].http_reuse is None
 
 
+class TestDefaultsHttpReuse:
+    """Test defaults http-reuse directive."""
+
+    def test_defaults_http_reuse(self):
+        """Test defaults http-reuse parsing."""
+        config = """
+        config test {
+            defaults {
+                mode: http
+                http-reuse: aggressive
+            }
+            backend app {
+                servers {
+                    server app1 { address: "10.0.1.1" port: 8080 }
+                }
+            }
+        }
+        """
+        parser = DSLParser()
+        ir = parser.parse(config)
+        assert ir.defaults.http_reuse == "aggressive"
+        assert ir.backends[0].http_reuse is None
+
+    def test_defaults_http_reuse_codegen(self):
+        """Test defaults http-reuse code generation."""
+        config = """
+        config test {
+            defaults {
+                mode: http
+                http-reuse: never
+            }
+            backend app {
+                http-reuse: safe
+                servers {
+                    server app1 { address: "10.0.1.1" port: 8080 }
+                }
+            }
+        }
+        """
+        parser = DSLParser()
+        ir = parser.parse(config)
+        codegen = HAProxyCodeGenerator()
+        output = codegen.generate(ir)
+
+        defaults = output[output.index("defaults") : output.index("backend app")]
+        assert "http-reuse never" in defaults
+        assert "http-reuse safe" in output[output.index("backend app") :]
+
+    def test_defaults_without_http_reuse(self):
+        """Test defaults without http-reuse (should be None)."""
+        config = """
+        config test {
+            defaults {
+                mode: http
+            }
+        }
+        """
+        parser = DSLParser()
+        ir = parser.parse(config)
+        assert ir.defaults.http_reuse is None
+
+
 class TestHttpReuseIntegration:
     """Integration tests for http-reuse directive."""
 
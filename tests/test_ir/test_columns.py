@@ -0,0 +1,150 @@
+"""Tests for columnar server storage."""
+
+import dataclasses
+
+import pytest
+
+from haproxy_translator.codegen.haproxy import HAProxyCodeGenerator
+from haproxy_translator.ir.columns import ServerColumns
+from haproxy_translator.ir.nodes import Backend, ConfigIR, Server
+from haproxy_translator.parsers import DSLParser
+from haproxy_translator.utils.errors import ValidationError
+from haproxy_translator.validators.semantic import SemanticValidator
+
+POOL_CONFIG = """
+config test {
+    backend pool {
+        balance: roundrobin
+        servers {
+            for i in [1..40] {
+                server "srv${i}" {
+                    address: "10.0.0.${i}"
+                    port: 8080
+                    check: true
+                    weight: 100
+                }
+            }
+            server spare {
+                address: "10.0.1.1"
+                port: 8080
+                check: true
+                weight: 100
+                backup: true
+            }
+        }
+    }
+}
+"""
+
+
+def make_servers(count):
+    servers = [
+        Server(name=f"web{i}", address=f"10.0.0.{i}", port=8080, check=True, weight=i % 3 + 1)
+        for i in range(count)
+    ]
+    servers[3] = dataclasses.replace(servers[3], backup=True, alpn=["h2"])
+    return servers
+
+
+class TestServerColumns:
+    """Test ServerColumns."""
+
+    def test_round_trip(self):
+        """Views compare equal to the servers the columns were built from."""
+        servers = make_servers(10)
+        columns = ServerColumns.from_servers(servers)
+        assert len(columns) == 10
+        assert list(columns) == servers
+        assert columns == servers
+        assert columns[3] == servers[3]
+        assert columns[-1] == servers[-1]
+        assert columns[2:4] == servers[2:4]
+
+    def test_column_layout(self):
+        """Fields that vary per row are dense, rare differences are sparse."""
+        columns = ServerColumns.from_servers(make_servers(10))
+        assert set(columns.dense) == {"name", "address", "weight"}
+        assert set(columns.sparse) == {"backup", "alpn"}
+        assert columns.shared.port == 8080
+        assert columns.shared.check is True
+
+    def test_value_reads_columns(self):
+        """value() reads a field without building a view."""
+        columns = ServerColumns.from_servers(make_servers(10))
+        assert columns.value(4, "name") == "web4"
+        assert columns.value(3, "backup") is True
+        assert columns.value(4, "backup") is False
+        assert columns.value(4, "port") == 8080
+
+    def test_index_out_of_range(self):
+        """Indexing past the end raises IndexError."""
+        columns = ServerColumns.from_servers(make_servers(5))
+        with pytest.raises(IndexError):
+            columns[5]
+
+    def test_empty(self):
+        """An empty pool has no servers."""
+        columns = ServerColumns.from_servers([])
+        assert len(columns) == 0
+        assert not columns
+        assert list(columns) == []
+
+
+class TestColumnarCodegen:
+    """Test formatting servers from columns."""
+
+    def test_lines_match_row_formatting(self):
+        """Columnar servers format exactly like the equivalent Server list."""
+        servers = make_servers(20)
+        generator = HAProxyCodeGenerator()
+        plain = generator.generate(ConfigIR(backends=[Backend(name="pool", servers=servers)]))
+        columnar = generator.generate(
+            ConfigIR(backends=[Backend(name="pool", servers=ServerColumns.from_servers(servers))])
+        )
+        assert columnar == plain
+
+    def test_no_server_views_built(self, monkeypatch):
+        """Code generation reads the columns instead of building views."""
+        columns = ServerColumns.from_servers(make_servers(20))
+
+        def fail(*args):
+            raise AssertionError("server view built")
+
+        monkeypatch.setattr(ServerColumns, "__iter__", fail)
+        monkeypatch.setattr(ServerColumns, "__getitem__", fail)
+        lines = list(HAProxyCodeGenerator()._format_servers(columns))
+        assert len(lines) == 20
+        assert lines[0] == "server web0 10.0.0.0:8080 check rise 2 fall 3"
+        assert lines[3] == "server web3 10.0.0.3:8080 check rise 2 fall 3 backup"
+
+
+class TestParserColumnarServers:
+    """Test DSLParser(columnar_servers=N)."""
+
+    def test_large_backends_become_columnar(self):
+        """Backends at or above the threshold are stored as columns."""
+        ir = DSLParser(columnar_servers=41).parse(POOL_CONFIG)
+        servers = ir.backends[0].servers
+        assert isinstance(servers, ServerColumns)
+        assert len(servers) == 41
+        assert set(servers.sparse) == {"backup"}
+
+    def test_small_backends_stay_rows(self):
+        """Backends below the threshold keep a Server per entry."""
+        ir = DSLParser(columnar_servers=42).parse(POOL_CONFIG)
+        assert not isinstance(ir.backends[0].servers, ServerColumns)
+
+    def test_output_unchanged(self):
+        """Columnar storage does not change generated configuration."""
+        generate = HAProxyCodeGenerator().generate
+        plain = DSLParser().parse(POOL_CONFIG)
+        columnar = DSLParser(columnar_servers=1).parse(POOL_CONFIG)
+        assert generate(columnar) == generate(plain)
+
+    def test_validators_see_server_views(self):
+        """Validators iterate columnar servers as Server views."""
+        servers = make_servers(5)
+        servers[4] = dataclasses.replace(servers[4], name="web0")
+        backend = Backend(name="pool", servers=ServerColumns.from_servers(servers))
+        with pytest.raises(ValidationError, match="duplicate server names: web0"):
+            SemanticValidator(ConfigIR(backends=[backend])).validate()
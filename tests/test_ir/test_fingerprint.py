@@ -0,0 +1,137 @@
+"""Tests for per-section content fingerprints."""
+
+import subprocess
+import sys
+
+from haproxy_translator.ir.columns import ServerColumns
+from haproxy_translator.ir.fingerprint import Fingerprinter, section_fingerprints
+from haproxy_translator.ir.interning import IRInterner
+from haproxy_translator.ir.nodes import Backend, ConfigIR, Server
+from haproxy_translator.parsers import DSLParser
+from haproxy_translator.utils.errors import SourceLocation
+
+CONFIG = """
+config test {
+    global {
+        daemon: true
+        maxconn: 4096
+    }
+    defaults {
+        mode: http
+        retries: 3
+    }
+    frontend web {
+        bind *:80
+        default_backend: api
+    }
+    backend api {
+        balance: roundrobin
+        servers {
+            server api1 {
+                address: "10.0.1.1"
+                port: 8080
+                check: true
+            }
+        }
+    }
+    backend static {
+        servers {
+            server s1 {
+                address: "10.0.2.1"
+                port: 80
+            }
+        }
+    }
+}
+"""
+
+
+def fingerprint(node):
+    return Fingerprinter().fingerprint(node)
+
+
+class TestFingerprinter:
+    """Test Fingerprinter."""
+
+    def test_equal_content_equal_fingerprint(self):
+        """Separately built but equal nodes have the same fingerprint."""
+        first = Backend(name="api", servers=[Server(name="a", address="10.0.0.1", port=80)])
+        second = Backend(name="api", servers=[Server(name="a", address="10.0.0.1", port=80)])
+        assert fingerprint(first) == fingerprint(second)
+
+    def test_changed_field_changes_fingerprint(self):
+        """Any field change, however deep, changes the fingerprint."""
+        first = Backend(name="api", servers=[Server(name="a", port=80)])
+        second = Backend(name="api", servers=[Server(name="a", port=81)])
+        assert fingerprint(first) != fingerprint(second)
+
+    def test_type_sensitive(self):
+        """Values that compare equal across types fingerprint differently."""
+        assert fingerprint(Server(name="a", weight=1)) != fingerprint(Server(name="a", weight=True))
+        assert fingerprint(Server(name="a", port=80)) != fingerprint(Server(name="a", port="80"))
+
+    def test_location_ignored(self):
+        """Source locations do not affect the fingerprint."""
+        first = Server(name="a", location=SourceLocation("a.hap", 1, 1))
+        second = Server(name="a", location=SourceLocation("b.hap", 9, 4))
+        assert fingerprint(first) == fingerprint(second)
+
+    def test_storage_independent(self):
+        """Interned and columnar forms fingerprint like plain lists and dicts."""
+        servers = [
+            Server(name=f"s{i}", address=f"10.0.0.{i}", port=80, options={"id": i})
+            for i in range(10)
+        ]
+        plain = Backend(name="pool", servers=servers)
+        columnar = Backend(name="pool", servers=ServerColumns.from_servers(servers))
+        interned = IRInterner().intern(plain)
+        assert fingerprint(plain) == fingerprint(columnar) == fingerprint(interned)
+
+    def test_stable_across_processes(self):
+        """Fingerprints do not depend on per-process hash salting."""
+        code = (
+            "from haproxy_translator.ir.fingerprint import Fingerprinter\n"
+            "from haproxy_translator.ir.nodes import Server\n"
+            "print(Fingerprinter().fingerprint(Server(name='a', options={'x': 'y'})))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        assert output == fingerprint(Server(name="a", options={"x": "y"}))
+
+
+class TestConfigFingerprints:
+    """Test ConfigIR.fingerprints and changed_sections."""
+
+    def test_parse_fills_in_fingerprints(self):
+        """DSLParser.parse fingerprints every section, keyed by header."""
+        ir = DSLParser().parse(CONFIG)
+        assert list(ir.fingerprints) == [
+            "global",
+            "defaults",
+            "frontend web",
+            "backend api",
+            "backend static",
+        ]
+        assert ir.fingerprints == section_fingerprints(ir)
+
+    def test_unchanged_build(self):
+        """Rebuilding the same source changes nothing."""
+        assert DSLParser().parse(CONFIG).changed_sections(DSLParser().parse(CONFIG)) == []
+
+    def test_reformatting_changes_nothing(self):
+        """Moving sections down the file does not change their fingerprints."""
+        shifted = CONFIG.replace("config test {", "config test {\n\n\n")
+        assert DSLParser().parse(shifted).changed_sections(DSLParser().parse(CONFIG)) == []
+
+    def test_changed_section(self):
+        """Only the edited section is reported."""
+        old = DSLParser().parse(CONFIG)
+        new = DSLParser().parse(CONFIG.replace('"10.0.2.1"', '"10.0.2.2"'))
+        assert new.changed_sections(old) == ["backend static"]
+
+    def test_added_and_removed_sections(self):
+        """Added sections come first, then removed ones."""
+        old = ConfigIR(fingerprints={"backend a": "1", "backend b": "2"})
+        new = ConfigIR(fingerprints={"backend a": "1", "backend c": "3"})
+        assert new.changed_sections(old) == ["backend c", "backend b"]
@@ -0,0 +1,147 @@
+"""Tests for IR interning."""
+
+from pathlib import Path
+
+import pytest
+
+from haproxy_translator.codegen.haproxy import HAProxyCodeGenerator
+from haproxy_translator.ir.interning import IRInterner
+from haproxy_translator.ir.nodes import (
+    ACL,
+    EMPTY_MAPPING,
+    Backend,
+    ConfigIR,
+    FrozenMapping,
+    HealthCheck,
+    HttpRequestRule,
+    Server,
+)
+from haproxy_translator.parsers import DSLParser
+
+EXAMPLES_DIR = Path(__file__).parent.parent.parent / "examples"
+
+LOOP_CONFIG = """
+config test {
+    backend api {
+        health-check {
+            method: "GET"
+            uri: "/health"
+            expect: status 200
+        }
+        servers {
+            for i in [1..50] {
+                server "web${i}" {
+                    address: "10.0.1.${i}"
+                    port: 8080
+                    check: true
+                    alpn: ["h2", "http/1.1"]
+                }
+            }
+        }
+    }
+}
+"""
+
+
+class TestIRInterner:
+    """Test IRInterner."""
+
+    def test_equal_nodes_are_shared(self):
+        """Structurally equal nodes intern to the same object."""
+        interner = IRInterner()
+        first = interner.intern(ACL(name="api", criterion="path_beg", values=["/api"]))
+        second = interner.intern(ACL(name="api", criterion="path_beg", values=["/api"]))
+        assert first is second
+
+    def test_different_nodes_are_kept(self):
+        """Nodes that differ in any field stay distinct."""
+        interner = IRInterner()
+        first = interner.intern(ACL(name="api", values=["/api"]))
+        second = interner.intern(ACL(name="api", values=["/v2"]))
+        assert first is not second
+        assert first.values == ("/api",)
+        assert second.values == ("/v2",)
+
+    def test_collections_are_frozen(self):
+        """Lists become tuples and dicts become FrozenMappings."""
+        rule = IRInterner().intern(
+            HttpRequestRule(action="set-header", parameters={"name": "X-A", "value": ["a"]})
+        )
+        assert isinstance(rule.parameters, FrozenMapping)
+        assert rule.parameters["value"] == ("a",)
+
+    def test_interned_nodes_are_hashable(self):
+        """Nodes built with dicts and lists hash once interned."""
+        server = Server(name="web1", alpn=["h2"], options={"proto": "h2"}, metadata={"a": [1]})
+        with pytest.raises(TypeError):
+            hash(server)
+        interned = IRInterner().intern(server)
+        assert hash(interned) == hash(IRInterner().intern(server))
+
+    def test_empty_collections_share_defaults(self):
+        """Empty lists and dicts intern to the shared empty defaults."""
+        server = IRInterner().intern(Server(name="web1", alpn=[], options={}, metadata={}))
+        assert server.alpn == ()
+        assert server.options is EMPTY_MAPPING
+        assert server.metadata is EMPTY_MAPPING
+
+    def test_strings_are_interned(self):
+        """Equal strings become one object."""
+        interner = IRInterner()
+        first = interner.intern(Server(name="".join(["web", "1"])))
+        second = interner.intern(Server(name="".join(["web", "1"]), port=9090))
+        assert first.name is second.name
+
+    def test_bool_and_int_are_not_merged(self):
+        """Values equal across types (True == 1) are not deduplicated."""
+        interner = IRInterner()
+        first = interner.intern(HttpRequestRule(action="x", parameters={"v": True}))
+        second = interner.intern(HttpRequestRule(action="x", parameters={"v": 1}))
+        assert first is not second
+        assert first.parameters["v"] is True
+        assert type(second.parameters["v"]) is int
+
+    def test_sections_are_frozen_not_deduplicated(self):
+        """Sections are frozen like other nodes but never merged."""
+        interner = IRInterner()
+        ir = interner.intern(ConfigIR(backends=[Backend(name="a"), Backend(name="a")]))
+        assert isinstance(ir.backends, tuple)
+        assert ir.backends[0] is not ir.backends[1]
+
+    def test_reinterning_returns_same_tree(self):
+        """Interning an interned tree is a no-op."""
+        interner = IRInterner()
+        ir = interner.intern(ConfigIR(backends=[Backend(name="a", servers=[Server(name="s")])]))
+        assert interner.intern(ir) is ir
+
+    def test_unknown_values_are_kept(self):
+        """Values of unrecognised types pass through unchanged."""
+        marker = object()
+        node = IRInterner().intern(HealthCheck(metadata={"opaque": marker}))
+        assert node.metadata["opaque"] is marker
+
+
+class TestParserInterning:
+    """Test DSLParser(intern_ir=True)."""
+
+    def test_loop_servers_share_repeated_content(self):
+        """Loop-generated servers share one ALPN tuple."""
+        ir = DSLParser(intern_ir=True).parse(LOOP_CONFIG)
+        servers = ir.backends[0].servers
+        assert len(servers) == 50
+        assert len({id(server.alpn) for server in servers}) == 1
+        assert all(server.alpn == ("h2", "http/1.1") for server in servers)
+
+    def test_whole_config_is_hashable(self):
+        """The interned IR hashes from the root down."""
+        ir = DSLParser(intern_ir=True).parse(LOOP_CONFIG)
+        assert isinstance(hash(ir), int)
+
+    @pytest.mark.parametrize("example", sorted(EXAMPLES_DIR.glob("*.hap")), ids=lambda p: p.name)
+    def test_output_unchanged(self, example):
+        """Interning does not change generated configuration."""
+        source = example.read_text()
+        plain = DSLParser().parse(source, filepath=example)
+        interned = DSLParser(intern_ir=True).parse(source, filepath=example)
+        generate = HAProxyCodeGenerator().generate
+        assert generate(interned) == generate(plain)
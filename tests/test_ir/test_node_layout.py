@@ -0,0 +1,76 @@
+"""Test the memory layout of IR nodes."""
+
+import dataclasses
+import pickle
+
+import pytest
+
+from haproxy_translator.ir import nodes
+from haproxy_translator.ir.nodes import EMPTY_MAPPING, Backend, ConfigIR, IRNode, Server
+
+
+def _ir_node_classes() -> list[type[IRNode]]:
+    return [
+        obj
+        for obj in vars(nodes).values()
+        if isinstance(obj, type) and issubclass(obj, IRNode) and dataclasses.is_dataclass(obj)
+    ]
+
+
+class TestSlots:
+    """IR nodes carry no per-instance __dict__."""
+
+    @pytest.mark.parametrize("cls", _ir_node_classes(), ids=lambda cls: cls.__name__)
+    def test_node_is_slotted(self, cls):
+        """Every IR node class defines __slots__."""
+        assert "__slots__" in cls.__dict__
+        assert not hasattr(cls(), "__dict__")
+
+    def test_node_is_still_frozen(self):
+        """Slotted nodes remain immutable."""
+        server = Server(name="web1")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            server.name = "web2"  # type: ignore[misc]
+
+    def test_replace_works(self):
+        """dataclasses.replace works on slotted nodes."""
+        server = dataclasses.replace(Server(name="web1"), port=8080)
+        assert server.name == "web1"
+        assert server.port == 8080
+
+
+class TestSharedEmptyDefaults:
+    """Unset collections share one read-only empty object."""
+
+    def test_metadata_is_shared(self):
+        """Nodes without metadata share EMPTY_MAPPING."""
+        assert Server().metadata is EMPTY_MAPPING
+        assert Backend().metadata is EMPTY_MAPPING
+
+    def test_collections_are_shared(self):
+        """Unset mapping and sequence fields allocate nothing."""
+        server = Server()
+        assert server.options is EMPTY_MAPPING
+        assert server.alpn == ()
+        assert Backend().servers is Backend().servers
+
+    def test_empty_mapping_is_read_only(self):
+        """EMPTY_MAPPING cannot be written to."""
+        with pytest.raises(TypeError):
+            EMPTY_MAPPING["key"] = "value"  # type: ignore[index]
+
+    def test_empty_mapping_behaves_like_empty_dict(self):
+        """EMPTY_MAPPING compares and reads like {}."""
+        assert EMPTY_MAPPING == {}
+        assert len(EMPTY_MAPPING) == 0
+        assert "key" not in EMPTY_MAPPING
+        assert EMPTY_MAPPING.get("key") is None
+        assert dict(EMPTY_MAPPING) == {}
+
+    def test_pickle_keeps_shared_instance(self):
+        """Pickled IR (e.g. from an import worker) unpickles to the shared mapping."""
+        ir = ConfigIR(backends=[Backend(name="api", servers=[Server(name="web1")])])
+        restored = pickle.loads(pickle.dumps(ir))
+        assert restored == ir
+        assert restored.metadata is EMPTY_MAPPING
+        assert restored.backends[0].servers[0].options is EMPTY_MAPPING
@@ -0,0 +1,118 @@
+"""Tests for binary IR serialization."""
+
+import dataclasses
+from pathlib import Path
+
+import pytest
+
+from haproxy_translator.codegen.haproxy import HAProxyCodeGenerator
+from haproxy_translator.ir import serialization
+from haproxy_translator.ir.columns import ServerColumns
+from haproxy_translator.ir.interning import IRInterner
+from haproxy_translator.ir.nodes import (
+    EMPTY_MAPPING,
+    Backend,
+    BalanceAlgorithm,
+    ConfigIR,
+    FrozenMapping,
+    Server,
+)
+from haproxy_translator.ir.serialization import dumps, loads
+from haproxy_translator.parsers import DSLParser
+from haproxy_translator.utils.errors import SerializationError, SourceLocation
+
+EXAMPLES_DIR = Path(__file__).parent.parent.parent / "examples"
+
+
+def round_trip(ir):
+    return loads(dumps(ir))
+
+
+class TestRoundTrip:
+    """Test that dumps/loads preserve the IR."""
+
+    @pytest.mark.parametrize(
+        "example", sorted(EXAMPLES_DIR.glob("*.hap")), ids=lambda path: path.name
+    )
+    def test_examples(self, example):
+        """Every example round-trips and generates the same output."""
+        ir = DSLParser().parse_file(example)
+        restored = round_trip(ir)
+        assert restored == ir
+        generate = HAProxyCodeGenerator().generate
+        assert generate(restored) == generate(ir)
+
+    def test_values(self):
+        """Scalars, enums, locations and collection types survive."""
+        server = Server(
+            name="webé",
+            port=-8080,
+            weight=2**70,
+            options={"ratio": 0.25, "flag": True, "none": None, "list": [1, (2, 3)]},
+            location=SourceLocation("a.hap", 3, 5, 2),
+        )
+        ir = ConfigIR(
+            backends=[Backend(name="api", balance=BalanceAlgorithm.LEASTCONN, servers=[server])]
+        )
+        restored = round_trip(ir)
+        assert restored == ir
+        options = restored.backends[0].servers[0].options
+        assert type(options) is dict
+        assert type(options["list"][1]) is tuple
+        assert restored.backends[0].balance is BalanceAlgorithm.LEASTCONN
+        assert restored.backends[0].metadata is EMPTY_MAPPING
+
+    def test_sharing_preserved(self):
+        """A node reached twice is written once and shared after loading."""
+        ir = IRInterner().intern(DSLParser().parse_file(EXAMPLES_DIR / "basic.hap"))
+        shared = Server(name="same", address="10.0.0.1", port=80)
+        ir = dataclasses.replace(
+            ir, backends=[Backend(name="a", servers=[shared]), Backend(name="b", servers=[shared])]
+        )
+        restored = round_trip(ir)
+        assert restored.backends[0].servers[0] is restored.backends[1].servers[0]
+        assert isinstance(restored.fingerprints, (dict, FrozenMapping))
+
+    def test_server_columns(self):
+        """Columnar servers stay columnar."""
+        servers = [Server(name=f"s{i}", address=f"10.0.0.{i}", port=80) for i in range(10)]
+        ir = ConfigIR(backends=[Backend(name="pool", servers=ServerColumns.from_servers(servers))])
+        restored = round_trip(ir).backends[0].servers
+        assert isinstance(restored, ServerColumns)
+        assert list(restored) == servers
+
+    def test_file_round_trip(self, tmp_path):
+        """dump/load go through a file."""
+        ir = DSLParser().parse_file(EXAMPLES_DIR / "basic.hap")
+        path = tmp_path / "config.ir"
+        serialization.dump(ir, path)
+        assert serialization.load(path) == ir
+
+
+class TestRejectedInput:
+    """Test that unreadable input raises SerializationError."""
+
+    def test_not_ir(self):
+        with pytest.raises(SerializationError, match="Not a serialized IR file"):
+            loads(b"global\n    daemon\n")
+
+    def test_other_format_version(self, monkeypatch):
+        data = dumps(ConfigIR())
+        monkeypatch.setattr(serialization, "FORMAT_VERSION", serialization.FORMAT_VERSION + 1)
+        with pytest.raises(SerializationError, match="format version"):
+            loads(data)
+
+    def test_other_schema(self, monkeypatch):
+        data = dumps(ConfigIR())
+        monkeypatch.setattr(serialization, "SCHEMA_HASH", bytes(16))
+        with pytest.raises(SerializationError, match="different IR schema"):
+            loads(data)
+
+    def test_truncated(self):
+        data = dumps(DSLParser().parse_file(EXAMPLES_DIR / "basic.hap"))
+        with pytest.raises(SerializationError, match="Corrupt"):
+            loads(data[:-10])
+
+    def test_unsupported_value(self):
+        with pytest.raises(SerializationError, match="Cannot serialize value of type object"):
+            dumps(ConfigIR(metadata={"x": object()}))
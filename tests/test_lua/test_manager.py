@@ -1,5 +1,6 @@
 """Tests for Lua script manager."""
 
+import os
 import tempfile
 from pathlib import Path
 
@@ -285,6 +286,25 @@ end)
         assert lua_dir.exists()
         assert lua_dir.is_dir()
 
+    def test_unchanged_lua_file_left_alone(self, temp_dir):
+        """Re-extracting the same script does not rewrite its file."""
+        ir = ConfigIR(
+            name="test",
+            global_config=GlobalConfig(
+                lua_scripts=[LuaScript(name="test", source_type="inline", content="-- test")]
+            ),
+        )
+        first = LuaManager(temp_dir)
+        first.extract_lua_scripts(ir)
+        assert first.files_changed
+        lua_file = temp_dir / "lua" / "test.lua"
+        os.utime(lua_file, (1_000_000_000, 1_000_000_000))
+
+        second = LuaManager(temp_dir)
+        second.extract_lua_scripts(ir)
+        assert not second.files_changed
+        assert lua_file.stat().st_mtime == 1_000_000_000
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,171 @@
+"""Tests for routing map file generation."""
+
+from pathlib import Path
+
+import pytest
+
+from haproxy_translator.codegen.haproxy import HAProxyCodeGenerator
+from haproxy_translator.ir.nodes import ACL, ConfigIR, Frontend, HttpRequestRule, UseBackendRule
+from haproxy_translator.maps.manager import MapManager
+from haproxy_translator.parsers.dsl_parser import DSLParser
+
+EXAMPLES_DIR = Path(__file__).parent.parent.parent / "examples"
+
+SITES = ("shop", "blog", "docs", "mail")
+
+
+def host_routes(sites=SITES, criterion="hdr(host)", flags=("-i",)):
+    acls = [
+        ACL(name=f"is_{site}", criterion=criterion, values=[*flags, f"{site}.Example.com"])
+        for site in sites
+    ]
+    rules = [UseBackendRule(backend=f"{site}_be", condition=f"is_{site}") for site in sites]
+    return acls, rules
+
+
+def make_config(acls, rules, **fields):
+    frontend = Frontend(name="web", acls=acls, use_backend_rules=rules, **fields)
+    return ConfigIR(name="test", frontends=[frontend])
+
+
+class TestMapManager:
+    """Test MapManager."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        return MapManager(tmp_path)
+
+    def test_manager_initialization(self, tmp_path):
+        manager = MapManager(tmp_path)
+        assert manager.output_dir == tmp_path / "maps"
+        assert manager.generated_files == {}
+
+    def test_host_rules_become_map(self, manager, tmp_path):
+        ir = make_config(*host_routes(), default_backend="web")
+        frontend = manager.extract_routing_maps(ir).frontends[0]
+
+        map_file = tmp_path / "maps" / "web_host.map"
+        assert frontend.use_backend_rules == [
+            UseBackendRule(backend=f"%[req.hdr(host),lower,map({map_file})]")
+        ]
+        assert frontend.acls == []
+        lines = map_file.read_text().splitlines()
+        assert lines[0].startswith("#")
+        assert lines[2:] == [f"{site}.example.com {site}_be" for site in SITES]
+        assert manager.files_changed
+        assert manager.generated_files == {map_file: map_file.read_text()}
+
+    def test_case_sensitive_acl_keeps_case(self, manager, tmp_path):
+        ir = make_config(*host_routes(flags=()))
+        rule = manager.extract_routing_maps(ir).frontends[0].use_backend_rules[0]
+        assert rule.backend == f"%[req.hdr(host),map({tmp_path / 'maps' / 'web_host.map'})]"
+        assert "shop.Example.com shop_be\n" in (tmp_path / "maps" / "web_host.map").read_text()
+
+    def test_match_method_flag(self, manager, tmp_path):
+        ir = make_config(*host_routes(criterion="path", flags=("-m", "beg")))
+        rule = manager.extract_routing_maps(ir).frontends[0].use_backend_rules[0]
+        assert rule.backend == f"%[path,map_beg({tmp_path / 'maps' / 'web_path_beg.map'})]"
+
+    def test_few_rules_left_alone(self, manager):
+        ir = make_config(*host_routes(SITES[:3]))
+        assert manager.extract_routing_maps(ir) is ir
+        assert not manager.output_dir.exists()
+
+    def test_later_rules_still_reached(self, manager):
+        """A map rule followed by other rules only applies when its key is found."""
+        acls, rules = host_routes()
+        acls.append(ACL(name="is_api", criterion="src", values=["10.0.0.0/8"]))
+        rules.append(UseBackendRule(backend="api", condition="is_api"))
+        frontend = manager.extract_routing_maps(make_config(acls, rules)).frontends[0]
+
+        first, second = frontend.use_backend_rules
+        expression = first.backend.removeprefix("%[").removesuffix("]")
+        assert first.condition == f"{{ {expression} -m found }}"
+        assert second == rules[-1]
+        assert [acl.name for acl in frontend.acls] == ["is_api"]
+
+    def test_first_rule_wins_duplicate_key(self, manager, tmp_path):
+        acls, rules = host_routes()
+        rules.append(UseBackendRule(backend="other", condition="is_shop"))
+        manager.extract_routing_maps(make_config(acls, rules))
+        content = (tmp_path / "maps" / "web_host.map").read_text()
+        assert "shop.example.com shop_be\n" in content
+        assert "other" not in content
+
+    def test_prefix_before_longer_prefix_left_alone(self, manager):
+        """A map would pick /api/v2 where the rules picked /api."""
+        paths = ("/api", "/api/v2", "/static", "/admin")
+        acls = [ACL(name=f"p{i}", criterion="path_beg", values=[p]) for i, p in enumerate(paths)]
+        rules = [UseBackendRule(backend=f"b{i}", condition=f"p{i}") for i in range(len(paths))]
+        ir = make_config(acls, rules)
+        assert manager.extract_routing_maps(ir) is ir
+
+        # Longest first routes the same through a map
+        ir = make_config(acls, [rules[1], rules[0], *rules[2:]])
+        assert len(manager.extract_routing_maps(ir).frontends[0].use_backend_rules) == 1
+
+    @pytest.mark.parametrize(
+        "acl",
+        [
+            ACL(name="is_shop", criterion="src", values=["10.0.0.1"]),
+            ACL(name="is_shop", criterion="hdr(host)", values=["-f", "/etc/hosts.lst"]),
+            ACL(name="is_shop", criterion="hdr(host)", values=["-m", "reg", "shop"]),
+            ACL(name="is_shop", criterion="hdr(host)", values=['"shop example"']),
+        ],
+        ids=["criterion", "flag", "method", "quoted"],
+    )
+    def test_unsupported_acl_breaks_run(self, manager, acl):
+        acls, rules = host_routes(("shop", "blog", "docs", "mail", "news"))
+        ir = make_config([acl, *acls[1:]], rules)
+        frontend = manager.extract_routing_maps(ir).frontends[0]
+        assert frontend.use_backend_rules[0] == rules[0]
+        assert len(frontend.use_backend_rules) == 2
+
+    def test_complex_condition_breaks_run(self, manager):
+        acls, rules = host_routes()
+        rules[1] = UseBackendRule(backend="blog_be", condition="is_blog !is_shop")
+        ir = make_config(acls, rules)
+        assert manager.extract_routing_maps(ir) is ir
+
+    def test_acl_defined_twice_not_mapped(self, manager):
+        """HAProxy ORs ACLs declared more than once."""
+        acls, rules = host_routes()
+        acls.append(ACL(name="is_shop", criterion="src", values=["10.0.0.1"]))
+        ir = make_config(acls, rules)
+        assert manager.extract_routing_maps(ir) is ir
+
+    def test_acl_used_elsewhere_kept(self, manager):
+        acls, rules = host_routes()
+        ir = make_config(
+            acls, rules, http_request_rules=[HttpRequestRule(action="deny", condition="!is_blog")]
+        )
+        frontend = manager.extract_routing_maps(ir).frontends[0]
+        assert [acl.name for acl in frontend.acls] == ["is_blog"]
+
+    def test_map_names_unique(self, manager, tmp_path):
+        acls, rules = host_routes()
+        path_acls = [ACL(name=f"p{i}", criterion="path", values=[f"/{i}"]) for i in range(4)]
+        path_rules = [UseBackendRule(backend="b", condition=f"p{i}") for i in range(4)]
+        other_acls, other_rules = host_routes(("w", "x", "y", "z"))
+        ir = make_config([*acls, *path_acls, *other_acls], [*rules, *path_rules, *other_rules])
+        manager.extract_routing_maps(ir)
+        assert manager.map_paths == {
+            "web": [
+                tmp_path / "maps" / "web_host.map",
+                tmp_path / "maps" / "web_path.map",
+                tmp_path / "maps" / "web_host_2.map",
+            ]
+        }
+
+    def test_unchanged_file_not_rewritten(self, tmp_path):
+        ir = make_config(*host_routes())
+        MapManager(tmp_path).extract_routing_maps(ir)
+        manager = MapManager(tmp_path)
+        manager.extract_routing_maps(ir)
+        assert not manager.files_changed
+
+    @pytest.mark.parametrize("path", sorted(EXAMPLES_DIR.glob("*.hap")), ids=lambda p: p.name)
+    def test_examples_still_generate(self, path, tmp_path):
+        ir = DSLParser().parse_file(path)
+        extracted = MapManager(tmp_path, min_rules=2).extract_routing_maps(ir)
+        HAProxyCodeGenerator().generate(extracted)
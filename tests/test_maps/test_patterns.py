@@ -0,0 +1,148 @@
+"""Tests for ACL pattern file generation."""
+
+import ipaddress
+from pathlib import Path
+
+import pytest
+
+from haproxy_translator.codegen.haproxy import HAProxyCodeGenerator
+from haproxy_translator.ir.nodes import ACL, Backend, ConfigIR, Frontend, Listen
+from haproxy_translator.maps.patterns import PatternManager, canonical_patterns
+
+
+def make_config(*acls):
+    return ConfigIR(name="test", frontends=[Frontend(name="web", acls=list(acls))])
+
+
+def addresses(patterns):
+    """Return every address ``patterns`` cover."""
+    found = set()
+    for pattern in patterns:
+        found.update(ipaddress.ip_network(pattern, strict=False))
+    return found
+
+
+class TestCanonicalPatterns:
+    """Test canonical_patterns."""
+
+    def test_duplicates_dropped_in_order(self):
+        assert canonical_patterns("path_beg", [], ["/b", "/a", "/b"]) == ["/b", "/a"]
+
+    def test_case_ignored_with_i_flag(self):
+        values = ["BadBot", "badbot", "Crawler"]
+        assert canonical_patterns("hdr_sub(user-agent)", ["-i"], values) == ["BadBot", "Crawler"]
+        assert canonical_patterns("hdr_sub(user-agent)", [], values) == values
+
+    def test_networks_merged(self):
+        values = ["10.0.0.0/25", "10.0.0.128/25", "10.0.0.7", "192.168.1.1", "192.168.1.1/32"]
+        assert canonical_patterns("src", [], values) == ["10.0.0.0/24", "192.168.1.1"]
+
+    def test_merged_networks_match_the_same(self):
+        values = [f"10.1.{i // 4}.{i % 4 * 64}/26" for i in range(40)] + ["10.1.3.5", "10.1.99.1"]
+        merged = canonical_patterns("src", [], values)
+        assert len(merged) < len(values)
+        assert addresses(merged) == addresses(values)
+
+    def test_host_bits_ignored(self):
+        assert canonical_patterns("src", [], ["10.1.2.3/8"]) == ["10.0.0.0/8"]
+
+    def test_ipv6_kept_apart(self):
+        values = ["2001:db8::/33", "2001:db8:8000::/33", "10.0.0.1"]
+        assert canonical_patterns("src", [], values) == ["10.0.0.1", "2001:db8::/32"]
+
+    def test_ip_match_method(self):
+        values = ["10.0.0.0/25", "10.0.0.128/25"]
+        assert canonical_patterns("req.hdr(x-forwarded-for)", ["-m", "ip"], values) == [
+            "10.0.0.0/24"
+        ]
+        assert canonical_patterns("src", ["-m", "str"], values) == values
+
+    def test_host_names_not_merged(self):
+        values = ["10.0.0.1", "gateway.internal", "10.0.0.1"]
+        assert canonical_patterns("src", [], values) == ["10.0.0.1", "gateway.internal"]
+
+
+class TestPatternManager:
+    """Test PatternManager."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        return PatternManager(tmp_path, min_values=4)
+
+    def test_manager_initialization(self, tmp_path):
+        manager = PatternManager(tmp_path)
+        assert manager.output_dir == tmp_path / "patterns"
+        assert manager.generated_files == {}
+
+    def test_long_list_moved_to_file(self, manager):
+        bots = ["BadBot", "Crawler", "Scraper", "Spider", "badbot"]
+        ir = make_config(ACL(name="is_bot", criterion="hdr_sub(user-agent)", values=["-i", *bots]))
+        acl = manager.extract_acl_patterns(ir).frontends[0].acls[0]
+
+        assert acl.values[:2] == ["-i", "-f"]
+        path = manager.output_dir / Path(acl.values[2]).name
+        assert acl.values[2] == str(path)
+        assert path.read_text() == "BadBot\nCrawler\nScraper\nSpider\n"
+        assert manager.generated_files == {path: path.read_text()}
+        assert manager.files_changed
+
+        config = HAProxyCodeGenerator().generate(manager.extract_acl_patterns(ir))
+        assert f"    acl is_bot hdr_sub(user-agent) -i -f {path}\n" in config
+
+    def test_short_list_deduplicated_inline(self, manager):
+        ir = make_config(
+            ACL(name="internal", criterion="src", values=["10.0.0.0/9", "10.128.0.0/9"])
+        )
+        acl = manager.extract_acl_patterns(ir).frontends[0].acls[0]
+        assert acl.values == ["10.0.0.0/8"]
+        assert not manager.output_dir.exists()
+
+    def test_threshold_counts_deduplicated_values(self, manager):
+        ir = make_config(ACL(name="api", criterion="path_beg", values=["/a", "/b", "/c", "/a"]))
+        acl = manager.extract_acl_patterns(ir).frontends[0].acls[0]
+        assert acl.values == ["/a", "/b", "/c"]
+
+    def test_canonical_acl_unchanged(self, manager):
+        ir = make_config(ACL(name="api", criterion="path_beg", values=["/api"]))
+        assert manager.extract_acl_patterns(ir) is ir
+
+    def test_all_proxies(self, manager):
+        acl = ACL(name="dup", criterion="path", values=["/a", "/a"])
+        ir = ConfigIR(
+            name="test",
+            frontends=[Frontend(name="f", acls=[acl])],
+            backends=[Backend(name="b", acls=[acl])],
+            listens=[Listen(name="l", acls=[acl])],
+        )
+        extracted = manager.extract_acl_patterns(ir)
+        for proxy in (*extracted.frontends, *extracted.backends, *extracted.listens):
+            assert proxy.acls[0].values == ["/a"]
+
+    def test_same_values_share_file(self, manager):
+        values = [f"/{i}" for i in range(4)]
+        ir = make_config(
+            ACL(name="a", criterion="path_beg", values=values),
+            ACL(name="b", criterion="path_end", values=[*values, values[0]]),
+        )
+        first, second = manager.extract_acl_patterns(ir).frontends[0].acls
+        assert first.values == second.values
+        assert len(manager.generated_files) == 1
+
+    def test_unchanged_file_not_rewritten(self, tmp_path):
+        ir = make_config(ACL(name="a", criterion="path", values=[f"/{i}" for i in range(4)]))
+        PatternManager(tmp_path, min_values=4).extract_acl_patterns(ir)
+        manager = PatternManager(tmp_path, min_values=4)
+        manager.extract_acl_patterns(ir)
+        assert not manager.files_changed
+
+    @pytest.mark.parametrize("value", ["#comment", '"quoted value"', r"\.php$"])
+    def test_values_needing_parsing_stay_inline(self, manager, value):
+        values = [value, "/a", "/b", "/c"]
+        ir = make_config(ACL(name="a", criterion="path", values=values))
+        assert manager.extract_acl_patterns(ir) is ir
+
+    def test_flags_kept(self, manager):
+        values = ["-m", "beg", "-u", "7", "/a", "/b", "/c", "/d"]
+        ir = make_config(ACL(name="a", criterion="path", values=values))
+        acl = manager.extract_acl_patterns(ir).frontends[0].acls[0]
+        assert acl.values[:5] == ["-m", "beg", "-u", "7", "-f"]
@@ -0,0 +1,272 @@
+"""Test LALR/Earley parser modes and automatic fallback."""
+
+import copy
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from haproxy_translator.codegen.haproxy import HAProxyCodeGenerator
+from haproxy_translator.parsers.dsl_parser import PARSER_MODES, DSLParser
+from haproxy_translator.parsers.lalr_lexer import ViablePrefixLexer
+from haproxy_translator.utils.errors import ParseError
+
+EXAMPLES_DIR = Path(__file__).parent.parent.parent / "examples"
+
+# After `value: "DENY"`, `del_header` could be another parameter name or the
+# next rule's action; only the token after it (no colon) tells them apart.
+NEEDS_EARLEY = """
+config test {
+    backend api {
+        http-response {
+            set_header name: "X-Frame-Options" value: "DENY"
+            del_header name: "Server"
+        }
+        servers {
+            server api1 {
+                address: "10.0.1.1"
+                port: 8080
+            }
+        }
+    }
+}
+"""
+
+
+class TestParserModes:
+    """Test parser mode selection."""
+
+    def test_default_mode_is_auto(self):
+        """Test that the default parser mode is auto."""
+        assert DSLParser().parser_mode == "auto"
+
+    def test_invalid_mode(self):
+        """Test that an unknown parser mode is rejected."""
+        with pytest.raises(ValueError, match="Unknown parser mode: glr"):
+            DSLParser(parser_mode="glr")
+
+    def test_grammar_compiled_once(self):
+        """Test that parsers in the same mode share the compiled grammar."""
+        assert DSLParser().parser is DSLParser(parser_mode="lalr").parser
+        assert DSLParser(parser_mode="earley").parser is DSLParser(parser_mode="earley").parser
+
+    @pytest.mark.parametrize("example", sorted(EXAMPLES_DIR.glob("*.hap")), ids=lambda p: p.name)
+    def test_examples_identical_across_modes(self, example):
+        """Test that every mode produces the same output for the examples."""
+        source = example.read_text()
+        codegen = HAProxyCodeGenerator()
+        expected = codegen.generate(DSLParser(parser_mode="earley").parse(source))
+
+        assert codegen.generate(DSLParser(parser_mode="auto").parse(source)) == expected
+
+
+class TestInlineTransform:
+    """Test the fused parse+transform pass."""
+
+    def test_disabled_by_default(self):
+        """Test that the parse tree is built unless requested."""
+        assert DSLParser().inline_parser is None
+
+    def test_ignored_in_earley_mode(self):
+        """Test that Earley mode always builds a parse tree."""
+        assert DSLParser(parser_mode="earley", inline_transform=True).inline_parser is None
+
+    @pytest.mark.parametrize("example", sorted(EXAMPLES_DIR.glob("*.hap")), ids=lambda p: p.name)
+    def test_examples_identical_ir(self, example):
+        """Test that inline transformation builds the same IR."""
+        source = example.read_text()
+        expected = DSLParser().parse(source, example)
+
+        assert DSLParser(inline_transform=True).parse(source, example) == expected
+
+    def test_fallback_to_earley(self):
+        """Test that input LALR rejects is parsed by Earley."""
+        ir = DSLParser(inline_transform=True).parse(NEEDS_EARLEY)
+        assert [rule.action for rule in ir.backends[0].http_response_rules] == [
+            "set_header",
+            "del_header",
+        ]
+
+    def test_lalr_mode_does_not_fall_back(self):
+        """Test that LALR-only mode reports the syntax error."""
+        with pytest.raises(ParseError, match="Syntax error"):
+            DSLParser(parser_mode="lalr", inline_transform=True).parse(NEEDS_EARLEY)
+
+    def test_state_not_shared_between_parses(self):
+        """Test that variables from one parse don't leak into the next."""
+        parser = DSLParser(inline_transform=True)
+        parser.parse('config a { let host = "10.0.0.1" }')
+        source = """
+        config b {
+            backend api {
+                servers {
+                    server s1 {
+                        address: "${host}"
+                        port: 8080
+                    }
+                }
+            }
+        }
+        """
+        with pytest.raises(ParseError, match="Undefined variable: host"):
+            parser.parse(source)
+
+    def test_transform_errors_match_tree_transform(self, monkeypatch):
+        """Test that errors raised while transforming are reported identically."""
+        monkeypatch.delenv("MISSING_HOST", raising=False)
+        source = 'config test { let host = env("MISSING_HOST") }'
+        with pytest.raises(ParseError) as tree_error:
+            DSLParser().parse(source)
+        with pytest.raises(ParseError) as inline_error:
+            DSLParser(inline_transform=True).parse(source)
+
+        assert str(inline_error.value) == str(tree_error.value)
+
+
+class TestLALRMode:
+    """Test the LALR grammar and lexer."""
+
+    @pytest.fixture
+    def parser(self):
+        return DSLParser(parser_mode="lalr")
+
+    def test_dotted_and_hyphenated_keywords(self, parser):
+        """Test keywords that overlap identifier prefixes."""
+        source = """
+        config test {
+            global {
+                tune.bufsize: 32768
+            }
+            backend api {
+                balance: roundrobin
+                default-server {
+                    send-proxy: true
+                }
+            }
+        }
+        """
+        ir = parser.parse(source)
+        assert ir.global_config.tuning["tune.bufsize"] == 32768
+        assert ir.backends[0].default_server.send_proxy is True
+
+    def test_bind_option_before_directive(self, parser):
+        """Test a bind option name that is also a frontend directive."""
+        source = """
+        config test {
+            frontend web {
+                bind *:80 maxconn 5000
+                default_backend: api
+            }
+            backend api {
+                balance: roundrobin
+            }
+        }
+        """
+        ir = parser.parse(source)
+        assert ir.frontends[0].binds[0].options["maxconn"] == 5000
+        assert ir.frontends[0].default_backend == "api"
+
+    def test_keywords_as_identifiers(self, parser):
+        """Test keywords used where an identifier is expected."""
+        source = """
+        config test {
+            defaults {
+                timeout: {
+                    connect: 5s
+                    server: 30s
+                }
+            }
+        }
+        """
+        ir = parser.parse(source)
+        assert ir.defaults.timeout_server == "30s"
+
+    def test_interpolated_string(self, parser):
+        """Test that interpolated strings parse like plain strings."""
+        source = """
+        config test {
+            let host = "10.0.1.1"
+            backend api {
+                servers {
+                    server s1 {
+                        address: "${host}"
+                        port: 8080
+                    }
+                }
+            }
+        }
+        """
+        ir = parser.parse(source)
+        assert ir.backends[0].servers[0].address == "10.0.1.1"
+
+    def test_rejects_input_needing_more_lookahead(self, parser):
+        """Test that LALR-only mode does not fall back to Earley."""
+        with pytest.raises(ParseError, match="Syntax error"):
+            parser.parse(NEEDS_EARLEY)
+
+    def test_lexer_tables_built_once_across_threads(self, parser, monkeypatch):
+        """Test that threads reaching an unbuilt state lexer share one build."""
+        lexer = copy.copy(parser.parser.parser.lexer.root_lexer)
+        lexer._scanner = None
+        builds = []
+        build_scanner = ViablePrefixLexer._build_scanner
+
+        def slow_build_scanner(self):
+            builds.append(self)
+            # Slow construction widens the window for racing threads
+            time.sleep(0.05)
+            return build_scanner(self)
+
+        monkeypatch.setattr(ViablePrefixLexer, "_build_scanner", slow_build_scanner)
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(lexer.candidates("config test", 0, 11))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert builds == [lexer]
+        assert len(results) == 8
+        assert all(result == results[0] for result in results)
+        # (length, priority, is_literal, value, terminal name)
+        assert any(candidate[2:4] == (True, "config") for candidate in results[0])
+
+
+class TestAutoMode:
+    """Test automatic Earley fallback."""
+
+    def test_fallback_to_earley(self):
+        """Test that input LALR rejects is parsed by Earley."""
+        ir = DSLParser().parse(NEEDS_EARLEY)
+        rules = ir.backends[0].http_response_rules
+        assert [rule.action for rule in rules] == ["set_header", "del_header"]
+
+    def test_no_fallback_for_lalr_input(self):
+        """Test that Earley is not used when LALR succeeds."""
+        parser = DSLParser()
+        with patch("haproxy_translator.parsers.dsl_parser._get_lark") as build:
+            parser.parse("config test { global { maxconn: 1000 } }")
+        build.assert_not_called()
+
+    def test_syntax_error_reported_by_earley(self):
+        """Test that syntax errors match Earley's error messages."""
+        source = "config test { frontend web { bind } }"
+        with pytest.raises(ParseError) as auto_error:
+            DSLParser().parse(source)
+        with pytest.raises(ParseError) as earley_error:
+            DSLParser(parser_mode="earley").parse(source)
+
+        assert str(auto_error.value) == str(earley_error.value)
+        assert auto_error.value.location == earley_error.value.location
+
+    def test_all_modes_listed(self):
+        """Test the supported parser modes."""
+        assert PARSER_MODES == ("auto", "lalr", "earley")
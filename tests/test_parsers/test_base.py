@@ -1,7 +1,10 @@
 """Tests for base parser classes."""
 
 import tempfile
+import threading
+import time
 from pathlib import Path
+from typing import ClassVar
 
 import pytest
 
@@ -114,6 +117,22 @@ class TestConfigParser:
         assert "Invalid syntax" in str(errors[0])
 
 
+class ClassAttributeParser(ConfigParser):
+    """Parser declaring its metadata as class attributes."""
+
+    format_name: ClassVar[str] = "classattr"
+    file_extensions: ClassVar[list[str]] = [".ca"]
+    instances: ClassVar[int] = 0
+
+    def __init__(self) -> None:
+        # Slow construction widens the window for racing threads
+        time.sleep(0.01)
+        type(self).instances += 1
+
+    def parse(self, source: str, filepath: Path | None = None) -> ConfigIR:
+        return ConfigIR(name="classattr_config")
+
+
 class TestParserRegistry:
     """Test ParserRegistry class."""
 
@@ -121,6 +140,8 @@ class TestParserRegistry:
         """Clear registry before each test."""
         ParserRegistry._parsers = {}
         ParserRegistry._extension_map = {}
+        ParserRegistry._instances = {}
+        ClassAttributeParser.instances = 0
 
     def test_register_parser(self):
         """Test registering a parser."""
@@ -148,6 +169,47 @@ class TestParserRegistry:
         assert isinstance(parser, MockParser)
         assert parser.format_name == "mock"
 
+    def test_register_reads_class_attributes(self):
+        """Test that registering does not construct the parser."""
+        ParserRegistry.register(ClassAttributeParser)
+
+        assert ClassAttributeParser.instances == 0
+        assert ParserRegistry._extension_map[".ca"] == "classattr"
+
+    def test_get_parser_returns_shared_instance(self):
+        """Test that get_parser builds each parser once and reuses it."""
+        ParserRegistry.register(ClassAttributeParser)
+
+        by_name = ParserRegistry.get_parser(format_name="classattr")
+        by_path = ParserRegistry.get_parser(filepath=Path("config.ca"))
+        assert by_name is by_path
+        assert ClassAttributeParser.instances == 1
+
+    def test_get_parser_thread_safe(self):
+        """Test that concurrent first calls build a single parser."""
+        ParserRegistry.register(ClassAttributeParser)
+        parsers = []
+
+        def worker():
+            parsers.append(ParserRegistry.get_parser(format_name="classattr"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert ClassAttributeParser.instances == 1
+        assert all(parser is parsers[0] for parser in parsers)
+
+    def test_reregister_drops_shared_instance(self):
+        """Test that registering again builds a fresh parser."""
+        ParserRegistry.register(ClassAttributeParser)
+        first = ParserRegistry.get_parser(format_name="classattr")
+
+        ParserRegistry.register(ClassAttributeParser)
+        assert ParserRegistry.get_parser(format_name="classattr") is not first
+
     def test_get_parser_unknown_format(self):
         """Test getting parser with unknown format."""
         with pytest.raises(ValueError, match="Unknown format: unknown"):
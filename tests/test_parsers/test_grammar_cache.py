@@ -0,0 +1,142 @@
+"""Tests for the on-disk compiled grammar cache."""
+
+from unittest.mock import Mock
+
+import lark
+import pytest
+
+from haproxy_translator.parsers import grammar_cache
+from haproxy_translator.parsers.dsl_parser import _build_lark, _lark_config
+
+GRAMMAR = """
+start: WORD+
+%import common.WORD
+%import common.WS
+%ignore WS
+"""
+OPTIONS = {"parser": "lalr"}
+
+
+def build():
+    return lark.Lark(GRAMMAR, **OPTIONS)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the user cache at a temporary directory."""
+    monkeypatch.setenv(grammar_cache.CACHE_DIR_ENV, str(tmp_path))
+    return tmp_path
+
+
+class TestCacheKey:
+    """Test cache key derivation."""
+
+    def test_key_is_stable(self):
+        assert grammar_cache.cache_key(GRAMMAR, OPTIONS) == grammar_cache.cache_key(
+            GRAMMAR, dict(OPTIONS)
+        )
+
+    def test_key_depends_on_grammar(self):
+        assert grammar_cache.cache_key(GRAMMAR, OPTIONS) != grammar_cache.cache_key(
+            GRAMMAR + "\n", OPTIONS
+        )
+
+    def test_key_depends_on_options(self):
+        assert grammar_cache.cache_key(GRAMMAR, OPTIONS) != grammar_cache.cache_key(
+            GRAMMAR, {**OPTIONS, "propagate_positions": True}
+        )
+
+    def test_key_depends_on_lark_version(self, monkeypatch):
+        key = grammar_cache.cache_key(GRAMMAR, OPTIONS)
+        monkeypatch.setattr(lark, "__version__", "0.0.1")
+        assert grammar_cache.cache_key(GRAMMAR, OPTIONS) != key
+
+
+class TestUserCacheDir:
+    """Test user cache directory selection."""
+
+    def test_env_override(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(grammar_cache.CACHE_DIR_ENV, str(tmp_path))
+        assert grammar_cache.user_cache_dir() == tmp_path
+
+    def test_empty_env_disables_cache(self, monkeypatch):
+        monkeypatch.setenv(grammar_cache.CACHE_DIR_ENV, "")
+        assert grammar_cache.user_cache_dir() is None
+
+    def test_xdg_cache_home(self, tmp_path, monkeypatch):
+        monkeypatch.delenv(grammar_cache.CACHE_DIR_ENV, raising=False)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert grammar_cache.user_cache_dir() == tmp_path / "haproxy-translator"
+
+
+class TestLoadOrBuild:
+    """Test cache lookup, fallback and writing."""
+
+    def test_miss_builds_and_writes(self, cache_dir):
+        builder = Mock(side_effect=build)
+        parser = grammar_cache.load_or_build(GRAMMAR, OPTIONS, builder)
+
+        builder.assert_called_once()
+        assert parser.parse("a b").children == ["a", "b"]
+        key = grammar_cache.cache_key(GRAMMAR, OPTIONS)
+        assert (cache_dir / grammar_cache.cache_filename(key)).exists()
+        assert not list(cache_dir.glob("*.tmp"))
+
+    def test_hit_skips_build(self, cache_dir):
+        grammar_cache.load_or_build(GRAMMAR, OPTIONS, build)
+        builder = Mock(side_effect=build)
+        parser = grammar_cache.load_or_build(GRAMMAR, OPTIONS, builder)
+
+        builder.assert_not_called()
+        assert parser.parse("a b").children == ["a", "b"]
+
+    def test_key_mismatch_rebuilds(self, cache_dir):
+        key = grammar_cache.cache_key(GRAMMAR, OPTIONS)
+        stale = grammar_cache.serialize(build(), "0" * 64)
+        (cache_dir / grammar_cache.cache_filename(key)).write_bytes(stale)
+
+        builder = Mock(side_effect=build)
+        grammar_cache.load_or_build(GRAMMAR, OPTIONS, builder)
+        builder.assert_called_once()
+
+    def test_corrupt_cache_rebuilds(self, cache_dir):
+        key = grammar_cache.cache_key(GRAMMAR, OPTIONS)
+        data = grammar_cache.serialize(build(), key)
+        (cache_dir / grammar_cache.cache_filename(key)).write_bytes(data[: len(data) // 2])
+
+        builder = Mock(side_effect=build)
+        parser = grammar_cache.load_or_build(GRAMMAR, OPTIONS, builder)
+        builder.assert_called_once()
+        assert parser.parse("a").children == ["a"]
+
+    def test_disabled_cache_writes_nothing(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(grammar_cache.CACHE_DIR_ENV, "")
+        monkeypatch.chdir(tmp_path)
+        grammar_cache.load_or_build(GRAMMAR, OPTIONS, build)
+        assert not list(tmp_path.iterdir())
+
+    def test_unwritable_cache_dir(self, tmp_path, monkeypatch):
+        blocker = tmp_path / "file"
+        blocker.write_text("not a directory")
+        monkeypatch.setenv(grammar_cache.CACHE_DIR_ENV, str(blocker / "cache"))
+
+        parser = grammar_cache.load_or_build(GRAMMAR, OPTIONS, build)
+        assert parser.parse("a").children == ["a"]
+
+
+class TestPrebuiltCache:
+    """Test the prebuilt cache shipped with the package."""
+
+    def test_prebuilt_cache_matches_grammar(self, monkeypatch):
+        """Run tools/build_grammar_cache.py if this fails after a grammar change."""
+        monkeypatch.setenv(grammar_cache.CACHE_DIR_ENV, "")
+        grammar, options = _lark_config("lalr")
+        key = grammar_cache.cache_key(grammar, options)
+
+        assert grammar_cache._read_prebuilt_cache(key) is not None
+
+    def test_cached_parser_matches_compiled(self):
+        grammar, options = _lark_config("lalr")
+        source = "config test { global { maxconn: 1000 } }"
+
+        assert _build_lark("lalr").parse(source) == lark.Lark(grammar, **options).parse(source)
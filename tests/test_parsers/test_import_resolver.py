@@ -0,0 +1,200 @@
+"""Tests for import resolution."""
+
+import pytest
+
+from haproxy_translator.parsers import DSLParser, import_resolver
+from haproxy_translator.parsers.import_resolver import clear_module_cache, resolve_import
+from haproxy_translator.utils.errors import ParseError
+
+LIBRARY = """
+config common {
+    let port = 8080
+    template web {
+        check: true
+        inter: 5s
+    }
+}
+"""
+
+MAIN = """
+config main {
+    import "lib/common.hap"
+    backend api {
+        servers {
+            server a1 {
+                address: "10.0.0.1"
+                port: ${port}
+                @web
+            }
+        }
+    }
+}
+"""
+
+
+def backend(name):
+    return f"""
+config {name} {{
+    backend {name} {{
+        balance: roundrobin
+    }}
+}}
+"""
+
+
+@pytest.fixture(autouse=True)
+def empty_module_cache():
+    clear_module_cache()
+    yield
+    clear_module_cache()
+
+
+@pytest.fixture
+def parser():
+    return DSLParser(import_jobs=1)
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+class TestResolveImport:
+    """Test import path resolution."""
+
+    def test_relative_to_importing_file(self, tmp_path):
+        assert resolve_import("b.hap", tmp_path / "sub" / "a.hap") == tmp_path / "sub" / "b.hap"
+
+    def test_absolute_path(self, tmp_path):
+        assert resolve_import(str(tmp_path / "b.hap"), tmp_path / "x" / "a.hap") == (
+            tmp_path / "b.hap"
+        )
+
+    def test_without_importing_file(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        assert resolve_import("b.hap", None) == tmp_path / "b.hap"
+
+
+class TestImportResolution:
+    """Test merging imported modules."""
+
+    def test_variables_and_templates_imported(self, parser, tmp_path):
+        write(tmp_path / "lib" / "common.hap", LIBRARY)
+        main = write(tmp_path / "main.hap", MAIN)
+
+        ir = parser.parse_file(main)
+        server = ir.backends[0].servers[0]
+        assert server.port == 8080
+        assert server.check is True
+        assert ir.imports == ["lib/common.hap"]
+
+    def test_nested_imports_relative_to_importer(self, parser, tmp_path):
+        write(tmp_path / "lib" / "common.hap", 'config c { import "more/b.hap" }')
+        write(tmp_path / "lib" / "more" / "b.hap", backend("b"))
+        main = write(tmp_path / "main.hap", 'config main { import "lib/common.hap" }')
+
+        assert [b.name for b in parser.parse_file(main).backends] == ["b"]
+
+    def test_shared_dependency_merged_once(self, parser, tmp_path):
+        write(tmp_path / "a.hap", 'config a { import "shared.hap" }')
+        write(tmp_path / "b.hap", 'config b { import "shared.hap" }')
+        write(tmp_path / "shared.hap", backend("shared"))
+        main = write(tmp_path / "main.hap", 'config main { import "a.hap" import "b.hap" }')
+
+        assert [b.name for b in parser.parse_file(main).backends] == ["shared"]
+
+    def test_importer_definitions_win(self, parser, tmp_path):
+        write(tmp_path / "lib.hap", "config lib { let port = 1 }")
+        main = write(
+            tmp_path / "main.hap",
+            'config main { import "lib.hap" let port = 2 }',
+        )
+
+        assert parser.parse_file(main).variables["port"].value == 2
+
+    def test_missing_import(self, parser, tmp_path):
+        main = write(tmp_path / "main.hap", 'config main { import "missing.hap" }')
+
+        with pytest.raises(ParseError, match=r"Cannot import .*missing\.hap"):
+            parser.parse_file(main)
+
+    def test_syntax_error_reports_module(self, parser, tmp_path):
+        write(tmp_path / "broken.hap", "config broken { backend }")
+        main = write(tmp_path / "main.hap", 'config main { import "broken.hap" }')
+
+        with pytest.raises(ParseError) as exc:
+            parser.parse_file(main)
+        assert exc.value.location.filepath.endswith("broken.hap")
+
+    def test_cycle_reports_full_path(self, parser, tmp_path):
+        write(tmp_path / "a.hap", 'config a { import "b.hap" }')
+        write(tmp_path / "b.hap", 'config b { import "c.hap" }')
+        write(tmp_path / "c.hap", 'config c { import "a.hap" }')
+        main = write(tmp_path / "main.hap", 'config main { import "a.hap" }')
+
+        with pytest.raises(ParseError) as exc:
+            parser.parse_file(main)
+        a, b, c = (str(tmp_path / f"{n}.hap") for n in "abc")
+        assert str(exc.value) == f"Import cycle: {a} -> {b} -> {c} -> {a}"
+
+    def test_cycle_through_root(self, parser, tmp_path):
+        write(tmp_path / "a.hap", 'config a { import "main.hap" }')
+        main = write(tmp_path / "main.hap", 'config main { import "a.hap" }')
+
+        with pytest.raises(ParseError, match="Import cycle"):
+            parser.parse_file(main)
+
+
+class TestModuleCache:
+    """Test the module IR cache."""
+
+    def test_unchanged_module_not_reparsed(self, parser, tmp_path, monkeypatch):
+        write(tmp_path / "lib" / "common.hap", LIBRARY)
+        main = write(tmp_path / "main.hap", MAIN)
+        parser.parse_file(main)
+
+        calls = []
+        original = parser._parse_to_ir
+        monkeypatch.setattr(
+            DSLParser, "_parse_to_ir", lambda self, *args: calls.append(args) or original(*args)
+        )
+        parser.parse_file(main)
+        DSLParser(import_jobs=1).parse_file(main)
+        assert [filename for _, filename in calls] == [str(main), str(main)]
+
+    def test_changed_module_reparsed(self, parser, tmp_path):
+        lib = write(tmp_path / "lib.hap", "config lib { let port = 1 }")
+        main = write(tmp_path / "main.hap", 'config main { import "lib.hap" }')
+        parser.parse_file(main)
+
+        lib.write_text("config lib { let port = 2 }")
+        assert parser.parse_file(main).variables["port"].value == 2
+
+
+class TestParallelImports:
+    """Test parsing independent imports in a process pool."""
+
+    def test_pool_matches_serial(self, tmp_path, monkeypatch):
+        for name in "abc":
+            write(tmp_path / f"{name}.hap", backend(name))
+        main = write(
+            tmp_path / "main.hap",
+            'config main { import "a.hap" import "b.hap" import "c.hap" }',
+        )
+        serial = DSLParser(import_jobs=1).parse_file(main)
+        clear_module_cache()
+
+        monkeypatch.setattr(import_resolver, "PARALLEL_MIN_BYTES", 0)
+        parallel = DSLParser(import_jobs=3).parse_file(main)
+        assert parallel == serial
+        assert [b.name for b in parallel.backends] == ["a", "b", "c"]
+
+    def test_pool_reports_module_errors(self, tmp_path, monkeypatch):
+        write(tmp_path / "a.hap", backend("a"))
+        write(tmp_path / "b.hap", "config b { backend }")
+        main = write(tmp_path / "main.hap", 'config main { import "a.hap" import "b.hap" }')
+
+        monkeypatch.setattr(import_resolver, "PARALLEL_MIN_BYTES", 0)
+        with pytest.raises(ParseError, match=r"b\.hap"):
+            DSLParser(import_jobs=2).parse_file(main)
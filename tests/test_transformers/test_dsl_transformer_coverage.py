@@ -13,18 +13,27 @@ class TestImportStatement:
         """Create a DSL parser."""
         return DSLParser()
 
-    def test_import_single_file(self, parser):
+    @pytest.fixture
+    def library(self, tmp_path):
+        """Create importable files under tmp_path."""
+        for name in ("common/defaults.hcl", "security/ssl.hcl", "backends/api.hcl"):
+            path = tmp_path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("config lib { }")
+        return tmp_path
+
+    def test_import_single_file(self, parser, library):
         """Test importing a single file."""
         source = """
         config test {
             import "common/defaults.hcl"
         }
         """
-        ir = parser.parse(source)
+        ir = parser.parse(source, library / "main.hap")
         assert len(ir.imports) == 1
         assert ir.imports[0] == "common/defaults.hcl"
 
-    def test_import_multiple_files(self, parser):
+    def test_import_multiple_files(self, parser, library):
         """Test importing multiple files."""
         source = """
         config test {
@@ -33,7 +42,7 @@ class TestImportStatement:
             import "backends/api.hcl"
         }
         """
-        ir = parser.parse(source)
+        ir = parser.parse(source, library / "main.hap")
         assert len(ir.imports) == 3
         assert "common/defaults.hcl" in ir.imports
         assert "security/ssl.hcl" in ir.imports
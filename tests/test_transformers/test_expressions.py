@@ -0,0 +1,100 @@
+"""Tests for the compiled ${expr} evaluator used by loop unrolling."""
+
+import pytest
+
+from haproxy_translator.parsers import DSLParser
+from haproxy_translator.transformers.expressions import (
+    ExpressionError,
+    Scope,
+    compile_expression,
+    evaluate,
+)
+from haproxy_translator.utils.errors import ParseError
+
+
+class TestEvaluate:
+    """Supported expressions."""
+
+    @pytest.mark.parametrize(
+        ("source", "expected"),
+        [
+            ("i", 3),
+            ("10 + i", 13),
+            ("i * 2 - 1", 5),
+            ("i / 2", 1.5),
+            ("i // 2", 1),
+            ("i % 2", 1),
+            ("-i", -3),
+            ("(i + 1) * 2", 8),
+            ("i > 2 and i < 5", True),
+            ("i == 1 or name", "web"),
+            ("not i", False),
+            ("1 < i <= 3", True),
+            ("i in ports", False),
+            ("'a' if i > 1 else 'b'", "a"),
+            ("ports[0]", 80),
+            ("name + '-' + 'x'", "web-x"),
+        ],
+    )
+    def test_expression(self, source, expected):
+        assert evaluate(source, {"i": 3, "name": "web", "ports": [80, 443]}) == expected
+
+    def test_layered_scope(self):
+        """Inner layers shadow outer ones without copying them."""
+        globals_ = {"i": 100, "base": 10}
+        scope = Scope({"i": 2}, globals_)
+        assert evaluate("base + i", scope) == 12
+        assert dict(scope) == {"i": 2}
+        with pytest.raises(ExpressionError, match="name 'port' is not defined"):
+            evaluate("port", scope)
+
+    def test_compiled_once(self):
+        assert compile_expression("i + 1") is compile_expression("i + 1")
+
+
+class TestRejected:
+    """Anything beyond plain arithmetic and lookups is refused."""
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            "__import__('os')",
+            "().__class__",
+            "[x for x in ports]",
+            "lambda: 1",
+            "i ** 2",
+            "ports[0:1]",
+            "b'bytes'",
+        ],
+    )
+    def test_unsupported_syntax(self, source):
+        with pytest.raises(ExpressionError, match="unsupported syntax"):
+            compile_expression(source)
+
+    def test_invalid_syntax(self):
+        with pytest.raises(ExpressionError, match="invalid syntax"):
+            compile_expression("i +")
+
+    def test_undefined_name(self):
+        with pytest.raises(ExpressionError, match="name 'missing' is not defined"):
+            evaluate("missing + 1", {})
+
+
+def test_loop_expression_errors_are_parse_errors():
+    """Unsupported expressions in a loop body fail the parse."""
+    source = """
+config loop {
+    backend web {
+        servers {
+            for i in [1..2] {
+                server "web-${i.__class__}" {
+                    address: "10.0.0.${i}"
+                    port: 80
+                }
+            }
+        }
+    }
+}
+"""
+    with pytest.raises(ParseError, match=r"Failed to evaluate expression 'i.__class__'"):
+        DSLParser().parse(source)
@@ -0,0 +1,81 @@
+"""Tests for compiled ${...} interpolation templates."""
+
+from haproxy_translator.parsers import DSLParser
+from haproxy_translator.transformers import interpolation
+from haproxy_translator.transformers.interpolation import (
+    Template,
+    compile_expressions,
+    compile_variables,
+)
+
+
+class TestCompile:
+    """Splitting strings into literals and references."""
+
+    def test_plain_string(self):
+        assert compile_variables("10.0.0.1") == Template(format="10.0.0.1")
+
+    def test_references_and_literals(self):
+        template = compile_variables("${host}:${port}/x")
+        assert template.format == "{}:{}/x"
+        assert template.references == ("host", "port")
+
+    def test_variables_ignore_expressions(self):
+        template = compile_variables("${a + 1}-${b}")
+        assert template.format == "${{a + 1}}-{}"
+        assert template.references == ("b",)
+
+    def test_expressions_are_stripped(self):
+        template = compile_expressions("web-${ i * 2 }")
+        assert template.format == "web-{}"
+        assert template.references == ("i * 2",)
+
+    def test_compiled_once_per_string(self):
+        interpolation.clear_template_cache()
+        first = compile_expressions("srv-${i}")
+        assert compile_expressions("srv-${i}") is first
+        assert interpolation._compile_expressions.cache_info().misses == 1
+
+    def test_plain_strings_not_cached(self):
+        interpolation.clear_template_cache()
+        compile_variables("no references")
+        assert interpolation._compile_variables.cache_info().currsize == 0
+
+
+class TestRender:
+    """Rendering compiled templates."""
+
+    def test_render_joins_fragments(self):
+        template = compile_variables("${a}-${b}-${a}")
+        assert template.render({"a": "1", "b": "2"}.__getitem__) == "1-2-1"
+
+    def test_render_keeps_literal_braces(self):
+        template = compile_variables("{${a}} ${b}{}")
+        assert template.render({"a": "1", "b": "2"}.__getitem__) == "{1} 2{}"
+        assert compile_variables("{plain}").render(str) == "{plain}"
+
+
+def test_loop_reuses_templates():
+    """A server loop compiles its name and address templates once."""
+    interpolation.clear_template_cache()
+    ir = DSLParser().parse(
+        """
+config loop {
+    backend web {
+        servers {
+            for i in [1..200] {
+                server "web-${i}" {
+                    address: "10.0.0.${i}"
+                    port: 80
+                }
+            }
+        }
+    }
+}
+"""
+    )
+
+    servers = ir.backends[0].servers
+    assert [s.name for s in servers[:2]] == ["web-1", "web-2"]
+    assert servers[-1].address == "10.0.0.200"
+    assert interpolation._compile_expressions.cache_info().misses == 2
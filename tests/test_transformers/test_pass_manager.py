@@ -0,0 +1,86 @@
+"""Tests for the single-walk pass manager."""
+
+from pathlib import Path
+
+import pytest
+
+from haproxy_translator.parsers import DSLParser
+from haproxy_translator.transformers.loop_unroller import LoopUnroller
+from haproxy_translator.transformers.pass_manager import PassManager
+from haproxy_translator.transformers.template_expander import TemplateExpander
+from haproxy_translator.transformers.variable_resolver import VariableResolver
+
+EXAMPLES_DIR = Path(__file__).parent.parent.parent / "examples"
+
+LOOP_CONFIG = """
+config test {
+    let port = 8080
+    let base = "10.0.1"
+    template web {
+        check: true
+        inter: 5s
+    }
+    backend api {
+        servers {
+            server fixed {
+                address: "${base}.100"
+                port: ${port}
+                @web
+            }
+            for i in [1..2] {
+                server "web${i}" {
+                    address: "${base}.${i}"
+                    port: ${port}
+                    @web
+                }
+            }
+        }
+    }
+}
+"""
+
+
+def legacy_pipeline(ir):
+    """The separate passes DSLParser used to run."""
+    ir = TemplateExpander(ir).expand()
+    resolver = VariableResolver(ir)
+    ir = resolver.resolve()
+    ir = LoopUnroller(ir, variables=resolver.variables).unroll()
+    ir = TemplateExpander(ir).expand()
+    return VariableResolver(ir).resolve()
+
+
+def transformed(source):
+    return DSLParser()._parse_to_ir(source, "<input>")
+
+
+class TestPassManager:
+    """Test PassManager against the separate passes."""
+
+    @pytest.mark.parametrize("example", sorted(EXAMPLES_DIR.glob("*.hap")), ids=lambda p: p.name)
+    def test_examples_match_legacy_pipeline(self, example):
+        ir = transformed(example.read_text())
+        assert PassManager(ir).run() == legacy_pipeline(ir)
+
+    def test_loop_servers_expanded_and_resolved(self):
+        servers = PassManager(transformed(LOOP_CONFIG)).run().backends[0].servers
+
+        assert [s.name for s in servers] == ["fixed", "web1", "web2"]
+        assert [s.address for s in servers] == ["10.0.1.100", "10.0.1.1", "10.0.1.2"]
+        assert all(s.port == 8080 and s.check and s.check_interval == "5s" for s in servers)
+
+    def test_loop_metadata_removed(self):
+        backend = PassManager(transformed(LOOP_CONFIG)).run().backends[0]
+        assert "server_loops" not in backend.metadata
+
+    def test_variables_resolved_once(self, monkeypatch):
+        calls = []
+        original = VariableResolver.resolve_variable_values
+
+        def counting(self):
+            calls.append(self)
+            return original(self)
+
+        monkeypatch.setattr(VariableResolver, "resolve_variable_values", counting)
+        PassManager(transformed(LOOP_CONFIG)).run()
+        assert len(calls) == 1
@@ -0,0 +1,107 @@
+"""Tests for copy-on-write structural sharing in the transformers."""
+
+from haproxy_translator.ir.nodes import Backend, Bind, ConfigIR, Frontend, Server, Variable
+from haproxy_translator.parsers import DSLParser
+from haproxy_translator.transformers.pass_manager import PassManager
+from haproxy_translator.transformers.sharing import map_changed, replace_changed
+from haproxy_translator.transformers.template_expander import TemplateExpander
+from haproxy_translator.transformers.variable_resolver import VariableResolver
+
+MIXED_CONFIG = """
+config test {
+    let port = 8080
+    backend plain {
+        servers {
+            server a {
+                address: "10.0.0.1"
+                port: 80
+            }
+        }
+    }
+    backend templated {
+        servers {
+            server b {
+                address: "10.0.0.2"
+                port: ${port}
+            }
+            server c {
+                address: "10.0.0.3"
+                port: 80
+            }
+        }
+    }
+}
+"""
+
+
+class TestHelpers:
+    """Test replace_changed and map_changed."""
+
+    def test_replace_unchanged_returns_node(self):
+        """Replacing fields with the values they hold returns the node itself."""
+        server = Server(name="a", address="10.0.0.1", port=80)
+        assert replace_changed(server, name=server.name, port=server.port) is server
+
+    def test_replace_changed_copies(self):
+        """A changed field produces a copy."""
+        server = Server(name="a", address="10.0.0.1", port=80)
+        copy = replace_changed(server, name=server.name, port=81)
+        assert copy is not server
+        assert copy.port == 81
+        assert server.port == 80
+
+    def test_map_unchanged_returns_items(self):
+        """Mapping an identity function returns the same sequence."""
+        items = [Server(name="a"), Server(name="b")]
+        assert map_changed(lambda item: item, items) is items
+
+    def test_map_keeps_unchanged_items(self):
+        """Only changed items are replaced in the new list."""
+        items = [Server(name="a"), Server(name="b"), Server(name="c")]
+        result = map_changed(
+            lambda item: replace_changed(item, port=1) if item.name == "b" else item, items
+        )
+        assert result is not items
+        assert result[0] is items[0]
+        assert result[1].port == 1
+        assert result[2] is items[2]
+
+
+class TestTransformerSharing:
+    """Test that the stages return untouched nodes as they are."""
+
+    def test_resolver_keeps_plain_server(self):
+        """A server without variables is not copied by the resolver."""
+        server = Server(name="a", address="10.0.0.1", port=80)
+        resolver = VariableResolver(ConfigIR(variables={"port": Variable("port", 80)}))
+        assert resolver._resolve_server(server) is server
+
+    def test_resolver_keeps_plain_frontend(self):
+        """A frontend without variables comes back as the same object."""
+        frontend = Frontend(name="web", binds=[Bind(address="*:80")], default_backend="app")
+        resolver = VariableResolver(ConfigIR())
+        assert resolver.resolve_frontend(frontend) is frontend
+
+    def test_expander_keeps_untemplated_backend(self):
+        """A backend that uses no templates is not copied by the expander."""
+        backend = Backend(name="app", servers=[Server(name="a", address="10.0.0.1")])
+        expander = TemplateExpander(ConfigIR(backends=[backend]))
+        assert expander.expand_backend(backend) is backend
+
+    def test_pass_manager_shares_unchanged_nodes(self):
+        """Only nodes on the path to a change are rebuilt."""
+        ir = DSLParser()._parse_to_ir(MIXED_CONFIG, "<test>")
+        result = PassManager(ir).run()
+
+        plain, templated = ir.backends
+        new_plain, new_templated = result.backends
+        assert new_plain is plain
+        assert new_templated is not templated
+        assert new_templated.servers[0].port == 8080
+        assert new_templated.servers[1] is templated.servers[1]
+
+    def test_pass_manager_unchanged_config(self):
+        """A config with nothing to resolve is returned as is."""
+        backend = Backend(name="app", servers=[Server(name="a", address="10.0.0.1", port=80)])
+        ir = ConfigIR(name="test", backends=[backend])
+        assert PassManager(ir).run().backends[0] is backend
@@ -302,3 +302,60 @@ class TestVariableResolution:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestVariableDependencyOrder:
+    """Test resolving variable values through the reference graph."""
+
+    @pytest.fixture
+    def parser(self):
+        """Create a DSL parser."""
+        return DSLParser()
+
+    def resolve(self, parser, declarations):
+        ir = parser._parse_to_ir(f"config test {{ {declarations} }}", "<input>")
+        return VariableResolver(ir).resolve().variables
+
+    def test_declaration_order_does_not_matter(self, parser):
+        variables = self.resolve(
+            parser,
+            'let url = "http://${host}:${port}" let host = "${ip}" let ip = "10.0.0.1" '
+            "let port = 80",
+        )
+        assert variables["url"].value == "http://10.0.0.1:80"
+        assert list(variables) == ["url", "host", "ip", "port"]
+
+    def test_deep_chain(self, parser):
+        """Test chains far deeper than the old 10-pass limit."""
+        depth = 2000
+        declarations = 'let v0 = "end" ' + " ".join(
+            f'let v{i} = "${{v{i - 1}}}"' for i in range(1, depth)
+        )
+        assert self.resolve(parser, declarations)[f"v{depth - 1}"].value == "end"
+
+    def test_each_variable_resolved_once(self, parser, monkeypatch):
+        calls = []
+        original = VariableResolver._resolve_value
+
+        def counting(self, value):
+            calls.append(value)
+            return original(self, value)
+
+        monkeypatch.setattr(VariableResolver, "_resolve_value", counting)
+        ir = parser._parse_to_ir(
+            'config test { let a = "${b}${c}" let b = "${c}" let c = "x" }', "<input>"
+        )
+        VariableResolver(ir).resolve_variable_values()
+        assert sorted(calls) == ["${b}${c}", "${c}", "x"]
+
+    def test_cycle_reports_full_path(self, parser):
+        with pytest.raises(ParseError, match=r"Variable reference cycle: b -> c -> d -> b"):
+            self.resolve(parser, 'let a = "${b}" let b = "${c}" let c = "${d}" let d = "${b}"')
+
+    def test_self_reference(self, parser):
+        with pytest.raises(ParseError, match=r"Variable reference cycle: a -> a"):
+            self.resolve(parser, 'let a = "x${a}"')
+
+    def test_undefined_reference(self, parser):
+        with pytest.raises(ParseError, match="Undefined variable: missing"):
+            self.resolve(parser, 'let a = "${missing}"')
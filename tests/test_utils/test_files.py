@@ -0,0 +1,83 @@
+"""Tests for atomic write-if-changed helpers."""
+
+import os
+
+import pytest
+
+from haproxy_translator.utils.files import stream_text_if_changed, write_text_if_changed
+
+OLD_MTIME = 1_000_000_000
+
+
+def age(path):
+    os.utime(path, (OLD_MTIME, OLD_MTIME))
+
+
+class TestWriteTextIfChanged:
+    """Test write_text_if_changed."""
+
+    def test_creates_file(self, tmp_path):
+        path = tmp_path / "haproxy.cfg"
+        assert write_text_if_changed(path, "global\n    daemon\n")
+        assert path.read_text() == "global\n    daemon\n"
+
+    def test_same_content_left_alone(self, tmp_path):
+        path = tmp_path / "haproxy.cfg"
+        write_text_if_changed(path, "global\n")
+        age(path)
+        assert not write_text_if_changed(path, "global\n")
+        assert path.stat().st_mtime == OLD_MTIME
+
+    def test_changed_content_replaced(self, tmp_path):
+        path = tmp_path / "haproxy.cfg"
+        write_text_if_changed(path, "global\n")
+        age(path)
+        # Same size, different content
+        assert write_text_if_changed(path, "globaL\n")
+        assert path.read_text() == "globaL\n"
+        assert path.stat().st_mtime != OLD_MTIME
+
+    def test_keeps_permissions(self, tmp_path):
+        path = tmp_path / "haproxy.cfg"
+        path.write_text("old")
+        path.chmod(0o640)
+        write_text_if_changed(path, "new")
+        assert path.stat().st_mode & 0o777 == 0o640
+
+    def test_no_temporary_files_left(self, tmp_path):
+        path = tmp_path / "haproxy.cfg"
+        write_text_if_changed(path, "one")
+        write_text_if_changed(path, "one")
+        write_text_if_changed(path, "two")
+        assert [p.name for p in tmp_path.iterdir()] == ["haproxy.cfg"]
+
+
+class TestStreamTextIfChanged:
+    """Test stream_text_if_changed."""
+
+    def test_streams_and_skips_unchanged(self, tmp_path):
+        path = tmp_path / "haproxy.cfg"
+
+        def write(out):
+            out.write("global\n")
+            out.write("    daemon\n")
+
+        assert stream_text_if_changed(path, write)
+        age(path)
+        assert not stream_text_if_changed(path, write)
+        assert path.stat().st_mtime == OLD_MTIME
+        assert path.read_text() == "global\n    daemon\n"
+        assert [p.name for p in tmp_path.iterdir()] == ["haproxy.cfg"]
+
+    def test_failed_write_keeps_old_file(self, tmp_path):
+        path = tmp_path / "haproxy.cfg"
+        path.write_text("old")
+
+        def write(out):
+            out.write("partial")
+            raise RuntimeError("generation failed")
+
+        with pytest.raises(RuntimeError):
+            stream_text_if_changed(path, write)
+        assert path.read_text() == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["haproxy.cfg"]
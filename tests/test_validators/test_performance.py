@@ -0,0 +1,308 @@
+"""Tests for performance validator."""
+
+import pytest
+
+from haproxy_translator.ir.nodes import (
+    ACL,
+    Backend,
+    BalanceAlgorithm,
+    ConfigIR,
+    DefaultsConfig,
+    Frontend,
+    GlobalConfig,
+    Listen,
+    Mode,
+    Server,
+    ServerTemplate,
+    StickTable,
+)
+from haproxy_translator.parsers import DSLParser
+from haproxy_translator.validators.performance import (
+    PerformanceImpact,
+    PerformanceIssue,
+    PerformanceReport,
+    PerformanceValidator,
+)
+
+
+def validate(**sections):
+    return PerformanceValidator(ConfigIR(name="test", **sections)).validate()
+
+
+def acl_issues(*acls):
+    report = validate(frontends=[Frontend(name="web", acls=list(acls))])
+    return [issue for issue in report.issues if ".acl " in issue.location]
+
+
+def servers(count):
+    return [Server(name=f"s{i}", address=f"10.0.0.{i}", port=80) for i in range(count)]
+
+
+class TestPerformanceValidator:
+    """Test performance validation functionality."""
+
+    @pytest.fixture
+    def parser(self):
+        return DSLParser()
+
+    def test_efficient_config_passes(self, parser):
+        """Test that a configuration without anti-patterns reports nothing."""
+        source = """
+        config test {
+            global {
+                nbthread: 4
+                cpu-map "auto:1/1-4" "0-3"
+            }
+            defaults {
+                mode: http
+            }
+            frontend web {
+                bind 127.0.0.1:80
+                acl { is_api path_beg "/api" }
+                default_backend: app
+            }
+            backend app {
+                balance: roundrobin
+                http-reuse: safe
+                stick-table { type: ip size: 100000 expire: 30m }
+                servers {
+                    server s1 { address: "10.0.0.1" port: 8080 }
+                }
+            }
+        }
+        """
+        report = PerformanceValidator(parser.parse(source)).validate()
+        assert report.issues == []
+
+    def test_anti_patterns_from_dsl(self, parser):
+        source = """
+        config test {
+            global {
+                nbthread: 8
+                tune.bufsize: 16384
+                tune.maxrewrite: 12288
+            }
+            frontend web {
+                bind 127.0.0.1:80
+                acl { is_api path_reg "^/api" }
+                default_backend: app
+            }
+            backend app {
+                option: ["httpclose"]
+                http-reuse: never
+                stick-table { type: ip size: 1000 }
+                servers {
+                    server s1 { address: "10.0.0.1" port: 8080 }
+                }
+            }
+        }
+        """
+        report = PerformanceValidator(parser.parse(source)).validate()
+        locations = {issue.location for issue in report.issues}
+        assert locations == {
+            "frontend 'web'.acl 'is_api'",
+            "backend 'app'.http-reuse",
+            "backend 'app'.option",
+            "backend 'app'.stick-table",
+            "global.nbthread",
+            "global.tune.maxrewrite",
+        }
+        assert all(issue.cost and issue.recommendation for issue in report.issues)
+
+
+class TestRegexACLs:
+    """Test detection of regex ACLs matching literals."""
+
+    @pytest.mark.parametrize(
+        ("pattern", "method", "literal"),
+        [
+            ("^/api/v1$", "str", "/api/v1"),
+            ("^/api", "beg", "/api"),
+            (r"\.php$", "end", ".php"),
+            ("admin", "sub", "admin"),
+        ],
+    )
+    def test_literal_pattern(self, pattern, method, literal):
+        (issue,) = acl_issues(ACL(name="a", criterion="path", values=["-m", "reg", pattern]))
+        assert issue.recommendation == f"Use 'path -m {method} {literal}'"
+
+    def test_tree_lookups_rank_higher(self):
+        (exact,) = acl_issues(ACL(name="a", criterion="path", values=["-m", "reg", "^/a$"]))
+        (suffix,) = acl_issues(ACL(name="a", criterion="path", values=["-m", "reg", "/a$"]))
+        assert exact.impact == PerformanceImpact.MEDIUM
+        assert suffix.impact == PerformanceImpact.LOW
+
+    def test_reg_criterion(self):
+        acl = ACL(name="a", criterion="hdr_reg(host)", values=["-i", "^www\\.example\\.com$"])
+        (issue,) = acl_issues(acl)
+        assert issue.recommendation == "Use 'hdr(host) -i -m str www.example.com'"
+
+    def test_flags_field(self):
+        acl = ACL(name="a", criterion="path", flags=["-m", "reg"], values=["^/a", "^/b"])
+        (issue,) = acl_issues(acl)
+        assert issue.recommendation == "Use 'path -m beg /a /b'"
+
+    @pytest.mark.parametrize(
+        "values",
+        [
+            ["^/api/v[0-9]+"],
+            ["^/a.b"],
+            [r"^\d+$"],
+            ["^/a$", "^/b"],
+            ["-f", "/etc/haproxy/paths.lst"],
+            ["^$"],
+        ],
+        ids=["class", "wildcard", "escape-class", "mixed-anchors", "file", "empty"],
+    )
+    def test_real_regex_left_alone(self, values):
+        assert acl_issues(ACL(name="a", criterion="path", values=["-m", "reg", *values])) == []
+
+    def test_other_methods_left_alone(self):
+        assert acl_issues(ACL(name="a", criterion="path", values=["-m", "beg", "^/api"])) == []
+        assert acl_issues(ACL(name="a", criterion="path_beg", values=["/api"])) == []
+
+
+class TestConnectionChecks:
+    """Test connection reuse and close checks."""
+
+    def test_http_reuse_never(self):
+        report = validate(backends=[Backend(name="app", http_reuse="never")])
+        (issue,) = report.issues
+        assert issue.impact == PerformanceImpact.MEDIUM
+        assert issue.location == "backend 'app'.http-reuse"
+
+    def test_http_reuse_inherited_from_defaults(self):
+        report = validate(
+            defaults=DefaultsConfig(http_reuse="never"),
+            backends=[Backend(name="a"), Backend(name="b", http_reuse="safe")],
+        )
+        assert [issue.location for issue in report.issues] == ["backend 'a'.http-reuse"]
+
+    def test_http_reuse_unset(self):
+        (issue,) = validate(backends=[Backend(name="app")]).issues
+        assert issue.impact == PerformanceImpact.INFO
+
+    def test_tcp_backend_ignored(self):
+        assert validate(backends=[Backend(name="db", mode=Mode.TCP)]).issues == []
+
+    def test_httpclose(self):
+        report = validate(
+            defaults=DefaultsConfig(options=["httpclose"]),
+            frontends=[Frontend(name="web", options=["forceclose"])],
+        )
+        assert [issue.location for issue in report.issues] == [
+            "defaults.option",
+            "frontend 'web'.option",
+        ]
+        assert {issue.impact for issue in report.issues} == {PerformanceImpact.MEDIUM}
+
+    def test_httpclose_with_keep_alive(self):
+        report = validate(
+            defaults=DefaultsConfig(timeout_http_keep_alive="10s"),
+            listens=[Listen(name="app", options=["httpclose"])],
+        )
+        (issue,) = report.issues
+        assert issue.impact == PerformanceImpact.HIGH
+        assert "keep-alive" in issue.message
+
+
+class TestGlobalTuning:
+    """Test thread and buffer checks."""
+
+    def test_nbthread_without_cpu_map(self):
+        (issue,) = validate(global_config=GlobalConfig(nbthread=4)).issues
+        assert issue.location == "global.nbthread"
+        assert "0-3" in issue.recommendation
+
+    def test_single_thread(self):
+        assert validate(global_config=GlobalConfig(nbthread=1)).issues == []
+
+    @pytest.mark.parametrize(
+        ("tuning", "impact"),
+        [
+            ({"tune.bufsize": 16384, "tune.maxrewrite": 16384}, PerformanceImpact.HIGH),
+            ({"tune.bufsize": 4096, "tune.maxrewrite": 3072}, PerformanceImpact.MEDIUM),
+            ({"tune.maxrewrite": "9000"}, PerformanceImpact.MEDIUM),
+            ({"tune.bufsize": 1536}, PerformanceImpact.MEDIUM),
+        ],
+    )
+    def test_maxrewrite_too_large(self, tuning, impact):
+        (issue,) = validate(global_config=GlobalConfig(tuning=tuning)).issues
+        assert issue.impact == impact
+        assert issue.location == "global.tune.maxrewrite"
+
+    @pytest.mark.parametrize(
+        "tuning",
+        [
+            {"tune.bufsize": 32768, "tune.maxrewrite": 8192},
+            {"tune.bufsize": 32768},
+            {"tune.maxrewrite": "$MAXREWRITE"},
+        ],
+    )
+    def test_consistent_buffers(self, tuning):
+        assert validate(global_config=GlobalConfig(tuning=tuning)).issues == []
+
+
+class TestStickTables:
+    """Test stick table checks."""
+
+    def test_missing_expire(self):
+        report = validate(frontends=[Frontend(name="web", stick_table=StickTable(size=5000))])
+        (issue,) = report.issues
+        assert issue.impact == PerformanceImpact.MEDIUM
+        assert issue.location == "frontend 'web'.stick-table"
+        assert "5000" in issue.cost
+
+    def test_missing_expire_with_nopurge(self):
+        table = StickTable(nopurge=True)
+        (issue,) = validate(listens=[Listen(name="l", stick_table=table)]).issues
+        assert issue.impact == PerformanceImpact.HIGH
+
+
+class TestSourceBalancing:
+    """Test balance source checks."""
+
+    def test_large_pool(self):
+        backend = Backend(
+            name="app",
+            mode=Mode.TCP,
+            balance=BalanceAlgorithm.SOURCE,
+            servers=servers(2),
+            server_templates=[
+                ServerTemplate(prefix="web", count=30, fqdn_pattern="web-{id}.local")
+            ],
+        )
+        (issue,) = validate(backends=[backend]).issues
+        assert issue.impact == PerformanceImpact.MEDIUM
+        assert issue.message == "balance source over 32 servers"
+
+    def test_consistent_hashing(self):
+        backend = Backend(
+            name="app",
+            mode=Mode.TCP,
+            balance=BalanceAlgorithm.SOURCE,
+            servers=servers(40),
+            hash_type="consistent",
+        )
+        (issue,) = validate(backends=[backend]).issues
+        assert issue.impact == PerformanceImpact.LOW
+
+    def test_small_pool(self):
+        listen = Listen(name="app", balance=BalanceAlgorithm.SOURCE, servers=servers(4))
+        assert validate(listens=[listen]).issues == []
+
+
+class TestPerformanceReport:
+    """Test PerformanceReport class."""
+
+    def test_add_issue(self):
+        report = PerformanceReport()
+        issue = PerformanceIssue(
+            impact=PerformanceImpact.HIGH,
+            message="Test",
+            location="test",
+            cost="Test cost",
+            recommendation="Fix it",
+        )
+        report.add_issue(issue)
+        assert report.issues == [issue]
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Benchmark writing generated HAProxy configuration to a file.
+
+Parses a synthetic configuration with --backends backends of --servers
+servers each (50,000 servers by default) once, then writes it out with
+each method and reports the best wall time over --repeat runs and the
+tracemalloc peak of a separate run:
+
+- string: generate() builds the whole text, then writes it with write_text
+- stream: generate_to() writes each section as soon as it is formatted
+- parallel: generate_to() with --jobs worker processes (when --jobs > 1)
+- hoisted: generate_to() with options shared by every server of a backend
+  hoisted into default-server; its output is smaller, so its size is
+  reported as well
+
+The IR itself is allocated before measuring, so the peak is what code
+generation adds on top of it.
+
+Usage:
+    uv run python tools/benchmark_codegen.py
+    uv run python tools/benchmark_codegen.py --backends 100 --servers 50
+    uv run python tools/benchmark_codegen.py --jobs 8
+    uv run python tools/benchmark_codegen.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from haproxy_translator.codegen.haproxy import HAProxyCodeGenerator
+from haproxy_translator.parsers.dsl_parser import DSLParser
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from haproxy_translator.ir.nodes import ConfigIR
+
+METHODS = ("string", "stream", "parallel", "hoisted")
+
+
+def synthetic_config(backends: int, servers: int) -> str:
+    """Return a DSL config with ``backends`` backends of ``servers`` servers each."""
+    lines = [
+        "config synthetic {",
+        "    frontend web {",
+        "        bind *:80",
+        "        mode: http",
+        "        default_backend: pool0",
+        "    }",
+    ]
+    for b in range(backends):
+        lines += [
+            f"    backend pool{b} {{",
+            "        balance: roundrobin",
+            "        servers {",
+        ]
+        for s in range(servers):
+            lines += [
+                f"            server srv{b}_{s} {{",
+                f'                address: "10.{b // 256}.{b % 256}.{s % 256}"',
+                f"                port: {8000 + s // 256}",
+                "                check: true",
+                "                weight: 100",
+                "            }",
+            ]
+        lines += ["        }", "    }"]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Return the best wall time of ``repeat`` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """Return the tracemalloc peak, in bytes, of one call."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def writers(ir: ConfigIR, path: Path, jobs: int) -> dict[str, Callable[[], object]]:
+    """Return a function per method that writes ``ir`` to ``path``."""
+    generator = HAProxyCodeGenerator()
+
+    def string() -> None:
+        generator.generate(ir, output_path=path)
+
+    def stream(generator: HAProxyCodeGenerator = generator) -> None:
+        with path.open("w", encoding="utf-8") as out:
+            generator.generate_to(ir, out)
+
+    methods: dict[str, Callable[[], object]] = {"string": string, "stream": stream}
+    if jobs > 1:
+        methods["parallel"] = lambda: stream(HAProxyCodeGenerator(jobs=jobs))
+    methods["hoisted"] = lambda: stream(HAProxyCodeGenerator(hoist_default_server=True))
+    return methods
+
+
+def run(backends: int, servers: int, repeat: int, jobs: int = 1) -> dict[str, object]:
+    """Run the benchmark and return the results."""
+    ir = DSLParser(parser_mode="lalr", inline_transform=True).parse(
+        synthetic_config(backends, servers)
+    )
+    results: dict[str, object] = {
+        "backends": backends,
+        "servers": backends * servers,
+        "jobs": jobs,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "haproxy.cfg"
+        expected = None
+        for name, write in writers(ir, path, jobs).items():
+            row = results[name] = {
+                "seconds": best_time(write, repeat),
+                "peak_bytes": peak_memory(write),
+            }
+            output = path.read_bytes()
+            if name == "hoisted":
+                row["output_bytes"] = len(output)
+                continue
+            if expected is not None and output != expected:
+                raise SystemExit(f"{name} output differs from string output")
+            expected = output
+        assert expected is not None
+        results["output_bytes"] = len(expected)
+    return results
+
+
+def print_report(results: dict[str, object]) -> None:
+    """Print benchmark results as a text table."""
+    output_bytes = results["output_bytes"]
+    assert isinstance(output_bytes, int)
+    print(
+        f"{results['servers']:,} servers in {results['backends']:,} backends "
+        f"({output_bytes / 2**20:.1f}MB of output)\n"
+    )
+    header = f"{'method':10s} {'time':>9s} {'peak memory':>12s}"
+    print(header)
+    print("-" * len(header))
+    for name in METHODS:
+        if name not in results:
+            continue
+        row = results[name]
+        assert isinstance(row, dict)
+        print(f"{name:10s} {row['seconds']:8.2f}s {row['peak_bytes'] / 2**20:10.2f}MB")
+
+    string, stream = results["string"], results["stream"]
+    assert isinstance(string, dict)
+    assert isinstance(stream, dict)
+    print(f"\nstream: {string['peak_bytes'] / stream['peak_bytes']:.2f}x less peak memory")
+    parallel = results.get("parallel")
+    if isinstance(parallel, dict):
+        print(
+            f"parallel ({results['jobs']} jobs): "
+            f"{stream['seconds'] / parallel['seconds']:.2f}x faster than stream"
+        )
+    hoisted = results["hoisted"]
+    assert isinstance(hoisted, dict)
+    print(
+        f"hoisted: {output_bytes / hoisted['output_bytes']:.2f}x less output "
+        f"({hoisted['output_bytes'] / 2**20:.1f}MB)"
+    )
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    arg_parser.add_argument("--backends", type=int, default=500, help="Number of backends")
+    arg_parser.add_argument("--servers", type=int, default=100, help="Servers per backend")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per method")
+    arg_parser.add_argument(
+        "--jobs", type=int, default=1, help="Also time generate_to() with N worker processes"
+    )
+    arg_parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    args = arg_parser.parse_args()
+
+    results = run(args.backends, args.servers, args.repeat, args.jobs)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Measure the memory held by the IR of a large configuration.
+
+Generates a synthetic configuration with --backends backends of --servers
+servers each (80,000 servers by default), parses it to IR and reports the
+memory the finished ConfigIR keeps alive, as measured by tracemalloc: the
+total, per server, and the number of IR nodes of each type. Parse trees
+and other temporaries are freed before measuring, so only the IR counts.
+
+Run it against two checkouts to compare IR layouts, or with --intern or
+--columnar to measure DSLParser(intern_ir=True) and
+DSLParser(columnar_servers=N):
+
+Usage:
+    uv run python tools/benchmark_memory.py
+    uv run python tools/benchmark_memory.py --backends 100 --servers 50
+    uv run python tools/benchmark_memory.py --intern
+    uv run python tools/benchmark_memory.py --columnar 1000
+    uv run python tools/benchmark_memory.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import json
+import sys
+import tracemalloc
+from collections import Counter
+from typing import Any
+
+from haproxy_translator.ir.columns import ServerColumns
+from haproxy_translator.ir.nodes import IRNode
+from haproxy_translator.parsers.dsl_parser import DSLParser
+
+
+def synthetic_config(backends: int, servers: int) -> str:
+    """Return a DSL config with ``backends`` backends of ``servers`` servers each.
+
+    Every fourth server sets ALPN protocols and an extra option, so both
+    empty and populated collections are represented.
+    """
+    lines = [
+        "config synthetic {",
+        "    frontend web {",
+        "        bind *:80",
+        "        mode: http",
+        "        default_backend: pool0",
+        "    }",
+    ]
+    for b in range(backends):
+        lines += [
+            f"    backend pool{b} {{",
+            "        balance: roundrobin",
+            "        servers {",
+        ]
+        for s in range(servers):
+            lines += [
+                f"            server srv{b}_{s} {{",
+                f'                address: "10.{b // 256}.{b % 256}.{s % 256}"',
+                f"                port: {8000 + s // 256}",
+                "                check: true",
+                "                weight: 100",
+            ]
+            if s % 4 == 0:
+                lines += [
+                    '                alpn: ["h2", "http/1.1"]',
+                    f'                cookie: "s{s}"',
+                ]
+            lines.append("            }")
+        lines += ["        }", "    }"]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def count_nodes(node: Any, counts: Counter[str]) -> None:
+    """Count the IR nodes reachable from ``node`` by type name."""
+    if isinstance(node, IRNode):
+        counts[type(node).__name__] += 1
+        for f in dataclasses.fields(node):
+            count_nodes(getattr(node, f.name), counts)
+    elif isinstance(node, (list, tuple, ServerColumns)):
+        for item in node:
+            count_nodes(item, counts)
+    elif isinstance(node, dict):
+        for item in node.values():
+            count_nodes(item, counts)
+
+
+def run(
+    backends: int, servers: int, intern_ir: bool = False, columnar: int | None = None
+) -> dict[str, Any]:
+    """Parse the synthetic config and return the memory its IR retains."""
+    source = synthetic_config(backends, servers)
+    parser = DSLParser(
+        parser_mode="lalr",
+        inline_transform=True,
+        intern_ir=intern_ir,
+        columnar_servers=columnar,
+    )
+    # Load the grammar and fill lazy caches outside the measurement
+    parser.parse(synthetic_config(1, 1))
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        ir = parser.parse(source)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+
+    counts: Counter[str] = Counter()
+    count_nodes(ir, counts)
+    return {
+        "backends": backends,
+        "servers": backends * servers,
+        "intern_ir": intern_ir,
+        "columnar": columnar,
+        "retained_bytes": retained,
+        "bytes_per_server": retained / (backends * servers),
+        "nodes": dict(counts.most_common()),
+    }
+
+
+def print_report(results: dict[str, Any]) -> None:
+    """Print benchmark results as text."""
+    modes = [name for name in ("intern_ir", "columnar") if results[name]]
+    suffix = f" ({', '.join(modes)})" if modes else ""
+    print(f"{results['servers']:,} servers in {results['backends']:,} backends{suffix}\n")
+    print(f"IR retained:  {results['retained_bytes'] / 2**20:.1f}MB")
+    print(f"Per server:   {results['bytes_per_server']:,.0f} bytes\n")
+    header = f"{'node type':20s} {'count':>9s}"
+    print(header)
+    print("-" * len(header))
+    for name, count in results["nodes"].items():
+        print(f"{name:20s} {count:9,d}")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    arg_parser.add_argument("--backends", type=int, default=800, help="Number of backends")
+    arg_parser.add_argument("--servers", type=int, default=100, help="Servers per backend")
+    arg_parser.add_argument("--intern", action="store_true", help="Intern the IR while parsing")
+    arg_parser.add_argument(
+        "--columnar",
+        type=int,
+        metavar="N",
+        help="Store backends with at least N servers as columns",
+    )
+    arg_parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    args = arg_parser.parse_args()
+
+    results = run(args.backends, args.servers, intern_ir=args.intern, columnar=args.columnar)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
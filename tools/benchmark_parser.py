@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark DSL parsing in each parser mode (lalr, auto, earley).
+
+Grammar compilation is timed separately from parsing. Each input file is
+parsed --repeat times per mode and the best run is reported, along with
+whether auto mode had to fall back to Earley.
+
+Usage:
+    uv run python tools/benchmark_parser.py
+    uv run python tools/benchmark_parser.py examples/production-complete.hap
+    uv run python tools/benchmark_parser.py --repeat 10
+    uv run python tools/benchmark_parser.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from lark import LarkError
+
+from haproxy_translator.parsers import dsl_parser
+
+DEFAULT_INPUTS = Path(__file__).parent.parent / "examples"
+MODES = ("lalr", "auto", "earley")
+
+
+def collect_inputs(paths: list[Path]) -> list[Path]:
+    """Expand directories into the .hap files they contain."""
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.hap")))
+        else:
+            files.append(path)
+    return files
+
+
+def time_build() -> dict[str, float]:
+    """Time grammar compilation (or cache load) for each underlying Lark parser."""
+    timings = {}
+    for mode in ("lalr", "earley"):
+        start = time.perf_counter()
+        dsl_parser._build_lark(mode)
+        timings[mode] = time.perf_counter() - start
+    return timings
+
+
+def time_parse(mode: str, source: str, repeat: int) -> float | None:
+    """Return the best parse time for source, or None if it fails."""
+    parser = dsl_parser.DSLParser(parser_mode=mode)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            parser._parse_tree(source)
+        except LarkError:
+            return None
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(files: list[Path], repeat: int) -> dict[str, object]:
+    """Run the benchmark and return the results."""
+    build = time_build()
+    rows = []
+    for path in files:
+        source = path.read_text(encoding="utf-8")
+        timings = {mode: time_parse(mode, source, repeat) for mode in MODES}
+        rows.append(
+            {
+                "file": path.name,
+                "lines": source.count("\n") + 1,
+                "fallback": timings["lalr"] is None,
+                **timings,
+            }
+        )
+    totals = {
+        mode: sum(row[mode] or 0.0 for row in rows)  # type: ignore[misc]
+        for mode in MODES
+    }
+    return {"build": build, "files": rows, "totals": totals}
+
+
+def print_report(results: dict[str, object]) -> None:
+    """Print benchmark results as a text table."""
+
+    def fmt(value: float | None) -> str:
+        return "   reject" if value is None else f"{value * 1000:7.1f}ms"
+
+    build = results["build"]
+    assert isinstance(build, dict)
+    print(f"Grammar load: lalr {build['lalr']:.2f}s (cached), earley {build['earley']:.2f}s\n")
+
+    header = f"{'file':40s} {'lines':>6s} " + " ".join(f"{m:>9s}" for m in MODES)
+    print(header)
+    print("-" * len(header))
+    rows = results["files"]
+    assert isinstance(rows, list)
+    for row in rows:
+        note = "  (earley fallback)" if row["fallback"] else ""
+        print(f"{row['file']:40s} {row['lines']:6d} " + " ".join(fmt(row[m]) for m in MODES) + note)
+
+    totals = results["totals"]
+    assert isinstance(totals, dict)
+    print("-" * len(header))
+    print(f"{'total':40s} {'':6s} " + " ".join(fmt(totals[m]) for m in MODES))
+    if totals["auto"]:
+        print(f"\nauto mode speedup over earley: {totals['earley'] / totals['auto']:.1f}x")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    arg_parser.add_argument(
+        "inputs",
+        nargs="*",
+        type=Path,
+        default=[DEFAULT_INPUTS],
+        help="Files or directories to parse (default: examples/)",
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per file and mode")
+    arg_parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    args = arg_parser.parse_args()
+
+    files = collect_inputs(args.inputs)
+    if not files:
+        print("No input files found", file=sys.stderr)
+        return 1
+
+    results = run(files, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
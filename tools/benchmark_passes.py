@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Benchmark the IR transformation stages: legacy five passes vs PassManager.
+
+The legacy pipeline ran TemplateExpander, VariableResolver, LoopUnroller,
+TemplateExpander and VariableResolver in turn, each rebuilding the whole
+ConfigIR; PassManager runs the same stages in one walk per section. For
+each stage this reports the best wall time over --repeat runs and the IR
+nodes allocated (every IR node construction, including
+dataclasses.replace copies), along with the total for each pipeline.
+
+The synthetic configuration has --backends backends, each with
+--servers templated servers that reference variables, a server loop of the
+same size, and --plain literal servers. Stages return nodes they leave
+unchanged as they are, so plain servers should cost no allocations.
+
+Usage:
+    uv run python tools/benchmark_passes.py
+    uv run python tools/benchmark_passes.py --backends 50 --servers 20
+    uv run python tools/benchmark_passes.py --servers 5 --plain 200
+    uv run python tools/benchmark_passes.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+
+from haproxy_translator.ir import nodes
+from haproxy_translator.parsers.dsl_parser import DSLParser
+from haproxy_translator.transformers.loop_unroller import LoopUnroller
+from haproxy_translator.transformers.pass_manager import PassManager
+from haproxy_translator.transformers.template_expander import TemplateExpander
+from haproxy_translator.transformers.variable_resolver import VariableResolver
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from haproxy_translator.ir.nodes import ConfigIR
+
+# Methods PassManager calls, grouped by the stage they belong to
+FUSED_STAGES = {
+    "variables": (
+        VariableResolver,
+        (
+            "resolve_variable_values",
+            "resolve_global",
+            "resolve_defaults",
+            "resolve_frontend",
+            "resolve_backend",
+            "resolve_listen",
+            "resolve_lua_script",
+        ),
+    ),
+    "loops": (LoopUnroller, ("unroll_backend",)),
+    "templates": (TemplateExpander, ("expand_frontend", "expand_backend", "expand_listen")),
+}
+
+
+def synthetic_config(backends: int, servers: int, plain: int = 0) -> str:
+    """Return a config exercising loops, templates and variables."""
+    lines = [
+        "config synthetic {",
+        "    let port = 8080",
+        '    let subnet = "10.1"',
+        '    let base = "${subnet}.0"',
+        "    template web {",
+        "        check: true",
+        "        inter: 5s",
+        "        rise: 3",
+        "        weight: 50",
+        "    }",
+    ]
+    for b in range(backends):
+        lines += [
+            f"    backend pool{b} {{",
+            "        balance: roundrobin",
+            "        servers {",
+        ]
+        for s in range(servers):
+            lines += [
+                f"            server srv{b}_{s} {{",
+                f'                address: "${{base}}.{s % 256}"',
+                "                port: ${port}",
+                "                @web",
+                "            }",
+            ]
+        for s in range(plain):
+            lines += [
+                f"            server plain{b}_{s} {{",
+                f'                address: "10.2.{s // 256}.{s % 256}"',
+                "                port: 8080",
+                "                check: true",
+                "            }",
+            ]
+        lines += [
+            f"            for i in [1..{servers}] {{",
+            f'                server "loop{b}_${{i}}" {{',
+            '                    address: "${base}.${i}"',
+            "                    port: ${port}",
+            "                    @web",
+            "                }",
+            "            }",
+            "        }",
+            "    }",
+        ]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+class AllocationCounter:
+    """Count IR node constructions, attributed to the stage running at the time."""
+
+    def __init__(self) -> None:
+        self.counts: dict[str, int] = {}
+        self.stage = "other"
+        self._patches: list[tuple[type, str, Any]] = []
+
+    def __enter__(self) -> AllocationCounter:
+        for cls in vars(nodes).values():
+            if isinstance(cls, type) and issubclass(cls, nodes.IRNode):
+                self._patch(cls, "__init__", self._count_init(cls.__init__))
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        for cls, name, original in reversed(self._patches):
+            setattr(cls, name, original)
+        self._patches.clear()
+
+    def _patch(self, cls: type, name: str, wrapper: Any) -> None:
+        # Only patch methods defined on cls itself, or subclasses get wrapped twice
+        if name in vars(cls):
+            self._patches.append((cls, name, vars(cls)[name]))
+            setattr(cls, name, wrapper)
+
+    def _count_init(self, init: Callable[..., None]) -> Callable[..., None]:
+        @functools.wraps(init)
+        def wrapper(*args: Any, **kwargs: Any) -> None:
+            self.counts[self.stage] = self.counts.get(self.stage, 0) + 1
+            init(*args, **kwargs)
+
+        return wrapper
+
+    def staged(self, stage: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap ``method`` so allocations made inside it count towards ``stage``."""
+
+        @functools.wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            outer, self.stage = self.stage, stage
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.stage = outer
+
+        return wrapper
+
+    def attribute_fused_stages(self) -> None:
+        """Attribute PassManager's allocations to the stage methods it calls."""
+        for stage, (cls, methods) in FUSED_STAGES.items():
+            for name in methods:
+                self._patch(cls, name, self.staged(stage, vars(cls)[name]))
+
+
+def legacy_stages(ir: ConfigIR) -> Iterator[tuple[str, Callable[[], Any]]]:
+    """Yield the legacy passes in order, each applied to the previous result."""
+    state: dict[str, Any] = {"ir": ir}
+
+    def step(func: Callable[[ConfigIR], ConfigIR]) -> Callable[[], Any]:
+        def run() -> None:
+            state["ir"] = func(state["ir"])
+
+        return run
+
+    def resolve(ir: ConfigIR) -> ConfigIR:
+        resolver = VariableResolver(ir)
+        state["variables"] = resolver.variables
+        ir = resolver.resolve()
+        state["variables"] = resolver.variables
+        return ir
+
+    yield "templates (1st pass)", step(lambda ir: TemplateExpander(ir).expand())
+    yield "variables (1st pass)", step(resolve)
+    yield (
+        "loops",
+        step(lambda ir: LoopUnroller(ir, variables=state["variables"]).unroll()),
+    )
+    yield "templates (2nd pass)", step(lambda ir: TemplateExpander(ir).expand())
+    yield "variables (2nd pass)", step(resolve)
+
+
+def run_legacy(ir: ConfigIR, repeat: int) -> dict[str, dict[str, float]]:
+    """Time and count allocations of each legacy pass."""
+    results: dict[str, dict[str, float]] = {}
+    best = [float("inf")] * 5
+    for _ in range(repeat):
+        for i, (_, stage) in enumerate(legacy_stages(ir)):
+            start = time.perf_counter()
+            stage()
+            best[i] = min(best[i], time.perf_counter() - start)
+
+    with AllocationCounter() as counter:
+        for i, (name, stage) in enumerate(legacy_stages(ir)):
+            counter.stage = name
+            stage()
+            results[name] = {"seconds": best[i], "allocations": counter.counts.get(name, 0)}
+    return results
+
+
+def run_fused(ir: ConfigIR, repeat: int) -> dict[str, dict[str, float]]:
+    """Time PassManager and count allocations per stage."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        PassManager(ir).run()
+        best = min(best, time.perf_counter() - start)
+
+    with AllocationCounter() as counter:
+        counter.attribute_fused_stages()
+        PassManager(ir).run()
+
+    results = {
+        stage: {"seconds": float("nan"), "allocations": counter.counts.get(stage, 0)}
+        for stage in ("variables", "loops", "templates")
+    }
+    results["pass manager"] = {"seconds": best, "allocations": counter.counts.get("other", 0)}
+    return results
+
+
+def run(backends: int, servers: int, repeat: int, plain: int = 0) -> dict[str, object]:
+    """Run the benchmark and return the results."""
+    source = synthetic_config(backends, servers, plain)
+    ir = DSLParser()._parse_to_ir(source, "<synthetic>")
+    legacy = run_legacy(ir, repeat)
+    fused = run_fused(ir, repeat)
+    return {
+        "backends": backends,
+        "servers": backends * (servers * 2 + plain),
+        "legacy": legacy,
+        "fused": fused,
+        "totals": {
+            name: {
+                "seconds": sum(
+                    r["seconds"] for r in stages.values() if r["seconds"] == r["seconds"]
+                ),
+                "allocations": sum(r["allocations"] for r in stages.values()),
+            }
+            for name, stages in (("legacy", legacy), ("fused", fused))
+        },
+    }
+
+
+def print_report(results: dict[str, Any]) -> None:
+    """Print benchmark results as a text table."""
+    print(f"{results['servers']:,} servers in {results['backends']:,} backends\n")
+    header = f"{'pipeline / stage':30s} {'time':>9s} {'IR allocations':>15s}"
+    for pipeline in ("legacy", "fused"):
+        print(header)
+        print("-" * len(header))
+        for name, row in results[pipeline].items():
+            seconds = "" if row["seconds"] != row["seconds"] else f"{row['seconds'] * 1000:7.1f}ms"
+            print(f"{pipeline + ': ' + name:30s} {seconds:>9s} {row['allocations']:15,d}")
+        total = results["totals"][pipeline]
+        print("-" * len(header))
+        print(
+            f"{pipeline + ' total':30s} {total['seconds'] * 1000:7.1f}ms "
+            f"{total['allocations']:15,d}\n"
+        )
+
+    legacy, fused = results["totals"]["legacy"], results["totals"]["fused"]
+    print(
+        f"fused: {legacy['seconds'] / fused['seconds']:.2f}x faster, "
+        f"{legacy['allocations'] / max(fused['allocations'], 1):.2f}x fewer IR allocations"
+    )
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    arg_parser.add_argument("--backends", type=int, default=200, help="Number of backends")
+    arg_parser.add_argument(
+        "--servers", type=int, default=50, help="Servers per backend (plus a loop of as many)"
+    )
+    arg_parser.add_argument(
+        "--plain", type=int, default=0, help="Servers per backend without variables or templates"
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per pipeline")
+    arg_parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    args = arg_parser.parse_args()
+
+    results = run(args.backends, args.servers, args.repeat, args.plain)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
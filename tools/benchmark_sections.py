@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark formatting individual configuration sections.
+
+Parses every example in examples/ once, then formats each of their global,
+frontend, backend and listen sections --rounds times per timed run and
+reports the best time per section over --repeat runs. Servers are left out
+of backends and listens (--servers keeps them) so the numbers measure the
+section directives themselves.
+
+Usage:
+    uv run python tools/benchmark_sections.py
+    uv run python tools/benchmark_sections.py --rounds 2000 --servers
+    uv run python tools/benchmark_sections.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import json
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from haproxy_translator.codegen.haproxy import HAProxyCodeGenerator
+from haproxy_translator.parsers.dsl_parser import DSLParser
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+EXAMPLES_DIR = Path(__file__).parent.parent / "examples"
+
+SECTIONS = ("global", "frontend", "backend", "listen")
+
+
+def collect_sections(keep_servers: bool) -> dict[str, list[object]]:
+    """Return the sections of every example, by kind."""
+    parser = DSLParser()
+    sections: dict[str, list[object]] = {kind: [] for kind in SECTIONS}
+    for path in sorted(EXAMPLES_DIR.glob("*.hap")):
+        ir = parser.parse_file(path)
+        if ir.global_config:
+            sections["global"].append(ir.global_config)
+        sections["frontend"].extend(ir.frontends)
+        for kind, proxies in (("backend", ir.backends), ("listen", ir.listens)):
+            sections[kind].extend(
+                proxy if keep_servers else dataclasses.replace(proxy, servers=())
+                for proxy in proxies
+            )
+    return sections
+
+
+def time_sections(kind: str, nodes: Sequence[object], rounds: int, repeat: int) -> float:
+    """Return the best time, in seconds, to format one ``kind`` section."""
+    generator = HAProxyCodeGenerator()
+    generate = getattr(generator, f"_generate_{kind}")
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for node in nodes:
+                generate(node)
+        best = min(best, time.perf_counter() - start)
+        generator.lua_files.clear()
+    return best / (rounds * len(nodes))
+
+
+def run(rounds: int, repeat: int, keep_servers: bool = False) -> dict[str, object]:
+    """Run the benchmark and return the results."""
+    results: dict[str, object] = {}
+    for kind, nodes in collect_sections(keep_servers).items():
+        if nodes:
+            results[kind] = {
+                "sections": len(nodes),
+                "microseconds": time_sections(kind, nodes, rounds, repeat) * 1e6,
+            }
+    return results
+
+
+def print_report(results: dict[str, object]) -> None:
+    """Print benchmark results as a text table."""
+    header = f"{'section':10s} {'count':>6s} {'time/section':>13s}"
+    print(header)
+    print("-" * len(header))
+    for kind, row in results.items():
+        assert isinstance(row, dict)
+        print(f"{kind:10s} {row['sections']:6d} {row['microseconds']:11.1f}us")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    arg_parser.add_argument("--rounds", type=int, default=500, help="Passes per timed run")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Timed runs per section kind")
+    arg_parser.add_argument(
+        "--servers", action="store_true", help="Keep servers in backends and listens"
+    )
+    arg_parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    args = arg_parser.parse_args()
+
+    results = run(args.rounds, args.repeat, args.servers)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark the fused (inline) parse+transform pass against tree+transform.
+
+Generates a synthetic configuration with --backends backends of --servers
+servers each (50,000 servers by default) and reports, for both pipelines,
+the best wall time over --repeat runs and the tracemalloc peak of a
+separate run.
+
+Usage:
+    uv run python tools/benchmark_transform.py
+    uv run python tools/benchmark_transform.py --backends 100 --servers 50
+    uv run python tools/benchmark_transform.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from haproxy_translator.parsers.dsl_parser import DSLParser
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+PIPELINES = ("tree", "inline")
+
+
+def synthetic_config(backends: int, servers: int) -> str:
+    """Return a DSL config with ``backends`` backends of ``servers`` servers each."""
+    lines = [
+        "config synthetic {",
+        "    global {",
+        "        maxconn: 100000",
+        "    }",
+        "    frontend web {",
+        "        bind *:80",
+        "        mode: http",
+        "        default_backend: pool0",
+        "    }",
+    ]
+    for b in range(backends):
+        lines += [
+            f"    backend pool{b} {{",
+            "        balance: roundrobin",
+            "        servers {",
+        ]
+        for s in range(servers):
+            lines += [
+                f"            server srv{b}_{s} {{",
+                f'                address: "10.{b // 256}.{b % 256}.{s % 256}"',
+                f"                port: {8000 + s // 256}",
+                "                check: true",
+                "                weight: 100",
+                "            }",
+            ]
+        lines += ["        }", "    }"]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Return the best wall time of ``repeat`` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """Return the tracemalloc peak, in bytes, of one call."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(backends: int, servers: int, repeat: int) -> dict[str, object]:
+    """Run the benchmark and return the results."""
+    source = synthetic_config(backends, servers)
+    parsers = {
+        "tree": DSLParser(parser_mode="lalr"),
+        "inline": DSLParser(parser_mode="lalr", inline_transform=True),
+    }
+    results: dict[str, object] = {
+        "backends": backends,
+        "servers": backends * servers,
+        "lines": source.count("\n"),
+    }
+    for name, parser in parsers.items():
+
+        def translate(parser: DSLParser = parser) -> object:
+            return parser._parse_to_ir(source, "<synthetic>")
+
+        results[name] = {
+            "seconds": best_time(translate, repeat),
+            "peak_bytes": peak_memory(translate),
+        }
+    return results
+
+
+def print_report(results: dict[str, object]) -> None:
+    """Print benchmark results as a text table."""
+    print(
+        f"{results['servers']:,} servers in {results['backends']:,} backends "
+        f"({results['lines']:,} lines)\n"
+    )
+    header = f"{'pipeline':10s} {'time':>9s} {'peak memory':>12s}"
+    print(header)
+    print("-" * len(header))
+    for name in PIPELINES:
+        row = results[name]
+        assert isinstance(row, dict)
+        print(f"{name:10s} {row['seconds']:8.2f}s {row['peak_bytes'] / 2**20:10.1f}MB")
+
+    tree, inline = results["tree"], results["inline"]
+    assert isinstance(tree, dict)
+    assert isinstance(inline, dict)
+    print(
+        f"\ninline: {tree['seconds'] / inline['seconds']:.2f}x faster, "
+        f"{tree['peak_bytes'] / inline['peak_bytes']:.2f}x less peak memory"
+    )
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    arg_parser.add_argument("--backends", type=int, default=500, help="Number of backends")
+    arg_parser.add_argument("--servers", type=int, default=100, help="Servers per backend")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per pipeline")
+    arg_parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    args = arg_parser.parse_args()
+
+    results = run(args.backends, args.servers, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
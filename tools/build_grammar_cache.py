@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Regenerate the prebuilt LALR grammar cache shipped with the package.
+
+Run this after editing grammars/haproxy_dsl.lark or haproxy_dsl_lalr.lark,
+or after upgrading Lark; the parser ignores a prebuilt cache whose key does
+not match and falls back to compiling the grammar.
+
+Usage:
+    uv run python tools/build_grammar_cache.py
+    uv run python tools/build_grammar_cache.py --check
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from lark import Lark
+
+from haproxy_translator.parsers import grammar_cache
+from haproxy_translator.parsers.dsl_parser import _lark_config
+
+TARGET = Path(__file__).parent.parent / "src" / "haproxy_translator" / grammar_cache.PREBUILT_CACHE
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    arg_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only check that the prebuilt cache matches the current grammar",
+    )
+    args = arg_parser.parse_args()
+
+    grammar, options = _lark_config("lalr")
+    key = grammar_cache.cache_key(grammar, options)
+
+    if args.check:
+        data = TARGET.read_bytes() if TARGET.exists() else b""
+        if grammar_cache.deserialize(data, key) is None:
+            print(f"{TARGET} is out of date, run tools/build_grammar_cache.py", file=sys.stderr)
+            return 1
+        print(f"{TARGET} is up to date (key {key[:16]})")
+        return 0
+
+    TARGET.write_bytes(grammar_cache.serialize(Lark(grammar, **options), key))
+    print(f"Wrote {TARGET} ({TARGET.stat().st_size} bytes, key {key[:16]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())